@@ -5,6 +5,8 @@ import httpx
 from openai import OpenAI
 from typing import Optional
 
+from sugar.backend import config
+
 class NebiusAPI:
     """
     Nebius API client for generating text using Qwen models.
@@ -16,9 +18,11 @@ class NebiusAPI:
         Initialize the NebiusAPI client.
         
         Args:
-            api_key: Optional API key. If not provided, uses NEBIUS_API_KEY from environment.
+            api_key: Optional API key. If not provided, uses NEBIUS_API_KEY from the environment or .env.
             timeout: Request timeout in seconds (default: 60)
         """
+        if not api_key:
+            config.load_env()
         self.api_key = api_key or os.getenv('NEBIUS_API_KEY')
         if not self.api_key:
             raise ValueError("No API key provided and NEBIUS_API_KEY not found in environment variables.")
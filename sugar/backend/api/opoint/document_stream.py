@@ -0,0 +1,208 @@
+"""
+Incremental parsing of Opoint search responses.
+
+A /search/ response carries the header, summary, full text, matches and other sources of
+up to several thousand articles. Decoding it with response.json() holds the whole body
+and every parsed document in memory before the first article can be processed.
+iter_documents instead reads the body in chunks and yields the 'searchresult.document'
+entries one at a time as they arrive, so peak memory per request is bounded by a single
+document (plus one read chunk) and processing overlaps with the download.
+
+ijson is used when it is installed; otherwise a stdlib parser locates the document array
+and decodes its elements with json.JSONDecoder.raw_decode.
+"""
+import codecs
+import json
+import logging
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+try:
+    import ijson
+except ImportError:  # Optional dependency, the stdlib parser is used instead
+    ijson = None
+
+logger = logging.getLogger('OpointDocumentStream')
+
+# Bytes read from the response body at a time
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# ijson prefix of the documents of a search response
+DOCUMENTS_PREFIX = 'searchresult.document.item'
+
+_WHITESPACE = ' \t\r\n'
+
+
+def iter_documents(stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the 'searchresult.document' entries of a search response as they are read.
+
+    Args:
+        stream (BinaryIO): File-like object with the raw JSON response body
+        chunk_size (int): Bytes read from the stream at a time
+
+    Yields:
+        Dict[str, Any]: One raw document at a time, in response order
+
+    Raises:
+        ValueError: If the body is truncated or malformed
+    """
+    if ijson is not None:
+        try:
+            yield from ijson.items(stream, DOCUMENTS_PREFIX, use_float=True, buf_size=chunk_size)
+        except ijson.JSONError as e:
+            raise ValueError(f"Malformed search response: {e}") from e
+        return
+    yield from _iter_documents_stdlib(stream, chunk_size)
+
+
+def _iter_documents_stdlib(stream: BinaryIO, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    """Stdlib implementation of iter_documents"""
+    yield from _DocumentScanner(stream, chunk_size).documents()
+
+
+class _DocumentScanner:
+    """
+    Chunked reader of one search response.
+
+    The prefix up to 'searchresult.document' is scanned character by character, tracking
+    strings and nesting; each document is then decoded with raw_decode once it has been
+    read completely. Consumed text is dropped from the buffer as the scanner advances.
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.eof = False
+
+    def read_more(self) -> bool:
+        """Append the next chunk to the buffer, False at the end of the stream"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buffer += self.text_decoder.decode(b'', final=True)
+            return False
+        self.buffer += self.text_decoder.decode(chunk)
+        return True
+
+    def find_document_array(self) -> Optional[int]:
+        """
+        Scan up to the opening bracket of 'searchresult.document'.
+
+        Returns:
+            Optional[int]: Buffer position just after the bracket, or None if the response
+                has no document array
+        """
+        # One [bracket, current key] entry per open object or array
+        path = []
+        in_string = escaped = expect_key = False
+        key_start = None
+        position = 0
+
+        while True:
+            if position >= len(self.buffer):
+                if not self.read_more():
+                    if path or in_string:
+                        raise ValueError("Truncated search response")
+                    return None
+                continue
+
+            char = self.buffer[position]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                    if key_start is not None:
+                        path[-1][1] = self.buffer[key_start:position]
+                        key_start = None
+            elif char == '"':
+                in_string = True
+                if expect_key:
+                    key_start = position + 1
+                    expect_key = False
+            elif char == '{':
+                path.append(['{', None])
+                expect_key = True
+            elif char == '[':
+                if len(path) == 2 and path[0] == ['{', 'searchresult'] and path[1] == ['{', 'document']:
+                    return position + 1
+                path.append(['[', None])
+                expect_key = False
+            elif char in '}]':
+                if not path:
+                    raise ValueError("Malformed search response")
+                path.pop()
+                expect_key = False
+            elif char == ',':
+                expect_key = bool(path) and path[-1][0] == '{'
+            position += 1
+
+    def documents(self) -> Iterator[Dict[str, Any]]:
+        """Yield the elements of the document array"""
+        position = self.find_document_array()
+        if position is None:
+            return
+
+        while True:
+            # Skip the separator before the next document
+            while True:
+                while position < len(self.buffer) and (self.buffer[position] in _WHITESPACE
+                                                       or self.buffer[position] == ','):
+                    position += 1
+                if position < len(self.buffer):
+                    break
+                if not self.read_more():
+                    raise ValueError("Truncated search response: document array is not closed")
+            if self.buffer[position] == ']':
+                return
+
+            # A document is only decoded once it has been read completely
+            while True:
+                try:
+                    document, end = self.json_decoder.raw_decode(self.buffer, position)
+                    break
+                except json.JSONDecodeError as e:
+                    if not self.read_more():
+                        raise ValueError(f"Truncated or malformed search response: {e}") from e
+            yield document
+
+            position = end
+            if position > self.chunk_size:
+                self.buffer = self.buffer[position:]
+                position = 0
+
+
+class TeeReader:
+    """
+    File-like wrapper that copies every chunk read from a stream to a writer.
+
+    Used to store a streamed response in the response cache while it is being parsed.
+    A failing writer is aborted and dropped, so a full disk never interrupts a search.
+    """
+
+    def __init__(self, stream: BinaryIO, writer):
+        self.stream = stream
+        self.writer = writer
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        if chunk and self.writer is not None:
+            try:
+                self.writer.write(chunk)
+            except OSError as e:
+                logger.warning(f"Could not store search response in cache: {str(e)}")
+                self.writer.abort()
+                self.writer = None
+        return chunk
+
+    def drain(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Read the rest of the stream, e.g. the fields after the document array"""
+        while self.read(chunk_size):
+            pass
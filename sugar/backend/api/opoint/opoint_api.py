@@ -3,12 +3,17 @@ Module for interacting with the Opoint API.
 """
 import requests
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import BinaryIO, Dict, Iterator, List, Optional, Any
 import logging
 import os
+import time
 from dotenv import load_dotenv
 
+from sugar.backend.api.opoint.document_stream import TeeReader, iter_documents
+from sugar.backend.api.opoint.response_cache import OpointResponseCache, is_open_window, make_cache_key
+
 # Load environment variables
 load_dotenv()
 
@@ -19,23 +24,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger('OpointAPI')
 
+DEFAULT_BASE_URL = "https://api.opoint.com"
+
+# Longest Retry-After honoured when the API answers 429 Too Many Requests
+MAX_RETRY_AFTER_SECONDS = 60
+
 class OpointAPI:
     """
     A wrapper for the Opoint API that provides methods for searching sites and articles.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Cache modes for search responses:
+    #   'readwrite' - serve hits from the cache, store misses after fetching them; windows that
+    #                 have not ended yet are always fetched again
+    #   'refresh'   - always fetch from the network and overwrite cached entries
+    #   'replay'    - serve only from the cache and never touch the network (offline tests)
+    CACHE_MODES = ('readwrite', 'refresh', 'replay')
+    
+    # iter_articles streams search results one record at a time
+    SUPPORTS_STREAMING = True
+    
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 cache: Optional[OpointResponseCache] = None,
+                 cache_mode: str = 'readwrite',
+                 base_url: Optional[str] = None,
+                 rate_limit_retries: int = 3,
+                 rate_limiter=None):
         """
         Initialize the OpointAPI with an API key.
         
         Args:
             api_key (Optional[str]): API key for authentication. If None, uses the key from environment.
+            cache (Optional[OpointResponseCache]): Opt-in on-disk cache for raw search responses
+            cache_mode (str): One of CACHE_MODES, controls how the cache is used
+            base_url (Optional[str]): API root URL. If None, uses OPOINT_BASE_URL from the environment
+                or the public API (point it at a local stand-in server for offline benchmarks)
+            rate_limit_retries (int): Times a search answered with 429 Too Many Requests is retried
+            rate_limiter: Object whose acquire() is called before every search request, e.g. a
+                SharedRateLimiter that keeps several worker processes under one request rate
         """
+        if cache_mode not in self.CACHE_MODES:
+            raise ValueError(f"Unknown cache_mode '{cache_mode}', expected one of {self.CACHE_MODES}")
+        self.cache = cache
+        self.cache_mode = cache_mode
+        
         self.api_key = api_key or os.getenv('OPOINT_API_KEY')
         if not self.api_key:
             raise ValueError("No API key provided and OPOINT_API_KEY not found in environment variables.")
         
-        self.base_url = "https://api.opoint.com"
+        self.base_url = (base_url or os.getenv('OPOINT_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
+        self.rate_limit_retries = rate_limit_retries
+        self.rate_limiter = rate_limiter
         self.headers = {
             "Authorization": f"Token {self.api_key}",
             "Content-Type": "application/json",
@@ -77,7 +117,9 @@ class OpointAPI:
                        media_topic_ids: Optional[List[str]] = None,
                        start_date: Optional[datetime] = None,
                        end_date: Optional[datetime] = None,
-                       timeout: int = 30) -> pd.DataFrame:
+                       timeout: int = 30,
+                       site_ids: Optional[List[str]] = None,
+                       raise_errors: bool = False) -> pd.DataFrame:
         """
         Search for articles from a specific site or across all sites with optional text matching.
         If no site_id is provided, searches across all available sites.
@@ -97,12 +139,144 @@ class OpointAPI:
             start_date (Optional[datetime]): Start date for article search (inclusive)
             end_date (Optional[datetime]): End date for article search (inclusive)
             timeout (int): Request timeout in seconds
+            site_ids (Optional[List[str]]): Several site IDs to search at once (OR-ed MEDIA_ID filter),
+                instead of a single site_id
+            raise_errors (bool): Re-raise a request error instead of returning an empty DataFrame,
+                so callers can tell a failed search from one without results
             
         Returns:
             pd.DataFrame: DataFrame containing the matched articles
         """
         url = f"{self.base_url}/search/"
         
+        payload = self._build_search_payload(
+            site_id=site_id,
+            search_text=search_text,
+            language=language,
+            num_articles=num_articles,
+            min_score=min_score,
+            source=source,
+            topic_ids=topic_ids,
+            media_topic_ids=media_topic_ids,
+            start_date=start_date,
+            end_date=end_date,
+            site_ids=site_ids
+        )
+        
+        try:
+            logger.debug(f"Making API request with timeout: {timeout}s")
+            data = self._execute_search(url, payload, timeout)
+            if data is None:
+                return pd.DataFrame()
+            
+            articles = data.get("searchresult", {}).get("document", [])
+            
+            if not articles:
+                logger.warning("No articles found matching the search criteria")
+                return pd.DataFrame()
+            
+            # Rows reference their raw document in the response cache instead of carrying a copy
+            cache_key = make_cache_key(payload) if self.cache is not None else None
+            df = self._documents_to_dataframe(articles, cache_key=cache_key)
+            source_info = "from specified site" if site_id else "across all sites"
+            logger.info(f"Retrieved {len(df)} articles {source_info}")
+            return df
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error searching for articles: {str(e)}")
+            if raise_errors:
+                raise
+            return pd.DataFrame()
+    
+    def iter_articles(self,
+                      site_id: Optional[str] = None,
+                      search_text: Optional[str] = None,
+                      language: Optional[str] = None,
+                      num_articles: int = 20,
+                      min_score: float = None,
+                      source: Optional[str] = None,
+                      topic_ids: Optional[List[str]] = None,
+                      media_topic_ids: Optional[List[str]] = None,
+                      start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None,
+                      timeout: int = 30,
+                      site_ids: Optional[List[str]] = None,
+                      raise_errors: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the articles of a search as records, one at a time as the response arrives.
+        
+        Unlike search_articles, the response body is never decoded as a whole: documents are
+        parsed incrementally from the network or the response cache and converted one by one,
+        so memory is bounded by a single document and processing overlaps with the download.
+        A streamed network response is stored in the cache once it has been read completely.
+        
+        Args are the same as for search_articles, and:
+            raise_errors (bool): Re-raise a request or parse error instead of ending the stream
+                early, so callers can tell a truncated result from a complete one
+        
+        Yields:
+            Dict[str, Any]: Article records with the same fields as the search_articles columns
+        """
+        url = f"{self.base_url}/search/"
+        
+        payload = self._build_search_payload(
+            site_id=site_id,
+            search_text=search_text,
+            language=language,
+            num_articles=num_articles,
+            min_score=min_score,
+            source=source,
+            topic_ids=topic_ids,
+            media_topic_ids=media_topic_ids,
+            start_date=start_date,
+            end_date=end_date,
+            site_ids=site_ids
+        )
+        cache_key = make_cache_key(payload) if self.cache is not None else None
+        now = datetime.now()
+        count = 0
+        
+        try:
+            logger.debug(f"Streaming API request with timeout: {timeout}s")
+            with self._open_search_stream(url, payload, timeout) as stream:
+                if stream is None:
+                    return
+                for index, document in enumerate(iter_documents(stream)):
+                    count += 1
+                    yield self._document_to_record(document, now, cache_key, index)
+        except (requests.exceptions.RequestException, OSError, EOFError, ValueError) as e:
+            # Network errors, unreadable cache entries and truncated or malformed bodies
+            logger.error(f"Error streaming articles after {count} results: {str(e)}")
+            if raise_errors:
+                raise
+            return
+        
+        if not count:
+            logger.warning("No articles found matching the search criteria")
+        else:
+            source_info = "from specified site" if site_id else "across all sites"
+            logger.info(f"Retrieved {count} articles {source_info}")
+    
+    def _build_search_payload(self,
+                              site_id: Optional[str] = None,
+                              search_text: Optional[str] = None,
+                              language: Optional[str] = None,
+                              num_articles: int = 20,
+                              min_score: float = None,
+                              source: Optional[str] = None,
+                              topic_ids: Optional[List[str]] = None,
+                              media_topic_ids: Optional[List[str]] = None,
+                              start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None,
+                              site_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Build the request payload for the /search/ endpoint.
+        
+        Args are the same as for search_articles.
+        
+        Returns:
+            Dict[str, Any]: Request payload
+        """
         # Build the search query
         search_parts = []
         
@@ -135,6 +309,12 @@ class OpointAPI:
         # Add site filter only if specified
         if site_id:
             search_parts.append(f"site:{site_id}")
+        elif site_ids:
+            site_parts = [f"site:{sid}" for sid in site_ids]
+            if len(site_parts) == 1:
+                search_parts.append(site_parts[0])
+            else:
+                search_parts.append(f"({' OR '.join(site_parts)})")
             
         # Add source filter if specified
         if source:
@@ -185,80 +365,226 @@ class OpointAPI:
                 "min": min_score
             })
         
+        return payload
+    
+    def _reads_cache(self, payload: Dict[str, Any]) -> bool:
+        """
+        Whether a search is looked up in the response cache before going to the network.
+        
+        In 'readwrite' mode a window that has not ended yet is always fetched again, because
+        articles published since the cached response would otherwise be missed; the fresh
+        response still replaces the cached one, so 'replay' keeps working offline.
+        """
+        if self.cache is None or self.cache_mode == 'refresh':
+            return False
+        return self.cache_mode == 'replay' or not is_open_window(payload)
+    
+    def _execute_search(self, url: str, payload: Dict[str, Any], timeout: int) -> Optional[Dict[str, Any]]:
+        """
+        Execute a search request, consulting the response cache if one is configured.
+        
+        Args:
+            url (str): Search endpoint URL
+            payload (Dict[str, Any]): Request payload
+            timeout (int): Request timeout in seconds
+            
+        Returns:
+            Optional[Dict[str, Any]]: Raw JSON response, or None on a cache miss in replay mode
+        """
+        if self._reads_cache(payload):
+            cached = self.cache.get(payload)
+            if cached is not None:
+                logger.debug("Serving search response from cache")
+                return cached
+            if self.cache_mode == 'replay':
+                logger.warning("Search response not found in cache (replay mode, network disabled)")
+                return None
+        
+        response = self._post_search(url, payload, timeout)
+        response.raise_for_status()
+        
+        data = response.json()
+        if self.cache is not None:
+            try:
+                self.cache.put(payload, data)
+            except OSError as e:
+                logger.warning(f"Could not store search response in cache: {str(e)}")
+        return data
+    
+    def _post_search(self, url: str, payload: Dict[str, Any], timeout: int,
+                     stream: bool = False) -> requests.Response:
+        """
+        Send a search request, waiting and retrying while the API answers 429 Too Many Requests.
+        
+        Args:
+            url (str): Search endpoint URL
+            payload (Dict[str, Any]): Request payload
+            timeout (int): Request timeout in seconds
+            stream (bool): Whether the body is read as a stream
+            
+        Returns:
+            requests.Response: The first response that is not rate limited, or the last one
+        """
+        for attempt in range(self.rate_limit_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = requests.post(url, headers=self.headers, json=payload, timeout=timeout, stream=stream)
+            if response.status_code != 429 or attempt == self.rate_limit_retries:
+                return response
+            try:
+                delay = float(response.headers.get('Retry-After', 0))
+            except (TypeError, ValueError):
+                delay = 0.0
+            # Without a usable Retry-After, back off exponentially
+            delay = min(delay if delay > 0 else 0.5 * 2 ** attempt, MAX_RETRY_AFTER_SECONDS)
+            logger.warning(f"Search rate limited (429), retrying in {delay:.1f}s "
+                           f"(attempt {attempt + 1} of {self.rate_limit_retries})")
+            response.close()
+            time.sleep(delay)
+        return response
+    
+    @contextmanager
+    def _open_search_stream(self, url: str, payload: Dict[str, Any], timeout: int) -> Iterator[Optional[BinaryIO]]:
+        """
+        Open the raw body of a search response for streaming, consulting the response cache.
+        
+        Args:
+            url (str): Search endpoint URL
+            payload (Dict[str, Any]): Request payload
+            timeout (int): Request timeout in seconds
+            
+        Yields:
+            Optional[BinaryIO]: Raw JSON body, or None on a cache miss in replay mode
+        """
+        if self._reads_cache(payload):
+            cached = self.cache.open_raw(make_cache_key(payload))
+            if cached is not None:
+                logger.debug("Streaming search response from cache")
+                with cached:
+                    yield cached
+                return
+            if self.cache_mode == 'replay':
+                logger.warning("Search response not found in cache (replay mode, network disabled)")
+                yield None
+                return
+        
+        response = self._post_search(url, payload, timeout, stream=True)
         try:
-            logger.debug(f"Making API request with timeout: {timeout}s")
-            response = requests.post(url, headers=self.headers, json=payload, timeout=timeout)
             response.raise_for_status()
+            # Let urllib3 undo the transfer encoding (gzip) while reading
+            response.raw.decode_content = True
+            writer = None
+            if self.cache is not None:
+                try:
+                    writer = self.cache.open_writer(payload)
+                except OSError as e:
+                    logger.warning(f"Could not store search response in cache: {str(e)}")
+            if writer is None:
+                yield response.raw
+                return
             
-            data = response.json()
-            articles = data.get("searchresult", {}).get("document", [])
+            tee = TeeReader(response.raw, writer)
+            try:
+                yield tee
+                # Only a completely read response is stored
+                tee.drain()
+            except BaseException:
+                if tee.writer is not None:
+                    tee.writer.abort()
+                raise
+            if tee.writer is not None:
+                try:
+                    tee.writer.commit()
+                except OSError as e:
+                    logger.warning(f"Could not store search response in cache: {str(e)}")
+        finally:
+            response.close()
+    
+    def _documents_to_dataframe(self, articles: List[Dict[str, Any]],
+                                cache_key: Optional[str] = None) -> pd.DataFrame:
+        """
+        Convert raw searchresult documents into a DataFrame.
+        
+        Args:
+            articles (List[Dict[str, Any]]): Raw 'searchresult.document' entries
+            cache_key (Optional[str]): Response cache key of the search; when given, each row gets
+                'response_cache_key' and 'response_index' columns locating its raw document
             
-            if not articles:
-                logger.warning("No articles found matching the search criteria")
-                return pd.DataFrame()
+        Returns:
+            pd.DataFrame: DataFrame with one row per article
+        """
+        now = datetime.now()
+        records = [
+            self._document_to_record(article, now, cache_key, index)
+            for index, article in enumerate(articles)
+        ]
+        return pd.DataFrame(records)
+    
+    def _document_to_record(self, article: Dict[str, Any], now: datetime,
+                            cache_key: Optional[str] = None, index: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Convert one raw searchresult document into an article record.
+        
+        Args:
+            article (Dict[str, Any]): Raw 'searchresult.document' entry
+            now (datetime): Time the search was made, stored as 'date_added'
+            cache_key (Optional[str]): Response cache key of the search, see _documents_to_dataframe
+            index (Optional[int]): Position of the document in the response
             
-            # Process articles into DataFrame
-            now = datetime.now()
-            records = []
+        Returns:
+            Dict[str, Any]: Article record with the same fields as the DataFrame columns
+        """
+        # Extract all available fields according to API documentation
+        record = {
+            # Time fields
+            'published_date': pd.to_datetime(article.get('local_time', {}).get('text')),
+            'unix_timestamp': article.get('unix_timestamp'),
+            'date_added': now,
             
-            for article in articles:
-                # Extract all available fields according to API documentation
-                record = {
-                    # Time fields
-                    'published_date': pd.to_datetime(article.get('local_time', {}).get('text')),
-                    'unix_timestamp': article.get('unix_timestamp'),
-                    'date_added': now,
-                    
-                    # Content fields
-                    'title': article.get('header', {}).get('text', ''),
-                    'summary': article.get('summary', {}).get('text', ''),
-                    'text': article.get('body', {}).get('text', ''),
-                    'author': article.get('author', ''),
-                    'word_count': article.get('word_count'),
-                    
-                    # URL fields
-                    'url': article.get('orig_url', ''),  # Original article URL
-                    'opoint_url': article.get('url', ''),  # OPOINT tool URL
-                    'url_common': article.get('url_common', ''),  # Domain
-                    
-                    # Source fields
-                    'site_name': article.get('first_source', {}).get('sitename', ''),
-                    'source_name': article.get('first_source', {}).get('name', ''),
-                    'source_url': article.get('first_source', {}).get('url', ''),
-                    'site_url': article.get('first_source', {}).get('siteurl', ''),
-                    
-                    # IDs and metadata
-                    'id_site': article.get('id_site'),
-                    'id_article': article.get('id_article'),
-                    'position': article.get('position'),
-                    
-                    # Language and location
-                    'language': article.get('language', {}).get('text', ''),
-                    'country_name': article.get('countryname', ''),
-                    'country_code': article.get('countrycode', ''),
-                    
-                    # Sentiment if available
-                    'sentiment': article.get('topics_and_entities', {}).get('sentiment', ''),
-                    'sentiment_score': article.get('topics_and_entities', {}).get('sentiment_score'),
-                    
-                    # Media type info
-                    'media_type': article.get('mediatype', {}).get('text', ''),
-                    'paywall': article.get('mediatype', {}).get('paywall', False),
-                    'fulltext': article.get('mediatype', {}).get('fulltext', False),
-                    
-                    # Provider info
-                    'provider': 'opoint'
-                }
-                records.append(record)
+            # Content fields
+            'title': article.get('header', {}).get('text', ''),
+            'summary': article.get('summary', {}).get('text', ''),
+            'text': article.get('body', {}).get('text', ''),
+            'author': article.get('author', ''),
+            'word_count': article.get('word_count'),
             
-            df = pd.DataFrame(records)
-            source_info = "from specified site" if site_id else "across all sites"
-            logger.info(f"Retrieved {len(df)} articles {source_info}")
-            return df
+            # URL fields
+            'url': article.get('orig_url', ''),  # Original article URL
+            'opoint_url': article.get('url', ''),  # OPOINT tool URL
+            'url_common': article.get('url_common', ''),  # Domain
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error searching for articles: {str(e)}")
-            return pd.DataFrame()
+            # Source fields
+            'site_name': article.get('first_source', {}).get('sitename', ''),
+            'source_name': article.get('first_source', {}).get('name', ''),
+            'source_url': article.get('first_source', {}).get('url', ''),
+            'site_url': article.get('first_source', {}).get('siteurl', ''),
+            
+            # IDs and metadata
+            'id_site': article.get('id_site'),
+            'id_article': article.get('id_article'),
+            'position': article.get('position'),
+            
+            # Language and location
+            'language': article.get('language', {}).get('text', ''),
+            'country_name': article.get('countryname', ''),
+            'country_code': article.get('countrycode', ''),
+            
+            # Sentiment if available
+            'sentiment': article.get('topics_and_entities', {}).get('sentiment', ''),
+            'sentiment_score': article.get('topics_and_entities', {}).get('sentiment_score'),
+            
+            # Media type info
+            'media_type': article.get('mediatype', {}).get('text', ''),
+            'paywall': article.get('mediatype', {}).get('paywall', False),
+            'fulltext': article.get('mediatype', {}).get('fulltext', False),
+            
+            # Provider info
+            'provider': 'opoint'
+        }
+        if cache_key is not None:
+            record['response_cache_key'] = cache_key
+            record['response_index'] = index
+        return record
     
     def search_site_and_articles(self,
                                 site_name: Optional[str] = None,
@@ -271,7 +597,8 @@ class OpointAPI:
                                 media_topic_ids: Optional[List[str]] = None,
                                 start_date: Optional[datetime] = None,
                                 end_date: Optional[datetime] = None,
-                                timeout: int = 30) -> pd.DataFrame:
+                                timeout: int = 30,
+                                raise_errors: bool = False) -> pd.DataFrame:
         """
         Combined method to search for articles, optionally from a specific site.
         If no site_name is provided, searches across all sites.
@@ -291,6 +618,7 @@ class OpointAPI:
             start_date (Optional[datetime]): Start date for article search (inclusive)
             end_date (Optional[datetime]): End date for article search (inclusive)
             timeout (int): Request timeout in seconds
+            raise_errors (bool): Re-raise a request error of the article search (see search_articles)
             
         Returns:
             pd.DataFrame: DataFrame containing the matched articles
@@ -306,7 +634,8 @@ class OpointAPI:
                 start_date=start_date,
                 topic_ids=topic_ids,
                 media_topic_ids=media_topic_ids,
-                end_date=end_date
+                end_date=end_date,
+                raise_errors=raise_errors
             )
             
         # Search for specific site
@@ -339,5 +668,6 @@ class OpointAPI:
             media_topic_ids=media_topic_ids,
             start_date=start_date,
             end_date=end_date,
-            timeout=timeout
+            timeout=timeout,
+            raise_errors=raise_errors
         )
\ No newline at end of file
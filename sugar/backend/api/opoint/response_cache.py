@@ -0,0 +1,487 @@
+"""
+Content-addressed on-disk cache for raw Opoint search responses.
+
+Responses are keyed by a SHA-256 hash of the canonicalized request payload
+(searchline, date window, filters and requested article count), stored as
+gzip-compressed JSON and tracked in a small SQLite index that drives TTL
+expiry and size-bounded LRU eviction.
+
+The cache is opt-in: pass an OpointResponseCache instance to OpointAPI.
+Re-running a backfill with a changed triage rule or normalizer then reads the
+historical months from disk instead of the network, and a populated cache
+directory doubles as a set of recorded fixtures for offline tests
+(see the 'replay' mode of OpointAPI).
+
+Searches whose window is still open (it ends now or later, e.g. the current month)
+are stored but not served in the default 'readwrite' mode, since articles keep being
+published into them; see is_open_window.
+"""
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from sugar.backend.api.opoint.document_stream import iter_documents
+
+logger = logging.getLogger('OpointResponseCache')
+
+# Default time-to-live for cached responses (30 days)
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+# Default upper bound for the total size of the compressed cache files (2 GB)
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+
+def canonicalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a canonical copy of an Opoint search payload.
+
+    Only the parts of the request that determine the result set are kept:
+    the search line, its filters (order-insensitive), the date window and the
+    requested article count. Whitespace in the search line is collapsed so that
+    cosmetic differences in query building do not produce different keys.
+
+    Args:
+        payload (Dict[str, Any]): Request payload as sent to the /search/ endpoint
+
+    Returns:
+        Dict[str, Any]: Canonical representation of the payload
+    """
+    params = payload.get("params", {})
+    expressions = []
+    for expression in payload.get("expressions", []):
+        searchline = expression.get("searchline", {})
+        filters = sorted(
+            searchline.get("filters", []),
+            key=lambda f: json.dumps(f, sort_keys=True, ensure_ascii=False)
+        )
+        expressions.append({
+            "linemode": expression.get("linemode"),
+            "searchterm": " ".join(str(searchline.get("searchterm", "")).split()),
+            "filters": filters
+        })
+
+    return {
+        "expressions": expressions,
+        "requestedarticles": params.get("requestedarticles"),
+        "oldest": params.get("oldest"),
+        "newest": params.get("newest"),
+        "main": params.get("main", {})
+    }
+
+
+def is_open_window(payload: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """
+    Check whether the date window of a search payload has not ended yet.
+
+    A search without an end date runs up to the present, so its window is open too.
+
+    Args:
+        payload (Dict[str, Any]): Request payload as sent to the /search/ endpoint
+        now (Optional[float]): Current Unix time (default: time.time())
+
+    Returns:
+        bool: True if more articles can still be published into the window
+    """
+    newest = payload.get("params", {}).get("newest")
+    return newest is None or newest >= (time.time() if now is None else now)
+
+
+def make_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    Compute the content address of a search payload.
+
+    Args:
+        payload (Dict[str, Any]): Request payload as sent to the /search/ endpoint
+
+    Returns:
+        str: Hex SHA-256 digest of the canonicalized payload
+    """
+    canonical = json.dumps(
+        canonicalize_payload(payload),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class OpointResponseCache:
+    """
+    Thread-safe, size-bounded cache of raw Opoint search responses.
+
+    Layout of the cache directory:
+        index.db            SQLite index (key, size, timestamps, request summary)
+        ab/abcdef....json.gz  gzip-compressed raw JSON response bodies
+    """
+
+    def __init__(self,
+                 cache_dir: str,
+                 ttl_seconds: Optional[int] = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding the cache files and index
+            ttl_seconds (Optional[int]): Time-to-live of an entry in seconds, or None for no expiry
+            max_bytes (int): Maximum total size of the compressed entries before LRU eviction
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'writes': 0, 'evictions': 0}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(self.cache_dir, "index.db"), check_same_thread=False)
+        self._init_index()
+
+    def _init_index(self):
+        """Create the index table if it does not exist yet"""
+        with self.lock:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    expires_at REAL,
+                    searchterm TEXT,
+                    oldest INTEGER,
+                    newest INTEGER,
+                    requested INTEGER
+                )
+            ''')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)')
+            self.conn.commit()
+
+    def path_for(self, key: str) -> str:
+        """Return the file path of the compressed response body for a key"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json.gz")
+
+    def get(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up the raw response for a payload.
+
+        Args:
+            payload (Dict[str, Any]): Request payload
+
+        Returns:
+            Optional[Dict[str, Any]]: Parsed raw JSON response, or None on a miss or expired entry
+        """
+        key = make_cache_key(payload)
+        raw = self.get_raw(key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            logger.warning(f"Discarding corrupt cache entry {key}: {e}")
+            self.delete(key)
+            return None
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        """
+        Return the uncompressed raw JSON body stored under a key.
+
+        Args:
+            key (str): Cache key as returned by make_cache_key
+
+        Returns:
+            Optional[bytes]: Raw JSON body, or None on a miss or expired entry
+        """
+        stream = self.open_raw(key)
+        if stream is None:
+            return None
+        try:
+            with stream:
+                return stream.read()
+        except OSError as e:
+            logger.warning(f"Cache entry {key} is unreadable: {e}")
+            self.delete(key)
+            return None
+
+    def open_raw(self, key: str) -> Optional[BinaryIO]:
+        """
+        Open the uncompressed raw JSON body stored under a key for streaming.
+
+        Args:
+            key (str): Cache key as returned by make_cache_key
+
+        Returns:
+            Optional[BinaryIO]: File object to be closed by the caller, or None on a miss or
+                expired entry
+        """
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            if row[0] is not None and row[0] < now:
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                self._delete_locked(key)
+                return None
+            self.conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            self.conn.commit()
+
+        try:
+            stream = gzip.open(self.path_for(key), 'rb')
+        except OSError as e:
+            logger.warning(f"Cache entry {key} is indexed but unreadable: {e}")
+            self.delete(key)
+            with self.lock:
+                self.stats['misses'] += 1
+            return None
+
+        with self.lock:
+            self.stats['hits'] += 1
+        return stream
+
+    def get_documents(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the 'searchresult.document' list of a cached response.
+
+        Args:
+            key (str): Cache key as returned by make_cache_key
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Raw documents, or None on a miss or expired entry
+        """
+        raw = self.get_raw(key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw).get("searchresult", {}).get("document", [])
+        except ValueError as e:
+            logger.warning(f"Discarding corrupt cache entry {key}: {e}")
+            self.delete(key)
+            return None
+
+    def get_document(self, key: str, index: int) -> Optional[Dict[str, Any]]:
+        """
+        Return a single document of a cached response.
+
+        Processed articles keep a (key, index) reference instead of a copy of their raw document;
+        this resolves such a reference.
+
+        Args:
+            key (str): Cache key as returned by make_cache_key
+            index (int): Position of the document in 'searchresult.document'
+
+        Returns:
+            Optional[Dict[str, Any]]: Raw document, or None if the entry or document is gone
+        """
+        if index < 0:
+            return None
+        stream = self.open_raw(key)
+        if stream is None:
+            return None
+        try:
+            with stream:
+                # Only the documents up to the requested one are parsed
+                return next(itertools.islice(iter_documents(stream), index, None), None)
+        except (OSError, EOFError, ValueError) as e:
+            logger.warning(f"Discarding corrupt cache entry {key}: {e}")
+            self.delete(key)
+            return None
+
+    def put(self, payload: Dict[str, Any], data: Dict[str, Any]) -> str:
+        """
+        Store the raw response for a payload.
+
+        Args:
+            payload (Dict[str, Any]): Request payload
+            data (Dict[str, Any]): Parsed raw JSON response
+
+        Returns:
+            str: Cache key of the stored entry
+        """
+        raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        return self.put_raw(payload, raw)
+
+    def put_raw(self, payload: Dict[str, Any], raw: bytes) -> str:
+        """
+        Store an already serialized raw JSON response body for a payload.
+
+        The body is compressed to a temporary file and atomically renamed into
+        place before the index is updated, so readers never see partial entries.
+
+        Args:
+            payload (Dict[str, Any]): Request payload
+            raw (bytes): Raw JSON response body
+
+        Returns:
+            str: Cache key of the stored entry
+        """
+        writer = self.open_writer(payload)
+        try:
+            writer.write(raw)
+        except Exception:
+            writer.abort()
+            raise
+        return writer.commit()
+
+    def open_writer(self, payload: Dict[str, Any]) -> 'ResponseWriter':
+        """
+        Start storing a raw response body for a payload chunk by chunk.
+
+        Used to cache a streamed response while it is being parsed; the entry only becomes
+        visible once the writer is committed.
+
+        Args:
+            payload (Dict[str, Any]): Request payload
+
+        Returns:
+            ResponseWriter: Writer to feed the body to, then commit or abort
+        """
+        return ResponseWriter(self, payload)
+
+    def _index_entry(self, key: str, payload: Dict[str, Any], size: int):
+        """Record a freshly written entry in the index and enforce the size bound"""
+        canonical = canonicalize_payload(payload)
+        searchterm = canonical["expressions"][0]["searchterm"] if canonical["expressions"] else None
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+
+        with self.lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO responses
+                (key, size, created_at, last_access, expires_at, searchterm, oldest, newest, requested)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (key, size, now, now, expires_at, searchterm,
+                  canonical["oldest"], canonical["newest"], canonical["requestedarticles"]))
+            self.conn.commit()
+            self.stats['writes'] += 1
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """Drop expired entries, then least recently used entries until under max_bytes"""
+        now = time.time()
+        expired = self.conn.execute(
+            'SELECT key FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?', (now,)
+        ).fetchall()
+        for (key,) in expired:
+            self._delete_locked(key)
+            self.stats['expired'] += 1
+
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self.conn.execute(
+            'SELECT key, size FROM responses ORDER BY last_access ASC'
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._delete_locked(key)
+            total -= size
+            self.stats['evictions'] += 1
+
+    def delete(self, key: str):
+        """Remove an entry from the cache"""
+        with self.lock:
+            self._delete_locked(key)
+
+    def _delete_locked(self, key: str):
+        self.conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+        self.conn.commit()
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def keys_between(self, oldest: int, newest: int) -> List[str]:
+        """
+        Return the keys of searches whose date window lies within [oldest, newest].
+
+        Args:
+            oldest (int): Unix timestamp of the start of the window
+            newest (int): Unix timestamp of the end of the window
+
+        Returns:
+            List[str]: Cache keys, oldest search window first
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT key FROM responses WHERE oldest >= ? AND newest <= ? ORDER BY oldest, key',
+                (oldest, newest)
+            ).fetchall()
+        return [key for (key,) in rows]
+
+    def total_bytes(self) -> int:
+        """Return the total size of the compressed entries in bytes"""
+        with self.lock:
+            return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def close(self):
+        """Close the index connection"""
+        with self.lock:
+            self.conn.close()
+
+
+
+class ResponseWriter:
+    """
+    Incremental writer of one cache entry.
+
+    The body is compressed to a temporary file and atomically renamed into place by
+    commit() before the index is updated, so readers never see partial entries.
+    """
+
+    def __init__(self, cache: OpointResponseCache, payload: Dict[str, Any]):
+        self.cache = cache
+        self.payload = payload
+        self.key = make_cache_key(payload)
+        self.path = cache.path_for(self.key)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        fd, self.tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        self.tmp_file = os.fdopen(fd, 'wb')
+        self.gz = gzip.GzipFile(fileobj=self.tmp_file, mode='wb', mtime=0)
+
+    def write(self, chunk: bytes):
+        """Append a chunk of the raw JSON body"""
+        self.gz.write(chunk)
+
+    def commit(self) -> str:
+        """
+        Move the complete body into place and index it.
+
+        Returns:
+            str: Cache key of the stored entry
+        """
+        try:
+            self.gz.close()
+            self.tmp_file.close()
+            os.replace(self.tmp_path, self.path)
+        except Exception:
+            self.abort()
+            raise
+        self.cache._index_entry(self.key, self.payload, os.path.getsize(self.path))
+        return self.key
+
+    def abort(self):
+        """Discard the partial body, e.g. when the stream was not read to the end"""
+        try:
+            self.gz.close()
+            self.tmp_file.close()
+        except OSError:
+            pass
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
@@ -0,0 +1,347 @@
+"""
+Local stand-in for the Opoint /search/ endpoint.
+
+Benchmarks and end-to-end tests of the fetcher cannot hit the paid Opoint API. This module
+serves the part of the /search/ contract that OpointAPI uses from a local HTTP server:
+
+- POST /search/ with a Token Authorization header and the JSON payload built by
+  OpointAPI._build_search_payload
+- site:ID filters (single or OR-ed), the oldest/newest date window, the lang filter and
+  requestedarticles are applied; documents are returned newest first
+- the response has the Opoint shape ({"searchresult": {"document": [...]}}) and is gzip
+  encoded when the client accepts it
+
+Documents are either recorded responses replayed from an OpointResponseCache directory
+(load_recorded_documents) or synthetic multilingual documents (make_synthetic_documents).
+Latency, server errors (500) and rate limiting (429 with Retry-After) can be injected to
+measure the fetcher under realistic conditions:
+
+    with OpointStandinServer(documents, latency=0.05, rate_limit_rate=0.05) as server:
+        api = OpointAPI(api_key="standin", base_url=server.url)
+
+OpointAPI also reads OPOINT_BASE_URL, which points code that creates its own API instances
+(fetch_sugar_articles_for_period, run_month_pipeline) at the stand-in.
+"""
+import gzip
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('OpointStandinServer')
+
+_SITE_PATTERN = re.compile(r'site:(\d+)')
+
+# Sugar market paragraphs per language for synthetic documents
+SYNTHETIC_TEXTS = {
+    'en': ("Raw sugar futures on ICE rose 1.4% to 21.35 cents per pound as UNICA reported that mills in "
+           "Centre-South Brazil crushed less cane than expected. White sugar in London gained $6.20 to "
+           "$612.40 a tonne while traders watched India's monsoon and export quota."),
+    'pt': ("Os contratos futuros de açúcar bruto em Nova York subiram 1,4% para 21,35 centavos de dólar por "
+           "libra-peso, depois que a UNICA informou que as usinas do Centro-Sul moeram menos cana do que o "
+           "esperado na segunda quinzena do mês."),
+    'es': ("Los futuros del azúcar crudo subieron un 1,4% hasta 21,35 centavos por libra después de que la "
+           "UNICA informara de una molienda de caña menor de lo esperado en el centro-sur de Brasil."),
+    'fr': ("Les contrats à terme sur le sucre brut ont progressé de 1,4 % à 21,35 cents la livre, l'UNICA "
+           "ayant fait état d'un broyage de canne inférieur aux attentes dans le Centre-Sud du Brésil."),
+    'ru': ("Фьючерсы на сахар-сырец на ICE выросли на 1,4% до 21,35 цента за фунт после того, как UNICA "
+           "сообщила о меньшей, чем ожидалось, переработке тростника в центрально-южном регионе Бразилии."),
+    'zh': ("洲际交易所原糖期货上涨1.4%至每磅21.35美分，巴西甘蔗行业协会报告称中南部地区糖厂压榨的甘蔗少于预期，"
+           "交易商同时关注印度季风和出口配额。"),
+}
+
+
+def make_synthetic_documents(sites: Iterable[Tuple[int, str]], start_date: datetime, end_date: datetime,
+                             per_site: int = 40, languages: Optional[List[str]] = None,
+                             paragraphs: Tuple[int, int] = (2, 12), seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Create Opoint-shaped multilingual documents spread over a date window.
+
+    Args:
+        sites (Iterable[Tuple[int, str]]): (site ID, site name) pairs
+        start_date (datetime): Oldest publication time
+        end_date (datetime): Newest publication time
+        per_site (int): Documents per site
+        languages (Optional[List[str]]): Languages to rotate through (default: all of SYNTHETIC_TEXTS)
+        paragraphs (Tuple[int, int]): Range of body paragraphs per document
+        seed (int): Random seed, so runs are comparable
+
+    Returns:
+        List[Dict[str, Any]]: Raw 'searchresult.document' entries
+    """
+    rng = random.Random(seed)
+    languages = languages or list(SYNTHETIC_TEXTS)
+    first = int(start_date.timestamp())
+    span = max(1, int(end_date.timestamp()) - first)
+    documents = []
+    article_id = 0
+    for site_id, site_name in sites:
+        for _ in range(per_site):
+            article_id += 1
+            language = languages[article_id % len(languages)]
+            text = SYNTHETIC_TEXTS[language]
+            timestamp = first + rng.randrange(span)
+            body = "".join(f"<p>{text} ({article_id}.{i})</p>" for i in range(rng.randint(*paragraphs)))
+            documents.append({
+                "id_site": site_id,
+                "id_article": article_id,
+                "position": article_id,
+                "unix_timestamp": timestamp,
+                "local_time": {"text": datetime.fromtimestamp(timestamp).isoformat()},
+                "header": {"text": f"{text[:70]} #{article_id}"},
+                "summary": {"text": text[:200]},
+                "body": {"text": body},
+                "word_count": len(body.split()),
+                "orig_url": f"https://www.site{site_id}.example/sugar/{article_id}",
+                "url": f"https://m360.opoint.com/story/{article_id}",
+                "url_common": f"site{site_id}.example",
+                "first_source": {"sitename": site_name, "name": site_name,
+                                 "url": f"https://www.site{site_id}.example"},
+                "language": {"text": language},
+                "countryname": "Brazil",
+                "countrycode": "BR",
+                "matches": {"header": {"text": "sugar"}},
+            })
+    return documents
+
+
+def load_recorded_documents(cache) -> List[Dict[str, Any]]:
+    """
+    Collect the documents of every response recorded in an OpointResponseCache.
+
+    Documents returned by several recorded searches are kept once.
+
+    Args:
+        cache: OpointResponseCache with recorded responses
+
+    Returns:
+        List[Dict[str, Any]]: Raw 'searchresult.document' entries
+    """
+    documents = {}
+    for key in cache.keys_between(0, 2 ** 62):
+        for document in cache.get_documents(key) or []:
+            identity = (document.get('id_site'), document.get('id_article'), document.get('orig_url'))
+            documents.setdefault(identity, document)
+    return list(documents.values())
+
+
+class _StandinHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients close kept-alive connections after a response they do not read further (e.g. 429)
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class OpointStandinServer:
+    """
+    Threaded HTTP server answering /search/ requests from an in-memory corpus.
+
+    stats counts requests, served documents and injected failures.
+    """
+
+    def __init__(self,
+                 documents: List[Dict[str, Any]],
+                 latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0,
+                 retry_after: float = 0.0,
+                 api_key: Optional[str] = None,
+                 compress: bool = True,
+                 seed: int = 0,
+                 host: str = '127.0.0.1',
+                 port: int = 0):
+        """
+        Initialize the server; call start() or use it as a context manager.
+
+        Args:
+            documents (List[Dict[str, Any]]): Corpus of raw Opoint documents
+            latency (float): Seconds added before each response
+            error_rate (float): Share of searches answered with 500 Internal Server Error
+            rate_limit_rate (float): Share of searches answered with 429 Too Many Requests
+            retry_after (float): Retry-After seconds sent with 429 responses
+            api_key (Optional[str]): Token required in the Authorization header (any token if None)
+            compress (bool): Gzip responses for clients that accept it
+            seed (int): Random seed of the failure injection
+            host (str): Interface to listen on
+            port (int): Port to listen on, 0 for a free port
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.api_key = api_key
+        self.compress = compress
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'documents': 0, 'errors': 0, 'rate_limited': 0, 'bytes': 0}
+
+        # Documents per site, newest first, and the whole corpus for unfiltered searches
+        self.by_site = defaultdict(list)
+        for document in documents:
+            self.by_site[str(document.get('id_site'))].append(document)
+        for site_documents in self.by_site.values():
+            site_documents.sort(key=lambda document: document.get('unix_timestamp') or 0, reverse=True)
+        self.all_documents = sorted(documents, key=lambda document: document.get('unix_timestamp') or 0,
+                                    reverse=True)
+
+        self.httpd = _StandinHTTPServer((host, port), self._make_handler())
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to OpointAPI"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'OpointStandinServer':
+        """Serve requests in a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='opoint-standin', daemon=True)
+        self.thread.start()
+        logger.info(f"Opoint stand-in serving {len(self.all_documents)} documents at {self.url}")
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self) -> 'OpointStandinServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def search(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Answer a search payload from the corpus.
+
+        Args:
+            payload (Dict[str, Any]): Request payload as sent to the /search/ endpoint
+
+        Returns:
+            Dict[str, Any]: Opoint search response
+        """
+        params = payload.get('params', {})
+        expression = (payload.get('expressions') or [{}])[0]
+        searchline = expression.get('searchline', {})
+        site_ids = _SITE_PATTERN.findall(str(searchline.get('searchterm', '')))
+        languages = {f.get('id') for f in searchline.get('filters', []) if f.get('type') == 'lang'}
+        oldest = params.get('oldest')
+        newest = params.get('newest')
+        requested = int(params.get('requestedarticles', 20))
+
+        if site_ids:
+            candidates = [document for site_id in site_ids for document in self.by_site.get(site_id, [])]
+            if len(site_ids) > 1:
+                candidates.sort(key=lambda document: document.get('unix_timestamp') or 0, reverse=True)
+        else:
+            candidates = self.all_documents
+
+        matches = []
+        for document in candidates:
+            timestamp = document.get('unix_timestamp') or 0
+            if newest is not None and timestamp > newest:
+                continue
+            if oldest is not None and timestamp < oldest:
+                continue
+            if languages and document.get('language', {}).get('text') not in languages:
+                continue
+            matches.append(document)
+            if len(matches) >= requested:
+                break
+
+        return {
+            "searchresult": {
+                "search_start": 0,
+                "documents": len(matches),
+                "range_count": len(matches),
+                "document": matches
+            }
+        }
+
+    def _inject_failure(self) -> Optional[int]:
+        """Status code of an injected failure, or None"""
+        with self.lock:
+            draw = self.rng.random()
+        if draw < self.rate_limit_rate:
+            return 429
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                if server.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    data = gzip.compress(data, compresslevel=1)
+                    self.send_header('Content-Encoding', 'gzip')
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                with server.lock:
+                    server.stats['bytes'] += len(data)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                raw = self.rfile.read(length)
+                if self.path.rstrip('/') != '/search':
+                    self.send_json(404, {"error": f"Unknown endpoint {self.path}"})
+                    return
+                token = self.headers.get('Authorization', '')
+                if not token.startswith('Token ') or (server.api_key is not None and token != f"Token {server.api_key}"):
+                    self.send_json(401, {"detail": "Invalid token."})
+                    return
+                try:
+                    payload = json.loads(raw)
+                except ValueError:
+                    self.send_json(400, {"error": "Malformed JSON payload"})
+                    return
+
+                with server.lock:
+                    server.stats['requests'] += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                failure = server._inject_failure()
+                if failure == 429:
+                    with server.lock:
+                        server.stats['rate_limited'] += 1
+                    self.send_json(429, {"detail": "Request was throttled."},
+                                   headers={'Retry-After': f"{server.retry_after:g}"})
+                    return
+                if failure == 500:
+                    with server.lock:
+                        server.stats['errors'] += 1
+                    self.send_json(500, {"detail": "Internal server error"})
+                    return
+
+                response = server.search(payload)
+                with server.lock:
+                    server.stats['documents'] += len(response['searchresult']['document'])
+                self.send_json(200, response)
+
+        return Handler
+
@@ -1,54 +1,154 @@
+"""
+Backend configuration, resolved on first use.
+
+Settings are read from the environment (and the first .env file found) the first time one
+of them is accessed, and cached. Importing this module does no I/O, so the fetcher, the
+predictor and the scripts only pay for configuration when they use it:
+
+    from sugar.backend import config
+    config.CLICKHOUSE_NATIVE_CONFIG      # or get_config()['CLICKHOUSE_NATIVE_CONFIG']
+
+`from sugar.backend.config import NAME` still works and resolves the settings at that point.
+Code that reads other variables from the environment (NEBIUS_API_KEY, OPOINT_API_KEY, ...)
+calls load_env() first so that they can also come from the .env file.
+Set SUGAR_CONFIG_DEBUG=1 to print the .env search and the resolved settings (secrets masked).
+"""
+
 import os
+import threading
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Try to load environment variables from .env file
-env_path = Path(__file__).parents[2] / '.env'
-examples_env_path = Path(__file__).parents[1] / '.env'
-print(f"Looking for .env file at: {env_path}")
-print(f"Also checking for .env file at: {examples_env_path}")
-
-if env_path.exists():
-    print("Found .env file at project root, loading environment variables...")
-    load_dotenv(env_path)
-elif examples_env_path.exists():
-    print("Found .env file at examples directory, loading environment variables...")
-    load_dotenv(examples_env_path)
-else:
-    print("No .env file found")
-
-# Database configurations
-CLICKHOUSE_CONFIG = {
-    'host': os.getenv('CLICKHOUSE_HOST'),
-    'port': int(os.getenv('CLICKHOUSE_PORT', 8123)),  # HTTP interface
-    'user': os.getenv('CLICKHOUSE_USERNAME'),
-    'password': os.getenv('CLICKHOUSE_PASSWORD'),
-    'database': os.getenv('CLICKHOUSE_DATABASE', 'news'),
-}
-
-# Native TCP interface configuration (for clickhouse_driver)
-CLICKHOUSE_NATIVE_CONFIG = {
-    'host': os.getenv('CLICKHOUSE_HOST'),
-    'port': int(os.getenv('CLICKHOUSE_NATIVE_PORT', 9000)),  # Native TCP interface
-    'user': os.getenv('CLICKHOUSE_USERNAME'),
-    'password': os.getenv('CLICKHOUSE_PASSWORD'),
-    'database': os.getenv('CLICKHOUSE_DATABASE', 'news'),
-}
-
-# Remove None values from configs
-CLICKHOUSE_CONFIG = {k: v for k, v in CLICKHOUSE_CONFIG.items() if v is not None}
-CLICKHOUSE_NATIVE_CONFIG = {k: v for k, v in CLICKHOUSE_NATIVE_CONFIG.items() if v is not None}
-
-print("ClickHouse HTTP configuration:", {k: '***' if k == 'password' else v for k, v in CLICKHOUSE_CONFIG.items()})
-print("ClickHouse Native configuration:", {k: '***' if k == 'password' else v for k, v in CLICKHOUSE_NATIVE_CONFIG.items()})
-
-# Exchange configurations
-OKX_CONFIG = {
-    'api_key': os.getenv('OKX_API_KEY'),
-    'api_secret': os.getenv('OKX_API_SECRET'),
-    'password': os.getenv('OKX_PASSWORD'),
-}
-
-# Remove None values from config
-OKX_CONFIG = {k: v for k, v in OKX_CONFIG.items() if v is not None}
-print("OKX configuration:", {k: '***' if k in ['api_secret', 'password'] else v for k, v in OKX_CONFIG.items()}) 
\ No newline at end of file
+
+# .env files searched in order: project root, then the sugar directory
+ENV_PATHS = (Path(__file__).parents[2] / '.env', Path(__file__).parents[1] / '.env')
+
+SETTINGS = (
+    'CLICKHOUSE_CONFIG',
+    'CLICKHOUSE_NATIVE_CONFIG',
+    'STORAGE_BACKEND',
+    'EMBEDDED_STORE_PATH',
+    'OKX_CONFIG',
+)
+
+_CONFIG = None
+_CONFIG_LOCK = threading.Lock()
+_ENV_LOADED = False
+_ENV_LOCK = threading.Lock()
+
+
+def config_debug() -> bool:
+    """Whether configuration loading should be printed (SUGAR_CONFIG_DEBUG)"""
+    return os.getenv('SUGAR_CONFIG_DEBUG', '').lower() in ('1', 'true', 'yes')
+
+
+def _masked(config, secrets):
+    return {k: '***' if k in secrets else v for k, v in config.items()}
+
+
+def _load_env_file(debug):
+    # python-dotenv is only imported when the configuration is first used
+    from dotenv import load_dotenv
+
+    if debug:
+        for path in ENV_PATHS:
+            print(f"Looking for .env file at: {path}")
+    for path in ENV_PATHS:
+        if path.exists():
+            if debug:
+                print(f"Found .env file at {path.parent}, loading environment variables...")
+            load_dotenv(path)
+            return path
+    if debug:
+        print("No .env file found")
+    return None
+
+
+def load_env():
+    """
+    Load the first .env file found into os.environ, once per process.
+
+    Variables already set in the environment are not overridden.
+    """
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        with _ENV_LOCK:
+            if not _ENV_LOADED:
+                _load_env_file(config_debug())
+                _ENV_LOADED = True
+
+
+def _build_config():
+    debug = config_debug()
+    load_env()
+
+    # Database configurations
+    clickhouse_config = {
+        'host': os.getenv('CLICKHOUSE_HOST'),
+        'port': int(os.getenv('CLICKHOUSE_PORT', 8123)),  # HTTP interface
+        'user': os.getenv('CLICKHOUSE_USERNAME'),
+        'password': os.getenv('CLICKHOUSE_PASSWORD'),
+        'database': os.getenv('CLICKHOUSE_DATABASE', 'news'),
+    }
+
+    # Native TCP interface configuration (for clickhouse_driver)
+    clickhouse_native_config = {
+        'host': os.getenv('CLICKHOUSE_HOST'),
+        'port': int(os.getenv('CLICKHOUSE_NATIVE_PORT', 9000)),  # Native TCP interface
+        'user': os.getenv('CLICKHOUSE_USERNAME'),
+        'password': os.getenv('CLICKHOUSE_PASSWORD'),
+        'database': os.getenv('CLICKHOUSE_DATABASE', 'news'),
+    }
+
+    # Exchange configurations
+    okx_config = {
+        'api_key': os.getenv('OKX_API_KEY'),
+        'api_secret': os.getenv('OKX_API_SECRET'),
+        'password': os.getenv('OKX_PASSWORD'),
+    }
+
+    config = {
+        # Remove None values from configs
+        'CLICKHOUSE_CONFIG': {k: v for k, v in clickhouse_config.items() if v is not None},
+        'CLICKHOUSE_NATIVE_CONFIG': {k: v for k, v in clickhouse_native_config.items() if v is not None},
+        # Storage backend: 'clickhouse', or 'embedded' for Parquet files queried with DuckDB (no server needed)
+        'STORAGE_BACKEND': os.getenv('SUGAR_STORAGE_BACKEND', 'clickhouse').lower(),
+        'EMBEDDED_STORE_PATH': os.getenv('SUGAR_EMBEDDED_STORE_PATH',
+                                         str(Path(__file__).parents[2] / 'data' / 'embedded_store')),
+        'OKX_CONFIG': {k: v for k, v in okx_config.items() if v is not None},
+    }
+
+    if debug:
+        print("ClickHouse HTTP configuration:", _masked(config['CLICKHOUSE_CONFIG'], ('password',)))
+        print("ClickHouse Native configuration:", _masked(config['CLICKHOUSE_NATIVE_CONFIG'], ('password',)))
+        backend = config['STORAGE_BACKEND']
+        print("Storage backend:", backend if backend != 'embedded' else f"embedded ({config['EMBEDDED_STORE_PATH']})")
+        print("OKX configuration:", _masked(config['OKX_CONFIG'], ('api_secret', 'password')))
+    return config
+
+
+def get_config() -> dict:
+    """Resolved settings by name, loaded on the first call and cached"""
+    global _CONFIG
+    if _CONFIG is None:
+        with _CONFIG_LOCK:
+            if _CONFIG is None:
+                _CONFIG = _build_config()
+    return _CONFIG
+
+
+def reload_config() -> dict:
+    """Drop the cached settings and read the environment again (e.g. after changing it in tests)"""
+    global _CONFIG
+    with _CONFIG_LOCK:
+        _CONFIG = None
+    return get_config()
+
+
+def __getattr__(name):
+    # PEP 562: module attributes such as config.CLICKHOUSE_NATIVE_CONFIG resolve on first access
+    if name in SETTINGS:
+        return get_config()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(SETTINGS))
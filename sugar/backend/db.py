@@ -0,0 +1,293 @@
+"""
+Pooled ClickHouse access for the backend, the scripts and the neural modules.
+
+A ClickHousePool hands out clickhouse_driver connections built from
+CLICKHOUSE_NATIVE_CONFIG, reuses them across calls and threads, and records the time
+and row count of every query. Its execute() and disconnect() match those of
+clickhouse_driver.Client, so code written against a Client can use the shared pool:
+
+    from sugar.backend.db import get_pool
+
+    client = get_pool()
+    rows = client.execute('SELECT id FROM news.news WHERE asset = %(asset)s', {'asset': 'Sugar'})
+    for row in client.execute_iter('SELECT id, text FROM news.news'):
+        ...
+    client.insert('news.news', ['id', 'title'], [ids, titles], columnar=True)
+
+Connections use LZ4 compression when the lz4 and clickhouse-cityhash packages are
+installed.
+"""
+
+import importlib.util
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from clickhouse_driver import Client
+from clickhouse_driver import errors as clickhouse_errors
+
+from sugar.backend import config as backend_config
+from sugar.backend.parsers.metrics import PIPELINE_METRICS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_COMPRESSION = 'lz4'
+# Rows per INSERT block of insert()
+DEFAULT_INSERT_BLOCK_SIZE = 10000
+# Seconds to wait for a free connection before giving up
+DEFAULT_ACQUIRE_TIMEOUT = 60.0
+
+# Errors after which a connection is closed instead of being returned to the pool
+CONNECTION_ERRORS = (clickhouse_errors.NetworkError, clickhouse_errors.SocketTimeoutError, EOFError, OSError)
+
+
+def compression_available() -> bool:
+    """Check whether clickhouse_driver can compress blocks (needs lz4 and clickhouse-cityhash)"""
+    return all(importlib.util.find_spec(module) is not None for module in ('lz4', 'clickhouse_cityhash'))
+
+
+def _query_kind(query: str) -> str:
+    return 'insert' if query.lstrip().upper().startswith('INSERT') else 'query'
+
+
+class ClickHousePool:
+    """
+    Thread-safe pool of ClickHouse connections with per-query instrumentation.
+
+    Connections are opened on demand, up to size of them, and kept for later calls.
+    Every call is observed in PIPELINE_METRICS as the 'db_query' or 'db_insert' stage
+    with the rows read or written as items, and added to stats.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, size: int = DEFAULT_POOL_SIZE,
+                 compression: bool = True, settings: Optional[Dict[str, Any]] = None,
+                 acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT, client_factory=Client):
+        """
+        Args:
+            config: Client keyword arguments (default: CLICKHOUSE_NATIVE_CONFIG)
+            size: Maximum number of open connections
+            compression: Compress blocks with LZ4 if the compression packages are installed
+            settings: ClickHouse settings sent with every query
+            acquire_timeout: Seconds to wait for a free connection
+            client_factory: Connection class (clickhouse_driver.Client)
+        """
+        self.config = dict(backend_config.CLICKHOUSE_NATIVE_CONFIG if config is None else config)
+        if compression and not compression_available():
+            logger.warning("lz4/clickhouse-cityhash not installed, ClickHouse connections are not compressed")
+            compression = False
+        self.compression = DEFAULT_COMPRESSION if compression else False
+        self.settings = dict(settings or {})
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.client_factory = client_factory
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+        self.stats = {
+            'connections_opened': 0, 'connections_closed': 0, 'queries': 0, 'inserts': 0,
+            'rows_read': 0, 'rows_written': 0, 'seconds': 0.0, 'errors': 0
+        }
+
+    def _new_client(self):
+        kwargs = dict(self.config)
+        if self.compression:
+            kwargs['compression'] = self.compression
+        if self.settings:
+            kwargs['settings'] = dict(self.settings)
+        return self.client_factory(**kwargs)
+
+    def acquire(self):
+        """Take a connection from the pool, opening one if fewer than size are open"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._open < self.size
+            if can_open:
+                self._open += 1
+                self.stats['connections_opened'] += 1
+        if can_open:
+            try:
+                return self._new_client()
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No ClickHouse connection free after {self.acquire_timeout}s "
+                               f"({self.size} in use)") from None
+
+    def release(self, client, discard: bool = False):
+        """Return a connection to the pool, or close it if discard is set"""
+        if not discard:
+            self._idle.put(client)
+            return
+        with self._lock:
+            self._open -= 1
+            self.stats['connections_closed'] += 1
+        try:
+            client.disconnect()
+        except Exception as e:
+            logger.debug(f"Error closing ClickHouse connection: {e}")
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for several calls; it is closed if a connection error escapes"""
+        client = self.acquire()
+        discard = False
+        try:
+            yield client
+        except CONNECTION_ERRORS:
+            discard = True
+            raise
+        finally:
+            self.release(client, discard)
+
+    def _record(self, kind: str, seconds: float, rows: int, failed: bool = False):
+        stage = 'db_insert' if kind == 'insert' else 'db_query'
+        PIPELINE_METRICS.observe(stage, seconds, items=rows)
+        with self._lock:
+            self.stats['inserts' if kind == 'insert' else 'queries'] += 1
+            self.stats['rows_written' if kind == 'insert' else 'rows_read'] += rows
+            self.stats['seconds'] += seconds
+            if failed:
+                self.stats['errors'] += 1
+        logger.debug(f"ClickHouse {kind}: {rows} rows in {seconds * 1000:.1f} ms")
+
+    def execute(self, query: str, params=None, **kwargs):
+        """
+        Run a query on a pooled connection.
+
+        Takes the arguments of clickhouse_driver.Client.execute and returns its result.
+        """
+        kind = _query_kind(query)
+        started = time.perf_counter()
+        try:
+            with self.connection() as client:
+                result = client.execute(query, params, **kwargs)
+        except Exception:
+            self._record(kind, time.perf_counter() - started, 0, failed=True)
+            raise
+        if isinstance(result, int):
+            rows = result
+        elif kind == 'insert':
+            rows = 0
+        elif kwargs.get('columnar') and result:
+            rows = len(result[0])
+        else:
+            rows = len(result) if isinstance(result, list) else 0
+        self._record(kind, time.perf_counter() - started, rows)
+        return result
+
+    def execute_iter(self, query: str, params=None, **kwargs) -> Iterator[tuple]:
+        """
+        Stream the rows of a query block by block instead of loading them all.
+
+        The connection is held until the iterator is exhausted or closed; an iterator
+        abandoned before the end closes its connection, since unread blocks remain on it.
+        """
+        started = time.perf_counter()
+        rows = 0
+        finished = False
+        client = self.acquire()
+        try:
+            for row in client.execute_iter(query, params, **kwargs):
+                rows += 1
+                yield row
+            finished = True
+        finally:
+            self.release(client, discard=not finished)
+            self._record('query', time.perf_counter() - started, rows, failed=not finished)
+
+    def insert(self, table: str, columns: Sequence[str], data: Iterable, columnar: bool = False,
+               block_size: int = DEFAULT_INSERT_BLOCK_SIZE) -> int:
+        """
+        Insert rows in blocks of block_size on one connection.
+
+        Args:
+            table: Table name, e.g. 'news.news'
+            columns: Column names
+            data: Row tuples, or with columnar=True one sequence of values per column
+            columnar: Whether data holds columns instead of rows
+            block_size: Rows per INSERT
+
+        Returns:
+            int: Number of rows inserted
+        """
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES"
+        if columnar:
+            data = [list(column) for column in data]
+            total = len(data[0]) if data else 0
+            blocks = ([column[offset:offset + block_size] for column in data]
+                      for offset in range(0, total, block_size))
+        else:
+            rows = iter(data)
+            blocks = iter(lambda: list(islice(rows, block_size)), [])
+
+        inserted = 0
+        with self.connection() as client:
+            for block in blocks:
+                count = len(block[0]) if columnar else len(block)
+                started = time.perf_counter()
+                try:
+                    client.execute(query, block, columnar=columnar)
+                except Exception:
+                    self._record('insert', time.perf_counter() - started, 0, failed=True)
+                    raise
+                self._record('insert', time.perf_counter() - started, count)
+                inserted += count
+        return inserted
+
+    def disconnect(self):
+        """Close the idle connections; the pool opens new ones when it is used again"""
+        while True:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self.release(client, discard=True)
+
+    close = disconnect
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool statistics, including the number of open connections"""
+        with self._lock:
+            return dict(self.stats, open_connections=self._open, idle_connections=self._idle.qsize())
+
+
+_POOL: Optional[ClickHousePool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> ClickHousePool:
+    """Shared pool for CLICKHOUSE_NATIVE_CONFIG, created on first use"""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ClickHousePool()
+    return _POOL
+
+
+def execute(query: str, params=None, **kwargs):
+    """Run a query on the shared pool (see ClickHousePool.execute)"""
+    return get_pool().execute(query, params, **kwargs)
+
+
+def execute_iter(query: str, params=None, **kwargs) -> Iterator[tuple]:
+    """Stream the rows of a query from the shared pool (see ClickHousePool.execute_iter)"""
+    return get_pool().execute_iter(query, params, **kwargs)
+
+
+def insert(table: str, columns: Sequence[str], data: Iterable, columnar: bool = False,
+           block_size: int = DEFAULT_INSERT_BLOCK_SIZE) -> int:
+    """Insert rows in blocks through the shared pool (see ClickHousePool.insert)"""
+    return get_pool().insert(table, columns, data, columnar=columnar, block_size=block_size)
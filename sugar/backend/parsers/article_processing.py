@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+"""
+Multi-core article processing stage for the sugar news fetcher.
+
+normalize_and_filter_article (HTML cleaning, token counting, splitting, triage, article IDs)
+and content hashing are pure Python and run on a single core. ArticleProcessPool spreads
+them over a process pool:
+
+1. Articles are reduced to compact records holding only the fields processing reads.
+2. The model-heavy step, normalizing each article's title and text, stays in the calling
+   process and goes through the batched normalizer (normalize_batch) in one call per batch,
+   so the models are loaded once and per-source language priors keep their state.
+3. Records are sent to the workers in chunks together with their normalized texts; the
+   workers return the dedup entries built by build_dedup_entry.
+4. Entries are returned in input order with the original article re-attached as raw_article.
+
+Deduplication (register_unique_article) is left to the caller, which runs it sequentially
+in the same order as before, so results and dedup decisions are identical to in-process
+processing.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from sugar.backend.parsers.metrics import PIPELINE_METRICS
+
+logger = logging.getLogger(__name__)
+
+# Article fields read by normalize_and_filter_article; everything else stays in the parent
+ARTICLE_RECORD_FIELDS = ('title', 'text', 'site_name', 'url', 'published_date', 'score')
+
+# Normalizer used by the worker for steps that are not prefilled (pricing lines)
+_worker_normalizer = None
+
+
+def article_raw_text(article) -> str:
+    """Return the title and text combined as they are normalized"""
+    return f"{article.get('title', '')}\n{article.get('text', '')}"
+
+
+def to_article_record(article) -> Dict[str, Any]:
+    """
+    Reduce an article row to the fields needed for processing.
+
+    Args:
+        article: Raw article (pandas Series or dict)
+
+    Returns:
+        Dict[str, Any]: Picklable record; fields missing from the article stay missing
+    """
+    return {field: article[field] for field in ARTICLE_RECORD_FIELDS if field in article}
+
+
+def normalize_texts(normalization_pipeline, texts: List[str], sources: List[str]) -> List[str]:
+    """
+    Normalize texts with one batched call when the pipeline supports it.
+
+    Pipelines with per-source language priors (LanguageNormalizationPipeline, NormalizationClient)
+    provide normalize_batch(texts, sources); other pipelines are called once per text.
+    """
+    if getattr(normalization_pipeline, 'SUPPORTS_SOURCE_PRIORS', False) is True:
+        return normalization_pipeline.normalize_batch(texts, sources=sources)
+    return [normalization_pipeline.normalize(text) for text in texts]
+
+
+class PrefilledNormalizer:
+    """
+    Normalizer that answers from precomputed results and delegates everything else.
+    """
+
+    SUPPORTS_SOURCE_PRIORS = True
+
+    def __init__(self, normalized: Dict[str, str], fallback):
+        self.normalized = normalized
+        self.fallback = fallback
+
+    def normalize(self, text: str = None, sugar_pricing_lines: List[str] = None, source: str = None) -> Any:
+        if sugar_pricing_lines is None and text in self.normalized:
+            return self.normalized[text]
+        if getattr(self.fallback, 'SUPPORTS_SOURCE_PRIORS', False) is True:
+            return self.fallback.normalize(text, sugar_pricing_lines=sugar_pricing_lines, source=source)
+        if sugar_pricing_lines is not None:
+            return self.fallback.normalize(sugar_pricing_lines=sugar_pricing_lines)
+        return self.fallback.normalize(text)
+
+
+def _init_worker(normalization_service: Optional[str], pipeline_kwargs: Optional[Dict[str, Any]]):
+    global _worker_normalizer
+    if normalization_service:
+        from sugar.backend.text_filtering.normalization_service import NormalizationClient
+        _worker_normalizer = NormalizationClient(normalization_service)
+    else:
+        # Components load lazily, so a worker that only normalizes pricing lines loads no model
+        from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+        _worker_normalizer = LanguageNormalizationPipeline(**(pipeline_kwargs or {}))
+
+
+def process_article_chunk(records: List[Dict[str, Any]], normalized: Dict[str, str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Build the dedup entries of a chunk of article records in a worker process.
+
+    Args:
+        records (List[Dict[str, Any]]): Compact article records
+        normalized (Dict[str, str]): Normalized text of each record's raw text
+
+    Returns:
+        List[Optional[Dict[str, Any]]]: build_dedup_entry results (without raw_article), in record order
+    """
+    from sugar.backend.parsers.sugar_news_fetcher import build_dedup_entry
+    normalizer = PrefilledNormalizer(normalized, _worker_normalizer)
+    entries = []
+    for record in records:
+        entry = build_dedup_entry(record, normalizer)
+        if entry:
+            # The parent re-attaches the original article
+            entry['result'].pop('raw_article', None)
+        entries.append(entry)
+    return entries
+
+
+class ArticleProcessPool:
+    """
+    Process pool that builds dedup entries for batches of articles, preserving their order.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = 32,
+                 normalization_service: Optional[str] = None, pipeline_kwargs: Optional[Dict[str, Any]] = None,
+                 start_method: str = 'spawn'):
+        """
+        Start the pool.
+
+        Args:
+            max_workers (Optional[int]): Number of worker processes (default: number of CPUs)
+            chunk_size (int): Articles sent to a worker per task
+            normalization_service (Optional[str]): Address of a normalization service the workers
+                use for pricing lines instead of a local pipeline
+            pipeline_kwargs (Optional[Dict[str, Any]]): LanguageNormalizationPipeline arguments for the workers
+            start_method (str): multiprocessing start method; 'spawn' avoids forking the fetcher's threads
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.chunk_size = chunk_size
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(normalization_service, pipeline_kwargs)
+        )
+        self.max_workers = self.executor._max_workers
+        self.stats = {'articles': 0, 'chunks': 0}
+
+    @property
+    def batch_size(self) -> int:
+        """Number of articles that keeps every worker busy with one chunk"""
+        return self.chunk_size * self.max_workers
+
+    def process(self, articles: List[Any], normalization_pipeline) -> List[Optional[Dict[str, Any]]]:
+        """
+        Build dedup entries for articles.
+
+        Args:
+            articles (List[Any]): Raw articles (pandas Series or dicts)
+            normalization_pipeline: Batched normalizer for the articles' title and text
+
+        Returns:
+            List[Optional[Dict[str, Any]]]: One build_dedup_entry result per article, in input order
+        """
+        if not articles:
+            return []
+        records = [to_article_record(article) for article in articles]
+
+        # Model-heavy step: one batched normalization call in this process
+        raw_texts = [article_raw_text(record) for record in records]
+        unique_texts = {}
+        for raw_text, record in zip(raw_texts, records):
+            unique_texts.setdefault(raw_text, record.get('site_name'))
+        with PIPELINE_METRICS.time('normalize', items=len(unique_texts)):
+            normalized = dict(zip(unique_texts, normalize_texts(
+                normalization_pipeline, list(unique_texts), list(unique_texts.values())
+            )))
+
+        futures = []
+        for start in range(0, len(records), self.chunk_size):
+            chunk = records[start:start + self.chunk_size]
+            chunk_normalized = {text: normalized[text] for text in raw_texts[start:start + self.chunk_size]}
+            futures.append(self.executor.submit(process_article_chunk, chunk, chunk_normalized))
+
+        # Triage, splitting and hashing run in the workers; their wall time is recorded as triage
+        entries = []
+        with PIPELINE_METRICS.time('triage', items=len(records)):
+            for future in futures:
+                entries.extend(future.result())
+        for article, entry in zip(articles, entries):
+            if entry:
+                entry['result']['raw_article'] = article
+        self.stats['articles'] += len(articles)
+        self.stats['chunks'] += len(futures)
+        return entries
+
+    def close(self):
+        """Shut down the worker processes"""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
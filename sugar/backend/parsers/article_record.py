@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+Compact record for processed articles of the sugar news pipeline.
+
+normalize_and_filter_article returns a dict that carries the full original pandas row as
+'raw_article' next to the cleaned text, so every article kept for deduplication, saving and
+checkpointing held its text two or three times. Once an article has passed deduplication
+only ArticleRecord is kept: a __slots__ object holding the fields the downstream stages read,
+with repeated strings (source names, assets, triage reasons) interned.
+
+The raw Opoint document is not copied. When OpointAPI has a response cache, each row carries
+the cache key of its search response and its position in it, and the record keeps that as a
+RawArticleRef that can reload the document from the cache on demand.
+
+ArticleRecord is a read-only Mapping, so existing .get() call sites, pd.DataFrame(records)
+and the checkpoint store work on records the same way as on result dicts.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Optional
+
+# Fields read by source filtering, save_to_database, the dedup index and checkpoints
+ARTICLE_FIELDS = (
+    'id',
+    'site_name',
+    'clean_title',
+    'clean_text',
+    'published_date',
+    'url',
+    'score',
+    'context_zones_metadata',
+    'structured_pricing_metadata',
+    'entity_metadata',
+    'asset',
+    'triage_passed',
+    'triage_reason',
+    'article_split',
+    'split_parts',
+    'parts_passed',
+    'content_hash'
+)
+_FIELD_SET = frozenset(ARTICLE_FIELDS)
+
+# Low-cardinality string fields shared by many articles
+INTERNED_FIELDS = ('site_name', 'asset', 'triage_reason')
+
+
+def _intern(value):
+    """Intern a string value; other values are returned unchanged"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class RawArticleRef:
+    """
+    Location of a raw Opoint document in the on-disk response cache.
+    """
+
+    __slots__ = ('cache_key', 'index')
+
+    def __init__(self, cache_key: str, index: int):
+        self.cache_key = cache_key
+        self.index = index
+
+    @classmethod
+    def from_article(cls, article) -> Optional['RawArticleRef']:
+        """
+        Build a reference from a raw article row.
+
+        Args:
+            article: Raw article (pandas Series or dict) as returned by OpointAPI.search_articles
+
+        Returns:
+            Optional[RawArticleRef]: Reference, or None if the row was not served through a cache
+        """
+        if article is None:
+            return None
+        cache_key = article.get('response_cache_key')
+        index = article.get('response_index')
+        if not isinstance(cache_key, str) or index is None or index != index:
+            return None
+        return cls(cache_key, int(index))
+
+    def load(self, response_cache) -> Optional[Dict[str, Any]]:
+        """
+        Read the raw document back from the response cache.
+
+        Args:
+            response_cache: OpointResponseCache the search response was stored in
+
+        Returns:
+            Optional[Dict[str, Any]]: Raw document, or None if the entry has been evicted or expired
+        """
+        return response_cache.get_document(self.cache_key, self.index)
+
+    def __eq__(self, other):
+        if not isinstance(other, RawArticleRef):
+            return NotImplemented
+        return (self.cache_key, self.index) == (other.cache_key, other.index)
+
+    def __hash__(self):
+        return hash((self.cache_key, self.index))
+
+    def __repr__(self):
+        return f"RawArticleRef({self.cache_key!r}, {self.index})"
+
+
+class ArticleRecord(Mapping):
+    """
+    Processed article with only the fields used downstream.
+
+    Mapping keys are ARTICLE_FIELDS; the raw document reference is the raw_ref attribute and
+    is deliberately not a key, so it never ends up in DataFrames, checkpoints or the database.
+    """
+
+    __slots__ = ARTICLE_FIELDS + ('raw_ref',)
+
+    def __init__(self, raw_ref: Optional[RawArticleRef] = None, **fields):
+        unknown = set(fields) - _FIELD_SET
+        if unknown:
+            raise TypeError(f"Unknown article fields: {sorted(unknown)}")
+        for field in ARTICLE_FIELDS:
+            value = fields.get(field)
+            object.__setattr__(self, field, _intern(value) if field in INTERNED_FIELDS else value)
+        object.__setattr__(self, 'raw_ref', raw_ref)
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any], content_hash: Optional[str] = None) -> 'ArticleRecord':
+        """
+        Build a record from a normalize_and_filter_article result.
+
+        Fields that no downstream stage reads (raw_article, part_results) are dropped; the raw
+        article is replaced by a RawArticleRef when it came from the response cache.
+
+        Args:
+            result (Dict[str, Any]): Normalized article result
+            content_hash (Optional[str]): Content hash computed for deduplication
+
+        Returns:
+            ArticleRecord: Compact record
+        """
+        fields = {field: result.get(field) for field in ARTICLE_FIELDS}
+        if content_hash is not None:
+            fields['content_hash'] = content_hash
+        return cls(raw_ref=RawArticleRef.from_article(result.get('raw_article')), **fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fields as a plain dict"""
+        return {field: getattr(self, field) for field in ARTICLE_FIELDS}
+
+    def __getitem__(self, key):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(ARTICLE_FIELDS)
+
+    def __len__(self):
+        return len(ARTICLE_FIELDS)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ArticleRecord is read-only")
+
+    def __getstate__(self):
+        return self.to_dict(), self.raw_ref
+
+    def __setstate__(self, state):
+        fields, raw_ref = state
+        self.__init__(raw_ref=raw_ref, **fields)
+
+    def __repr__(self):
+        return f"ArticleRecord(id={self.id!r}, site_name={self.site_name!r}, asset={self.asset!r})"
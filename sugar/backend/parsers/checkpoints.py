@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+"""
+Append-only columnar checkpoints for the sugar news fetcher.
+
+Every completed (month, topic) pair is written once as a Parquet segment and recorded in a
+small JSON manifest:
+
+    checkpoint_dir/
+        manifest.json
+        segments/2024-01/topic_20000386.parquet
+
+Segments are never rewritten, so writing a checkpoint costs the size of that segment only.
+Resuming reads just the manifest to find the completed pairs, and downstream steps can
+memory-map the segments with pyarrow instead of unpickling and copying everything.
+
+Nested fields (lists and dicts such as entity_metadata) are stored as JSON strings and the
+raw API article is dropped; the manifest records which columns hold JSON.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+# Try to import pyarrow for Parquet segments, but make it optional
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+SEGMENTS_DIR = "segments"
+MANIFEST_VERSION = 1
+
+# Columns that are not written to segments
+EXCLUDED_COLUMNS = ('raw_article',)
+
+
+def month_key(date) -> str:
+    """Return the manifest month key ('YYYY-MM') for a date"""
+    return date.strftime("%Y-%m")
+
+
+def prepare_segment_frame(articles) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Convert processed articles into a flat DataFrame that can be stored as Parquet.
+
+    Args:
+        articles: DataFrame or list of article dicts
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: Flat DataFrame and the names of JSON-encoded columns
+    """
+    df = articles.copy() if isinstance(articles, pd.DataFrame) else pd.DataFrame(list(articles))
+    df = df.drop(columns=[column for column in EXCLUDED_COLUMNS if column in df.columns])
+
+    json_columns = []
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        values = df[column]
+        if values.map(lambda value: isinstance(value, (list, dict, tuple))).any():
+            json_columns.append(column)
+            df[column] = values.map(
+                lambda value: None if value is None else json.dumps(value, default=str, ensure_ascii=False)
+            )
+        else:
+            # Mixed object columns (e.g. timestamps and strings) are stored as strings
+            df[column] = values.map(lambda value: value if value is None or isinstance(value, str) else str(value))
+    return df.reset_index(drop=True), json_columns
+
+
+class SegmentCheckpointStore:
+    """
+    Manifest-indexed store of Parquet segments, one per completed (month, topic) pair.
+    """
+
+    def __init__(self, checkpoint_dir: str):
+        """
+        Initialize the store, loading the manifest if one exists.
+
+        Args:
+            checkpoint_dir (str): Directory holding manifest.json and the segments
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Parquet checkpoint segments")
+        self.checkpoint_dir = checkpoint_dir
+        self.manifest_path = os.path.join(checkpoint_dir, MANIFEST_FILE)
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if manifest.get('version') == MANIFEST_VERSION:
+                    return manifest
+                logger.warning(f"Ignoring checkpoint manifest with unknown version: {manifest.get('version')}")
+            except Exception as e:
+                logger.error(f"Failed to read checkpoint manifest {self.manifest_path}: {e}")
+        return {'version': MANIFEST_VERSION, 'segments': []}
+
+    def _write_manifest(self):
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _find(self, month: str, topic_id: str) -> Optional[Dict[str, Any]]:
+        for entry in self.manifest['segments']:
+            if entry['month'] == month and entry['topic_id'] == str(topic_id):
+                return entry
+        return None
+
+    def is_completed(self, month: str, topic_id: str) -> bool:
+        """Check whether a (month, topic) pair has a segment"""
+        with self._lock:
+            return self._find(month, topic_id) is not None
+
+    def completed_pairs(self) -> Set[Tuple[str, str]]:
+        """Return every completed (month, topic_id) pair"""
+        with self._lock:
+            return {(entry['month'], entry['topic_id']) for entry in self.manifest['segments']}
+
+    def completed_topics(self, month: str) -> Set[str]:
+        """Return the completed topic IDs of a month"""
+        with self._lock:
+            return {entry['topic_id'] for entry in self.manifest['segments'] if entry['month'] == month}
+
+    def total_rows(self) -> int:
+        """Return the number of checkpointed articles, read from the manifest only"""
+        with self._lock:
+            return sum(entry['rows'] for entry in self.manifest['segments'])
+
+    def write_segment(self, month: str, topic_id: str, articles) -> Dict[str, Any]:
+        """
+        Write the processed articles of a completed (month, topic) pair.
+
+        Segments are append-only: if the pair already has a segment the existing entry is returned.
+        A pair without articles is recorded in the manifest without a file.
+
+        Args:
+            month (str): Month key ('YYYY-MM')
+            topic_id (str): Topic ID (MEDIA_TOPIC_ID)
+            articles: DataFrame or list of article dicts
+
+        Returns:
+            Dict[str, Any]: Manifest entry of the segment
+        """
+        topic_id = str(topic_id)
+        with self._lock:
+            existing = self._find(month, topic_id)
+            if existing is not None:
+                return existing
+
+            df, json_columns = prepare_segment_frame(articles)
+            entry = {
+                'month': month,
+                'topic_id': topic_id,
+                'file': None,
+                'rows': len(df),
+                'bytes': 0,
+                'json_columns': json_columns,
+                'created_at': datetime.now().isoformat(timespec='seconds')
+            }
+            if not df.empty:
+                relative_path = os.path.join(SEGMENTS_DIR, month, f"topic_{topic_id}.parquet")
+                path = os.path.join(self.checkpoint_dir, relative_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+                os.replace(tmp_path, path)
+                entry['file'] = relative_path
+                entry['bytes'] = os.path.getsize(path)
+
+            self.manifest['segments'].append(entry)
+            self._write_manifest()
+            return entry
+
+    def segments(self, month: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return manifest entries, optionally only those of one month"""
+        with self._lock:
+            return [dict(entry) for entry in self.manifest['segments'] if month is None or entry['month'] == month]
+
+    def read_segment(self, entry: Dict[str, Any], columns: Optional[List[str]] = None):
+        """
+        Memory-map a segment as a pyarrow Table.
+
+        Args:
+            entry (Dict[str, Any]): Manifest entry
+            columns (Optional[List[str]]): Columns to read (default: all)
+
+        Returns:
+            pyarrow.Table: Segment contents, or None for a pair without articles
+        """
+        if not entry.get('file'):
+            return None
+        path = os.path.join(self.checkpoint_dir, entry['file'])
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    def iter_frames(self, month: Optional[str] = None, columns: Optional[List[str]] = None,
+                    decode_json: bool = True) -> Iterator[pd.DataFrame]:
+        """
+        Yield the segments as DataFrames one at a time.
+
+        Args:
+            month (Optional[str]): Only yield segments of this month
+            columns (Optional[List[str]]): Columns to read (default: all)
+            decode_json (bool): Decode JSON-encoded columns back into lists and dicts
+
+        Yields:
+            pd.DataFrame: Articles of one (month, topic) segment
+        """
+        for entry in self.segments(month):
+            if columns is not None:
+                available = set(pq.read_schema(os.path.join(self.checkpoint_dir, entry['file'])).names) if entry.get('file') else set()
+                table = self.read_segment(entry, [column for column in columns if column in available])
+            else:
+                table = self.read_segment(entry)
+            if table is None:
+                continue
+            df = table.to_pandas()
+            if decode_json:
+                for column in entry.get('json_columns', []):
+                    if column in df.columns:
+                        df[column] = df[column].map(lambda value: None if value is None else json.loads(value))
+            yield df
+
+    def cleanup(self) -> bool:
+        """Remove every segment and the manifest"""
+        with self._lock:
+            try:
+                shutil.rmtree(os.path.join(self.checkpoint_dir, SEGMENTS_DIR), ignore_errors=True)
+                if os.path.exists(self.manifest_path):
+                    os.remove(self.manifest_path)
+                self.manifest = {'version': MANIFEST_VERSION, 'segments': []}
+                return True
+            except Exception as e:
+                logger.error(f"Failed to clean up checkpoint segments in {self.checkpoint_dir}: {e}")
+                return False
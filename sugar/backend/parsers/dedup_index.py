@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+"""
+Persistent cross-run deduplication index for the sugar news pipeline.
+
+The in-run global_dedup_cache of sugar_news_fetcher.py only lives for one month of one run.
+This index keeps every URL, article ID, content hash and save_to_database ID that has been
+processed, plus a 64-bit SimHash signature per article for near-duplicate detection, in an
+on-disk SQLite key-value store. An in-memory Bloom filter is warm-loaded from the store at
+startup, so the common "never seen" case is answered without touching the disk and
+duplicates can be dropped before normalization runs.
+
+When several processes write to one index file (job queue workers), open it with shared=True:
+the Bloom filter only knows the keys present at startup and those this process added, so every
+lookup then goes to SQLite and sees what the other workers have committed.
+
+Entries are only added after the corresponding articles have been saved, in one transaction
+per batch, so a failed save never hides articles from the next run.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Key kinds stored in the index
+KIND_URL = 'url'
+KIND_ARTICLE_ID = 'article_id'
+KIND_CONTENT_HASH = 'content_hash'
+KIND_DB_ID = 'db_id'
+KINDS = (KIND_URL, KIND_ARTICLE_ID, KIND_CONTENT_HASH, KIND_DB_ID)
+
+# SimHash signatures are split into 4 bands of 16 bits; two signatures within
+# Hamming distance 3 always share at least one band
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+DEFAULT_MAX_HAMMING_DISTANCE = 3
+# SimHash is too noisy on short texts; they are only matched by their exact hashes
+MIN_SIGNATURE_TOKENS = 50
+# Seconds a connection waits for another process's write transaction
+BUSY_TIMEOUT = 30
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def compute_simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash signature of a text.
+
+    Args:
+        text (str): Text to sign (title and body)
+
+    Returns:
+        int: Unsigned 64-bit signature, 0 for texts with fewer than MIN_SIGNATURE_TOKENS distinct words
+    """
+    tokens = set(_TOKEN_PATTERN.findall((text or '').lower()))
+    if len(tokens) < MIN_SIGNATURE_TOKENS:
+        return 0
+    weights = [0] * SIMHASH_BITS
+    for token in tokens:
+        value = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    signature = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature
+
+
+def _to_signed(value: int) -> int:
+    """Convert an unsigned 64-bit integer to the signed form SQLite stores"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _bands(signature: int) -> List[int]:
+    width = SIMHASH_BITS // SIMHASH_BANDS
+    mask = (1 << width) - 1
+    return [(signature >> (band * width)) & mask for band in range(SIMHASH_BANDS)]
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize the filter.
+
+        Args:
+            capacity (int): Expected number of items
+            error_rate (float): Target false positive rate at capacity
+        """
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.num_hashes):
+            yield (first + i * second) % self.num_bits
+
+    def add(self, item: str):
+        """Add an item to the filter"""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class PersistentDedupIndex:
+    """
+    SQLite-backed deduplication index with an in-memory Bloom filter in front of it.
+    """
+
+    def __init__(self, db_path: str = "dedup_index.db", bloom_capacity: int = 1_000_000,
+                 bloom_error_rate: float = 0.001, max_hamming_distance: int = DEFAULT_MAX_HAMMING_DISTANCE,
+                 shared: bool = False):
+        """
+        Open the index and warm-load the Bloom filter from it.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+            bloom_capacity (int): Initial Bloom filter capacity; the filter is rebuilt larger when exceeded
+            bloom_error_rate (float): Bloom filter false positive rate at capacity
+            max_hamming_distance (int): Maximum SimHash distance for near duplicates (at most 3)
+            shared (bool): Other processes write to the index at the same time; lookups skip the
+                Bloom filter, which would miss their keys, and query SQLite directly
+        """
+        if max_hamming_distance >= SIMHASH_BANDS:
+            raise ValueError(f"max_hamming_distance must be below {SIMHASH_BANDS}")
+        self.db_path = db_path
+        self.bloom_error_rate = bloom_error_rate
+        self.max_hamming_distance = max_hamming_distance
+        self.shared = shared
+        self.lock = threading.RLock()
+        self.stats = {'bloom_negatives': 0, 'lookups': 0, 'hits': 0, 'near_duplicates': 0, 'added': 0}
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._init_database()
+
+        self.bloom = None
+        if shared:
+            return
+        started = time.perf_counter()
+        key_count = self.conn.execute('SELECT COUNT(*) FROM dedup_keys').fetchone()[0]
+        self._build_bloom(max(bloom_capacity, key_count * 2))
+        logger.info(f"Loaded {key_count} dedup keys from {db_path} in {time.perf_counter() - started:.2f}s")
+
+    def _init_database(self):
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS dedup_keys (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    PRIMARY KEY (kind, key)
+                ) WITHOUT ROWID
+            ''')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS signatures (
+                    content_hash TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    signature INTEGER NOT NULL,
+                    band0 INTEGER NOT NULL,
+                    band1 INTEGER NOT NULL,
+                    band2 INTEGER NOT NULL,
+                    band3 INTEGER NOT NULL,
+                    created_at INTEGER NOT NULL
+                )
+            ''')
+            for band in range(SIMHASH_BANDS):
+                self.conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS idx_signatures_band{band} ON signatures (source, band{band})'
+                )
+
+    def _build_bloom(self, capacity: int):
+        bloom = BloomFilter(capacity, self.bloom_error_rate)
+        for kind, key in self.conn.execute('SELECT kind, key FROM dedup_keys'):
+            bloom.add(f"{kind}:{key}")
+        self.bloom = bloom
+
+    def contains(self, kind: str, key: str) -> bool:
+        """
+        Check whether a key has been recorded.
+
+        Args:
+            kind (str): One of KINDS
+            key (str): Key to look up
+
+        Returns:
+            bool: True if the key is in the index
+        """
+        if not key:
+            return False
+        with self.lock:
+            self.stats['lookups'] += 1
+            if self.bloom is not None and f"{kind}:{key}" not in self.bloom:
+                self.stats['bloom_negatives'] += 1
+                return False
+            found = self.conn.execute(
+                'SELECT 1 FROM dedup_keys WHERE kind = ? AND key = ?', (kind, key)
+            ).fetchone() is not None
+            if found:
+                self.stats['hits'] += 1
+            return found
+
+    def known(self, kind: str, keys: Iterable[str]) -> Set[str]:
+        """
+        Return the subset of keys that have been recorded.
+
+        Args:
+            kind (str): One of KINDS
+            keys (Iterable[str]): Keys to look up
+
+        Returns:
+            Set[str]: Recorded keys
+        """
+        return {key for key in set(keys) if self.contains(kind, key)}
+
+    def contains_url(self, url: str) -> bool:
+        """Check whether an article URL has been recorded"""
+        return self.contains(KIND_URL, (url or '').strip())
+
+    def find_near_duplicate(self, title: str, text: str, source: str) -> Optional[str]:
+        """
+        Find a recorded article from the same source whose SimHash is within max_hamming_distance.
+
+        Args:
+            title (str): Normalized title
+            text (str): Normalized text
+            source (str): Source name
+
+        Returns:
+            Optional[str]: Content hash of the near duplicate, or None
+        """
+        signature = compute_simhash(f"{title} {text}")
+        if not signature:
+            return None
+        bands = _bands(signature)
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT content_hash, signature FROM signatures '
+                'WHERE source = ? AND (band0 = ? OR band1 = ? OR band2 = ? OR band3 = ?)',
+                (source or '', *bands)
+            ).fetchall()
+            for content_hash, candidate in rows:
+                if bin(signature ^ _to_unsigned(candidate)).count('1') <= self.max_hamming_distance:
+                    self.stats['near_duplicates'] += 1
+                    return content_hash
+        return None
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Record saved articles in one transaction.
+
+        Args:
+            entries (List[Dict[str, Any]]): Dicts with any of 'url', 'article_id', 'content_hash' and
+                'db_id', plus 'title', 'text' and 'source' for the near-duplicate signature
+
+        Returns:
+            int: Number of new keys recorded
+        """
+        now = int(time.time())
+        keys = []
+        signatures = []
+        for entry in entries:
+            for kind in KINDS:
+                key = entry.get(kind)
+                if key:
+                    keys.append((kind, str(key).strip() if kind == KIND_URL else str(key)))
+            if entry.get('content_hash') and (entry.get('title') or entry.get('text')):
+                signature = compute_simhash(f"{entry.get('title', '')} {entry.get('text', '')}")
+                if signature:
+                    signatures.append((
+                        entry['content_hash'], entry.get('source') or '', _to_signed(signature),
+                        *_bands(signature), now
+                    ))
+
+        with self.lock:
+            try:
+                with self.conn:
+                    before = self.conn.total_changes
+                    self.conn.executemany(
+                        'INSERT OR IGNORE INTO dedup_keys (kind, key, created_at) VALUES (?, ?, ?)',
+                        [(kind, key, now) for kind, key in keys]
+                    )
+                    added = self.conn.total_changes - before
+                    self.conn.executemany(
+                        'INSERT OR IGNORE INTO signatures '
+                        '(content_hash, source, signature, band0, band1, band2, band3, created_at) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        signatures
+                    )
+            except Exception as e:
+                logger.error(f"Failed to record {len(entries)} entries in dedup index: {e}")
+                raise
+
+            self.stats['added'] += added
+            if self.bloom is None:
+                return added
+            # Only update the Bloom filter once the transaction has committed
+            for kind, key in keys:
+                self.bloom.add(f"{kind}:{key}")
+            if self.bloom.count > self.bloom.capacity:
+                self._build_bloom(self.bloom.capacity * 2)
+            return added
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM dedup_keys').fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.conn.close()
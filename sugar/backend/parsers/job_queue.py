@@ -0,0 +1,538 @@
+#!/usr/bin/env python
+"""
+Durable SQLite job queue for sugar news backfills.
+
+A backfill is a set of (date window, topic) jobs instead of a loop over months. Jobs are
+claimed with a lease that the worker renews while it runs; a worker that crashes simply
+stops renewing, and once the lease expires the job is handed to the next worker. A failed
+job is retried with exponential backoff until it has used max_attempts, then marked failed.
+
+    pending --claim--> leased --complete--> done
+                          |
+                          +--fail--> pending (retry after backoff) or failed (no attempts left)
+                          +--lease expires--> claimable again (or failed if no attempts left)
+
+Completion is idempotent: completing a job that is already done is a no-op, so a worker
+whose lease expired while it was finishing does not corrupt the queue. Saving is idempotent
+too (save_to_database skips existing article IDs), so a job that runs twice saves nothing twice.
+
+Several processes, or machines sharing a filesystem, can drain one queue file. Claims run in
+BEGIN IMMEDIATE transactions, so two workers never lease the same job. WAL journaling needs
+shared memory and only works for processes on one host; on a network filesystem open the
+queue with journal_mode='DELETE'.
+
+SharedRateLimiter keeps a token bucket in the same database, so all workers together stay
+under one request rate to the Opoint API.
+
+Inspect and manage a queue from the command line:
+
+    python -m sugar.backend.parsers.job_queue jobs.db status
+    python -m sugar.backend.parsers.job_queue jobs.db list --status failed
+    python -m sugar.backend.parsers.job_queue jobs.db retry
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = 'pending'
+JOB_LEASED = 'leased'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_STATUSES = (JOB_PENDING, JOB_LEASED, JOB_DONE, JOB_FAILED)
+
+DEFAULT_LEASE_SECONDS = 1800
+DEFAULT_MAX_ATTEMPTS = 3
+# First retry delay; doubled for every further attempt
+DEFAULT_RETRY_DELAY = 60
+# Seconds a connection waits for another process's write transaction
+BUSY_TIMEOUT = 30
+
+WINDOW_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def default_worker_id() -> str:
+    """Worker ID unique across the machines sharing a queue: host name and process ID"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def job_key(window_start: datetime, window_end: datetime, topic_id) -> str:
+    """Job ID of a (date window, topic) pair"""
+    return f"{window_start.strftime(WINDOW_FORMAT)}/{window_end.strftime(WINDOW_FORMAT)}/{topic_id}"
+
+
+class Job:
+    """One (date window, topic) job as stored in the queue"""
+    __slots__ = ('job_id', 'window_start', 'window_end', 'topic_id', 'status', 'attempts', 'max_attempts',
+                 'lease_owner', 'lease_expires_at', 'last_error', 'result')
+
+    def __init__(self, job_id, window_start, window_end, topic_id, status, attempts, max_attempts,
+                 lease_owner=None, lease_expires_at=None, last_error=None, result=None):
+        self.job_id = job_id
+        self.window_start = datetime.strptime(window_start, WINDOW_FORMAT)
+        self.window_end = datetime.strptime(window_end, WINDOW_FORMAT)
+        self.topic_id = topic_id
+        self.status = status
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+        self.lease_owner = lease_owner
+        self.lease_expires_at = lease_expires_at
+        self.last_error = last_error
+        self.result = json.loads(result) if result else None
+
+    def __repr__(self):
+        return f"Job({self.job_id!r}, status={self.status!r}, attempts={self.attempts})"
+
+
+JOB_COLUMNS = ('job_id', 'window_start', 'window_end', 'topic_id', 'status', 'attempts', 'max_attempts',
+               'lease_owner', 'lease_expires_at', 'last_error', 'result')
+
+
+def _connect(db_path: str, journal_mode: str) -> sqlite3.Connection:
+    directory = os.path.dirname(os.path.abspath(db_path))
+    os.makedirs(directory, exist_ok=True)
+    # Autocommit mode: every write transaction is opened explicitly with BEGIN IMMEDIATE
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+    conn.execute(f'PRAGMA journal_mode={journal_mode}')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+class JobQueue:
+    """
+    Queue of backfill jobs in a SQLite database.
+
+    Each process opens its own JobQueue on the shared file; one instance is safe to use from
+    several threads (e.g. a worker and its lease keep-alive).
+    """
+
+    def __init__(self, db_path: str, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, retry_delay: float = DEFAULT_RETRY_DELAY,
+                 journal_mode: str = 'WAL'):
+        """
+        Args:
+            db_path: Queue database file
+            lease_seconds: Seconds a claimed job stays leased without a heartbeat
+            max_attempts: Attempts of newly enqueued jobs before they are marked failed
+            retry_delay: Seconds before the first retry of a failed attempt, doubled per attempt
+            journal_mode: SQLite journal mode ('WAL' on one host, 'DELETE' on a network filesystem)
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lock = threading.RLock()
+        self.conn = _connect(db_path, journal_mode)
+        self._init_database()
+
+    def _init_database(self):
+        with self._transaction():
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    window_start TEXT NOT NULL,
+                    window_end TEXT NOT NULL,
+                    topic_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    available_at REAL NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires_at REAL,
+                    last_error TEXT,
+                    result TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    completed_at REAL
+                )
+            ''')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, available_at)')
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that holds the database write lock from its first statement"""
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    def enqueue(self, windows: Iterable[Tuple[datetime, datetime]], topic_ids: Iterable,
+                max_attempts: Optional[int] = None) -> int:
+        """
+        Add a job for every (window, topic) pair; pairs already in the queue are left as they are.
+
+        Args:
+            windows: (start, end) datetimes of the date windows
+            topic_ids: Topic IDs to fetch in every window
+            max_attempts: Attempts before a job is marked failed (default: the queue's max_attempts)
+
+        Returns:
+            int: Number of jobs added
+        """
+        now = time.time()
+        max_attempts = max_attempts or self.max_attempts
+        topic_ids = [str(topic_id) for topic_id in topic_ids]
+        rows = [
+            (job_key(start, end, topic_id), start.strftime(WINDOW_FORMAT), end.strftime(WINDOW_FORMAT), topic_id,
+             JOB_PENDING, max_attempts, now, now, now)
+            for start, end in windows
+            for topic_id in topic_ids
+        ]
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO jobs (job_id, window_start, window_end, topic_id, status, max_attempts, '
+                'available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            return conn.total_changes - before
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[Job]:
+        """
+        Lease the next available jobs, oldest window first.
+
+        Pending jobs whose retry time has come and leased jobs whose lease has expired are
+        claimable. An expired job that has no attempts left is marked failed instead.
+
+        Args:
+            worker_id: ID of the claiming worker (see default_worker_id)
+            limit: Maximum number of jobs to lease
+
+        Returns:
+            List[Job]: The leased jobs, empty if none is available now
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?, '
+                "last_error = COALESCE(last_error, 'lease expired') "
+                'WHERE status = ? AND lease_expires_at <= ? AND attempts >= max_attempts',
+                (JOB_FAILED, now, JOB_LEASED, now)
+            )
+            job_ids = [row[0] for row in conn.execute(
+                'SELECT job_id FROM jobs '
+                'WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires_at <= ?) '
+                'ORDER BY window_start, topic_id LIMIT ?',
+                (JOB_PENDING, now, JOB_LEASED, now, limit)
+            )]
+            if not job_ids:
+                return []
+            conn.executemany(
+                'UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires_at = ?, '
+                'updated_at = ? WHERE job_id = ?',
+                [(JOB_LEASED, worker_id, now + self.lease_seconds, now, job_id) for job_id in job_ids]
+            )
+            return self._select(conn, 'WHERE job_id IN ({})'.format(','.join('?' * len(job_ids))), job_ids,
+                                order='window_start, topic_id')
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Renew the lease of a running job.
+
+        Returns:
+            bool: False if the worker no longer holds the lease (it expired and was taken over)
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET lease_expires_at = ?, updated_at = ? '
+                'WHERE job_id = ? AND status = ? AND lease_owner = ?',
+                (time.time() + self.lease_seconds, time.time(), job_id, JOB_LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: Optional[str] = None, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Mark a job done. Idempotent: a job that is already done is left unchanged.
+
+        The work of a job is finished whoever completes it, so a worker whose lease has been
+        taken over may still complete it; the other worker's completion is then a no-op.
+
+        Args:
+            job_id: Job ID
+            worker_id: Completing worker (recorded in the log only)
+            result: JSON-serializable summary of the job (e.g. its counters)
+
+        Returns:
+            bool: True if this call completed the job
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, last_error = NULL, lease_owner = NULL, '
+                'lease_expires_at = NULL, completed_at = ?, updated_at = ? WHERE job_id = ? AND status != ?',
+                (JOB_DONE, json.dumps(result, default=str) if result is not None else None, now, now, job_id, JOB_DONE)
+            )
+            completed = cursor.rowcount == 1
+        if not completed:
+            logger.info(f"Job {job_id} was already done (completion by {worker_id} ignored)")
+        return completed
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt: the job is retried after a backoff, or marked failed once it
+        has used all its attempts. Ignored if the worker no longer holds the lease.
+
+        Returns:
+            Optional[str]: The job's new status, or None if the failure was ignored
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT attempts, max_attempts FROM jobs WHERE job_id = ? AND status = ? AND lease_owner = ?',
+                (job_id, JOB_LEASED, worker_id)
+            ).fetchone()
+            if row is None:
+                return None
+            attempts, max_attempts = row
+            status = JOB_FAILED if attempts >= max_attempts else JOB_PENDING
+            available_at = now + self.retry_delay * 2 ** max(attempts - 1, 0)
+            conn.execute(
+                'UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_owner = NULL, '
+                'lease_expires_at = NULL, updated_at = ? WHERE job_id = ?',
+                (status, available_at, str(error)[:2000], now, job_id)
+            )
+        return status
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """Return a leased job to the queue without using up an attempt (e.g. on shutdown)"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), lease_owner = NULL, '
+                'lease_expires_at = NULL, available_at = ?, updated_at = ? '
+                'WHERE job_id = ? AND status = ? AND lease_owner = ?',
+                (JOB_PENDING, time.time(), time.time(), job_id, JOB_LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def retry(self, status: str = JOB_FAILED) -> int:
+        """Requeue every job with the given status with fresh attempts; returns the number requeued"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, attempts = 0, available_at = ?, lease_owner = NULL, '
+                'lease_expires_at = NULL, updated_at = ? WHERE status = ?',
+                (JOB_PENDING, now, now, status)
+            )
+            return cursor.rowcount
+
+    @contextmanager
+    def keep_alive(self, job_id: str, worker_id: str, interval: Optional[float] = None) -> Iterator[threading.Event]:
+        """
+        Renew a job's lease in a background thread while the block runs.
+
+        Yields:
+            threading.Event: Set if the lease was lost, i.e. another worker may have taken the job
+        """
+        interval = interval or max(self.lease_seconds / 3, 1)
+        stop = threading.Event()
+        lost = threading.Event()
+
+        def renew():
+            while not stop.wait(interval):
+                try:
+                    if not self.heartbeat(job_id, worker_id):
+                        logger.warning(f"Lease of job {job_id} lost by {worker_id}")
+                        lost.set()
+                        return
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to renew lease of job {job_id}: {e}")
+
+        thread = threading.Thread(target=renew, name=f"lease-{job_id}", daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            thread.join()
+
+    def _select(self, conn, where: str = '', params=(), order: str = 'window_start, topic_id',
+                limit: Optional[int] = None) -> List[Job]:
+        query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs {where} ORDER BY {order}"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return [Job(*row) for row in conn.execute(query, list(params))]
+
+    def jobs(self, status: Optional[str] = None, limit: Optional[int] = None) -> List[Job]:
+        """Jobs in window and topic order, optionally only those with one status"""
+        with self.lock:
+            if status:
+                return self._select(self.conn, 'WHERE status = ?', (status,), limit=limit)
+            return self._select(self.conn, limit=limit)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self.lock:
+            counts = dict.fromkeys(JOB_STATUSES, 0)
+            counts.update(self.conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+            return counts
+
+    def unfinished(self) -> int:
+        """Number of jobs that are neither done nor failed"""
+        counts = self.counts()
+        return counts[JOB_PENDING] + counts[JOB_LEASED]
+
+    def window_done(self, window_start: datetime, window_end: datetime) -> bool:
+        """Whether every job of a date window is done"""
+        with self.lock:
+            total, done = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(status = ?), 0) FROM jobs WHERE window_start = ? AND window_end = ?',
+                (JOB_DONE, window_start.strftime(WINDOW_FORMAT), window_end.strftime(WINDOW_FORMAT))
+            ).fetchone()
+            return total > 0 and total == done
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class SharedRateLimiter:
+    """
+    Token bucket shared by every process that opens the same database.
+
+    The bucket refills at `rate` tokens per second up to `burst` tokens; acquire() takes a
+    token, waiting for the refill if the bucket is empty. The state lives in one row that is
+    updated in a write transaction, so workers on one host or on machines sharing the queue
+    file (with roughly synchronized clocks) stay under the rate together.
+    """
+
+    def __init__(self, db_path: str, rate: float, burst: Optional[float] = None, name: str = 'opoint',
+                 journal_mode: str = 'WAL'):
+        """
+        Args:
+            db_path: Database file (usually the job queue's)
+            rate: Tokens (requests) per second for all processes together
+            burst: Bucket size, i.e. requests that may be sent at once (default: max(rate, 1))
+            name: Bucket name, for several independent limits in one database
+            journal_mode: SQLite journal mode, as for JobQueue
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(rate, 1.0)
+        self.name = name
+        self.lock = threading.Lock()
+        self.stats = {'acquired': 0, 'waits': 0, 'wait_seconds': 0.0}
+        self.conn = _connect(db_path, journal_mode)
+        with self.lock:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until the next one"""
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                now = time.time()
+                row = self.conn.execute('SELECT tokens, updated_at FROM rate_limits WHERE name = ?',
+                                        (self.name,)).fetchone()
+                tokens = self.burst if row is None else min(self.burst, row[0] + max(now - row[1], 0) * self.rate)
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+                if not wait:
+                    tokens -= 1
+                self.conn.execute('INSERT OR REPLACE INTO rate_limits (name, tokens, updated_at) VALUES (?, ?, ?)',
+                                  (self.name, tokens, now))
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+        return wait
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for it if necessary.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits as long as needed)
+
+        Returns:
+            bool: False if the timeout passed without a token
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        started = time.monotonic()
+        waited = False
+        while True:
+            wait = self._take()
+            if not wait:
+                self.stats['acquired'] += 1
+                if waited:
+                    self.stats['waits'] += 1
+                    self.stats['wait_seconds'] += time.monotonic() - started
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            waited = True
+            time.sleep(wait)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def _format_time(timestamp) -> str:
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S') if timestamp else '-'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and manage a sugar news backfill job queue')
+    parser.add_argument('db_path', help='Job queue database file')
+    parser.add_argument('--journal-mode', default='WAL', choices=['WAL', 'DELETE'],
+                        help="SQLite journal mode; use DELETE on a network filesystem (default: WAL)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help='Number of jobs per status')
+    list_parser = subparsers.add_parser('list', help='List jobs')
+    list_parser.add_argument('--status', choices=JOB_STATUSES, default=None, help='Only jobs with this status')
+    list_parser.add_argument('--limit', type=int, default=100, help='Maximum number of jobs listed (default: 100)')
+    retry_parser = subparsers.add_parser('retry', help='Requeue failed jobs with fresh attempts')
+    retry_parser.add_argument('--status', choices=[JOB_FAILED, JOB_DONE], default=JOB_FAILED,
+                              help='Requeue jobs with this status (default: failed)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db_path):
+        print(f"No job queue at {args.db_path}")
+        return 1
+    queue = JobQueue(args.db_path, journal_mode=args.journal_mode)
+    try:
+        if args.command == 'status':
+            counts = queue.counts()
+            total = sum(counts.values())
+            for status in JOB_STATUSES:
+                print(f"{status:>8}: {counts[status]}")
+            print(f"{'total':>8}: {total}")
+        elif args.command == 'list':
+            for job in queue.jobs(args.status, limit=args.limit):
+                lease = f" lease={job.lease_owner} until {_format_time(job.lease_expires_at)}" if job.lease_owner else ''
+                error = f" error={job.last_error}" if job.last_error else ''
+                saved = f" saved={job.result.get('saved')}" if job.result else ''
+                print(f"{job.job_id} {job.status} attempts={job.attempts}/{job.max_attempts}{lease}{saved}{error}")
+        elif args.command == 'retry':
+            print(f"Requeued {queue.retry(args.status)} {args.status} jobs")
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
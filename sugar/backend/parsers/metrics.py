@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+"""
+Run metrics for the sugar news fetcher.
+
+PIPELINE_METRICS collects, for one fetcher run:
+
+- per-stage latency histograms and item counts for fetch, normalize, triage, dedup,
+  source_filter and save
+- event counters (articles fetched, processed, passed triage, duplicates, quota allocated ...)
+- the same counters per source, for the triage pass rate and quota utilization of each source
+- cache hits and misses (deduplication cache, Opoint response cache, spelling and language caches)
+- busy time of the streaming pipeline stages, whose share of the wall time shows which
+  stage is limiting throughput
+
+export() writes the run as JSON and as a Prometheus textfile (for node_exporter's textfile
+collector):
+
+    metrics_dir/
+        sugar_fetcher_<run_id>.json
+        sugar_fetcher.prom
+
+Recording is a perf_counter call and a few additions under a lock, so it is always enabled;
+only the export is opt-in (--metrics-dir).
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('fetch', 'normalize', 'triage', 'dedup', 'source_filter', 'save')
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Ratios reported in the export: name -> (numerator counter, denominator counter)
+DERIVED_RATIOS = {
+    'triage_pass_rate': ('sugar', 'processed'),
+    'quota_utilization': ('quota_fetched', 'quota_allocated'),
+    'similarity_duplicate_rate': ('similarity_duplicates', 'similarity_checks'),
+    'source_filtered_rate': ('source_filtered', 'processed'),
+    'parts_per_split_article': ('split_parts', 'split_articles'),
+}
+
+PROMETHEUS_PREFIX = 'sugar_fetcher'
+PROMETHEUS_FILE = 'sugar_fetcher.prom'
+
+
+def _ratios(counters: Dict[str, float]) -> Dict[str, float]:
+    """DERIVED_RATIOS whose denominator is non-zero in counters"""
+    return {
+        name: round(counters.get(numerator, 0) / counters[denominator], 6)
+        for name, (numerator, denominator) in DERIVED_RATIOS.items()
+        if counters.get(denominator)
+    }
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class LatencyHistogram:
+    """
+    Cumulative-bucket latency histogram in the Prometheus layout.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for upper, bucket_count in zip(self.buckets + (self.max,), self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = upper
+        return self.max
+
+    def cumulative_counts(self) -> List[int]:
+        """Return the number of observations <= each bucket bound, ending with +Inf"""
+        totals = []
+        running = 0
+        for bucket_count in self.counts:
+            running += bucket_count
+            totals.append(running)
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum_seconds': round(self.sum, 6),
+            'mean_seconds': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50_seconds': round(self.quantile(0.5), 6),
+            'p95_seconds': round(self.quantile(0.95), 6),
+            'p99_seconds': round(self.quantile(0.99), 6),
+            'max_seconds': round(self.max, 6),
+            'buckets': dict(zip([str(bound) for bound in self.buckets] + ['+Inf'], self.cumulative_counts()))
+        }
+
+
+class _StageTimer:
+    """Handle yielded by PipelineMetrics.time(); set items when a call handles several articles"""
+    __slots__ = ('items',)
+
+    def __init__(self, items: int):
+        self.items = items
+
+
+class PipelineMetrics:
+    """
+    Thread-safe collector of stage latencies, counters and cache statistics for one run.
+    """
+
+    def __init__(self, run_id: Optional[str] = None):
+        self._lock = threading.Lock()
+        self.reset(run_id)
+
+    def reset(self, run_id: Optional[str] = None):
+        """Start a new run, discarding everything recorded so far"""
+        with self._lock:
+            self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.started_at = datetime.now()
+            self._started = time.perf_counter()
+            self.histograms: Dict[str, LatencyHistogram] = {}
+            self.stage_items: Dict[str, int] = {}
+            self.counters: Dict[str, float] = {}
+            self.sources: Dict[str, Dict[str, float]] = {}
+            self.caches: Dict[str, Dict[str, int]] = {}
+            self.pipeline = {'wall_seconds': 0.0, 'stages': {}}
+
+    def observe(self, stage: str, seconds: float, items: int = 1):
+        """Record one call of a stage that handled items articles"""
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.observe(seconds)
+            self.stage_items[stage] = self.stage_items.get(stage, 0) + items
+
+    @contextmanager
+    def time(self, stage: str, items: int = 1) -> Iterator[_StageTimer]:
+        """Time the enclosed block as one call of stage"""
+        timer = _StageTimer(items)
+        started = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            self.observe(stage, time.perf_counter() - started, timer.items)
+
+    def timed(self, stage: str):
+        """Decorator that times every call of a function as one item of stage"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def increment(self, name: str, value: float = 1):
+        """Add to an event counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_counters(self, counters: Dict[str, Any]):
+        """Add every numeric value of a counters dict (e.g. a month's pipeline counters)"""
+        with self._lock:
+            for name, value in counters.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_source(self, source: str, **counts: float):
+        """Add to the counters of one source (processed, sugar, quota_allocated, quota_fetched ...)"""
+        with self._lock:
+            counters = self.sources.setdefault(source or 'unknown', {})
+            for name, value in counts.items():
+                counters[name] = counters.get(name, 0) + value
+
+    def record_cache(self, cache: str, hits: int, misses: int, **extra: int):
+        """Add hits, misses and optional extra counts (evictions, ...) of a cache"""
+        with self._lock:
+            stats = self.caches.setdefault(cache, {'hits': 0, 'misses': 0})
+            stats['hits'] += hits
+            stats['misses'] += misses
+            for name, value in extra.items():
+                stats[name] = stats.get(name, 0) + value
+
+    def record_pipeline(self, pipeline_stats: Dict[str, Any]):
+        """Add the busy time and item counts of a StreamingPipeline run"""
+        with self._lock:
+            self.pipeline['wall_seconds'] += pipeline_stats.get('wall_seconds', 0.0)
+            stages = dict(pipeline_stats.get('stages', {}))
+            if 'source' in pipeline_stats:
+                stages = {'source': pipeline_stats['source'], **stages}
+            for name, stats in stages.items():
+                totals = self.pipeline['stages'].setdefault(name, {'busy_seconds': 0.0, 'items_out': 0})
+                totals['busy_seconds'] += stats.get('busy_seconds', 0.0)
+                totals['items_out'] += stats.get('items_out', 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return everything recorded so far as a JSON-serializable dict.
+
+        Returns:
+            Dict[str, Any]: run info, 'stages' (latency summary and throughput per stage),
+                'counters', 'ratios', 'sources' (counters and ratios per source), 'caches'
+                (with hit rates) and 'pipeline' (busy share per stage)
+        """
+        with self._lock:
+            elapsed = time.perf_counter() - self._started
+            stages = {}
+            for stage in sorted(self.histograms, key=lambda name: (STAGES + (name,)).index(name)):
+                histogram = self.histograms[stage]
+                summary = histogram.to_dict()
+                items = self.stage_items.get(stage, 0)
+                summary['items'] = items
+                # Items per second of time spent in the stage; compare with the run's overall rate
+                summary['items_per_busy_second'] = round(items / histogram.sum, 3) if histogram.sum else 0.0
+                stages[stage] = summary
+
+            sources = {
+                source: {'counters': dict(counters), 'ratios': _ratios(counters)}
+                for source, counters in sorted(self.sources.items())
+            }
+
+            caches = {}
+            for cache, stats in self.caches.items():
+                lookups = stats['hits'] + stats['misses']
+                caches[cache] = dict(stats, hit_rate=round(stats['hits'] / lookups, 6) if lookups else 0.0)
+
+            wall = self.pipeline['wall_seconds']
+            pipeline = {'wall_seconds': round(wall, 6), 'stages': {}}
+            for name, totals in self.pipeline['stages'].items():
+                pipeline['stages'][name] = {
+                    'busy_seconds': round(totals['busy_seconds'], 6),
+                    'items_out': totals['items_out'],
+                    'utilization': round(totals['busy_seconds'] / wall, 6) if wall else 0.0
+                }
+            if pipeline['stages']:
+                # The stage busy for the largest share of the wall time limits throughput
+                pipeline['bottleneck'] = max(pipeline['stages'], key=lambda name: pipeline['stages'][name]['busy_seconds'])
+
+            return {
+                'run_id': self.run_id,
+                'started_at': self.started_at.isoformat(),
+                'elapsed_seconds': round(elapsed, 6),
+                'stages': stages,
+                'counters': dict(self.counters),
+                'ratios': _ratios(self.counters),
+                'sources': sources,
+                'caches': caches,
+                'pipeline': pipeline
+            }
+
+    def to_prometheus(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """Render a snapshot in the Prometheus text exposition format"""
+        snapshot = snapshot or self.snapshot()
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {p}_run_elapsed_seconds Elapsed time of the fetcher run.",
+            f"# TYPE {p}_run_elapsed_seconds gauge",
+            f'{p}_run_elapsed_seconds{{run_id="{snapshot["run_id"]}"}} {snapshot["elapsed_seconds"]}',
+            f"# HELP {p}_stage_latency_seconds Latency of one call of a pipeline stage.",
+            f"# TYPE {p}_stage_latency_seconds histogram",
+        ]
+        for stage, summary in snapshot['stages'].items():
+            for bound, count in summary['buckets'].items():
+                lines.append(f'{p}_stage_latency_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{p}_stage_latency_seconds_sum{{stage="{stage}"}} {summary["sum_seconds"]}')
+            lines.append(f'{p}_stage_latency_seconds_count{{stage="{stage}"}} {summary["count"]}')
+        lines += [f"# HELP {p}_stage_items_total Articles handled by a pipeline stage.",
+                  f"# TYPE {p}_stage_items_total counter"]
+        lines += [f'{p}_stage_items_total{{stage="{stage}"}} {summary["items"]}'
+                  for stage, summary in snapshot['stages'].items()]
+        lines += [f"# HELP {p}_events_total Event counters of the run.",
+                  f"# TYPE {p}_events_total counter"]
+        lines += [f'{p}_events_total{{name="{name}"}} {value}' for name, value in sorted(snapshot['counters'].items())]
+        lines += [f"# HELP {p}_ratio Derived ratios of the run.",
+                  f"# TYPE {p}_ratio gauge"]
+        lines += [f'{p}_ratio{{name="{name}"}} {value}' for name, value in sorted(snapshot['ratios'].items())]
+        lines += [f"# HELP {p}_source_events_total Event counters of the run per source.",
+                  f"# TYPE {p}_source_events_total counter"]
+        for source, stats in snapshot['sources'].items():
+            lines += [f'{p}_source_events_total{{source="{_label(source)}",name="{name}"}} {value}'
+                      for name, value in sorted(stats['counters'].items())]
+        lines += [f"# HELP {p}_source_ratio Derived ratios of the run per source.",
+                  f"# TYPE {p}_source_ratio gauge"]
+        for source, stats in snapshot['sources'].items():
+            lines += [f'{p}_source_ratio{{source="{_label(source)}",name="{name}"}} {value}'
+                      for name, value in sorted(stats['ratios'].items())]
+        lines += [f"# HELP {p}_cache_requests_total Cache lookups by result.",
+                  f"# TYPE {p}_cache_requests_total counter"]
+        for cache, stats in sorted(snapshot['caches'].items()):
+            lines.append(f'{p}_cache_requests_total{{cache="{cache}",result="hit"}} {stats["hits"]}')
+            lines.append(f'{p}_cache_requests_total{{cache="{cache}",result="miss"}} {stats["misses"]}')
+        lines += [f"# HELP {p}_pipeline_stage_utilization Share of the pipeline wall time a stage was busy.",
+                  f"# TYPE {p}_pipeline_stage_utilization gauge"]
+        lines += [f'{p}_pipeline_stage_utilization{{stage="{stage}"}} {stats["utilization"]}'
+                  for stage, stats in snapshot['pipeline']['stages'].items()]
+        return "\n".join(lines) + "\n"
+
+    def export(self, metrics_dir: str) -> Dict[str, str]:
+        """
+        Write the run's metrics as JSON and as a Prometheus textfile.
+
+        Files are written to a temporary name and renamed, so collectors never read a partial file.
+
+        Args:
+            metrics_dir (str): Output directory, created if missing
+
+        Returns:
+            Dict[str, str]: Paths of the written files ('json' and 'prometheus')
+        """
+        os.makedirs(metrics_dir, exist_ok=True)
+        snapshot = self.snapshot()
+        paths = {
+            'json': os.path.join(metrics_dir, f"sugar_fetcher_{snapshot['run_id']}.json"),
+            'prometheus': os.path.join(metrics_dir, PROMETHEUS_FILE)
+        }
+        contents = {
+            'json': json.dumps(snapshot, indent=2, default=str),
+            'prometheus': self.to_prometheus(snapshot)
+        }
+        for kind, path in paths.items():
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(contents[kind])
+            os.replace(tmp_path, path)
+        logger.info(f"Wrote run metrics to {paths['json']} and {paths['prometheus']}")
+        return paths
+
+
+# Metrics of the current run, shared by the fetcher, its stages and the article process pool
+PIPELINE_METRICS = PipelineMetrics()
@@ -15,7 +15,6 @@ import re
 import time
 import argparse
 import hashlib
-from clickhouse_driver import Client
 
 # Load environment variables
 load_dotenv()
@@ -26,7 +25,7 @@ project_root = current_dir.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from sugar.backend.api.opoint.opoint_api import OpointAPI
-from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
+from sugar.backend.storage import NEWS_COLUMNS, get_store
 from sugar.backend.parsers.source_filter import is_trusted_source, filter_trusted_sources
 
 def clean_html(text):
@@ -144,134 +143,167 @@ def generate_article_id(url, title, published_date, asset):
     content = f"{url}_{title}_{published_date}_{asset}"
     return hashlib.md5(content.encode()).hexdigest()
 
+# Rows per columnar INSERT block
+INSERT_BLOCK_SIZE = 10000
 
 
-def save_to_database(articles_df, search_metadata, asset=None):
-    """Save articles to ClickHouse database (only trusted sources)"""
+def _column_values(articles_df, column, default=None):
+    """Values of a DataFrame column as a list, or the default for every row if it is missing"""
+    if column in articles_df.columns:
+        return articles_df[column].tolist()
+    return [default] * len(articles_df)
+
+
+def generate_article_ids(articles_df, assets):
+    """
+    Generate the IDs of all articles of a DataFrame at once.
+
+    Equivalent to calling generate_article_id for every row, without iterating over rows.
+
+    Args:
+        articles_df: Articles with 'url', 'title' and 'published_date' columns
+        assets: Asset of every article
+
+    Returns:
+        list: Article IDs in row order
+    """
+    return [
+        generate_article_id(url, title, published_date, article_asset)
+        for url, title, published_date, article_asset in zip(
+            _column_values(articles_df, 'url', ''),
+            _column_values(articles_df, 'title', ''),
+            _column_values(articles_df, 'published_date', ''),
+            assets
+        )
+    ]
+
+
+def _parse_published_date(value, default):
+    try:
+        if pd.notna(value):
+            return pd.to_datetime(value)
+    except Exception:
+        pass
+    return default
+
+
+def save_to_database(articles_df, search_metadata, asset=None, dedup_index=None, filter_sources=True):
+    """
+    Save articles to ClickHouse database (only trusted sources)
+    
+    IDs are computed for the whole batch, existing articles are looked up in chunks of IDs and
+    new articles are inserted in columnar blocks, so a batch takes a handful of round trips
+    instead of one per article. Articles go to the configured storage backend (get_store).
+    
+    Args:
+        articles_df: Articles to save
+        search_metadata: Search parameters stored with every article
+        asset: Asset used for articles without an 'asset' column
+        dedup_index: PersistentDedupIndex; IDs it already knows are skipped without a database
+            lookup and the IDs of inserted articles are recorded in it (optional)
+        filter_sources: Drop articles from non-trusted sources first; callers that already
+            filtered them pass False
+    """
     try:
-        # DEBUG: Log input DataFrame details
         print(f"DEBUG save_to_database: Input DataFrame shape: {articles_df.shape}")
-        if 'asset' in articles_df.columns:
-            asset_counts = articles_df['asset'].value_counts().to_dict()
-            print(f"DEBUG save_to_database: Asset distribution in input: {asset_counts}")
-        else:
-            print("DEBUG save_to_database: No 'asset' column found in input DataFrame")
         
         # Filter out non-trusted sources before saving
-        filtered_df = filter_trusted_sources(articles_df)
-        
-        print(f"DEBUG save_to_database: After source filtering - DataFrame shape: {filtered_df.shape}")
-        if 'asset' in filtered_df.columns:
-            filtered_asset_counts = filtered_df['asset'].value_counts().to_dict()
-            print(f"DEBUG save_to_database: Asset distribution after source filtering: {filtered_asset_counts}")
+        filtered_df = filter_trusted_sources(articles_df) if filter_sources else articles_df
         
         if filtered_df.empty:
             print("No articles from trusted sources to save")
             return 0
         
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        # CRITICAL FIX: Only save articles with asset='Sugar'
+        assets = _column_values(filtered_df, 'asset', asset)
+        sugar_mask = [article_asset == 'Sugar' for article_asset in assets]
+        non_sugar_count = len(sugar_mask) - sum(sugar_mask)
+        if non_sugar_count > 0:
+            print(f"DEBUG save_to_database: SUCCESS - {non_sugar_count} non-Sugar articles were SKIPPED and NOT saved to database")
+        sugar_df = filtered_df[sugar_mask]
+        assets = [article_asset for article_asset, is_sugar in zip(assets, sugar_mask) if is_sugar]
+        if sugar_df.empty:
+            print("No new articles to save (all were either non-Sugar or duplicates)")
+            return 0
+        
+        article_ids = generate_article_ids(sugar_df, assets)
+        
+        # Articles recorded by the persistent index were saved by an earlier batch or run
+        indexed_ids = dedup_index.known('db_id', article_ids) if dedup_index is not None else set()
+        
+        store = get_store()
         
         # CRITICAL FIX: Check for existing duplicates in database BEFORE inserting
-        print("DEBUG save_to_database: Checking for existing duplicates in database...")
-        existing_duplicates = 0
-        records_to_insert = []
+        unknown_ids = [article_id for article_id in article_ids if article_id not in indexed_ids]
+        try:
+            existing_ids = store.existing_ids(unknown_ids)
+        except Exception as e:
+            print(f"Warning: Could not check for existing duplicates: {e}")
+            # Continue with insertion if check fails
+            existing_ids = set()
         
-        for _, row in filtered_df.iterrows():
-            # Determine asset value - use individual article asset if available, otherwise use the provided asset
-            article_asset = row.get('asset', asset) if 'asset' in row else asset
-            
-            # CRITICAL FIX: Only save articles with asset='Sugar'
-            if article_asset != 'Sugar':
-                print(f"DEBUG save_to_database: SKIPPING Non-Sugar article - Asset: '{article_asset}', Title: {row.get('clean_title', 'N/A')[:100]}...")
-                continue  # Skip this record - don't add to database
-            
-            # Generate unique ID for the article (including asset for proper deduplication)
-            article_id = generate_article_id(
-                row.get('url', ''),
-                row.get('title', ''),
-                row.get('published_date', ''),
-                article_asset
-            )
-            
-            # CRITICAL FIX: Check if this article already exists in the database
-            try:
-                check_query = f"SELECT COUNT(*) FROM news.news WHERE id = '{article_id}'"
-                existing_count = client.execute(check_query)[0][0]
-                
-                if existing_count > 0:
-                    existing_duplicates += 1
-                    print(f"DEBUG save_to_database: DUPLICATE FOUND - Skipping article with ID: {article_id}")
-                    print(f"  Title: {row.get('clean_title', 'N/A')[:100]}...")
-                    continue
-            except Exception as e:
-                print(f"Warning: Could not check for existing duplicate: {e}")
-                # Continue with insertion if check fails
-            
-            # Prepare metadata as JSON
-            metadata = {
+        if dedup_index is not None and existing_ids:
+            dedup_index.add_many([{'db_id': article_id} for article_id in existing_ids])
+        
+        # Keep the first of several articles with the same ID in the batch
+        skip_ids = indexed_ids | existing_ids
+        selected = []
+        for position, article_id in enumerate(article_ids):
+            if article_id not in skip_ids:
+                skip_ids.add(article_id)
+                selected.append(position)
+        existing_duplicates = len(article_ids) - len(selected)
+        if existing_duplicates > 0:
+            print(f"DEBUG save_to_database: SUCCESS - {existing_duplicates} duplicates were detected and SKIPPED")
+        
+        if not selected:
+            print("No new articles to save (all were either non-Sugar or duplicates)")
+            return 0
+        
+        new_df = sugar_df.iloc[selected]
+        now = datetime.now()
+        metadata = [
+            json.dumps({
                 'search_topic_ids': search_metadata.get('topic_ids'),
                 'search_person_entities': search_metadata.get('person_entities'),
                 'search_company_entities': search_metadata.get('company_entities'),
                 'search_keywords': search_metadata.get('keywords'),
-                'score': row.get('score'),
-                'triage_passed': row.get('triage_passed', None),
-                'triage_reason': row.get('triage_reason', None)
-            }
-            
-            # Parse published_date to datetime
-            try:
-                if pd.notna(row.get('published_date')):
-                    pub_date = pd.to_datetime(row['published_date'])
-                else:
-                    pub_date = datetime.now()
-            except:
-                pub_date = datetime.now()
-            
-            # Add created_at as now
-            created_at = datetime.now()
-            
-            record = (
-                article_id,
-                pub_date,
-                row.get('site_name', ''),
-                row.get('clean_title', ''),
-                row.get('clean_text', ''),
-                json.dumps(metadata),
-                created_at,
-                article_asset
+                'score': score,
+                'triage_passed': triage_passed,
+                'triage_reason': triage_reason
+            })
+            for score, triage_passed, triage_reason in zip(
+                _column_values(new_df, 'score'),
+                _column_values(new_df, 'triage_passed'),
+                _column_values(new_df, 'triage_reason')
             )
-            records_to_insert.append(record)
+        ]
+        columns = [
+            [article_ids[position] for position in selected],
+            [_parse_published_date(value, now) for value in _column_values(new_df, 'published_date')],
+            _column_values(new_df, 'site_name', ''),
+            _column_values(new_df, 'clean_title', ''),
+            _column_values(new_df, 'clean_text', ''),
+            metadata,
+            [now] * len(selected),
+            [assets[position] for position in selected]
+        ]
         
-        # DEBUG: Log duplicate detection results
-        if existing_duplicates > 0:
-            print(f"DEBUG save_to_database: SUCCESS - {existing_duplicates} duplicates were detected and SKIPPED")
+        # Insert into database
+        print(f"Executing INSERT with {len(selected)} records...")
+        store.insert('news.news', NEWS_COLUMNS, columns, columnar=True, block_size=INSERT_BLOCK_SIZE)
         
-        # DEBUG: Log non-Sugar records that were skipped
-        non_sugar_count = len(filtered_df[filtered_df['asset'] != 'Sugar'])
-        if non_sugar_count > 0:
-            print(f"DEBUG save_to_database: SUCCESS - {non_sugar_count} non-Sugar articles were SKIPPED and NOT saved to database")
+        if dedup_index is not None:
+            dedup_index.add_many([{'db_id': article_id} for article_id in columns[0]])
         
-        # Insert into database
-        print(f"Executing INSERT with {len(records_to_insert)} records...")
-        if records_to_insert:
-            # Write to news.news table
-            result = client.execute(
-                'INSERT INTO news.news (id, datetime, source, title, text, metadata, created_at, asset) VALUES',
-                records_to_insert
-            )
-            print(f"INSERT statement executed successfully, result: {result}")
-            
-            print(f"Successfully saved {len(records_to_insert)} articles from trusted sources to ClickHouse database")
-            print(f"DEDUPLICATION SUMMARY:")
-            print(f"  - Total articles processed: {len(filtered_df)}")
-            print(f"  - Non-Sugar articles skipped: {non_sugar_count}")
-            print(f"  - Existing duplicates skipped: {existing_duplicates}")
-            print(f"  - New articles saved: {len(records_to_insert)}")
-            
-            return len(records_to_insert)
-        else:
-            print("No new articles to save (all were either non-Sugar or duplicates)")
-            return 0
+        print(f"Successfully saved {len(selected)} articles from trusted sources to ClickHouse database")
+        print(f"DEDUPLICATION SUMMARY:")
+        print(f"  - Total articles processed: {len(filtered_df)}")
+        print(f"  - Non-Sugar articles skipped: {non_sugar_count}")
+        print(f"  - Existing duplicates skipped: {existing_duplicates}")
+        print(f"  - New articles saved: {len(selected)}")
+        
+        return len(selected)
         
     except Exception as e:
         print(f"Error saving to database: {e}")
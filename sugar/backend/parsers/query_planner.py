@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+Grouped source queries for the sugar news fetcher.
+
+For every month and topic the fetcher used to issue one search per sugar source, each with
+a single site: filter and the same search query, although most sources return far fewer
+articles than their quota. SourceQueryPlanner packs sources into OR-ed site: groups whose
+expected result count fits one Opoint page, fetches each group page by page, and splits the
+results back into per-source frames truncated to each source's quota.
+
+Pages are walked with a time cursor: Opoint returns the newest articles first, so the next
+page ends at the oldest article of the previous one (the overlap is dropped by article ID),
+and sources that have reached their quota are dropped from the next page's site: filter.
+If a group is still truncated after max_pages, the sources that did not reach their quota
+are reported as overflowing and the caller fetches them one at a time as before.
+
+The expected result count of a source starts at default_expected_yield and is updated from
+what each fetch returned, so the plan improves over the topics and months of a run.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Articles requested per grouped search
+DEFAULT_PAGE_SIZE = 500
+# Keeps the OR-ed site: filter and the search line short
+DEFAULT_MAX_SITES_PER_GROUP = 10
+# Pages fetched per group before the unfinished sources fall back to per-source searches
+DEFAULT_MAX_PAGES = 4
+# Expected results of a source that has not been fetched yet in this run
+DEFAULT_EXPECTED_YIELD = 25
+
+
+class SourceGroup:
+    """
+    Sources searched together with one OR-ed site: filter.
+    """
+
+    __slots__ = ('sources', 'quotas', 'start_date')
+
+    def __init__(self, sources: List[Dict[str, Any]], quotas: Dict[str, int], start_date: datetime):
+        self.sources = sources
+        self.quotas = quotas
+        self.start_date = start_date
+
+    def __repr__(self):
+        return f"SourceGroup({[source['name'] for source in self.sources]}, start={self.start_date})"
+
+
+def article_keys(results: pd.DataFrame) -> pd.Series:
+    """Identify articles across pages by site and article ID, or by URL"""
+    if 'id_site' in results.columns and 'id_article' in results.columns:
+        return results['id_site'].astype(str) + ':' + results['id_article'].astype(str)
+    if 'url' in results.columns:
+        return results['url'].astype(str)
+    return pd.Series(results.index.astype(str), index=results.index)
+
+
+def oldest_timestamp(results: pd.DataFrame) -> Optional[int]:
+    """Unix timestamp of the oldest article of a page, or None if it cannot be determined"""
+    if 'unix_timestamp' in results.columns:
+        timestamps = pd.to_numeric(results['unix_timestamp'], errors='coerce').dropna()
+        if not timestamps.empty:
+            return int(timestamps.min())
+    if 'published_date' in results.columns:
+        published = pd.to_datetime(results['published_date'], errors='coerce', utc=True).dropna()
+        if not published.empty:
+            return int(published.min().timestamp())
+    return None
+
+
+class SourceQueryPlanner:
+    """
+    Plans and fetches grouped site: searches for the sugar sources.
+    """
+
+    def __init__(self,
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 max_sites_per_group: int = DEFAULT_MAX_SITES_PER_GROUP,
+                 max_pages: int = DEFAULT_MAX_PAGES,
+                 default_expected_yield: int = DEFAULT_EXPECTED_YIELD):
+        """
+        Initialize the planner.
+
+        Args:
+            page_size (int): Articles requested per grouped search
+            max_sites_per_group (int): Maximum number of sources in one group
+            max_pages (int): Pages fetched per group before falling back to per-source searches
+            default_expected_yield (int): Expected results of a source without fetch history
+        """
+        self.page_size = page_size
+        self.max_sites_per_group = max_sites_per_group
+        self.max_pages = max_pages
+        self.default_expected_yield = default_expected_yield
+        self.expected_yields: Dict[str, int] = {}
+        self.stats = {'groups': 0, 'requests': 0, 'overflow_sources': 0}
+
+    def expected_yield(self, source_name: str, quota: int) -> int:
+        """Number of results expected from a source, at most its quota"""
+        return max(1, min(quota, self.expected_yields.get(source_name, self.default_expected_yield)))
+
+    def record_yield(self, source_name: str, count: int):
+        """Remember how many results a source returned"""
+        self.expected_yields[source_name] = count
+
+    def plan(self, sources: List[Dict[str, Any]], quotas: Dict[str, int],
+             start_dates: Dict[str, datetime]) -> List[SourceGroup]:
+        """
+        Pack sources into groups whose expected results fit one page.
+
+        Sources are packed first-fit in decreasing order of expected results; only sources
+        sharing a start date (see incremental mode) are grouped together.
+
+        Args:
+            sources (List[Dict[str, Any]]): Sources with 'name' and a site 'id'
+            quotas (Dict[str, int]): Articles to fetch per source name
+            start_dates (Dict[str, datetime]): Start of the search window per source name
+
+        Returns:
+            List[SourceGroup]: Groups in the order they should be fetched
+        """
+        ordered = sorted(
+            sources,
+            key=lambda source: self.expected_yield(source['name'], quotas[source['name']]),
+            reverse=True
+        )
+        bins: List[Tuple[List[Dict[str, Any]], int, datetime]] = []
+        for source in ordered:
+            name = source['name']
+            expected = self.expected_yield(name, quotas[name])
+            for index, (members, load, start_date) in enumerate(bins):
+                if (start_date == start_dates[name] and len(members) < self.max_sites_per_group
+                        and load + expected <= self.page_size):
+                    members.append(source)
+                    bins[index] = (members, load + expected, start_date)
+                    break
+            else:
+                bins.append(([source], expected, start_dates[name]))
+
+        # Fetch in configuration order of the first member, so results arrive in a stable order
+        position = {source['name']: index for index, source in enumerate(sources)}
+        groups = []
+        for members, _, start_date in bins:
+            members.sort(key=lambda source: position[source['name']])
+            groups.append(SourceGroup(members, {s['name']: quotas[s['name']] for s in members}, start_date))
+        groups.sort(key=lambda group: position[group.sources[0]['name']])
+        return groups
+
+    def fetch_group(self, api, group: SourceGroup, end_date: datetime,
+                    **search_kwargs) -> Tuple[Dict[str, pd.DataFrame], List[Dict[str, Any]]]:
+        """
+        Fetch a group page by page and split the results per source.
+
+        Args:
+            api: OpointAPI instance
+            group (SourceGroup): Group to fetch
+            end_date (datetime): End of the search window
+            **search_kwargs: Remaining search_articles arguments (search_text, min_score,
+                media_topic_ids, timeout, raise_errors)
+
+        Returns:
+            Tuple[Dict[str, pd.DataFrame], List[Dict[str, Any]]]: Results per source name, truncated
+                to the source quotas, and the overflowing sources that must be fetched one at a time
+        """
+        self.stats['groups'] += 1
+        site_names = {str(source['id']): source['name'] for source in group.sources}
+        pages = []
+        seen = set()
+        counts = dict.fromkeys(group.quotas, 0)
+        active = list(group.sources)
+        page_end = end_date
+        complete = False
+
+        for _ in range(self.max_pages):
+            remaining = sum(group.quotas[source['name']] - counts[source['name']] for source in active)
+            requested = min(self.page_size, remaining)
+            results = api.search_articles(
+                site_ids=[str(source['id']) for source in active],
+                num_articles=requested,
+                start_date=group.start_date,
+                end_date=page_end,
+                **search_kwargs
+            )
+            self.stats['requests'] += 1
+            if results.empty:
+                complete = True
+                break
+
+            keys = article_keys(results)
+            new = results[~keys.isin(seen)]
+            seen.update(keys)
+            if 'id_site' in new.columns:
+                for site_id, count in new['id_site'].astype(str).value_counts().items():
+                    if site_id in site_names:
+                        counts[site_names[site_id]] += count
+            pages.append(new)
+
+            if len(results) < requested:
+                complete = True
+                break
+            # Sources that have their quota are dropped from the next pages; pages are newest
+            # first, so the quota articles already fetched are the ones a per-source search returns
+            active = [source for source in active if counts[source['name']] < group.quotas[source['name']]]
+            if not active:
+                complete = True
+                break
+            oldest = oldest_timestamp(results)
+            if new.empty or oldest is None:
+                break
+            # The next page ends at the oldest article of this one
+            page_end = datetime.fromtimestamp(oldest)
+
+        combined = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+        per_source = {}
+        overflow = []
+        site_column = combined['id_site'].astype(str) if 'id_site' in combined.columns else None
+        for source in group.sources:
+            name = source['name']
+            quota = group.quotas[name]
+            if not complete and counts[name] < quota:
+                # Truncated group: this source may have more articles than were returned
+                overflow.append(source)
+                continue
+            if site_column is not None:
+                source_results = combined[site_column == str(source['id'])]
+            else:
+                source_results = combined.iloc[0:0]
+            per_source[name] = source_results.head(quota).reset_index(drop=True)
+            self.record_yield(name, counts[name])
+
+        if overflow:
+            self.stats['overflow_sources'] += len(overflow)
+            logger.info(f"{len(overflow)} sources overflow their group after {self.max_pages} pages; "
+                        f"fetching them one at a time")
+        return per_source, overflow
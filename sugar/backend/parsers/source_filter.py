@@ -4,6 +4,8 @@ Source filtering utilities for news parsers.
 Provides functionality to filter out non-trusted news sources.
 """
 
+from sugar.backend.parsers.source_registry import SourceRegistry
+
 def get_sugar_trusted_sources():
     """
     Return a set of sugar-specific trusted news sources.
@@ -180,6 +182,13 @@ def get_non_trusted_sources():
         'SlideShare'
     }
 
+# Lookup tables for the source lists above, built once at import
+SOURCE_REGISTRY = SourceRegistry(
+    trusted_names=get_sugar_trusted_sources(),
+    trusted_ids=get_sugar_trusted_source_ids(),
+    non_trusted_names=get_non_trusted_sources()
+)
+
 def is_trusted_source(source_name, source_id=None):
     """
     Check if a source is trusted (not in the non-trusted list or in sugar-specific trusted sources).
@@ -191,24 +200,9 @@ def is_trusted_source(source_name, source_id=None):
     Returns:
         bool: True if source is trusted, False otherwise
     """
-    # First check by ID if available (more reliable)
-    if source_id is not None:
-        sugar_trusted_ids = get_sugar_trusted_source_ids()
-        if source_id in sugar_trusted_ids:
-            return True
-    
-    # Fall back to name-based checking
-    if not source_name:
-        return False
-    
-    non_trusted = get_non_trusted_sources()
-    sugar_trusted = get_sugar_trusted_sources()
-    
-    # Case-sensitive exact match
-    normalized_source = source_name.strip()
-    
+    # ID is checked first (more reliable), then the name (case-sensitive exact match).
     # Source is trusted if it's in sugar-specific trusted sources OR not in non-trusted sources
-    return normalized_source in sugar_trusted or normalized_source not in non_trusted
+    return SOURCE_REGISTRY.is_trusted(source_name, source_id)
 
 def filter_trusted_sources(articles_df, verbose=True):
     """
@@ -227,16 +221,8 @@ def filter_trusted_sources(articles_df, verbose=True):
     # Get initial count
     initial_count = len(articles_df)
     
-    # Filter for trusted sources using both name and ID if available
-    if 'site_id' in articles_df.columns:
-        # Use both name and ID for more reliable filtering
-        trusted_mask = articles_df.apply(
-            lambda row: is_trusted_source(row.get('site_name'), row.get('site_id')),
-            axis=1
-        )
-    else:
-        # Fall back to name-based filtering only
-        trusted_mask = articles_df['site_name'].apply(lambda x: is_trusted_source(x))
+    # Filter for trusted sources using both name and ID if available (vectorized)
+    trusted_mask = SOURCE_REGISTRY.mask(articles_df)
     
     filtered_df = articles_df[trusted_mask].copy()
     
@@ -273,16 +259,8 @@ def get_source_statistics(articles_df):
             'non_trusted_sources': []
         }
     
-    # Classify sources using both name and ID if available
-    if 'site_id' in articles_df.columns:
-        # Use both name and ID for more reliable filtering
-        trusted_mask = articles_df.apply(
-            lambda row: is_trusted_source(row.get('site_name'), row.get('site_id')),
-            axis=1
-        )
-    else:
-        # Fall back to name-based filtering only
-        trusted_mask = articles_df['site_name'].apply(lambda x: is_trusted_source(x))
+    # Classify sources using both name and ID if available (vectorized)
+    trusted_mask = SOURCE_REGISTRY.mask(articles_df)
     
     trusted_sources = articles_df[trusted_mask]['site_name'].value_counts().to_dict()
     non_trusted_sources = articles_df[~trusted_mask]['site_name'].value_counts().to_dict()
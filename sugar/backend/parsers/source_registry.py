@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Precomputed source lookups for the sugar news pipeline.
+
+The source configuration is a nested dict of category lists (SUGAR_SOURCES) plus separate
+name and ID sets for trusted and non-trusted sources. SourceRegistry flattens all of it once
+into dicts keyed by source name and by Opoint site ID, so category, reliability, trust and
+site ID lookups are O(1) instead of walking the category lists for every source and article.
+
+For DataFrames, mask() classifies each distinct site name once through the frame's
+categorical codes and matches site IDs with a single isin, instead of a row-wise apply.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN_CATEGORY = 'unknown'
+DEFAULT_RELIABILITY = 0.5
+
+
+class SourceRegistry:
+    """
+    Name and site ID lookups for configured, trusted and non-trusted sources.
+    """
+
+    def __init__(self,
+                 sources_config: Optional[Dict[str, Any]] = None,
+                 reliability_scores: Optional[Dict[str, float]] = None,
+                 trusted_names: Optional[Iterable[str]] = None,
+                 trusted_ids: Optional[Iterable[int]] = None,
+                 non_trusted_names: Optional[Iterable[str]] = None):
+        """
+        Build the lookup tables.
+
+        Args:
+            sources_config (Optional[Dict[str, Any]]): Sources by category, as in SUGAR_SOURCES;
+                a category maps to a list of {'name', 'id'} dicts or to a dict of such lists by region
+            reliability_scores (Optional[Dict[str, float]]): Reliability score by source name
+            trusted_names (Optional[Iterable[str]]): Names of sources that are always trusted
+            trusted_ids (Optional[Iterable[int]]): Site IDs of sources that are always trusted
+            non_trusted_names (Optional[Iterable[str]]): Names of sources to filter out
+        """
+        self.reliability_scores = dict(reliability_scores or {})
+        self.trusted_names = frozenset(trusted_names or ())
+        self.trusted_ids = frozenset(trusted_ids or ())
+        self.non_trusted_names = frozenset(non_trusted_names or ())
+        # Only these names are rejected by name; trusted names win over the non-trusted list
+        self._rejected_names = self.non_trusted_names - self.trusted_names
+
+        self.categories: Dict[str, str] = {}
+        self.site_ids: Dict[str, int] = {}
+        self.names_by_id: Dict[int, str] = {}
+        for category, sources in (sources_config or {}).items():
+            source_lists = sources.values() if isinstance(sources, dict) else [sources]
+            for source_list in source_lists:
+                for source in source_list:
+                    # The first category listing a source wins, as in the category walk it replaces
+                    self.categories.setdefault(source['name'], category)
+                    self.site_ids.setdefault(source['name'], source['id'])
+                    self.names_by_id.setdefault(source['id'], source['name'])
+
+    def get_category(self, source_name: str) -> str:
+        """Return the category of a source, or 'unknown'"""
+        return self.categories.get(source_name, UNKNOWN_CATEGORY)
+
+    def get_reliability(self, source_name: str, default: float = DEFAULT_RELIABILITY) -> float:
+        """Return the reliability score of a source"""
+        return self.reliability_scores.get(source_name, default)
+
+    def get_site_id(self, source_name: str) -> Optional[int]:
+        """Return the Opoint site ID of a configured source"""
+        return self.site_ids.get(source_name)
+
+    def get_name(self, site_id: int) -> Optional[str]:
+        """Return the name of a configured source by its Opoint site ID"""
+        return self.names_by_id.get(site_id)
+
+    def is_trusted_name(self, source_name) -> bool:
+        """Check a source by name: trusted unless it is empty or non-trusted"""
+        if not isinstance(source_name, str) or not source_name:
+            return False
+        return source_name.strip() not in self._rejected_names
+
+    def is_trusted(self, source_name, source_id=None) -> bool:
+        """
+        Check if a source is trusted.
+
+        Args:
+            source_name: Name of the news source
+            source_id: Site ID of the news source; a trusted ID overrides the name check
+
+        Returns:
+            bool: True if the source is trusted
+        """
+        if source_id is not None and source_id in self.trusted_ids:
+            return True
+        return self.is_trusted_name(source_name)
+
+    def mask(self, articles_df: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized is_trusted over a DataFrame.
+
+        Args:
+            articles_df (pd.DataFrame): Articles with a 'site_name' column and optionally 'site_id'
+
+        Returns:
+            pd.Series: Boolean mask aligned with articles_df
+        """
+        names = articles_df['site_name']
+        if not isinstance(names.dtype, pd.CategoricalDtype):
+            names = names.astype('category')
+        # Classify each distinct name once; code -1 (missing name) maps to the trailing False
+        category_trusted = np.fromiter(
+            (self.is_trusted_name(name) for name in names.cat.categories),
+            dtype=bool, count=len(names.cat.categories)
+        )
+        trusted = np.append(category_trusted, False)[names.cat.codes.to_numpy()]
+        mask = pd.Series(trusted, index=articles_df.index)
+        if 'site_id' in articles_df.columns and self.trusted_ids:
+            mask |= articles_df['site_id'].isin(self.trusted_ids)
+        return mask
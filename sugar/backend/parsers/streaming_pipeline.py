@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+"""
+Bounded-queue streaming pipeline used by the sugar news fetcher.
+
+A pipeline is a source iterable followed by a chain of stages. Every stage runs
+in its own thread and is connected to the next one by a bounded queue, so a slow
+downstream stage (for example the database save) blocks the upstream stages
+instead of letting items pile up in memory. Memory use is therefore bounded by
+the queue sizes and stage batch sizes, not by the amount of data processed.
+
+Stages:
+- A stage function receives one item and returns the output item, or None to drop it.
+- A batch stage (batch_size > 1) receives a list of up to batch_size items and
+  returns a list of output items; the input order is preserved.
+- on_end is called once after the last item, to flush any buffered state.
+
+Example:
+    pipeline = StreamingPipeline([
+        PipelineStage('normalize', normalize_item),
+        PipelineStage('dedup', dedup_item),
+        PipelineStage('save', sink.add, on_end=sink.flush),
+    ], queue_size=256)
+    stats = pipeline.run(fetch_items())
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream on every queue
+_END = object()
+
+
+class PipelineStage:
+    """
+    A single processing step of a StreamingPipeline.
+    """
+
+    def __init__(self,
+                 name: str,
+                 func: Callable[[Any], Any],
+                 batch_size: int = 1,
+                 on_end: Optional[Callable[[], None]] = None):
+        """
+        Initialize the stage.
+
+        Args:
+            name (str): Stage name used in statistics and logs
+            func (Callable): Item function (batch_size == 1) or batch function (batch_size > 1)
+            batch_size (int): Number of items passed to func at once
+            on_end (Optional[Callable]): Called once after the last item has been processed
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.name = name
+        self.func = func
+        self.batch_size = batch_size
+        self.on_end = on_end
+        self.stats = {'items_in': 0, 'items_out': 0, 'busy_seconds': 0.0}
+
+    def process(self, items: List[Any]) -> List[Any]:
+        """
+        Run the stage function on a list of items.
+
+        Args:
+            items (List[Any]): Input items (a single item unless this is a batch stage)
+
+        Returns:
+            List[Any]: Output items, with dropped items removed
+        """
+        started = time.perf_counter()
+        if self.batch_size > 1:
+            outputs = [item for item in self.func(items) if item is not None]
+        else:
+            outputs = []
+            for item in items:
+                output = self.func(item)
+                if output is not None:
+                    outputs.append(output)
+        self.stats['busy_seconds'] += time.perf_counter() - started
+        self.stats['items_in'] += len(items)
+        self.stats['items_out'] += len(outputs)
+        return outputs
+
+
+class StreamingPipeline:
+    """
+    Runs a source iterable through a chain of PipelineStages with backpressure.
+    """
+
+    def __init__(self, stages: List[PipelineStage], queue_size: int = 256, name: str = "pipeline"):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages (List[PipelineStage]): Stages in processing order; the last stage acts as the sink
+            queue_size (int): Maximum number of items buffered between two stages
+            name (str): Pipeline name used for thread names and logs
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.name = name
+        self.source_stats = {'items_out': 0, 'busy_seconds': 0.0}
+        self._stop = threading.Event()
+        self._errors = []
+        self._errors_lock = threading.Lock()
+
+    def _fail(self, stage_name: str, error: BaseException):
+        """Record the first error and ask every thread to stop"""
+        with self._errors_lock:
+            self._errors.append((stage_name, error))
+        self._stop.set()
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        """Blocking put that gives up when the pipeline is stopping; returns False if it gave up"""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        """Blocking get that returns _END when the pipeline is stopping"""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _run_source(self, source: Iterable[Any], out_q: queue.Queue):
+        try:
+            iterator = iter(source)
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    self.source_stats['busy_seconds'] += time.perf_counter() - started
+                if not self._put(out_q, item):
+                    return
+                self.source_stats['items_out'] += 1
+        except BaseException as e:
+            logger.error(f"[{self.name}] source failed: {e}")
+            self._fail('source', e)
+        finally:
+            self._put(out_q, _END)
+
+    def _run_stage(self, stage: PipelineStage, in_q: queue.Queue, out_q: Optional[queue.Queue]):
+        try:
+            batch = []
+            while True:
+                item = self._get(in_q)
+                if item is not _END:
+                    batch.append(item)
+                    if len(batch) < stage.batch_size:
+                        continue
+                if batch:
+                    for output in stage.process(batch):
+                        if out_q is not None and not self._put(out_q, output):
+                            return
+                    batch = []
+                if item is _END:
+                    break
+            if stage.on_end is not None and not self._stop.is_set():
+                stage.on_end()
+        except BaseException as e:
+            logger.error(f"[{self.name}] stage '{stage.name}' failed: {e}")
+            self._fail(stage.name, e)
+        finally:
+            if out_q is not None:
+                self._put(out_q, _END)
+
+    def run(self, source: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Stream every item of source through the stages and wait for completion.
+
+        Args:
+            source (Iterable[Any]): Items to process; consumed lazily in a dedicated thread
+
+        Returns:
+            Dict[str, Any]: Per-stage statistics and total wall time
+
+        Raises:
+            Exception: The first error raised by the source or any stage
+        """
+        started = time.perf_counter()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = [threading.Thread(
+            target=self._run_source, args=(source, queues[0]),
+            name=f"{self.name}-source", daemon=True
+        )]
+        for index, stage in enumerate(self.stages):
+            out_q = queues[index + 1] if index + 1 < len(self.stages) else None
+            threads.append(threading.Thread(
+                target=self._run_stage, args=(stage, queues[index], out_q),
+                name=f"{self.name}-{stage.name}", daemon=True
+            ))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._errors:
+            stage_name, error = self._errors[0]
+            raise RuntimeError(f"Pipeline '{self.name}' failed in stage '{stage_name}': {error}") from error
+
+        return {
+            'wall_seconds': time.perf_counter() - started,
+            'source': dict(self.source_stats),
+            'stages': {stage.name: dict(stage.stats) for stage in self.stages}
+        }
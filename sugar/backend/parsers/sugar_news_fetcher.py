@@ -15,6 +15,7 @@ import os
 import sys
 import argparse
 import json
+import re
 import time
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
@@ -28,17 +29,10 @@ import pickle
 import tempfile
 import sqlite3
 from typing import List, Tuple, Dict, Any
-# Try to import psutil for memory monitoring, but make it optional
-try:
-    import psutil  # For memory monitoring
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    # Silently disable memory monitoring if psutil is not available
-    pass
+from functools import lru_cache
+import multiprocessing
 
 import gc  # For garbage collection
-import tiktoken  # For token counting
 
 # Load environment variables
 load_dotenv()
@@ -49,15 +43,31 @@ project_root = current_dir.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from sugar.backend.api.opoint.opoint_api import OpointAPI
+from sugar.backend.api.opoint.response_cache import OpointResponseCache
 from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
-from sugar.backend.text_filtering.sugar_triage_filter import triage_filter
+from sugar.backend.text_filtering.normalization_service import NormalizationClient
+from sugar.backend.text_filtering.sugar_triage_filter import triage_filter, merge_part_results
 from sugar.backend.parsers.news_parser import (
     build_search_query,
     save_to_database,
     clean_html,
     generate_article_id
 )
-from sugar.backend.parsers.source_filter import filter_trusted_sources
+from sugar.backend.parsers.source_filter import (
+    filter_trusted_sources,
+    get_sugar_trusted_sources,
+    get_sugar_trusted_source_ids,
+    get_non_trusted_sources
+)
+from sugar.backend.parsers.source_registry import SourceRegistry
+from sugar.backend.parsers.article_record import ArticleRecord
+from sugar.backend.parsers.streaming_pipeline import StreamingPipeline, PipelineStage
+from sugar.backend.parsers.checkpoints import SegmentCheckpointStore, month_key
+from sugar.backend.parsers.dedup_index import PersistentDedupIndex, KIND_ARTICLE_ID, KIND_CONTENT_HASH
+from sugar.backend.parsers.article_processing import ArticleProcessPool, article_raw_text
+from sugar.backend.parsers.metrics import PIPELINE_METRICS
+from sugar.backend.parsers.query_planner import SourceQueryPlanner, DEFAULT_PAGE_SIZE
+from sugar.backend.parsers.job_queue import JobQueue, SharedRateLimiter, default_worker_id
 
 # Configure logging for debugging
 logging.basicConfig(
@@ -74,11 +84,23 @@ logger = logging.getLogger(__name__)
 active_requests = threading.Semaphore(value=50)  # Limit concurrent API requests
 request_counter = 0
 request_lock = threading.Lock()
+dedup_cache_lock = threading.Lock()  # Guards the deduplication cache shared by pipeline stages
+
+# psutil and tiktoken are imported on first use rather than with this module
+@lru_cache(maxsize=None)
+def _psutil():
+    """psutil for memory monitoring, or None if it is not installed"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
 
 # Memory monitoring functions
 def get_memory_usage():
     """Get current memory usage in MB"""
-    if PSUTIL_AVAILABLE:
+    psutil = _psutil()
+    if psutil is not None:
         process = psutil.Process(os.getpid())
         return process.memory_info().rss / 1024 / 1024
     else:
@@ -89,7 +111,7 @@ def get_memory_usage():
 
 def check_memory_usage(max_memory_mb=4000):
     """Check if memory usage is within limits, return True if OK"""
-    if PSUTIL_AVAILABLE:
+    if _psutil() is not None:
         current_memory = get_memory_usage()
         # Silently check memory usage
         pass
@@ -141,58 +163,37 @@ def load_checkpoint(checkpoint_file):
         pass
         return None
 
-def save_intermediate_results(all_structured, batch_index, checkpoint_dir):
-    """Save intermediate results to prevent data loss"""
+def save_intermediate_results(articles, month, topic_id, checkpoint_dir):
+    """
+    Save the processed articles of a completed (month, topic) pair as an append-only Parquet segment.
+    
+    Args:
+        articles: DataFrame or list of article dicts
+        month: Month key ('YYYY-MM')
+        topic_id: Topic ID (MEDIA_TOPIC_ID)
+        checkpoint_dir: Directory holding the checkpoint manifest and segments
+    
+    Returns:
+        bool: True if the segment was written (or already existed)
+    """
     try:
-        if not all_structured:
-            return False
-            
-        # Create checkpoint directory if it doesn't exist
-        os.makedirs(checkpoint_dir, exist_ok=True)
-        
-        # Save intermediate results
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        intermediate_file = os.path.join(checkpoint_dir, f"intermediate_results_batch_{batch_index}_{timestamp}.pkl")
-        
-        with open(intermediate_file, 'wb') as f:
-            pickle.dump(all_structured, f)
-        
-        # Silently save intermediate results
-        pass
+        SegmentCheckpointStore(checkpoint_dir).write_segment(month, topic_id, articles)
         return True
     except Exception as e:
-        # Silently handle intermediate results save failure
-        pass
+        logger.error(f"Failed to save checkpoint segment {month}/{topic_id}: {e}")
         return False
 
 def load_intermediate_results(checkpoint_dir):
-    """Load all intermediate results from checkpoint directory"""
+    """Load all checkpoint segments from checkpoint directory, one DataFrame per (month, topic) pair"""
     try:
         if not os.path.exists(checkpoint_dir):
             # Silently handle missing checkpoint directory
             pass
             return []
         
-        # Load all intermediate result files
-        all_results = []
-        checkpoint_files = [f for f in os.listdir(checkpoint_dir) if f.startswith("intermediate_results_batch_")]
-        
-        for file in sorted(checkpoint_files):
-            file_path = os.path.join(checkpoint_dir, file)
-            try:
-                with open(file_path, 'rb') as f:
-                    batch_results = pickle.load(f)
-                    all_results.extend(batch_results)
-                # Silently load intermediate results
-                pass
-            except Exception as e:
-                # Silently handle intermediate results load failure
-                pass
-        
-        return all_results
+        return list(SegmentCheckpointStore(checkpoint_dir).iter_frames())
     except Exception as e:
-        # Silently handle intermediate results load failure
-        pass
+        logger.error(f"Failed to load checkpoint segments from {checkpoint_dir}: {e}")
         return []
 
 def cleanup_checkpoint_files(checkpoint_dir):
@@ -201,6 +202,10 @@ def cleanup_checkpoint_files(checkpoint_dir):
         if not os.path.exists(checkpoint_dir):
             return True
         
+        if not SegmentCheckpointStore(checkpoint_dir).cleanup():
+            return False
+        
+        # Remove pickle batches left by older versions
         checkpoint_files = [f for f in os.listdir(checkpoint_dir) if f.startswith("intermediate_results_batch_")]
         
         for file in checkpoint_files:
@@ -235,19 +240,36 @@ class ProcessedDatesTracker:
     
     This class maintains a SQLite database of processed date ranges and provides
     methods to check if dates have already been processed and to mark dates as processed.
+    
+    It also keeps a per-(source, topic) high-water mark of the newest published
+    article seen, which drives incremental fetching: a run only needs to request
+    the delta between the watermark and the end of the requested window. A source's
+    watermark only advances once its fetch finished without error.
+    
+    Watermarks are not keyed by window: a later incremental run with a larger
+    --months-back does not backfill the older months for sources that already have a
+    watermark. Backfill older months with a run without --incremental.
+    
+    A single persistent connection in WAL mode is shared by all threads (guarded by
+    a lock), and processed ranges are covered by an interval index so overlap
+    checks stay fast as history grows.
     """
     
     def __init__(self, db_path="processed_dates.db"):
         """Initialize the tracker with a database path"""
         self.db_path = db_path
         self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self._init_database()
     
     def _init_database(self):
         """Initialize the SQLite database for tracking processed dates"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self.conn.cursor()
+            
+            # WAL mode lets readers proceed while a writer commits
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
             
             # Create table for processed date ranges
             cursor.execute('''
@@ -261,6 +283,12 @@ class ProcessedDatesTracker:
                 )
             ''')
             
+            # Interval index used by overlap checks
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_processed_date_ranges_interval
+                ON processed_date_ranges (processing_mode, start_date, end_date)
+            ''')
+            
             # Create table for individual processed dates (for more granular tracking)
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS processed_dates (
@@ -272,8 +300,23 @@ class ProcessedDatesTracker:
                 )
             ''')
             
-            conn.commit()
-            conn.close()
+            # Create table for per-(source, topic) high-water marks (unix seconds of the newest published article)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS fetch_watermarks (
+                    source TEXT NOT NULL,
+                    topic_id TEXT NOT NULL,
+                    watermark INTEGER NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (source, topic_id)
+                )
+            ''')
+            
+            self.conn.commit()
+    
+    def close(self):
+        """Close the persistent database connection"""
+        with self.lock:
+            self.conn.close()
     
     def is_date_range_processed(self, start_date, end_date, processing_mode):
         """
@@ -288,19 +331,14 @@ class ProcessedDatesTracker:
             bool: True if the date range has been processed, False otherwise
         """
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Check for exact match
-            cursor.execute('''
-                SELECT COUNT(*) FROM processed_date_ranges
+            row = self.conn.execute('''
+                SELECT 1 FROM processed_date_ranges
                 WHERE start_date = ? AND end_date = ? AND processing_mode = ?
-            ''', (start_date.isoformat(), end_date.isoformat(), processing_mode))
+                LIMIT 1
+            ''', (start_date.isoformat(), end_date.isoformat(), processing_mode)).fetchone()
             
-            count = cursor.fetchone()[0]
-            conn.close()
-            
-            return count > 0
+            return row is not None
     
     def is_date_processed(self, date, processing_mode):
         """
@@ -314,18 +352,13 @@ class ProcessedDatesTracker:
             bool: True if the date has been processed, False otherwise
         """
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT COUNT(*) FROM processed_dates
+            row = self.conn.execute('''
+                SELECT 1 FROM processed_dates
                 WHERE date = ? AND processing_mode = ?
-            ''', (date.isoformat(), processing_mode))
-            
-            count = cursor.fetchone()[0]
-            conn.close()
+                LIMIT 1
+            ''', (date.isoformat(), processing_mode)).fetchone()
             
-            return count > 0
+            return row is not None
     
     def mark_date_range_processed(self, start_date, end_date, processing_mode):
         """
@@ -341,33 +374,29 @@ class ProcessedDatesTracker:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                # Mark the date range as processed
-                cursor.execute('''
-                    INSERT OR REPLACE INTO processed_date_ranges
-                    (start_date, end_date, processing_mode)
-                    VALUES (?, ?, ?)
-                ''', (start_date.isoformat(), end_date.isoformat(), processing_mode))
-                
-                # Also mark all individual dates in the range as processed
-                current_date = start_date
-                while current_date <= end_date:
-                    cursor.execute('''
+                with self.conn:
+                    # Mark the date range as processed
+                    self.conn.execute('''
+                        INSERT OR REPLACE INTO processed_date_ranges
+                        (start_date, end_date, processing_mode)
+                        VALUES (?, ?, ?)
+                    ''', (start_date.isoformat(), end_date.isoformat(), processing_mode))
+                    
+                    # Also mark all individual dates in the range as processed
+                    dates = []
+                    current_date = start_date
+                    while current_date <= end_date:
+                        dates.append((current_date.isoformat(), processing_mode))
+                        current_date += timedelta(days=1)
+                    self.conn.executemany('''
                         INSERT OR REPLACE INTO processed_dates
                         (date, processing_mode)
                         VALUES (?, ?)
-                    ''', (current_date.isoformat(), processing_mode))
-                    current_date += timedelta(days=1)
-                
-                conn.commit()
-                conn.close()
+                    ''', dates)
                 return True
                 
-            except Exception as e:
-                # Silently handle date range marking failure
-                pass
+            except sqlite3.Error as e:
+                logger.error(f"Failed to mark date range {start_date} - {end_date} as processed: {e}")
                 return False
     
     def get_processed_date_ranges(self, processing_mode=None, limit=None):
@@ -382,11 +411,8 @@ class ProcessedDatesTracker:
             list: List of tuples (start_date, end_date, processing_mode, processed_at)
         """
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             if processing_mode:
-                cursor.execute('''
+                cursor = self.conn.execute('''
                     SELECT start_date, end_date, processing_mode, processed_at
                     FROM processed_date_ranges
                     WHERE processing_mode = ?
@@ -394,17 +420,14 @@ class ProcessedDatesTracker:
                     LIMIT ?
                 ''', (processing_mode, limit or 1000))
             else:
-                cursor.execute('''
+                cursor = self.conn.execute('''
                     SELECT start_date, end_date, processing_mode, processed_at
                     FROM processed_date_ranges
                     ORDER BY processed_at DESC
                     LIMIT ?
                 ''', (limit or 1000,))
             
-            results = cursor.fetchall()
-            conn.close()
-            
-            return results
+            return cursor.fetchall()
     
     def get_processed_dates(self, processing_mode=None, limit=None):
         """
@@ -418,11 +441,8 @@ class ProcessedDatesTracker:
             list: List of tuples (date, processing_mode, processed_at)
         """
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             if processing_mode:
-                cursor.execute('''
+                cursor = self.conn.execute('''
                     SELECT date, processing_mode, processed_at
                     FROM processed_dates
                     WHERE processing_mode = ?
@@ -430,22 +450,22 @@ class ProcessedDatesTracker:
                     LIMIT ?
                 ''', (processing_mode, limit or 1000))
             else:
-                cursor.execute('''
+                cursor = self.conn.execute('''
                     SELECT date, processing_mode, processed_at
                     FROM processed_dates
                     ORDER BY processed_at DESC
                     LIMIT ?
                 ''', (limit or 1000,))
             
-            results = cursor.fetchall()
-            conn.close()
-            
-            return results
+            return cursor.fetchall()
     
     def check_overlap_with_processed_ranges(self, start_date, end_date, processing_mode):
         """
         Check if the given date range overlaps with any already processed ranges.
         
+        Two closed intervals overlap exactly when each one starts before the other
+        ends, which the interval index answers with a single range scan.
+        
         Args:
             start_date (datetime): Start date of the range to check
             end_date (datetime): End date of the range to check
@@ -455,38 +475,91 @@ class ProcessedDatesTracker:
             tuple: (has_overlap: bool, overlapping_ranges: list)
         """
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Find overlapping ranges
-            cursor.execute('''
+            overlapping_ranges = self.conn.execute('''
                 SELECT start_date, end_date, processed_at
                 FROM processed_date_ranges
                 WHERE processing_mode = ?
-                AND (
-                    (start_date <= ? AND end_date >= ?) OR  -- New range contains existing range
-                    (start_date >= ? AND end_date <= ?) OR  -- Existing range contains new range
-                    (start_date <= ? AND end_date >= ?) OR  -- New range overlaps start of existing range
-                    (start_date <= ? AND end_date >= ?)     -- New range overlaps end of existing range
-                )
-            ''', (
-                processing_mode,
-                start_date.isoformat(), end_date.isoformat(),  # New contains existing
-                start_date.isoformat(), end_date.isoformat(),  # Existing contains new
-                start_date.isoformat(), start_date.isoformat(),  # New overlaps start of existing
-                end_date.isoformat(), end_date.isoformat()       # New overlaps end of existing
-            ))
-            
-            overlapping_ranges = cursor.fetchall()
-            conn.close()
+                AND start_date <= ?
+                AND end_date >= ?
+            ''', (processing_mode, end_date.isoformat(), start_date.isoformat())).fetchall()
             
             has_overlap = len(overlapping_ranges) > 0
             return has_overlap, overlapping_ranges
     
+    def get_watermark(self, source, topic_id):
+        """
+        Get the high-water mark for a (source, topic) pair.
+        
+        Args:
+            source (str): Source name
+            topic_id (str): MEDIA_TOPIC_ID
+            
+        Returns:
+            datetime or None: Publication time of the newest article seen, or None if never fetched
+        """
+        with self.lock:
+            row = self.conn.execute('''
+                SELECT watermark FROM fetch_watermarks
+                WHERE source = ? AND topic_id = ?
+            ''', (source, str(topic_id))).fetchone()
+        
+        return datetime.fromtimestamp(row[0]) if row else None
+    
+    def get_watermarks(self, topic_id):
+        """
+        Get the high-water marks of all sources for a topic.
+        
+        Args:
+            topic_id (str): MEDIA_TOPIC_ID
+            
+        Returns:
+            dict: Mapping of source name to the publication time of the newest article seen
+        """
+        with self.lock:
+            rows = self.conn.execute('''
+                SELECT source, watermark FROM fetch_watermarks
+                WHERE topic_id = ?
+            ''', (str(topic_id),)).fetchall()
+        
+        return {source: datetime.fromtimestamp(watermark) for source, watermark in rows}
+    
+    def update_watermarks(self, topic_id, source_watermarks):
+        """
+        Advance the high-water marks of several sources for a topic in one transaction.
+        
+        Watermarks only ever move forward; an older timestamp never replaces a newer one.
+        
+        Args:
+            topic_id (str): MEDIA_TOPIC_ID
+            source_watermarks (dict): Mapping of source name to unix timestamp of the newest article fetched
+            
+        Returns:
+            bool: True if successfully updated, False otherwise
+        """
+        if not source_watermarks:
+            return True
+        
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.executemany('''
+                        INSERT INTO fetch_watermarks (source, topic_id, watermark)
+                        VALUES (?, ?, ?)
+                        ON CONFLICT(source, topic_id) DO UPDATE SET
+                            watermark = MAX(watermark, excluded.watermark),
+                            updated_at = CURRENT_TIMESTAMP
+                    ''', [(source, str(topic_id), int(ts)) for source, ts in source_watermarks.items()])
+                return True
+            except sqlite3.Error as e:
+                logger.error(f"Failed to update watermarks for topic {topic_id}: {e}")
+                return False
+    
     def cleanup_old_records(self, days_to_keep=90):
         """
         Clean up old processed date records to keep the database size manageable.
         
+        Watermarks are never cleaned up, since incremental fetching depends on them.
+        
         Args:
             days_to_keep (int): Number of days to keep records for
             
@@ -495,39 +568,34 @@ class ProcessedDatesTracker:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
                 cutoff_date = datetime.now() - timedelta(days=days_to_keep)
                 
-                # Clean up old date range records
-                cursor.execute('''
-                    DELETE FROM processed_date_ranges
-                    WHERE processed_at < ?
-                ''', (cutoff_date.isoformat(),))
-                
-                ranges_removed = cursor.rowcount
-                
-                # Clean up old individual date records
-                cursor.execute('''
-                    DELETE FROM processed_dates
-                    WHERE processed_at < ?
-                ''', (cutoff_date.isoformat(),))
-                
-                dates_removed = cursor.rowcount
-                
-                conn.commit()
-                conn.close()
+                with self.conn:
+                    # Clean up old date range records
+                    ranges_removed = self.conn.execute('''
+                        DELETE FROM processed_date_ranges
+                        WHERE processed_at < ?
+                    ''', (cutoff_date.isoformat(),)).rowcount
+                    
+                    # Clean up old individual date records
+                    dates_removed = self.conn.execute('''
+                        DELETE FROM processed_dates
+                        WHERE processed_at < ?
+                    ''', (cutoff_date.isoformat(),)).rowcount
                 
-                # Silently clean up old records
-                pass
                 return ranges_removed + dates_removed
                 
-            except Exception as e:
-                # Silently handle cleanup failure
-                pass
+            except sqlite3.Error as e:
+                logger.error(f"Failed to clean up old processed date records: {e}")
                 return 0
 
+# Lines written by DateProcessingLogger: "<asctime> - <name> - <level> - <message>"
+DATE_LOG_LINE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),\d+ - \S+ - \w+ - (.*)$')
+DATE_LOG_EVENT_PATTERN = re.compile(
+    r'^(START|COMPLETE|SKIP|OVERLAP) .*?date range: (\S+) to (\S+) \((\w+) mode\)'
+)
+DATE_LOG_ARTICLES_PATTERN = re.compile(r'Articles: (\d+)')
+
 class DateProcessingLogger:
     """
     Enhanced logger for tracking date processing activities.
@@ -609,22 +677,73 @@ class DateProcessingLogger:
         self.logger.info(message)
         print(f"[DATE PROCESSING] {message}")
     
-    def get_processing_statistics(self, processing_mode=None, hours_back=24):
-        """Get processing statistics from the log file"""
+    def get_processing_statistics(self, processing_mode=None, hours_back=24, recent_limit=20):
+        """
+        Get processing statistics by parsing the log file.
+        
+        Args:
+            processing_mode (str, optional): Only count entries of this processing mode
+            hours_back (float, optional): Only count entries from the last N hours (None for all)
+            recent_limit (int): Number of most recent entries returned in 'recent_activity'
+            
+        Returns:
+            dict: Counts of started, processed (completed), skipped and overlapping date ranges,
+                total articles of the completed ranges and the most recent entries, or {} on error
+        """
         try:
             stats = {
+                'total_started': 0,
                 'total_processed': 0,
                 'total_skipped': 0,
                 'total_overlaps': 0,
+                'total_articles': 0,
                 'recent_activity': []
             }
-            
-            # This is a simple implementation - in production, you might want to parse the log file
-            # or use a more sophisticated tracking mechanism
+            if not os.path.exists(self.log_file):
+                return stats
+            
+            cutoff = datetime.now() - timedelta(hours=hours_back) if hours_back is not None else None
+            counter_by_event = {
+                'START': 'total_started',
+                'COMPLETE': 'total_processed',
+                'SKIP': 'total_skipped',
+                'OVERLAP': 'total_overlaps'
+            }
+            with open(self.log_file, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    line_match = DATE_LOG_LINE_PATTERN.match(line.rstrip('\n'))
+                    if not line_match:
+                        continue
+                    timestamp = datetime.strptime(line_match.group(1), '%Y-%m-%d %H:%M:%S')
+                    if cutoff is not None and timestamp < cutoff:
+                        continue
+                    event_match = DATE_LOG_EVENT_PATTERN.match(line_match.group(2))
+                    if not event_match:
+                        continue
+                    event, range_start, range_end, mode = event_match.groups()
+                    if processing_mode is not None and mode != processing_mode:
+                        continue
+                    
+                    stats[counter_by_event[event]] += 1
+                    articles = None
+                    if event == 'COMPLETE':
+                        articles_match = DATE_LOG_ARTICLES_PATTERN.search(line_match.group(2))
+                        if articles_match:
+                            articles = int(articles_match.group(1))
+                            stats['total_articles'] += articles
+                    stats['recent_activity'].append({
+                        'timestamp': timestamp.isoformat(),
+                        'event': event,
+                        'start_date': range_start,
+                        'end_date': range_end,
+                        'processing_mode': mode,
+                        'articles': articles
+                    })
+            
+            stats['recent_activity'] = stats['recent_activity'][-recent_limit:] if recent_limit else []
             return stats
         except Exception as e:
-            # Silently handle statistics retrieval failure
-            pass
+            logger.warning(f"Failed to read processing statistics from {self.log_file}: {e}")
             return {}
 
 # Sugar asset configuration
@@ -869,6 +988,15 @@ SOURCE_RELIABILITY_SCORES = {
     'FAO': 0.9
 }
 
+# O(1) category, reliability, trust and site ID lookups, built once at import
+SOURCE_REGISTRY = SourceRegistry(
+    SUGAR_SOURCES,
+    SOURCE_RELIABILITY_SCORES,
+    trusted_names=get_sugar_trusted_sources(),
+    trusted_ids=get_sugar_trusted_source_ids(),
+    non_trusted_names=get_non_trusted_sources()
+)
+
 def calculate_source_quotas(max_articles, sources_config):
     """
     Calculate dynamic quota allocation for each of the 27 predefined sugar sources based on category weights and reliability scores.
@@ -890,10 +1018,10 @@ def calculate_source_quotas(max_articles, sources_config):
         source_name = source['name']
         
         # Get category for this source
-        category = get_source_category(source_name, SUGAR_SOURCES)
+        category = SOURCE_REGISTRY.get_category(source_name)
         category_weight = SOURCE_CATEGORY_WEIGHTS.get(category, 0.5)  # Default weight for unknown categories
         
-        reliability_score = SOURCE_RELIABILITY_SCORES.get(source_name, 0.5)  # Default reliability
+        reliability_score = SOURCE_REGISTRY.get_reliability(source_name)  # Default reliability 0.5
         weighted_score = category_weight * reliability_score
         source_scores[source_name] = weighted_score
         total_weight += weighted_score
@@ -948,6 +1076,8 @@ def get_source_category(source_name, sources_config):
     Returns:
         str: Category name or 'unknown' if not found
     """
+    if sources_config is SUGAR_SOURCES:
+        return SOURCE_REGISTRY.get_category(source_name)
     for category, sources in sources_config.items():
         if isinstance(sources, dict):
             # Handle regional sources
@@ -1005,9 +1135,15 @@ def generate_content_hash(title, text, source):
             # Find all occurrences of the keyword, including within compound words
             # We'll use a case-insensitive search
             pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-            matches = list(pattern.finditer(content))
             
-            for match in matches:
+            # Search the current content after each replacement: positions of matches found
+            # before it are stale and could select parts of earlier placeholders, which the
+            # global replace below then multiplies (exponential growth on long German texts)
+            search_from = 0
+            while True:
+                match = pattern.search(content, search_from)
+                if match is None:
+                    break
                 matched_text = match.group(0)
                 start_pos = match.start()
                 end_pos = match.end()
@@ -1042,12 +1178,14 @@ def generate_content_hash(title, text, source):
                     keyword_map[placeholder] = compound_word
                     content = content.replace(compound_word, placeholder)
                     placeholder_count += 1
+                    search_from = word_start + len(placeholder)
                 else:
                     # For standalone keywords, use the original approach
                     placeholder = f"__STANDALONE_SUGAR_{placeholder_count}__"
                     keyword_map[placeholder] = matched_text
-                    content = content.replace(matched_text, placeholder, 1)  # Replace only this occurrence
+                    content = content[:start_pos] + placeholder + content[end_pos:]  # Replace only this occurrence
                     placeholder_count += 1
+                    search_from = start_pos + len(placeholder)
         
         # Now handle other multilingual keywords with the original approach
         other_keywords = [k for k in multilingual_sugar_keywords if k not in german_compound_keywords]
@@ -1203,6 +1341,15 @@ def is_similar_content(title1, text1, source1, title2, text2, source2, threshold
     
     return similarity >= threshold
 
+@lru_cache(maxsize=None)
+def _token_encoding(encoding_name):
+    """tiktoken encoding, or None if tiktoken or the encoding cannot be loaded (tried once)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        return None
+
 def count_tokens(text, encoding_name="cl100k_base"):
     """
     Count the number of tokens in a text string using tiktoken.
@@ -1214,8 +1361,11 @@ def count_tokens(text, encoding_name="cl100k_base"):
     Returns:
         int: Number of tokens in the text
     """
+    encoding = _token_encoding(encoding_name)
+    if encoding is None:
+        # Fallback to rough estimate (1 token ≈ 4 characters for English text)
+        return len(text) // 4
     try:
-        encoding = tiktoken.get_encoding(encoding_name)
         return len(encoding.encode(text))
     except Exception as e:
         # Silently handle token counting failure
@@ -1389,7 +1539,7 @@ def normalize_and_filter_article(article, normalization_pipeline):
     6. If ANY part passes the sugar-related filter, the ENTIRE original article is retained.
     """
     # Combine title and text for normalization
-    raw_text = f"{article.get('title', '')}\n{article.get('text', '')}"
+    raw_text = article_raw_text(article)
     
     # Check if article needs to be split due to token limits
     article_tokens = count_tokens(raw_text)
@@ -1403,19 +1553,29 @@ def normalize_and_filter_article(article, normalization_pipeline):
         # Process as a single article (original logic)
         return process_single_article(article, normalization_pipeline, raw_text)
 
+def normalize_article_text(normalization_pipeline, text, source=None):
+    """
+    Normalize article text, passing the article source to pipelines that keep per-source language priors.
+    """
+    if getattr(normalization_pipeline, 'SUPPORTS_SOURCE_PRIORS', False) is True:
+        return normalization_pipeline.normalize(text, source=source)
+    return normalization_pipeline.normalize(text)
+
 def process_single_article(article, normalization_pipeline, raw_text):
     """
     Process a single article that doesn't need splitting.
     """
     # Normalize the text
-    normalized_text = normalization_pipeline.normalize(raw_text)
+    with PIPELINE_METRICS.time('normalize'):
+        normalized_text = normalize_article_text(normalization_pipeline, raw_text, article.get('site_name'))
 
     # Clean HTML after normalization
     clean_text = clean_html(normalized_text)
     clean_title = clean_html(article.get('title', ''))
 
     # Apply simplified triage filter (only sugar-related keywords, no exclusion keywords)
-    triage_result = triage_filter(clean_text, clean_title)
+    with PIPELINE_METRICS.time('triage'):
+        triage_result = triage_filter(clean_text, clean_title)
 
     # Determine asset based on triage filter result
     triage_passed = triage_result.get("passed", False)
@@ -1482,69 +1642,39 @@ def process_split_article(article, normalization_pipeline, raw_text, max_tokens_
     """
     Process a long article by splitting it into parts and applying the triage filter to each part.
     If ANY part passes the sugar-related filter, the ENTIRE original article is retained.
+    
+    The full text is normalized and cleaned once; the parts are slices of the normalized text,
+    and the full-article metadata is merged from the part results instead of a second triage
+    pass over the whole article.
     """
-    # Split the article into parts
     title = article.get('title', '')
-    text = article.get('text', '')
     
-    # Split the text content (excluding title)
-    text_parts = split_article_intelligently(text, max_tokens_per_part)
+    # Normalize and clean the full article once
+    with PIPELINE_METRICS.time('normalize'):
+        normalized_full_text = normalize_article_text(normalization_pipeline, raw_text, article.get('site_name'))
+    clean_full_text = clean_html(normalized_full_text)
+    clean_title = clean_html(title)
     
-    # Silently process split article
-    pass
+    # Split the normalized text so the parts are slices of clean_text
+    text_parts = split_article_intelligently(clean_full_text, max_tokens_per_part)
     
     # Process each part through the triage filter
-    all_parts_passed = []
-    all_triage_results = []
-    any_part_passed = False
-    
-    for i, part_text in enumerate(text_parts):
-        # Silently process article part
-        pass
-        
-        # Combine title with this part for processing
-        part_raw_text = f"{title}\n{part_text}"
-        
-        # Normalize this part
-        normalized_part = normalization_pipeline.normalize(part_raw_text)
-        clean_part = clean_html(normalized_part)
-        clean_title = clean_html(title)
-        
-        # Apply triage filter to this part with part information
-        part_triage_result = triage_filter(clean_part, clean_title, is_part=True, part_number=i+1)
-        part_passed = part_triage_result.get("passed", False)
-        
-        all_parts_passed.append(part_passed)
-        all_triage_results.append(part_triage_result)
-        
-        if part_passed:
-            any_part_passed = True
-            # Silently handle part passing filter
-            pass
-        else:
-            # Silently handle part failing filter
-            pass
+    with PIPELINE_METRICS.time('triage'):
+        all_triage_results = [
+            triage_filter(part_text, clean_title, is_part=True, part_number=i+1)
+            for i, part_text in enumerate(text_parts)
+        ]
+    all_parts_passed = [part_result.get("passed", False) for part_result in all_triage_results]
+    any_part_passed = any(all_parts_passed)
     
     # Determine asset based on whether ANY part passed
     if any_part_passed:
         asset = "Sugar"
-        # Silently accept article
-        pass
     else:
         asset = "General"
-        # Silently classify article as General
-        pass
-    
-    # Now process the ENTIRE original article for metadata extraction (not filtering)
-    # This ensures we get complete metadata from the full article
-    normalized_full_text = normalization_pipeline.normalize(raw_text)
-    clean_full_text = clean_html(normalized_full_text)
-    clean_title = clean_html(title)
     
-    # Apply triage filter to the full article for metadata extraction only
-    full_triage_result = triage_filter(clean_full_text, clean_title)
-    
-    # Extract metadata features from the FULL article (only for enrichment, not for filtering)
+    # Build the full-article metadata from the part matches (only for enrichment, not for filtering)
+    full_triage_result = merge_part_results(all_triage_results, text_parts, clean_title)
     context_zones_metadata = full_triage_result.get("matched_zones", [])
     
     # Structured pricing metadata (only for enrichment)
@@ -1591,291 +1721,704 @@ def process_split_article(article, normalization_pipeline, raw_text, max_tokens_
     }
     return result
 
-def fetch_sugar_articles_for_period(api_key, start_date, end_date, topic_ids, max_articles=30000, normalization_pipeline=None, global_dedup_cache=None):
+def get_newest_published_timestamp(articles_df):
     """
-    Fetch and process sugar news articles for a given period and topic IDs.
-    Returns a DataFrame of structured, filtered articles.
+    Get the unix timestamp of the newest published article in a search result.
     
-    CRITICAL: Implements DOUBLE FILTERING by both MEDIA_ID and MEDIA_TOPIC_ID:
-    1. Articles must be from one of the 27 predefined sugar sources (matching MEDIA_ID)
-    2. Articles must have one of the predefined MEDIA_TOPIC_IDs
-    3. Only articles that pass BOTH filters are processed further
+    Args:
+        articles_df (pd.DataFrame): Articles as returned by OpointAPI.search_articles
+        
+    Returns:
+        int or None: Unix timestamp of the newest article, or None if it cannot be determined
+    """
+    if articles_df.empty:
+        return None
     
-    ENHANCED: Double filtering is now implemented at the API level for maximum efficiency:
-    - MEDIA_ID filtering: Uses site_id parameter in API calls
-    - MEDIA_TOPIC_ID filtering: Uses media_topic_ids parameter in API calls
-    - Additional validation is performed on returned results to ensure double filtering worked correctly
+    if 'unix_timestamp' in articles_df.columns:
+        timestamps = pd.to_numeric(articles_df['unix_timestamp'], errors='coerce').dropna()
+        if not timestamps.empty:
+            return int(timestamps.max())
     
-    CRITICAL FIX: Enhanced deduplication to prevent processing same articles across different topic IDs:
-    - Global deduplication cache now persists across all topic ID processing calls
-    - Content hash generation includes source information for better accuracy
-    - Similarity checking prevents near-duplicates from different sources
+    if 'published_date' in articles_df.columns:
+        published = pd.to_datetime(articles_df['published_date'], errors='coerce', utc=True).dropna()
+        if not published.empty:
+            return int(published.max().timestamp())
     
-    Simplified to exclusively fetch from 27 predefined sugar sources with matching MEDIA_IDs.
-    All quota allocated to the 27 predefined sugar sources only.
-    Uses simplified triage filter focused on sugar-related keywords only.
-    Context zones, structured pricing, and name-entity recognition are used only for metadata extraction.
+    return None
+
+def get_article_timestamp(article):
+    """
+    Get the unix timestamp of one article record, as get_newest_published_timestamp does for a DataFrame.
     
     Args:
-        api_key: Opoint API key
-        start_date: Start date for fetching articles
-        end_date: End date for fetching articles
-        topic_ids: List of topic IDs to search (MEDIA_TOPIC_IDs)
-        max_articles: Maximum number of articles to fetch
-        normalization_pipeline: Language normalization pipeline
-        global_dedup_cache: Global cache for cross-topic deduplication (optional)
+        article (dict): Article as yielded by OpointAPI.iter_articles
+        
+    Returns:
+        int or None: Unix timestamp of the article, or None if it cannot be determined
     """
-    global request_counter
-    with request_lock:
-        request_counter += 1
-        current_request_id = request_counter
+    timestamp = pd.to_numeric(article.get('unix_timestamp'), errors='coerce')
+    if pd.notna(timestamp):
+        return int(timestamp)
+    published = pd.to_datetime(article.get('published_date'), errors='coerce', utc=True)
+    if pd.notna(published):
+        return int(published.timestamp())
+    return None
+
+def create_global_dedup_cache(start_date):
+    """
+    Create an empty cross-topic deduplication cache.
     
-    # Silently start fetch
-    pass
+    Args:
+        start_date: Start date of the processed period, used for cache management
     
-    # CRITICAL FIX: Initialize global deduplication cache if not provided with enhanced structure
+    Returns:
+        dict: Deduplication cache with seen hashes, IDs and URLs and a bounded similarity window
+    """
+    return {
+        'seen_content_hashes': set(),
+        'seen_article_ids': set(),
+        'seen_urls': set(),  # CRITICAL: Track URLs to prevent duplicates
+        'processed_articles': [],
+        'cache_stats': {
+            'total_hashes_added': 0,
+            'total_duplicates_prevented': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'similarity_checks': 0,
+            'similarity_duplicates': 0,
+            'url_duplicates': 0,  # Track URL-based duplicates
+            'persistent_duplicates': 0  # Duplicates found in the persistent cross-run index
+        },
+        'processing_date': start_date.date()  # Track processing date for cache management
+    }
+
+def ensure_global_dedup_cache(global_dedup_cache, start_date):
+    """
+    Return a usable deduplication cache, creating one or filling in missing fields of an older one.
+    
+    Args:
+        global_dedup_cache: Existing cache or None
+        start_date: Start date of the processed period
+    
+    Returns:
+        dict: Deduplication cache
+    """
     if global_dedup_cache is None:
-        global_dedup_cache = {
-            'seen_content_hashes': set(),
-            'seen_article_ids': set(),
-            'seen_urls': set(),  # CRITICAL: Track URLs to prevent duplicates
-            'processed_articles': [],
-            'cache_stats': {
-                'total_hashes_added': 0,
-                'total_duplicates_prevented': 0,
-                'cache_hits': 0,
-                'cache_misses': 0,
-                'similarity_checks': 0,
-                'similarity_duplicates': 0,
-                'url_duplicates': 0  # Track URL-based duplicates
-            },
-            'processing_date': start_date.date()  # Track processing date for cache management
-        }
-        # Silently initialize cache
-        pass
+        return create_global_dedup_cache(start_date)
+    
+    # Ensure cache has enhanced statistics structure
+    defaults = create_global_dedup_cache(start_date)
+    for key, value in defaults.items():
+        if key not in global_dedup_cache:
+            global_dedup_cache[key] = value
+    for key, value in defaults['cache_stats'].items():
+        global_dedup_cache['cache_stats'].setdefault(key, value)
+    return global_dedup_cache
+
+def is_duplicate_url(article_url, global_dedup_cache, dedup_index=None):
+    """
+    Check an article URL against the deduplication cache before any normalization work is done.
+    
+    Args:
+        article_url: Article URL (may be empty)
+        global_dedup_cache: Deduplication cache
+        dedup_index: PersistentDedupIndex with URLs saved by earlier months and runs (optional)
+    
+    Returns:
+        bool: True if the URL has already been processed
+    """
+    article_url = (article_url or '').strip()
+    if not article_url:
+        return False
+    
+    if article_url in global_dedup_cache['seen_urls']:
+        stat = 'url_duplicates'
+    elif dedup_index is not None and dedup_index.contains_url(article_url):
+        stat = 'persistent_duplicates'
     else:
-        # Ensure cache has enhanced statistics structure
-        if 'cache_stats' not in global_dedup_cache:
-            global_dedup_cache['cache_stats'] = {
-                'total_hashes_added': 0,
-                'total_duplicates_prevented': 0,
-                'cache_hits': 0,
-                'cache_misses': 0,
-                'similarity_checks': 0,
-                'similarity_duplicates': 0,
-                'url_duplicates': 0
-            }
-        # CRITICAL FIX: Add URL tracking if not present
-        if 'seen_urls' not in global_dedup_cache:
-            global_dedup_cache['seen_urls'] = set()
-        if 'processing_date' not in global_dedup_cache:
-            global_dedup_cache['processing_date'] = start_date.date()
-            
-        # Silently use existing cache
-        pass
+        return False
     
-    # Acquire semaphore to limit concurrent API requests
-    # Silently acquire semaphore
-    pass
-    acquired = active_requests.acquire(timeout=60)  # Wait up to 60 seconds for a slot
-    if not acquired:
-        # Silently handle semaphore timeout
-        pass
-        raise Exception("Timeout waiting for available API request slot")
+    with dedup_cache_lock:
+        global_dedup_cache['cache_stats'][stat] += 1
+        global_dedup_cache['cache_stats']['total_duplicates_prevented'] += 1
+    return True
+
+def build_dedup_entry(article, normalization_pipeline):
+    """
+    Normalize and triage an article and compute the content hash used for deduplication.
     
-    try:
-        # Silently create API instance
-        pass
-        api = OpointAPI(api_key=api_key)
-        
-        # Build search query for the 27 predefined sugar sources
-        # Silently build search query
-        pass
-        sugar_search_query = build_search_query(
-            topic_ids,
-            SUGAR_CONFIG['person_entities'],
-            SUGAR_CONFIG['company_entities'],
-            ALL_SUGAR_SOURCE_NAMES_27
-        )
+    Args:
+        article: Raw article (pandas Series or dict)
+        normalization_pipeline: Language normalization pipeline
+    
+    Returns:
+        dict: Entry with the normalized result, content hash, title, text, source, article ID and URL,
+            or None if the article could not be processed
+    """
+    result = normalize_and_filter_article(article, normalization_pipeline)
+    if not result:
+        return None
+    
+    # Generate content hash using normalized content for better accuracy
+    title = result.get('clean_title', '')
+    text = result.get('clean_text', '')
+    source = result.get('site_name', '') or result.get('source_name', '')
+    return {
+        'result': result,
+        'content_hash': generate_content_hash(title, text, source),
+        'title': title,
+        'text': text,
+        'source': source,
+        'article_id': result.get('id', ''),
+        'url': (article.get('url', '') or '').strip()  # CRITICAL: Store URL for deduplication
+    }
 
-        # Silently fetch articles
-        pass
-        # Silently fetch articles
-        pass
+@PIPELINE_METRICS.timed('dedup')
+def register_unique_article(entry, global_dedup_cache, max_similarity_check=5000, dedup_index=None):
+    """
+    Check a normalized article against the deduplication cache and register it if it is new.
+    
+    Duplicates are detected by content hash, article ID and content similarity against a
+    sliding window of the most recent max_similarity_check articles, and, when a persistent
+    index is given, against everything saved by earlier months and runs.
+    
+    Args:
+        entry: Entry created by build_dedup_entry
+        global_dedup_cache: Deduplication cache
+        max_similarity_check: Sliding window size for similarity checking
+        dedup_index: PersistentDedupIndex (optional)
+    
+    Returns:
+        ArticleRecord: Compact record of the normalized result with its content hash, or None if
+            it is a duplicate; the raw article is only kept as a reference into the response cache
+    """
+    content_hash = entry['content_hash']
+    title = entry['title']
+    text = entry['text']
+    source = entry['source']
+    article_id = entry['article_id']
+    article_url = entry['url']
+    
+    with dedup_cache_lock:
+        cache_stats = global_dedup_cache['cache_stats']
+        
+        # CRITICAL FIX: Check global deduplication cache first (multiple layers)
+        # 1. Check content hash (most reliable for exact duplicates)
+        # 2. Check article ID (backup for content hash)
+        if content_hash in global_dedup_cache['seen_content_hashes'] or article_id in global_dedup_cache['seen_article_ids']:
+            cache_stats['cache_hits'] += 1
+            cache_stats['total_duplicates_prevented'] += 1
+            return None
         
-        # Calculate dynamic quota allocation for the 27 predefined sugar sources - now using ALL quota
-        sugar_source_quotas = calculate_source_quotas(max_articles, SUGAR_SOURCES)  # Use ALL of max_articles for the 27 sugar sources
+        # 3. Check for similar content with globally processed articles
+        for processed_article in global_dedup_cache['processed_articles'][-max_similarity_check:]:
+            cache_stats['similarity_checks'] += 1
+            if is_similar_content(
+                title, text, source,
+                processed_article['title'], processed_article['text'], processed_article['source']
+            ):
+                cache_stats['similarity_duplicates'] += 1
+                cache_stats['total_duplicates_prevented'] += 1
+                return None
+        
+        # 4. Check the persistent index of articles saved by earlier months and runs
+        if dedup_index is not None and (
+            dedup_index.contains(KIND_CONTENT_HASH, content_hash)
+            or dedup_index.contains(KIND_ARTICLE_ID, article_id)
+            or dedup_index.find_near_duplicate(title, text, source)
+        ):
+            cache_stats['persistent_duplicates'] += 1
+            cache_stats['total_duplicates_prevented'] += 1
+            return None
         
-        # Log quota allocation
-        # Silently allocate quotas
-        pass
-        total_sugar_quota = 0
-        for source, quota in sugar_source_quotas.items():
-            category = get_source_category(source, SUGAR_SOURCES)
-            reliability = SOURCE_RELIABILITY_SCORES.get(source, 0.5)
-            # Silently display quota allocation
-            pass
-            total_sugar_quota += quota
-        # Silently display total quota
+        # CRITICAL FIX: Add to global deduplication cache (multiple layers)
+        global_dedup_cache['seen_content_hashes'].add(content_hash)
+        global_dedup_cache['seen_article_ids'].add(article_id)
+        if article_url:  # Only add non-empty URLs
+            global_dedup_cache['seen_urls'].add(article_url)
+        cache_stats['total_hashes_added'] += 1
+        cache_stats['cache_misses'] += 1
+        
+        # Store article info for global similarity checking
+        global_dedup_cache['processed_articles'].append({
+            'title': title,
+            'text': text,
+            'source': source
+        })
+        
+        # Periodically clean up old articles to prevent memory buildup
+        if len(global_dedup_cache['processed_articles']) > max_similarity_check * 2:
+            global_dedup_cache['processed_articles'] = global_dedup_cache['processed_articles'][-max_similarity_check:]
+    
+    # Keep only the fields used downstream; this drops the raw pandas row and the part results
+    return ArticleRecord.from_result(entry['result'], content_hash)
+
+def build_dedup_index_entries(results):
+    """
+    Build PersistentDedupIndex entries for processed articles.
+    
+    Args:
+        results: Normalized article results (dicts with id, url, content_hash, clean_title, clean_text, site_name)
+    
+    Returns:
+        list: Entries for PersistentDedupIndex.add_many
+    """
+    return [{
+        'url': result.get('url', ''),
+        'article_id': result.get('id', ''),
+        'content_hash': result.get('content_hash', ''),
+        'title': result.get('clean_title', ''),
+        'text': result.get('clean_text', ''),
+        'source': result.get('site_name', '') or result.get('source_name', '')
+    } for result in results]
+
+def fetch_source_articles(api, source, quota, sugar_search_query, start_date, end_date, topic_ids):
+    """
+    Fetch the articles of one sugar source with its own search.
+    
+    Args:
+        api: OpointAPI instance
+        source: Source dict with 'name' and 'id'
+        quota: Number of articles to request
+        sugar_search_query: Search query built by build_search_query
+        start_date: Start date for fetching articles
+        end_date: End date for fetching articles
+        topic_ids: List of topic IDs to search (MEDIA_TOPIC_IDs)
+    
+    Returns:
+        pd.DataFrame: Raw search results
+    
+    Raises:
+        requests.exceptions.RequestException: If the search fails, so that a failed source is
+            not mistaken for one without new articles
+    """
+    # CRITICAL FIX: Implement DOUBLE FILTERING by both MEDIA_ID and MEDIA_TOPIC_ID
+    # Use source ID directly with site_id parameter to ensure only articles with matching MEDIA_ID are processed
+    # AND explicitly pass media_topic_ids to ensure only articles with matching MEDIA_TOPIC_ID are returned
+    if source['id']:
+        # Ensure site_id is passed as string to match API's expected format
+        site_id_str = str(source['id'])
+        # Silently use site_id
         pass
-        
-        # === STEP 1: Fetch articles from sugar sources ONLY ===
-        # Silently start step 1
+            
+        with PIPELINE_METRICS.time('fetch') as fetch_timer:
+            results = api.search_articles(
+                site_id=site_id_str,
+                search_text=sugar_search_query,
+                num_articles=quota,  # Use enhanced quota
+                min_score=0.77,
+                start_date=start_date,
+                end_date=end_date,
+                media_topic_ids=topic_ids,  # CRITICAL: Explicitly pass MEDIA_TOPIC_IDs for double filtering
+                timeout=30,  # 30 second timeout
+                raise_errors=True
+            )
+            fetch_timer.items = len(results)
+    else:
+        # Fallback to source name if ID is not available
+        with PIPELINE_METRICS.time('fetch') as fetch_timer:
+            results = api.search_site_and_articles(
+                site_name=None,
+                search_text=sugar_search_query,
+                source=source['name'],
+                num_articles=quota,  # Use enhanced quota
+                min_score=0.77,
+                start_date=start_date,
+                end_date=end_date,
+                media_topic_ids=topic_ids,  # CRITICAL: Explicitly pass MEDIA_TOPIC_IDs for double filtering
+                timeout=30,  # 30 second timeout
+                raise_errors=True
+            )
+            fetch_timer.items = len(results)
+    PIPELINE_METRICS.increment('api_requests')
+    return results
+
+def has_valid_media_topic(article_topics, topic_ids):
+    """
+    Check whether any of an article's topics is one of the searched MEDIA_TOPIC_IDs.
+    
+    Args:
+        article_topics: Topics of the article, a list of topic dicts or IDs, or its JSON encoding
+        topic_ids: List of topic IDs searched (MEDIA_TOPIC_IDs)
+    
+    Returns:
+        bool: True if the article has a matching topic
+    """
+    if isinstance(article_topics, str):
+        # Try to parse as JSON if it's a string
+        try:
+            import json
+            article_topics = json.loads(article_topics)
+        except:
+            article_topics = []
+    
+    # Check if any of the article's topic IDs match our MEDIA_TOPIC_IDs
+    if isinstance(article_topics, list):
+        for topic in article_topics:
+            if isinstance(topic, dict) and 'id' in topic:
+                if str(topic['id']) in topic_ids:
+                    return True
+            elif isinstance(topic, str):
+                if topic in topic_ids:
+                    return True
+    return False
+
+def validate_source_results(results, source, topic_ids, watermark_updates=None):
+    """
+    Validate the DOUBLE FILTERING of one source's search results.
+    
+    Args:
+        results: Raw search results of the source
+        source: Source dict with 'name' and 'id'
+        topic_ids: List of topic IDs to search (MEDIA_TOPIC_IDs)
+        watermark_updates: Incremental mode - dict filled with source name -> newest fetched unix timestamp (optional)
+    
+    Returns:
+        pd.DataFrame: Articles that passed the MEDIA_ID and MEDIA_TOPIC_ID double filter
+    """
+    # CRITICAL FIX: Validate DOUBLE FILTERING - ensure articles have both correct MEDIA_ID and MEDIA_TOPIC_ID
+    # The API now performs double filtering at the server level, but we validate the results here
+    # First filter: Check if articles have the correct MEDIA_ID (source ID)
+    if 'id_site' in results.columns:
+        # CRITICAL FIX: Handle type mismatch - API returns strings, config has integers
+        # Convert both to strings for comparison
+        expected_id = str(source['id'])
+        media_id_filtered = results[results['id_site'].astype(str) == expected_id].copy()
+        # Silently validate MEDIA_ID
         pass
-        # Silently start step 1
+    else:
+        # If id_site column is not available, assume all articles are from the correct source
+        media_id_filtered = results.copy()
+        # Silently handle missing id_site column
         pass
         
-        sugar_results = []
-        
-        # Process only the 27 predefined sugar sources
-        # Silently process sugar sources
+    # Incremental mode: remember the newest article fetched for this source
+    if watermark_updates is not None:
+        newest = get_newest_published_timestamp(media_id_filtered)
+        if newest is not None:
+            watermark_updates[source['name']] = max(newest, watermark_updates.get(source['name'], newest))
+        
+    # Second filter: Validate that articles have the correct MEDIA_TOPIC_ID
+    # This is a validation step since the API should have already filtered by MEDIA_TOPIC_ID
+    # But we add additional validation to ensure double filtering worked correctly
+    if 'topics' in results.columns or 'topic_ids' in results.columns:
+        # If topic information is available, validate by MEDIA_TOPIC_ID
+        topic_column = 'topics' if 'topics' in results.columns else 'topic_ids'
+        validated_results = []
+            
+        for _, article in media_id_filtered.iterrows():
+            if has_valid_media_topic(article.get(topic_column, []), topic_ids):
+                validated_results.append(article)
+            
+        validated_df = pd.DataFrame(validated_results)
+        # Silently validate MEDIA_TOPIC_ID
         pass
-        # Silently process sugar sources
+    else:
+        # If topic information is not available in the results, assume the API filtered correctly
+        validated_df = media_id_filtered.copy()
+        # Silently handle missing topic information
         pass
         
-        for source in ALL_SUGAR_SOURCES_27:
-            # Get enhanced dynamic quota for this source
-            source_quota = sugar_source_quotas.get(source['name'], 10)  # Default to 10 if not found
+    return validated_df
+
+def stream_source_articles(api, source, quota, sugar_search_query, start_date, end_date, topic_ids,
+                           watermark_updates=None):
+    """
+    Stream the articles of one sugar source, applying the DOUBLE FILTERING to each article.
+    
+    The streaming counterpart of fetch_source_articles + validate_source_results: articles are
+    parsed from the response as it arrives (OpointAPI.iter_articles) and yielded one at a time,
+    without building a DataFrame of the whole search result.
+    
+    Args:
+        api: OpointAPI instance that supports streaming
+        source: Source dict with 'name' and a site 'id'
+        quota: Number of articles to request
+        sugar_search_query: Search query built by build_search_query
+        start_date: Start date for fetching articles
+        end_date: End date for fetching articles
+        topic_ids: List of topic IDs to search (MEDIA_TOPIC_IDs)
+        watermark_updates: Incremental mode - dict filled with source name -> newest fetched unix timestamp,
+            once the whole response has been read without error (optional)
+    
+    Yields:
+        dict: Articles that passed the MEDIA_ID and MEDIA_TOPIC_ID double filter
+    
+    Returns:
+        int: Number of articles returned by the search
+    
+    Raises:
+        Request and parse errors of the search, so a truncated source is not taken for a complete one
+    """
+    expected_id = str(source['id'])
+    records = iter(api.iter_articles(
+        site_id=expected_id,
+        search_text=sugar_search_query,
+        num_articles=quota,  # Use enhanced quota
+        min_score=0.77,
+        start_date=start_date,
+        end_date=end_date,
+        media_topic_ids=topic_ids,  # CRITICAL: Explicitly pass MEDIA_TOPIC_IDs for double filtering
+        timeout=30,  # 30 second timeout
+        raise_errors=True
+    ))
+    fetched = 0
+    passed = 0
+    fetch_seconds = 0.0
+    newest = None
+    try:
+        while True:
+            # Only the time spent waiting for the response counts as fetch time
+            started = time.perf_counter()
+            article = next(records, None)
+            fetch_seconds += time.perf_counter() - started
+            if article is None:
+                break
+            fetched += 1
             
+            # First filter: MEDIA_ID (the API returns strings, the config has integers)
+            if 'id_site' in article and str(article['id_site']) != expected_id:
+                continue
+            if watermark_updates is not None:
+                timestamp = get_article_timestamp(article)
+                if timestamp is not None:
+                    newest = timestamp if newest is None else max(newest, timestamp)
+            
+            # Second filter: MEDIA_TOPIC_ID, when topic information is available
+            topic_column = 'topics' if 'topics' in article else 'topic_ids' if 'topic_ids' in article else None
+            if topic_column is not None and not has_valid_media_topic(article[topic_column], topic_ids):
+                continue
+            passed += 1
+            yield article
+        # Only a source that was read to the end advances its watermark
+        if newest is not None:
+            watermark_updates[source['name']] = max(newest, watermark_updates.get(source['name'], newest))
+    finally:
+        PIPELINE_METRICS.observe('fetch', fetch_seconds, items=fetched)
+        PIPELINE_METRICS.increment('api_requests')
+        PIPELINE_METRICS.increment('quota_allocated', quota)
+        PIPELINE_METRICS.increment('api_results', fetched)
+        PIPELINE_METRICS.increment('quota_fetched', passed)
+    return fetched
+
+def iter_sugar_source_articles(api, sugar_search_query, sugar_source_quotas, start_date, end_date, topic_ids,
+                               source_watermarks=None, watermark_updates=None, query_planner=None,
+                               stream_records=False, failed_sources=None):
+    """
+    Fetch articles from the 27 predefined sugar sources.
+    
+    Without a query planner every source gets its own search. With a SourceQueryPlanner, sources
+    are searched in OR-ed site: groups and the results are split back per source; only sources
+    that overflow their group are searched one at a time.
+    
+    Yields each source's validated results as soon as they arrive, so callers can start
+    processing before every source has been fetched. Errors for a single source are logged and
+    recorded in failed_sources, and the remaining sources are still fetched. A failed group is
+    searched again one source at a time.
+    
+    With stream_records, single articles are yielded instead of DataFrames, and the sources
+    searched one at a time are streamed from the response as it is parsed (if the API supports
+    streaming) instead of being decoded and converted to a DataFrame first.
+    
+    Args:
+        api: OpointAPI instance
+        sugar_search_query: Search query built by build_search_query
+        sugar_source_quotas: Mapping of source name to number of articles to request
+        start_date: Start date for fetching articles
+        end_date: End date for fetching articles
+        topic_ids: List of topic IDs to search (MEDIA_TOPIC_IDs)
+        source_watermarks: Incremental mode - mapping of source name to newest article already fetched (optional)
+        watermark_updates: Incremental mode - dict filled with source name -> newest fetched unix timestamp (optional)
+        query_planner: SourceQueryPlanner for grouped searches (optional)
+        stream_records: Yield article dicts instead of one DataFrame per source
+        failed_sources: List filled with the names of the sources whose fetch failed (optional)
+    
+    Yields:
+        pd.DataFrame or dict: Articles of one source (or single articles with stream_records) that
+            passed the MEDIA_ID and MEDIA_TOPIC_ID double filter
+    """
+    sources = []
+    source_quotas = {}
+    source_start_dates = {}
+    for source in ALL_SUGAR_SOURCES_27:
+        # Get enhanced dynamic quota for this source
+        source_quotas[source['name']] = sugar_source_quotas.get(source['name'], 10)  # Default to 10 if not found
+        
+        # Incremental mode: only request articles newer than this source's high-water mark
+        source_start_date = start_date
+        if source_watermarks and source['name'] in source_watermarks:
+            source_start_date = max(start_date, source_watermarks[source['name']] + timedelta(seconds=1))
+            if source_start_date > end_date:
+                continue
+        source_start_dates[source['name']] = source_start_date
+        sources.append(source)
+    
+    def validated(source, results):
+        PIPELINE_METRICS.increment('quota_allocated', source_quotas[source['name']])
+        PIPELINE_METRICS.increment('api_results', len(results))
+        if results.empty:
+            PIPELINE_METRICS.record_source(source['name'], quota_allocated=source_quotas[source['name']], quota_fetched=0)
+            return None
+        validated_df = validate_source_results(results, source, topic_ids, watermark_updates)
+        PIPELINE_METRICS.increment('quota_fetched', len(validated_df))
+        PIPELINE_METRICS.record_source(source['name'], quota_allocated=source_quotas[source['name']],
+                                       quota_fetched=len(validated_df))
+        return validated_df if not validated_df.empty else None
+    
+    def emit(validated_df):
+        if stream_records:
+            yield from validated_df.to_dict('records')
+        else:
+            yield validated_df
+    
+    streaming = stream_records and getattr(api, 'SUPPORTS_STREAMING', False) is True
+    
+    individual_sources = sources
+    if query_planner is not None:
+        individual_sources = [source for source in sources if not source['id']]
+        groups = query_planner.plan([source for source in sources if source['id']], source_quotas, source_start_dates)
+        for group in groups:
             try:
-                # Silently make API call
-                pass
-                # CRITICAL FIX: Implement DOUBLE FILTERING by both MEDIA_ID and MEDIA_TOPIC_ID
-                # Use source ID directly with site_id parameter to ensure only articles with matching MEDIA_ID are processed
-                # AND explicitly pass media_topic_ids to ensure only articles with matching MEDIA_TOPIC_ID are returned
-                if source['id']:
-                    # Ensure site_id is passed as string to match API's expected format
-                    site_id_str = str(source['id'])
-                    # Silently use site_id
-                    pass
-                    
-                    results = api.search_articles(
-                        site_id=site_id_str,
-                        search_text=sugar_search_query,
-                        num_articles=source_quota,  # Use enhanced quota
-                        min_score=0.77,
-                        start_date=start_date,
-                        end_date=end_date,
-                        media_topic_ids=topic_ids,  # CRITICAL: Explicitly pass MEDIA_TOPIC_IDs for double filtering
-                        timeout=30  # 30 second timeout
-                    )
-                else:
-                    # Fallback to source name if ID is not available
-                    results = api.search_site_and_articles(
-                        site_name=None,
+                requests_before = query_planner.stats['requests']
+                with PIPELINE_METRICS.time('fetch') as fetch_timer:
+                    group_results, overflow = query_planner.fetch_group(
+                        api, group, end_date,
                         search_text=sugar_search_query,
-                        source=source['name'],
-                        num_articles=source_quota,  # Use enhanced quota
                         min_score=0.77,
-                        start_date=start_date,
-                        end_date=end_date,
                         media_topic_ids=topic_ids,  # CRITICAL: Explicitly pass MEDIA_TOPIC_IDs for double filtering
-                        timeout=30  # 30 second timeout
+                        timeout=30,  # 30 second timeout
+                        raise_errors=True
                     )
-                
-                if not results.empty:
-                    # CRITICAL FIX: Validate DOUBLE FILTERING - ensure articles have both correct MEDIA_ID and MEDIA_TOPIC_ID
-                    # The API now performs double filtering at the server level, but we validate the results here
-                    # First filter: Check if articles have the correct MEDIA_ID (source ID)
-                    if 'id_site' in results.columns:
-                        # CRITICAL FIX: Handle type mismatch - API returns strings, config has integers
-                        # Convert both to strings for comparison
-                        expected_id = str(source['id'])
-                        media_id_filtered = results[results['id_site'].astype(str) == expected_id].copy()
-                        # Silently validate MEDIA_ID
-                        pass
-                    else:
-                        # If id_site column is not available, assume all articles are from the correct source
-                        media_id_filtered = results.copy()
-                        # Silently handle missing id_site column
-                        pass
-                    
-                    # Second filter: Validate that articles have the correct MEDIA_TOPIC_ID
-                    # This is a validation step since the API should have already filtered by MEDIA_TOPIC_ID
-                    # But we add additional validation to ensure double filtering worked correctly
-                    if 'topics' in results.columns or 'topic_ids' in results.columns:
-                        # If topic information is available, validate by MEDIA_TOPIC_ID
-                        topic_column = 'topics' if 'topics' in results.columns else 'topic_ids'
-                        validated_results = []
-                        
-                        for _, article in media_id_filtered.iterrows():
-                            article_topics = article.get(topic_column, [])
-                            if isinstance(article_topics, str):
-                                # Try to parse as JSON if it's a string
-                                try:
-                                    import json
-                                    article_topics = json.loads(article_topics)
-                                except:
-                                    article_topics = []
-                            
-                            # Check if any of the article's topic IDs match our MEDIA_TOPIC_IDs
-                            has_valid_topic = False
-                            if isinstance(article_topics, list):
-                                for topic in article_topics:
-                                    if isinstance(topic, dict) and 'id' in topic:
-                                        topic_id = str(topic['id'])
-                                        if topic_id in topic_ids:
-                                            has_valid_topic = True
-                                            break
-                                    elif isinstance(topic, str):
-                                        if topic in topic_ids:
-                                            has_valid_topic = True
-                                            break
-                            
-                            if has_valid_topic:
-                                validated_results.append(article)
-                        
-                        validated_df = pd.DataFrame(validated_results)
-                        # Silently validate MEDIA_TOPIC_ID
-                        pass
-                    else:
-                        # If topic information is not available in the results, assume the API filtered correctly
-                        validated_df = media_id_filtered.copy()
-                        # Silently handle missing topic information
-                        pass
-                    
-                    if not validated_df.empty:
-                        sugar_results.append(validated_df)
-                        # Silently handle found articles
-                        pass
-                        # Silently handle found articles
-                        pass
-                    else:
-                        # Silently handle no articles passing filter
-                        pass
-                        # Silently handle no articles passing filter
-                        pass
-                else:
-                    # Silently handle no articles found
-                    pass
-                    # Silently handle no articles found
-                    pass
+                    fetch_timer.items = sum(len(results) for results in group_results.values())
+                PIPELINE_METRICS.increment('api_requests', query_planner.stats['requests'] - requests_before)
             except Exception as e:
-                # Silently handle fetch error
-                pass
-                # Silently handle fetch error
-                pass
+                PIPELINE_METRICS.increment('fetch_errors')
+                logger.error(f"Failed to fetch source group {[source['name'] for source in group.sources]}: {e}")
+                # Fall back to one search per source for this group
+                overflow = group.sources
+                group_results = {}
+            
+            for source in group.sources:
+                if source['name'] in group_results:
+                    validated_df = validated(source, group_results[source['name']])
+                    if validated_df is not None:
+                        yield from emit(validated_df)
+            individual_sources = individual_sources + list(overflow)
+    
+    for source in individual_sources:
+        try:
+            if streaming and source['id']:
+                fetched = yield from stream_source_articles(
+                    api, source, source_quotas[source['name']], sugar_search_query,
+                    source_start_dates[source['name']], end_date, topic_ids, watermark_updates
+                )
+                if query_planner is not None:
+                    query_planner.record_yield(source['name'], fetched)
+                continue
+            results = fetch_source_articles(
+                api, source, source_quotas[source['name']], sugar_search_query,
+                source_start_dates[source['name']], end_date, topic_ids
+            )
+            if query_planner is not None:
+                query_planner.record_yield(source['name'], len(results))
+            validated_df = validated(source, results)
+            if validated_df is not None:
+                yield from emit(validated_df)
+        except Exception as e:
+            PIPELINE_METRICS.increment('fetch_errors')
+            logger.error(f"Failed to fetch articles from {source['name']}: {e}")
+            if failed_sources is not None:
+                failed_sources.append(source['name'])
+
+def fetch_sugar_articles_for_period(api_key, start_date, end_date, topic_ids, max_articles=30000, normalization_pipeline=None, global_dedup_cache=None,
+                                    response_cache=None, response_cache_mode='readwrite',
+                                    source_watermarks=None, watermark_updates=None, dedup_index=None,
+                                    article_processor=None, query_planner=None):
+    """
+    Fetch and process sugar news articles for a given period and topic IDs.
+    Returns a DataFrame of structured, filtered articles.
+    
+    CRITICAL: Implements DOUBLE FILTERING by both MEDIA_ID and MEDIA_TOPIC_ID:
+    1. Articles must be from one of the 27 predefined sugar sources (matching MEDIA_ID)
+    2. Articles must have one of the predefined MEDIA_TOPIC_IDs
+    3. Only articles that pass BOTH filters are processed further
+    
+    ENHANCED: Double filtering is now implemented at the API level for maximum efficiency:
+    - MEDIA_ID filtering: Uses site_id parameter in API calls
+    - MEDIA_TOPIC_ID filtering: Uses media_topic_ids parameter in API calls
+    - Additional validation is performed on returned results to ensure double filtering worked correctly
+    
+    CRITICAL FIX: Enhanced deduplication to prevent processing same articles across different topic IDs:
+    - Global deduplication cache now persists across all topic ID processing calls
+    - Content hash generation includes source information for better accuracy
+    - Similarity checking prevents near-duplicates from different sources
+    
+    Simplified to exclusively fetch from 27 predefined sugar sources with matching MEDIA_IDs.
+    All quota allocated to the 27 predefined sugar sources only.
+    Uses simplified triage filter focused on sugar-related keywords only.
+    Context zones, structured pricing, and name-entity recognition are used only for metadata extraction.
+    
+    Args:
+        api_key: Opoint API key
+        start_date: Start date for fetching articles
+        end_date: End date for fetching articles
+        topic_ids: List of topic IDs to search (MEDIA_TOPIC_IDs)
+        max_articles: Maximum number of articles to fetch
+        normalization_pipeline: Language normalization pipeline
+        global_dedup_cache: Global cache for cross-topic deduplication (optional)
+        response_cache: OpointResponseCache for raw search responses (optional)
+        response_cache_mode: How the response cache is used ('readwrite', 'refresh' or 'replay')
+        source_watermarks: Incremental mode - mapping of source name to the newest published article
+            already fetched for these topic IDs; only the delta after it is requested (optional)
+        watermark_updates: Incremental mode - dict filled with source name -> unix timestamp of the
+            newest article fetched in this call, to be committed once the results are saved (optional)
+        dedup_index: PersistentDedupIndex of articles saved by earlier months and runs (optional)
+        article_processor: ArticleProcessPool that processes the articles on several cores (optional)
+        query_planner: SourceQueryPlanner that searches the sources in grouped requests (optional)
+    """
+    global request_counter
+    with request_lock:
+        request_counter += 1
+        current_request_id = request_counter
+    
+    # CRITICAL FIX: Initialize global deduplication cache if not provided with enhanced structure
+    global_dedup_cache = ensure_global_dedup_cache(global_dedup_cache, start_date)
+    
+    # Acquire semaphore to limit concurrent API requests
+    acquired = active_requests.acquire(timeout=60)  # Wait up to 60 seconds for a slot
+    if not acquired:
+        raise Exception("Timeout waiting for available API request slot")
+    
+    try:
+        api = OpointAPI(api_key=api_key, cache=response_cache, cache_mode=response_cache_mode)
+        
+        # Build search query for the 27 predefined sugar sources
+        sugar_search_query = build_search_query(
+            topic_ids,
+            SUGAR_CONFIG['person_entities'],
+            SUGAR_CONFIG['company_entities'],
+            ALL_SUGAR_SOURCE_NAMES_27
+        )
+        
+        # Calculate dynamic quota allocation for the 27 predefined sugar sources - now using ALL quota
+        sugar_source_quotas = calculate_source_quotas(max_articles, SUGAR_SOURCES)  # Use ALL of max_articles for the 27 sugar sources
+        
+        # === STEP 1: Fetch articles from sugar sources ONLY ===
+        # Quota allocated and fetched per source is recorded in PIPELINE_METRICS as the sources are searched
+        sugar_results = list(iter_sugar_source_articles(
+            api, sugar_search_query, sugar_source_quotas, start_date, end_date, topic_ids,
+            source_watermarks=source_watermarks, watermark_updates=watermark_updates,
+            query_planner=query_planner
+        ))
         
         # Combine sugar results
         if sugar_results:
             all_results = pd.concat(sugar_results, ignore_index=True)
-            # Silently handle total articles
-            pass
-            # Silently handle total articles
-            pass
         else:
-            all_results = pd.DataFrame()
             logger.info(f"[Request-{current_request_id}] No articles found from sugar sources")
-            # Silently handle no articles found
-            pass
             return pd.DataFrame()
 
         # === STEP 2: Apply normalization and triage pipeline to sugar articles only ===
-        # Silently start step 2
-        pass
-        # Silently start step 2
-        pass
-        
         structured_articles = []
         triage_passed_count = 0
         triage_failed_count = 0
@@ -1883,286 +2426,575 @@ def fetch_sugar_articles_for_period(api_key, start_date, end_date, topic_ids, ma
         
         # CRITICAL FIX: Enhanced deduplication with global cache and URL tracking
         # First pass: Normalize all articles and generate hashes for better deduplication
-        normalized_articles = []
+        candidate_articles = []
         for _, article in all_results.iterrows():
             # CRITICAL FIX: Check URL-based deduplication first (most reliable)
-            article_url = article.get('url', '').strip()
-            if article_url and article_url in global_dedup_cache['seen_urls']:
-                # Silently handle URL duplicate
-                pass
+            if is_duplicate_url(article.get('url', ''), global_dedup_cache, dedup_index):
                 duplicates_removed_count += 1
-                global_dedup_cache['cache_stats']['url_duplicates'] += 1
-                global_dedup_cache['cache_stats']['total_duplicates_prevented'] += 1
                 continue
-            
-            # Normalize the article for better deduplication
-            result = normalize_and_filter_article(article, normalization_pipeline)
-            if result:
-                # Generate content hash using normalized content for better accuracy
-                title = result.get('clean_title', '')
-                text = result.get('clean_text', '')
-                source = result.get('site_name', '') or result.get('source_name', '')
-                content_hash = generate_content_hash(title, text, source)
-                
-                # Store normalized article with hash and URL
-                normalized_articles.append({
-                    'result': result,
-                    'content_hash': content_hash,
-                    'title': title,
-                    'text': text,
-                    'source': source,
-                    'article_id': result.get('id', ''),
-                    'url': article_url  # CRITICAL: Store URL for deduplication
-                })
+            candidate_articles.append(article)
+        
+        # Normalize the articles for better deduplication, on several cores if a process pool is given
+        if article_processor is not None:
+            entries = article_processor.process(candidate_articles, normalization_pipeline)
+        else:
+            entries = [build_dedup_entry(article, normalization_pipeline) for article in candidate_articles]
+        normalized_articles = [entry for entry in entries if entry]
         
         # Second pass: Apply enhanced deduplication with global cache
-        max_similarity_check = 5000  # Sliding window size for similarity checking
-        
-        for article_data in normalized_articles:
-            content_hash = article_data['content_hash']
-            title = article_data['title']
-            text = article_data['text']
-            source = article_data['source']
-            result = article_data['result']
-            article_id = article_data['article_id']
-            article_url = article_data['url']
-            
-            # CRITICAL FIX: Check global deduplication cache first (multiple layers)
-            # 1. Check content hash (most reliable for exact duplicates)
-            if content_hash in global_dedup_cache['seen_content_hashes']:
-                # Silently handle content hash duplicate
-                pass
-                duplicates_removed_count += 1
-                global_dedup_cache['cache_stats']['cache_hits'] += 1
-                global_dedup_cache['cache_stats']['total_duplicates_prevented'] += 1
-                continue
-                
-            # 2. Check article ID (backup for content hash)
-            if article_id in global_dedup_cache['seen_article_ids']:
-                # Silently handle article ID duplicate
-                pass
+        for entry in normalized_articles:
+            result = register_unique_article(entry, global_dedup_cache, dedup_index=dedup_index)
+            if result is None:
                 duplicates_removed_count += 1
-                global_dedup_cache['cache_stats']['cache_hits'] += 1
-                global_dedup_cache['cache_stats']['total_duplicates_prevented'] += 1
                 continue
             
-            # 3. Check for similar content with globally processed articles
-            is_duplicate = False
-            # Use global cache for similarity checking
-            recent_articles = global_dedup_cache['processed_articles'][-max_similarity_check:] if len(global_dedup_cache['processed_articles']) > max_similarity_check else global_dedup_cache['processed_articles']
-            
-            for processed_article in recent_articles:
-                global_dedup_cache['cache_stats']['similarity_checks'] += 1
-                if is_similar_content(
-                    title, text, source,
-                    processed_article['title'], processed_article['text'], processed_article['source']
-                ):
-                    is_duplicate = True
-                    # Silently handle similarity duplicate
-                    pass
-                    duplicates_removed_count += 1
-                    global_dedup_cache['cache_stats']['similarity_duplicates'] += 1
-                    global_dedup_cache['cache_stats']['total_duplicates_prevented'] += 1
-                    break
-            
-            if is_duplicate:
-                continue
-            
-            # CRITICAL FIX: Add to global deduplication cache (multiple layers)
-            global_dedup_cache['seen_content_hashes'].add(content_hash)
-            global_dedup_cache['seen_article_ids'].add(article_id)
-            if article_url:  # Only add non-empty URLs
-                global_dedup_cache['seen_urls'].add(article_url)
-            global_dedup_cache['cache_stats']['total_hashes_added'] += 1
-            global_dedup_cache['cache_stats']['cache_misses'] += 1
-            
-            # Store article info for global similarity checking
-            global_dedup_cache['processed_articles'].append({
-                'title': title,
-                'text': text,
-                'source': source
-            })
-            
-            # Periodically clean up old articles to prevent memory buildup
-            if len(global_dedup_cache['processed_articles']) > max_similarity_check * 2:
-                global_dedup_cache['processed_articles'] = global_dedup_cache['processed_articles'][-max_similarity_check:]
-                # Silently clean up cache
-                pass
-            
-            # Add the normalized result to structured articles
-            result['content_hash'] = content_hash
             structured_articles.append(result)
             
-            # Track triage filter results with enhanced logging
-            if result.get('triage_passed', False):
+            # Track triage filter results, overall and per source
+            passed = bool(result.get('triage_passed', False))
+            if passed:
                 triage_passed_count += 1
-                # Silently handle article passing triage
-                pass
             else:
                 triage_failed_count += 1
-                # Silently handle article failing triage
-                pass
+            PIPELINE_METRICS.record_source(result.get('site_name', ''), processed=1, sugar=int(passed))
+        
+        # Article splitting statistics (parts_per_split_article ratio)
+        split_articles = [article for article in structured_articles if article.get('article_split', False)]
+        PIPELINE_METRICS.add_counters({
+            'fetched': len(all_results),
+            'processed': triage_passed_count + triage_failed_count,
+            'sugar': triage_passed_count,
+            'general': triage_failed_count,
+            'duplicates': duplicates_removed_count,
+            'split_articles': len(split_articles),
+            'split_parts': sum(article.get('split_parts', 1) for article in split_articles)
+        })
 
         if not structured_articles:
-            # Silently handle no articles processed
-            pass
-            # Silently handle no articles processed
-            pass
             return pd.DataFrame()
 
-        # Log triage filter statistics
-        # Silently display triage filter results
-        pass
-        
-        # Log article splitting statistics
-        split_articles = [article for article in structured_articles if article.get('article_split', False)]
-        if split_articles:
-            # Silently display article splitting statistics
-            pass
-            
-            total_parts = sum(article.get('split_parts', 1) for article in split_articles)
-            avg_parts_per_article = total_parts / len(split_articles) if split_articles else 0
-            
-            # Silently display parts statistics
-            pass
-            
-            # Log split articles that passed the filter
-            split_passed = [article for article in split_articles if article.get('triage_passed', False)]
-            if split_passed:
-                # Silently display split articles that passed
-                pass
-                
-                # Show details of split articles that passed
-                for article in split_passed[:5]:  # Show first 5
-                    title = article.get('clean_title', 'No title')[:80]
-                    parts = article.get('split_parts', 1)
-                    passed_parts = article.get('parts_passed', 0)
-                    # Silently display split article details
-                    pass
-                
-                if len(split_passed) > 5:
-                    # Silently display remaining split articles
-                    pass
-            else:
-                # Silently handle no split articles passing
-                pass
-
-        # Report ACTUAL deduplication statistics
-        original_count = len(all_results)
         after_deduplication_count = len(structured_articles)
-        # Silently display deduplication statistics
-        pass
-        if duplicates_removed_count > 0:
-            # Silently display deduplication details
-            pass
-            
-            # Report detailed cache statistics
-            cache_stats = global_dedup_cache.get('cache_stats', {})
-            if cache_stats:
-                # Silently display cache performance statistics
-                pass
-                
-                # Calculate cache hit rate
-                total_cache_operations = cache_stats.get('cache_hits', 0) + cache_stats.get('cache_misses', 0)
-                if total_cache_operations > 0:
-                    hit_rate = (cache_stats.get('cache_hits', 0) / total_cache_operations) * 100
-                    # Silently display cache hit rate
-                    pass
-                
-                # Calculate similarity detection rate
-                similarity_checks = cache_stats.get('similarity_checks', 0)
-                if similarity_checks > 0:
-                    similarity_detection_rate = (cache_stats.get('similarity_duplicates', 0) / similarity_checks) * 100
-                    # Silently display similarity detection rate
-                    pass
-        else:
-            # Silently handle no duplicates
-            pass
 
         # Convert to DataFrame
         df_structured = pd.DataFrame(structured_articles)
 
         # Apply source filtering to sugar articles only
-        # Silently start step 3
-        pass
-        # Silently start step 3
-        pass
-        df_structured = filter_trusted_sources(df_structured, verbose=True)
+        with PIPELINE_METRICS.time('source_filter', items=len(df_structured)):
+            df_structured = filter_trusted_sources(df_structured, verbose=True)
 
         # Report source filtering statistics (separate from deduplication)
         after_source_filtering_count = len(df_structured)
         source_filtered_count = after_deduplication_count - after_source_filtering_count
-        if source_filtered_count > 0:
-            # Silently display source filtering statistics
-            pass
-
-        # Log source distribution - only the 27 predefined sugar sources
-        if not df_structured.empty:
-            sugar_source_articles = df_structured[df_structured['site_name'].isin(ALL_SUGAR_SOURCE_NAMES_27)]
-            sugar_source_count = len(sugar_source_articles)
-            
-            # Silently display source distribution analysis
-            pass
-            
-            # Special logging for the 27 sugar sources
-            if sugar_source_count > 0:
-                # Silently display sugar sources analysis
-                pass
-                
-                # Group by sugar source name
-                sugar_sources_grouped = sugar_source_articles.groupby('site_name').size().sort_values(ascending=False)
-                for source, count in sugar_sources_grouped.items():
-                    # Calculate percentage of sugar articles that passed triage for this source
-                    passed_triage = len(sugar_source_articles[(sugar_source_articles['site_name'] == source) &
-                                                             (sugar_source_articles['asset'] == 'Sugar')])
-                    pass_rate = (passed_triage / count) * 100 if count > 0 else 0
-                    
-                    # Get quota and reliability information for this source
-                    allocated_quota = sugar_source_quotas.get(source, 0)
-                    reliability = SOURCE_RELIABILITY_SCORES.get(source, 0.5)
-                    category = get_source_category(source, SUGAR_SOURCES)
-                    
-                    # Calculate quota utilization
-                    quota_utilization = (count / allocated_quota * 100) if allocated_quota > 0 else 0
-                    
-                    # Silently display source details
-                    pass
-                
-                # Overall sugar source statistics
-                total_sugar_passed = len(sugar_source_articles[sugar_source_articles['asset'] == 'Sugar'])
-                overall_sugar_pass_rate = (total_sugar_passed / sugar_source_count) * 100 if sugar_source_count > 0 else 0
-                
-                # Calculate overall quota utilization
-                total_allocated_quota = sum(sugar_source_quotas.values())
-                overall_quota_utilization = (sugar_source_count / total_allocated_quota * 100) if total_allocated_quota > 0 else 0
-                
-                # Silently display overall performance
-                pass
-                
-                # Monthly interval analysis
-                month_start = start_date.strftime("%Y-%m-%d")
-                month_end = end_date.strftime("%Y-%m-%d")
-                days_in_month = (end_date - start_date).days + 1
-                # Silently display monthly interval analysis
-                pass
-            
-            # Note: Only the 27 predefined sugar sources are processed
-            # Silently display source selection summary
-            pass
+        PIPELINE_METRICS.increment('source_filtered', source_filtered_count)
 
-        # Silently complete processing
-        pass
         return df_structured
     
-    except Exception as e:
-        # Silently handle exception
-        pass
-        raise
     finally:
         # Always release the semaphore
         active_requests.release()
-        # Silently release semaphore
-        pass
+
+class TopicComplete:
+    """Pipeline marker emitted after the last article of a successfully fetched topic"""
+    __slots__ = ('topic_id',)
+    
+    def __init__(self, topic_id):
+        self.topic_id = topic_id
+
+def run_month_pipeline(api_key, start_date, end_date, topic_ids, max_articles, normalization_pipeline, search_metadata,
+                       global_dedup_cache=None, save=True, response_cache=None, response_cache_mode='readwrite',
+                       source_watermarks_by_topic=None, watermark_updates_by_topic=None,
+                       queue_size=256, save_batch_size=200, max_memory_mb=4000, topic_delay=0.5,
+                       checkpoint_store=None, skip_topic_ids=None, dedup_index=None, article_processor=None,
+                       query_planner=None, rate_limiter=None):
+    """
+    Fetch, normalize, triage, deduplicate and save one period as a streaming pipeline.
+    
+    Unlike fetch_sugar_articles_for_period, which returns every processed article of a period,
+    articles flow through bounded queues between the stages:
+    
+        fetch (per topic, per source) -> normalize + triage -> dedup -> save (batched)
+    
+    A slow stage blocks the stages before it, so memory stays bounded by queue_size and
+    save_batch_size instead of growing with the period, and the first batches are saved
+    while later topics are still being fetched. Only counters are kept for the summary.
+    
+    Args:
+        api_key: Opoint API key
+        start_date: Start date for fetching articles
+        end_date: End date for fetching articles
+        topic_ids: Topic IDs (MEDIA_TOPIC_IDs) to fetch, one search per topic as in main()
+        max_articles: Maximum number of articles per topic
+        normalization_pipeline: Language normalization pipeline
+        search_metadata: Search metadata passed to save_to_database
+        global_dedup_cache: Cross-topic deduplication cache (optional, created if not provided)
+        save: Whether to save sugar articles to the database (False for dry runs)
+        response_cache: OpointResponseCache for raw search responses (optional)
+        response_cache_mode: How the response cache is used ('readwrite', 'refresh' or 'replay')
+        source_watermarks_by_topic: Incremental mode - topic ID -> {source name: newest fetched datetime} (optional)
+        watermark_updates_by_topic: Incremental mode - dict filled with topic ID -> {source name: unix timestamp} (optional)
+        queue_size: Maximum number of articles buffered between two stages
+        save_batch_size: Number of deduplicated articles per database save
+        max_memory_mb: Memory limit checked before each topic is fetched
+        topic_delay: Delay in seconds between topics to prevent overwhelming the API
+        checkpoint_store: SegmentCheckpointStore; each topic is written as a segment once all of
+            its articles have been saved (optional)
+        skip_topic_ids: Topic IDs already completed for this period, e.g. when resuming (optional)
+        dedup_index: PersistentDedupIndex; known articles are dropped before normalization and each
+            batch is recorded once it has been saved (optional)
+        article_processor: ArticleProcessPool; the normalize stage then processes batches of
+            articles on several cores (optional)
+        query_planner: SourceQueryPlanner that searches the sources in grouped requests; it learns
+            the expected results per source, so pass the same planner for every month (optional)
+        rate_limiter: Limiter acquired before every Opoint search request, e.g. the
+            SharedRateLimiter of a job queue (optional)
+    
+    Returns:
+        dict: Counters for the period ('fetched', 'processed', 'sugar', 'general', 'url_duplicates',
+            'content_duplicates', 'source_filtered', 'split_articles', 'split_parts', 'saved', 'save_batches',
+            'save_errors', 'completed_topics', 'failed_topics', 'source_errors', 'skipped_topics',
+            'checkpointed_topics') and the pipeline stage
+            statistics under 'pipeline'. A topic with source_errors is neither completed nor checkpointed.
+    """
+    global_dedup_cache = ensure_global_dedup_cache(global_dedup_cache, start_date)
+    counters = {
+        'fetched': 0,
+        'processed': 0,
+        'sugar': 0,
+        'general': 0,
+        'url_duplicates': 0,
+        'content_duplicates': 0,
+        'source_filtered': 0,
+        'split_articles': 0,
+        'split_parts': 0,
+        'saved': 0,
+        'save_batches': 0,
+        'save_errors': 0,
+        'completed_topics': 0,
+        'failed_topics': 0,
+        'source_errors': 0,
+        'skipped_topics': 0,
+        'checkpointed_topics': 0
+    }
+    skip_topic_ids = {str(topic_id) for topic_id in (skip_topic_ids or [])}
+    
+    api = OpointAPI(api_key=api_key, cache=response_cache, cache_mode=response_cache_mode, rate_limiter=rate_limiter)
+    sugar_source_quotas = calculate_source_quotas(max_articles, SUGAR_SOURCES)
+    
+    def fetch_articles():
+        for topic_idx, topic_id in enumerate(topic_ids):
+            if str(topic_id) in skip_topic_ids:
+                counters['skipped_topics'] += 1
+                continue
+            if not check_memory_usage(max_memory_mb=max_memory_mb):
+                cleanup_memory()
+            
+            source_watermarks = (source_watermarks_by_topic or {}).get(topic_id)
+            topic_watermark_updates = None
+            if watermark_updates_by_topic is not None:
+                topic_watermark_updates = watermark_updates_by_topic.setdefault(topic_id, {})
+            
+            acquired = active_requests.acquire(timeout=60)  # Wait up to 60 seconds for a slot
+            if not acquired:
+                logger.error(f"Timeout waiting for available API request slot for topic {topic_id}")
+                counters['failed_topics'] += 1
+                continue
+            try:
+                sugar_search_query = build_search_query(
+                    [topic_id],
+                    SUGAR_CONFIG['person_entities'],
+                    SUGAR_CONFIG['company_entities'],
+                    ALL_SUGAR_SOURCE_NAMES_27
+                )
+                failed_sources = []
+                for article in iter_sugar_source_articles(
+                    api, sugar_search_query, sugar_source_quotas, start_date, end_date, [topic_id],
+                    source_watermarks=source_watermarks, watermark_updates=topic_watermark_updates,
+                    query_planner=query_planner, stream_records=True, failed_sources=failed_sources
+                ):
+                    counters['fetched'] += 1
+                    yield article
+                # The topic is only complete if every source was fetched
+                counters['source_errors'] += len(failed_sources)
+                topic_complete = not failed_sources
+                if failed_sources:
+                    logger.error(f"Topic {topic_id} for {start_date.date()} to {end_date.date()} is incomplete: "
+                                 f"failed to fetch {', '.join(failed_sources)}")
+            except Exception as e:
+                logger.error(f"Failed to fetch topic {topic_id} for {start_date.date()} to {end_date.date()}: {e}")
+                counters['failed_topics'] += 1
+                topic_complete = False
+            finally:
+                active_requests.release()
+            
+            if topic_complete:
+                counters['completed_topics'] += 1
+                yield TopicComplete(topic_id)
+            
+            if topic_idx < len(topic_ids) - 1:
+                time.sleep(topic_delay)  # Delay to prevent overwhelming the system
+    
+    def normalize_article(article):
+        if isinstance(article, TopicComplete):
+            return article
+        # CRITICAL FIX: Check URL-based deduplication first (most reliable)
+        if is_duplicate_url(article.get('url', ''), global_dedup_cache, dedup_index):
+            counters['url_duplicates'] += 1
+            return None
+        return build_dedup_entry(article, normalization_pipeline)
+    
+    def normalize_articles(items):
+        # Batch version of normalize_article for the process pool; markers keep their position
+        outputs = []
+        articles = []
+        for item in items:
+            if isinstance(item, TopicComplete):
+                outputs.append(item)
+            elif is_duplicate_url(item.get('url', ''), global_dedup_cache, dedup_index):
+                counters['url_duplicates'] += 1
+            else:
+                outputs.append(len(articles))
+                articles.append(item)
+        entries = article_processor.process(articles, normalization_pipeline)
+        return [entries[output] if isinstance(output, int) else output for output in outputs]
+    
+    def deduplicate_article(entry):
+        if isinstance(entry, TopicComplete):
+            return entry
+        result = register_unique_article(entry, global_dedup_cache, dedup_index=dedup_index)
+        if result is None:
+            counters['content_duplicates'] += 1
+            return None
+        counters['processed'] += 1
+        passed = result.get('asset') == 'Sugar'
+        if passed:
+            counters['sugar'] += 1
+        else:
+            counters['general'] += 1
+        if result.get('article_split', False):
+            counters['split_articles'] += 1
+            counters['split_parts'] += result.get('split_parts', 1)
+        PIPELINE_METRICS.record_source(result.get('site_name', ''), processed=1, sugar=int(passed))
+        return result
+    
+    pending_rows = []  # Deduplicated articles waiting for the next database save
+    topic_rows = []  # Articles of the current topic, kept for its checkpoint segment
+    topic_state = {'save_failed': False}
+    
+    def flush_pending():
+        if not pending_rows:
+            return
+        batch_rows = list(pending_rows)
+        pending_rows.clear()
+        with PIPELINE_METRICS.time('source_filter', items=len(batch_rows)):
+            batch_df = filter_trusted_sources(pd.DataFrame(batch_rows), verbose=False)
+        counters['source_filtered'] += len(batch_rows) - len(batch_df)
+        if not save:
+            return
+        # Save only articles that passed the triage filter (asset='Sugar')
+        if batch_df.empty or 'asset' not in batch_df.columns:
+            return
+        sugar_df = batch_df[batch_df['asset'] == 'Sugar']
+        if sugar_df.empty:
+            return
+        try:
+            with PIPELINE_METRICS.time('save', items=len(sugar_df)):
+                counters['saved'] += save_to_database(
+                    sugar_df, search_metadata, 'Sugar', dedup_index=dedup_index, filter_sources=False
+                )
+            counters['save_batches'] += 1
+        except Exception as e:
+            counters['save_errors'] += 1
+            topic_state['save_failed'] = True
+            logger.error(f"Failed to save batch of {len(sugar_df)} articles: {e}")
+            return
+        # Only saved articles go into the index: articles the triage or source filter dropped are
+        # fetched and judged again by later runs, so a changed triage rule can still pick them up
+        if dedup_index is not None:
+            try:
+                dedup_index.add_many(build_dedup_index_entries(sugar_df.to_dict('records')))
+            except Exception as e:
+                logger.error(f"Failed to record batch in dedup index: {e}")
+    
+    def save_batch(items):
+        for item in items:
+            if not isinstance(item, TopicComplete):
+                pending_rows.append(item)
+                if checkpoint_store is not None:
+                    topic_rows.append(item)
+                continue
+            
+            # All articles of the topic have arrived: save them, then checkpoint the topic
+            flush_pending()
+            if checkpoint_store is not None and not topic_state['save_failed']:
+                try:
+                    checkpoint_store.write_segment(month_key(start_date), item.topic_id, topic_rows)
+                    counters['checkpointed_topics'] += 1
+                except Exception as e:
+                    logger.error(f"Failed to checkpoint topic {item.topic_id} for {month_key(start_date)}: {e}")
+            topic_rows.clear()
+            topic_state['save_failed'] = False
+        flush_pending()
+        return []
+    
+    if article_processor is not None:
+        normalize_stage = PipelineStage('normalize', normalize_articles, batch_size=article_processor.batch_size)
+    else:
+        normalize_stage = PipelineStage('normalize', normalize_article)
+    pipeline = StreamingPipeline([
+        normalize_stage,
+        PipelineStage('dedup', deduplicate_article),
+        PipelineStage('save', save_batch, batch_size=save_batch_size)
+    ], queue_size=queue_size, name=f"month-{start_date.strftime('%Y-%m')}")
+    try:
+        counters['pipeline'] = pipeline.run(fetch_articles())
+    finally:
+        record_month_metrics(counters, global_dedup_cache)
+    return counters
+
+def record_month_metrics(counters, global_dedup_cache):
+    """
+    Add a month's counters, pipeline statistics and deduplication cache statistics to PIPELINE_METRICS.
+    
+    Args:
+        counters: Counters returned by run_month_pipeline
+        global_dedup_cache: The month's deduplication cache
+    """
+    PIPELINE_METRICS.add_counters(counters)
+    if 'pipeline' in counters:
+        PIPELINE_METRICS.record_pipeline(counters['pipeline'])
+    cache_stats = global_dedup_cache.get('cache_stats', {})
+    PIPELINE_METRICS.record_cache('dedup', cache_stats.get('cache_hits', 0), cache_stats.get('cache_misses', 0))
+    PIPELINE_METRICS.add_counters({
+        'similarity_checks': cache_stats.get('similarity_checks', 0),
+        'similarity_duplicates': cache_stats.get('similarity_duplicates', 0),
+        'persistent_duplicates': cache_stats.get('persistent_duplicates', 0)
+    })
+
+def export_run_metrics(metrics_dir, response_cache=None, normalization_pipeline=None, dedup_index=None):
+    """
+    Add the caches' statistics to PIPELINE_METRICS and write the run's metrics files.
+    
+    Args:
+        metrics_dir: Output directory for the JSON and Prometheus files
+        response_cache: OpointResponseCache (optional)
+        normalization_pipeline: LanguageNormalizationPipeline or NormalizationClient (optional)
+        dedup_index: PersistentDedupIndex (optional)
+    
+    Returns:
+        dict: Paths of the written files, or None if the export failed
+    """
+    if response_cache is not None:
+        stats = response_cache.stats
+        PIPELINE_METRICS.record_cache('opoint_response', stats['hits'], stats['misses'],
+                                      expired=stats['expired'], evictions=stats['evictions'])
+    if dedup_index is not None:
+        stats = dedup_index.stats
+        PIPELINE_METRICS.record_cache('dedup_index', stats['hits'], stats['lookups'] - stats['hits'],
+                                      bloom_negatives=stats['bloom_negatives'])
+    # Local pipelines only; a normalization service keeps its own statistics
+    spell_corrector = getattr(normalization_pipeline, '_spell_corrector', None)
+    if spell_corrector is not None:
+        info = spell_corrector.cache_info()
+        PIPELINE_METRICS.record_cache('spelling', info.hits, info.misses)
+    language_identifier = getattr(normalization_pipeline, 'language_identifier', None)
+    if language_identifier is not None:
+        stats = language_identifier.stats
+        # Cached texts and texts answered by a source prior skip detection
+        hits = stats['cache'] + stats['prior']
+        PIPELINE_METRICS.record_cache('language_id', hits, sum(stats.values()) - hits)
+    try:
+        return PIPELINE_METRICS.export(metrics_dir)
+    except OSError as e:
+        logger.error(f"Failed to write run metrics to {metrics_dir}: {e}")
+        return None
+
+def build_search_metadata(start_date, end_date, processing_mode='monthly'):
+    """Search metadata saved with the articles of one period"""
+    return {
+        'topic_ids': MEDIA_TOPIC_IDS,
+        'keywords_main': SUGAR_CONFIG['keywords_main'],
+        # Exclusion keywords removed - now only filtering based on sugar-related keywords
+        'keywords_context_zones': SUGAR_CONFIG['keywords_context_zones'],
+        'company_entities': SUGAR_CONFIG['company_entities'],
+        'government_entities': SUGAR_CONFIG['government_entities'],
+        'person_entities': SUGAR_CONFIG['person_entities'],
+        'search_period': f"{start_date.date()} to {end_date.date()}",
+        'processing_mode': processing_mode
+    }
+
+def normalization_pipeline_kwargs():
+    """LanguageNormalizationPipeline arguments: entity names are protected from typo correction"""
+    return {
+        'protected_terms': (SUGAR_CONFIG['company_entities'] + SUGAR_CONFIG['government_entities']
+                            + SUGAR_CONFIG['person_entities'])
+    }
+
+def create_response_cache(args):
+    """The opt-in response cache for raw Opoint search results configured by the command line, or None"""
+    if not args.response_cache_dir:
+        return None
+    return OpointResponseCache(
+        args.response_cache_dir,
+        ttl_seconds=int(args.response_cache_ttl_days * 24 * 3600) if args.response_cache_ttl_days > 0 else None,
+        max_bytes=args.response_cache_max_mb * 1024 * 1024
+    )
+
+def run_queue_worker(queue_path, api_key, args, worker_id=None, poll_interval=5.0):
+    """
+    Drain a backfill job queue: claim (date window, topic) jobs one at a time and run each
+    through run_month_pipeline until no job is pending or leased.
+    
+    The lease of the running job is renewed in the background, so a crashed worker's job is
+    picked up by another worker once its lease expires. A job whose topic fetch, source
+    fetches or saves failed is retried with backoff (see JobQueue.fail). When the last job of a window is done
+    the window is marked processed in the processed dates tracker.
+    
+    Deduplication across the jobs of a window relies on the persistent dedup index, opened in
+    shared mode so that every lookup sees the articles other workers have saved, and on the
+    existing-ID check of save_to_database, since every job has its own in-run cache.
+    Checkpoint segments are not written: the queue records which jobs are complete.
+    
+    Args:
+        queue_path: Job queue database file
+        api_key: Opoint API key
+        args: Parsed command line of main() (an argparse.Namespace, picklable for worker processes)
+        worker_id: Worker ID (default: host name and process ID)
+        poll_interval: Seconds to wait for leased jobs of other workers or for retry backoffs
+    
+    Returns:
+        dict: Jobs 'completed', 'retried', 'failed' and articles 'saved' by this worker
+    """
+    worker_id = worker_id or default_worker_id()
+    queue = JobQueue(queue_path, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts,
+                     retry_delay=args.retry_delay, journal_mode=args.queue_journal_mode)
+    rate_limiter = None
+    if args.requests_per_second > 0:
+        rate_limiter = SharedRateLimiter(queue_path, args.requests_per_second, journal_mode=args.queue_journal_mode)
+    response_cache = create_response_cache(args)
+    if args.normalization_service:
+        normalization_pipeline = NormalizationClient(args.normalization_service)
+    else:
+        normalization_pipeline = LanguageNormalizationPipeline(**normalization_pipeline_kwargs())
+    article_processor = None
+    if args.process_workers > 0:
+        article_processor = ArticleProcessPool(
+            max_workers=args.process_workers, chunk_size=args.process_chunk_size,
+            normalization_service=args.normalization_service, pipeline_kwargs=normalization_pipeline_kwargs()
+        )
+    query_planner = None if args.no_source_groups else SourceQueryPlanner(page_size=args.source_group_page_size)
+    # Other workers add to the index while this one runs, so lookups must not trust the Bloom filter
+    dedup_index = None if args.no_dedup_index else PersistentDedupIndex(args.dedup_index_db, shared=True)
+    processed_dates_tracker = ProcessedDatesTracker(args.processed_dates_db)
+    
+    summary = {'completed': 0, 'retried': 0, 'failed': 0, 'saved': 0}
+    PIPELINE_METRICS.reset()
+    try:
+        while True:
+            jobs = queue.claim(worker_id)
+            if not jobs:
+                if not queue.unfinished():
+                    break
+                # Other workers hold the remaining jobs, or they wait for a retry
+                time.sleep(poll_interval)
+                continue
+            job = jobs[0]
+            global_dedup_cache = create_global_dedup_cache(job.window_start)
+            search_metadata = build_search_metadata(job.window_start, job.window_end, processing_mode='queue')
+            error = None
+            try:
+                with queue.keep_alive(job.job_id, worker_id):
+                    counters = run_month_pipeline(
+                        api_key, job.window_start, job.window_end, [job.topic_id], args.max_articles,
+                        normalization_pipeline, search_metadata, global_dedup_cache=global_dedup_cache,
+                        response_cache=response_cache, response_cache_mode=args.response_cache_mode,
+                        queue_size=args.queue_size, save_batch_size=args.save_batch_size,
+                        max_memory_mb=args.max_memory_mb, dedup_index=dedup_index,
+                        article_processor=article_processor, query_planner=query_planner,
+                        rate_limiter=rate_limiter
+                    )
+                if counters['failed_topics'] or counters['source_errors'] or counters['save_errors']:
+                    error = (f"{counters['failed_topics']} failed topic fetches, "
+                             f"{counters['source_errors']} failed source fetches, "
+                             f"{counters['save_errors']} failed saves")
+            except KeyboardInterrupt:
+                queue.release(job.job_id, worker_id)
+                raise
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                del global_dedup_cache
+                cleanup_memory()
+            
+            if error is None:
+                summary['saved'] += counters['saved']
+                if queue.complete(job.job_id, worker_id, {k: v for k, v in counters.items() if k != 'pipeline'}):
+                    summary['completed'] += 1
+                if queue.window_done(job.window_start, job.window_end):
+                    processed_dates_tracker.mark_date_range_processed(job.window_start, job.window_end, 'monthly')
+                continue
+            status = queue.fail(job.job_id, worker_id, error)
+            logger.error(f"Job {job.job_id} failed on attempt {job.attempts} of {job.max_attempts}: {error}")
+            if status == 'failed':
+                summary['failed'] += 1
+            elif status is not None:
+                summary['retried'] += 1
+    finally:
+        if article_processor is not None:
+            article_processor.close()
+        if args.metrics_dir:
+            export_run_metrics(os.path.join(args.metrics_dir, worker_id), response_cache, normalization_pipeline,
+                               dedup_index)
+        if rate_limiter is not None:
+            rate_limiter.close()
+        queue.close()
+    return summary
+
+def run_job_queue(args, api_key):
+    """
+    Backfill through the job queue at args.job_queue: enqueue a job per (month, topic) of the
+    requested months (jobs already in the queue are kept with their state), then drain the
+    queue with args.queue_workers worker processes.
+    
+    Workers on other machines sharing the queue file can drain it at the same time by running
+    the same command.
+    
+    Returns:
+        int: Exit code, 1 if jobs are left failed
+    """
+    queue = JobQueue(args.job_queue, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts,
+                     retry_delay=args.retry_delay, journal_mode=args.queue_journal_mode)
+    try:
+        added = queue.enqueue(generate_monthly_date_ranges(args.months_back), MEDIA_TOPIC_IDS)
+        print(f"Job queue {args.job_queue}: {added} jobs added, {queue.counts()}")
+    finally:
+        queue.close()
+    if args.dry_run:
+        return 0
+    
+    base_worker_id = args.worker_id or default_worker_id()
+    if args.queue_workers <= 1:
+        summary = run_queue_worker(args.job_queue, api_key, args, worker_id=base_worker_id)
+        print(f"Worker {base_worker_id}: {summary}")
+    else:
+        # Spawned workers load their own models and connections instead of inheriting this process's
+        context = multiprocessing.get_context('spawn')
+        workers = [
+            context.Process(target=run_queue_worker, args=(args.job_queue, api_key, args),
+                            kwargs={'worker_id': f"{base_worker_id}-{index}"}, name=f"queue-worker-{index}")
+            for index in range(args.queue_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    
+    queue = JobQueue(args.job_queue, journal_mode=args.queue_journal_mode)
+    try:
+        counts = queue.counts()
+    finally:
+        queue.close()
+    print(f"Job queue {args.job_queue}: {counts}")
+    return 1 if counts['failed'] else 0
 
 def generate_monthly_date_ranges(months_back=12):
     """Generate list of (start_date, end_date) tuples for the last N months"""
@@ -2203,16 +3035,73 @@ def main():
     parser.add_argument('--months-back', type=int, default=12, help='Number of months back to fetch (default: 12, approx 1 year)')
     parser.add_argument('--max-articles', type=int, default=5000, help='Maximum articles per request (default: 5000)')
     parser.add_argument('--resume', action='store_true', help='Resume from last checkpoint if available')
-    parser.add_argument('--checkpoint-dir', type=str, default='./checkpoints', help='Directory for storing checkpoints (default: ./checkpoints)')
+    parser.add_argument('--checkpoint-dir', type=str, default='./checkpoints', help='Directory for Parquet checkpoint segments and their manifest (default: ./checkpoints)')
     parser.add_argument('--processed-dates-db', type=str, default='processed_dates.db',
                         help='Database file for tracking processed dates (default: processed_dates.db)')
     parser.add_argument('--skip-processed', action='store_true',
                         help='Skip already processed date ranges (default: False)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Fetch only articles newer than each (source, topic) watermark instead of whole months; '
+                             'months older than a source\'s watermark are not backfilled, run without it for that (default: False)')
     parser.add_argument('--cleanup-old-records', type=int, default=90,
                         help='Clean up processed date records older than N days (default: 90)')
     parser.add_argument('--max-memory-mb', type=int, default=4000,
                         help='Maximum memory usage in MB before triggering cleanup (default: 4000)')
+    parser.add_argument('--dedup-index-db', type=str, default='dedup_index.db',
+                        help='Database file of the persistent cross-run deduplication index (default: dedup_index.db)')
+    parser.add_argument('--no-dedup-index', action='store_true',
+                        help='Disable the persistent deduplication index (default: False)')
+    parser.add_argument('--queue-size', type=int, default=256,
+                        help='Maximum number of articles buffered between pipeline stages (default: 256)')
+    parser.add_argument('--save-batch-size', type=int, default=200,
+                        help='Number of deduplicated articles saved to the database per batch (default: 200)')
+    parser.add_argument('--response-cache-dir', type=str, default=None,
+                        help='Directory for caching raw Opoint search responses (default: disabled)')
+    parser.add_argument('--response-cache-ttl-days', type=float, default=30,
+                        help='Time-to-live of cached Opoint responses in days, 0 for no expiry (default: 30)')
+    parser.add_argument('--response-cache-max-mb', type=int, default=2048,
+                        help='Maximum size of the response cache in MB before LRU eviction (default: 2048)')
+    parser.add_argument('--response-cache-mode', type=str, default='readwrite',
+                        choices=list(OpointAPI.CACHE_MODES),
+                        help="Response cache mode: 'readwrite', 'refresh' or 'replay' (offline) (default: readwrite)")
+    parser.add_argument('--process-workers', type=int, default=0,
+                        help='Worker processes for article processing (normalization, triage, hashing); '
+                             '0 processes articles in the main process (default: 0)')
+    parser.add_argument('--process-chunk-size', type=int, default=32,
+                        help='Articles sent to a worker process per task (default: 32)')
+    parser.add_argument('--normalization-service', type=str, default=None,
+                        help='host:port or socket path of a running normalization_service.py to use instead of '
+                             'loading the normalization models in this process; its key is read from '
+                             'NORMALIZATION_SERVICE_AUTHKEY or the key file the service wrote')
+    parser.add_argument('--no-source-groups', action='store_true',
+                        help='Search every sugar source separately instead of in grouped site: requests (default: False)')
+    parser.add_argument('--source-group-page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f'Articles requested per grouped source search (default: {DEFAULT_PAGE_SIZE})')
+    parser.add_argument('--metrics-dir', type=str, default=None,
+                        help='Directory for per-run metrics (stage latencies, throughput, cache statistics) '
+                             'as JSON and as a Prometheus textfile (default: disabled)')
+    parser.add_argument('--job-queue', type=str, default=None,
+                        help='Backfill through a durable SQLite job queue of (month, topic) jobs at this path '
+                             'instead of processing the months in order; rerun to resume (default: disabled)')
+    parser.add_argument('--queue-workers', type=int, default=1,
+                        help='Worker processes draining the job queue on this machine (default: 1)')
+    parser.add_argument('--worker-id', type=str, default=None,
+                        help='Worker ID recorded in job leases (default: host name and process ID)')
+    parser.add_argument('--lease-seconds', type=float, default=1800,
+                        help='Seconds a job stays leased without a heartbeat before another worker takes it (default: 1800)')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help='Attempts per job before it is marked failed (default: 3)')
+    parser.add_argument('--retry-delay', type=float, default=60,
+                        help='Seconds before a failed job is retried, doubled on every further attempt (default: 60)')
+    parser.add_argument('--requests-per-second', type=float, default=0,
+                        help='Opoint search requests per second shared by all workers of the job queue, '
+                             '0 for no limit (default: 0)')
+    parser.add_argument('--queue-journal-mode', type=str, default='WAL', choices=['WAL', 'DELETE'],
+                        help='SQLite journal mode of the job queue; use DELETE when machines share it over '
+                             'a network filesystem (default: WAL)')
     args = parser.parse_args()
+    if args.job_queue and args.incremental:
+        parser.error("--job-queue backfills whole months and cannot be combined with --incremental")
 
     api_key = os.getenv('OPOINT_API_KEY')
     if not api_key:
@@ -2220,6 +3109,12 @@ def main():
         pass
         return
 
+    if args.job_queue:
+        return run_job_queue(args, api_key)
+
+    # Initialize the opt-in response cache for raw Opoint search results
+    response_cache = create_response_cache(args)
+
     # Initialize processed dates tracker
     processed_dates_tracker = ProcessedDatesTracker(args.processed_dates_db)
     # Silently initialize tracker
@@ -2253,20 +3148,45 @@ def main():
         pass
         return
 
-    normalization_pipeline = LanguageNormalizationPipeline()
+    # Entity names are protected from typo correction; models load on first use
+    pipeline_kwargs = normalization_pipeline_kwargs()
+    if args.normalization_service:
+        # Models are loaded once by the shared service instead of in every worker
+        normalization_pipeline = NormalizationClient(args.normalization_service)
+    else:
+        normalization_pipeline = LanguageNormalizationPipeline(**pipeline_kwargs)
+
+    # Optional process pool for the CPU-bound article processing; normalization stays batched here
+    article_processor = None
+    if args.process_workers > 0:
+        article_processor = ArticleProcessPool(
+            max_workers=args.process_workers, chunk_size=args.process_chunk_size,
+            normalization_service=args.normalization_service, pipeline_kwargs=pipeline_kwargs
+        )
+
+    # Grouped source searches; the planner learns the result counts per source over the run
+    query_planner = None if args.no_source_groups else SourceQueryPlanner(page_size=args.source_group_page_size)
 
     start_time = datetime.now()
     total_saved = 0
-    all_structured = []
+    PIPELINE_METRICS.reset()
+
+    # Persistent deduplication index shared across months and runs, warm-loaded at startup
+    dedup_index = None if args.no_dedup_index else PersistentDedupIndex(args.dedup_index_db)
 
-    # Check for resume option and load intermediate results if available
+    # Every completed (month, topic) pair is checkpointed as an append-only Parquet segment
+    checkpoint_store = None
+    try:
+        checkpoint_store = SegmentCheckpointStore(args.checkpoint_dir)
+    except ImportError as e:
+        logger.warning(f"Checkpointing disabled: {e}")
+
+    # Check for resume option; only the checkpoint manifest is read, not the segments
     if args.resume:
         # Silently enable resume mode
         pass
-        loaded_results = load_intermediate_results(args.checkpoint_dir)
-        if loaded_results:
-            all_structured = loaded_results
-            total_saved = sum(len(df) for df in all_structured)
+        if checkpoint_store is not None and checkpoint_store.completed_pairs():
+            total_saved = checkpoint_store.total_rows()
             # Silently load results
             pass
             # Silently resume with checkpoints
@@ -2294,7 +3214,8 @@ def main():
             month_name = start_date.strftime("%B %Y")
             
             # Check if this month has already been processed
-            if args.skip_processed and processed_dates_tracker.is_date_range_processed(start_date, end_date, 'monthly'):
+            # In incremental mode the per-(source, topic) watermarks decide what is left to fetch instead
+            if not args.incremental and args.skip_processed and processed_dates_tracker.is_date_range_processed(start_date, end_date, 'monthly'):
                 # Silently skip processed month
                 pass
                 date_processing_logger.log_processing_skip(
@@ -2308,7 +3229,7 @@ def main():
             
             # Check for overlaps with processed ranges
             has_overlap, overlapping_ranges = processed_dates_tracker.check_overlap_with_processed_ranges(start_date, end_date, 'monthly')
-            if has_overlap:
+            if has_overlap and not args.incremental:
                 # Silently handle overlap
                 pass
                 date_processing_logger.log_overlap_detected(start_date, end_date, 'monthly', overlapping_ranges)
@@ -2337,143 +3258,91 @@ def main():
             pass
             
             month_start_time = datetime.now()
-            month_articles = []
-            month_completed_tasks = 0
-            month_failed_tasks = 0
+            month_watermark_updates = {} if args.incremental else None
             
-            # CRITICAL FIX: Initialize enhanced global deduplication cache for this month
-            # This prevents duplicate processing across different topic IDs with multiple layers of deduplication
-            global_dedup_cache = {
-                'seen_content_hashes': set(),
-                'seen_article_ids': set(),
-                'seen_urls': set(),  # CRITICAL: Track URLs to prevent duplicates
-                'processed_articles': [],
-                'cache_stats': {
-                    'total_hashes_added': 0,
-                    'total_duplicates_prevented': 0,
-                    'cache_hits': 0,
-                    'cache_misses': 0,
-                    'similarity_checks': 0,
-                    'similarity_duplicates': 0,
-                    'url_duplicates': 0  # Track URL-based duplicates
-                },
-                'processing_date': start_date.date()  # Track processing date for cache management
-            }
+            # Incremental mode: start each source after its watermark for each topic
+            month_source_watermarks = None
+            if args.incremental:
+                month_source_watermarks = {
+                    topic_id: processed_dates_tracker.get_watermarks(topic_id) for topic_id in MEDIA_TOPIC_IDS
+                }
             
-            # Silently initialize cache
-            pass
-            # Silently initialize cache
-            pass
+            search_metadata = build_search_metadata(start_date, end_date)
             
-            # Process all topic IDs for this month
-            for topic_idx, topic_id in enumerate(MEDIA_TOPIC_IDS):
-                # Silently process topic
-                pass
-                
-                try:
-                    # Check memory usage before processing each topic
-                    if not check_memory_usage(max_memory_mb=args.max_memory_mb):
-                        # Silently handle high memory usage
-                        pass
-                        cleanup_memory()
-                        time.sleep(2)
-                    
-                    # Pass global deduplication cache to prevent duplicates across topics
-                    df_structured = fetch_sugar_articles_for_period(
-                        api_key, start_date, end_date, [topic_id], args.max_articles, normalization_pipeline, global_dedup_cache
+            # CRITICAL FIX: Initialize enhanced global deduplication cache for this month
+            # This prevents duplicate processing across different topic IDs with multiple layers of deduplication
+            global_dedup_cache = create_global_dedup_cache(start_date)
+            
+            # When resuming, skip the topics already checkpointed for this month and
+            # seed the deduplication cache with their articles
+            completed_topic_ids = set()
+            if args.resume and checkpoint_store is not None:
+                completed_topic_ids = checkpoint_store.completed_topics(month_key(start_date))
+                if completed_topic_ids >= {str(topic_id) for topic_id in MEDIA_TOPIC_IDS}:
+                    date_processing_logger.log_processing_skip(
+                        start_date, end_date, 'monthly',
+                        "All topics already checkpointed",
+                        f"Month: {month_name}"
                     )
-                    
-                    if not df_structured.empty:
-                        month_articles.append(df_structured)
-                        # Silently complete topic
-                        pass
-                        # Silently display topic results
-                        pass
-                    else:
-                        # Silently handle no results
-                        pass
-                        # Silently handle no articles found
-                        pass
-                    
-                    month_completed_tasks += 1
-                    time.sleep(0.5)  # Delay to prevent overwhelming the system
-                    
-                except Exception as e:
-                    month_failed_tasks += 1
-                    # Silently handle topic failure
-                    pass
-                    # Silently handle topic failure
-                    pass
+                    continue
+                for segment_df in checkpoint_store.iter_frames(month_key(start_date), columns=['id', 'url', 'content_hash'], decode_json=False):
+                    if 'content_hash' in segment_df.columns:
+                        global_dedup_cache['seen_content_hashes'].update(segment_df['content_hash'].dropna())
+                    if 'id' in segment_df.columns:
+                        global_dedup_cache['seen_article_ids'].update(segment_df['id'].dropna())
+                    if 'url' in segment_df.columns:
+                        global_dedup_cache['seen_urls'].update(url for url in segment_df['url'].dropna() if url)
+            
+            # Stream all topic IDs for this month through fetch -> normalize/triage -> dedup -> save;
+            # saving starts with the first full batch instead of after the whole month has been fetched
+            try:
+                month_stats = run_month_pipeline(
+                    api_key, start_date, end_date, MEDIA_TOPIC_IDS, args.max_articles, normalization_pipeline,
+                    search_metadata, global_dedup_cache=global_dedup_cache, save=not args.dry_run,
+                    response_cache=response_cache, response_cache_mode=args.response_cache_mode,
+                    source_watermarks_by_topic=month_source_watermarks,
+                    watermark_updates_by_topic=month_watermark_updates,
+                    queue_size=args.queue_size, save_batch_size=args.save_batch_size,
+                    max_memory_mb=args.max_memory_mb,
+                    checkpoint_store=checkpoint_store, skip_topic_ids=completed_topic_ids,
+                    dedup_index=dedup_index, article_processor=article_processor,
+                    query_planner=query_planner
+                )
+            except Exception as e:
+                logger.error(f"Streaming pipeline failed for {month_name}: {e}")
+                failed_months += 1
+                continue
             
-            # Process month results
-            month_end_time = datetime.now()
-            month_duration = month_end_time - month_start_time
+            month_duration = datetime.now() - month_start_time
+            month_total_articles = month_stats['processed']
+            month_saved_count = month_stats['saved']
+            month_save_ok = month_stats['save_errors'] == 0
+            month_fetch_ok = not month_stats['failed_topics'] and not month_stats['source_errors']
             
-            if month_articles:
-                # Concatenate all articles for this month
-                month_df = pd.concat(month_articles, ignore_index=True)
-                
-                # Log month statistics
-                month_total_articles = len(month_df)
-                month_sugar_articles = len(month_df[month_df['asset'] == 'Sugar'])
-                month_general_articles = len(month_df[month_df['asset'] == 'General'])
-                
+            if month_total_articles > 0:
                 print(f"\n=== MONTH {month_name} STATISTICS ===")
                 print(f"Total articles processed: {month_total_articles}")
-                print(f"Sugar articles (passed triage): {month_sugar_articles}")
-                print(f"General articles (failed triage): {month_general_articles}")
+                print(f"Sugar articles (passed triage): {month_stats['sugar']}")
+                print(f"General articles (failed triage): {month_stats['general']}")
                 print(f"Processing duration: {month_duration}")
-                print(f"Tasks completed: {month_completed_tasks}, Failed: {month_failed_tasks}")
-                
-                # Save to database for this month
-                search_metadata = {
-                    'topic_ids': MEDIA_TOPIC_IDS,
-                    'keywords_main': SUGAR_CONFIG['keywords_main'],
-                    # Exclusion keywords removed - now only filtering based on sugar-related keywords
-                    'keywords_context_zones': SUGAR_CONFIG['keywords_context_zones'],
-                    'company_entities': SUGAR_CONFIG['company_entities'],
-                    'government_entities': SUGAR_CONFIG['government_entities'],
-                    'person_entities': SUGAR_CONFIG['person_entities'],
-                    'search_period': f"{start_date.date()} to {end_date.date()}",
-                    'processing_mode': 'monthly'
-                }
-                
-                # Save only articles that passed the triage filter (asset='Sugar')
-                # Silently debug database save
-                pass
-                
-                month_sugar_only_df = month_df[month_df['asset'] == 'Sugar'].copy()
-                
-                # Silently debug database save
-                pass
-                
-                if not args.dry_run and not month_sugar_only_df.empty:
-                    try:
-                        month_saved_count = save_to_database(month_sugar_only_df, search_metadata, 'Sugar')
-                        total_articles_saved += month_saved_count
-                        print(f"Saved {month_saved_count} articles to database for {month_name}")
-                        
-                        # Log breakdown by asset type for this month
-                        print(f"Breakdown for {month_name}:")
-                        print(f"  - Sugar articles saved: {month_saved_count}")
-                        print(f"  - General articles (not saved): {month_general_articles}")
-                        
-                    except Exception as e:
-                        # Silently handle database save failure
-                        pass
-                        # Silently handle database save error
-                        pass
-                elif args.dry_run:
-                    # Silently handle dry run
-                    pass
+                print(f"Tasks completed: {month_stats['completed_topics']}, Failed: {month_stats['failed_topics']}")
+                if not args.dry_run:
+                    print(f"Saved {month_saved_count} articles to database for {month_name} "
+                          f"in {month_stats['save_batches']} batches")
                 
-                # Add to overall results for final summary
-                all_structured.append(month_df)
                 total_saved += month_total_articles
+                total_articles_saved += month_saved_count
                 
                 # Mark this month as processed in the tracker
-                if not args.dry_run:
-                    mark_success = processed_dates_tracker.mark_date_range_processed(start_date, end_date, 'monthly')
+                # In incremental mode only the days that have already happened are marked,
+                # so the current month is not recorded as complete before it ends.
+                # A month with failed topics or sources is left unmarked so that it is fetched again
+                if not month_fetch_ok:
+                    print(f"Month {month_name} not marked as processed: {month_stats['failed_topics']} failed topics, "
+                          f"{month_stats['source_errors']} failed source fetches")
+                elif not args.dry_run:
+                    mark_end_date = min(end_date, datetime.now()) if args.incremental else end_date
+                    mark_success = processed_dates_tracker.mark_date_range_processed(start_date, mark_end_date, 'monthly')
                     if mark_success:
                         # Silently mark month as processed
                         pass
@@ -2492,12 +3361,10 @@ def main():
                         pass
                 
                 # Log completion of processing
-                month_end_time = datetime.now()
-                month_duration = month_end_time - month_start_time
                 date_processing_logger.log_processing_complete(
                     start_date, end_date, 'monthly',
                     month_total_articles, month_duration,
-                    f"Month: {month_name}, Saved: {month_saved_count if 'month_saved_count' in locals() else 0}"
+                    f"Month: {month_name}, Saved: {month_saved_count}"
                 )
                 
                 completed_months += 1
@@ -2506,27 +3373,16 @@ def main():
                 pass
                 failed_months += 1
             
-            # MEMORY CLEANUP after each month
-            # Silently run memory cleanup
-            pass
-            # Silently run memory cleanup
-            pass
-            
-            # Clear month-specific data structures
-            month_articles.clear()
-            if 'month_df' in locals():
-                del month_df
-            if 'month_sugar_only_df' in locals():
-                del month_sugar_only_df
+            # Advance the watermarks only once this month's articles are safely saved,
+            # so a failed save is refetched on the next incremental run
+            if args.incremental and month_save_ok and not args.dry_run:
+                for topic_id, topic_watermark_updates in month_watermark_updates.items():
+                    processed_dates_tracker.update_watermarks(topic_id, topic_watermark_updates)
             
-            # Force garbage collection
+            # Release the month's deduplication cache before the next month
+            del global_dedup_cache
             cleanup_memory()
             
-            # Check memory usage after cleanup
-            if PSUTIL_AVAILABLE:
-                # Silently check memory usage
-                pass
-            
             # Add delay between months to allow system resources to free up
             if month_idx < len(date_ranges) - 1:  # Not the last month
                 # Silently pause before next month
@@ -2542,22 +3398,9 @@ def main():
         # Silently complete monthly processing
         pass
 
-        # Concatenate all results (for weekly mode or final summary)
-        if all_structured:
-            final_df = pd.concat(all_structured, ignore_index=True)
-            
-            # Log overall statistics
-            total_articles = len(final_df)
-            sugar_articles = len(final_df[final_df['asset'] == 'Sugar'])
-            general_articles = len(final_df[final_df['asset'] == 'General'])
-            
-            # Silently display overall statistics
-            pass
-            
-            # Note: Weekly processing has been removed - only monthly processing is now supported
-        else:
-            # Silently handle no articles processed
-            pass
+        # Articles are saved as they stream through the pipeline, so only the counters are summarized here
+        # Silently display overall statistics
+        pass
 
         end_time = datetime.now()
         duration = end_time - start_time
@@ -2584,8 +3427,9 @@ def main():
         
         # Silently display top sources
         pass
+        top_sources = sorted(SOURCE_RELIABILITY_SCORES.items(), key=lambda item: item[1], reverse=True)[:10]
         for source, reliability in top_sources:
-            category = get_source_category(source, SUGAR_SOURCES)
+            category = SOURCE_REGISTRY.get_category(source)
             # Silently display source reliability
             pass
             
@@ -2601,6 +3445,10 @@ def main():
     
     finally:
         # This block always executes, whether there was an exception or not
+        if article_processor is not None:
+            article_processor.close()
+        if args.metrics_dir:
+            export_run_metrics(args.metrics_dir, response_cache, normalization_pipeline, dedup_index)
         end_time = datetime.now()
         duration = end_time - start_time
         # Silently end process
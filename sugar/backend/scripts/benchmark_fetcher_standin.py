@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+"""
+End-to-end throughput benchmark of the sugar news fetcher against a local Opoint stand-in.
+
+Starts an OpointStandinServer, points OpointAPI at it through OPOINT_BASE_URL and runs
+fetch_sugar_articles_for_period for one month and each topic, as main() does. Reports
+articles per second, per-stage time from PIPELINE_METRICS, memory and the requests
+seen by the server. No Opoint credentials or network access are needed.
+
+Synthetic multilingual documents for the 27 sugar sources (default):
+
+    python benchmark_fetcher_standin.py --articles-per-source 40 --latency 0.05 --rate-limit-rate 0.05
+
+Recorded documents replayed from a populated Opoint response cache:
+
+    python benchmark_fetcher_standin.py --response-cache-dir /path/to/cache --month 2024-01
+
+Normalization runs without the translation and spaCy models unless --full-normalization
+is given, so the benchmark isolates fetching, parsing, triage and deduplication.
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.api.opoint.response_cache import OpointResponseCache
+from sugar.backend.api.opoint.standin_server import (
+    OpointStandinServer,
+    load_recorded_documents,
+    make_synthetic_documents
+)
+from sugar.backend.parsers.metrics import PIPELINE_METRICS
+from sugar.backend.parsers.query_planner import SourceQueryPlanner
+from sugar.backend.parsers.sugar_news_fetcher import (
+    ALL_SUGAR_SOURCES_27,
+    MEDIA_TOPIC_IDS,
+    SUGAR_CONFIG,
+    create_global_dedup_cache,
+    fetch_sugar_articles_for_period
+)
+from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+
+
+def month_window(month):
+    """First and last second of a YYYY-MM month"""
+    start = datetime.strptime(month, '%Y-%m')
+    next_month = (start.replace(day=28) + pd.Timedelta(days=4)).replace(day=1)
+    return start, next_month - pd.Timedelta(seconds=1)
+
+
+def make_pipeline(full_normalization):
+    pipeline = LanguageNormalizationPipeline(
+        protected_terms=(SUGAR_CONFIG['company_entities'] + SUGAR_CONFIG['government_entities']
+                         + SUGAR_CONFIG['person_entities'])
+    )
+    if not full_normalization:
+        pipeline.tokenizer = None
+        pipeline.model = None
+        pipeline.nlp = None
+    return pipeline
+
+
+def run_benchmark(documents, month_start, month_end, topic_ids, max_articles=5000, grouped=True,
+                  full_normalization=False, trace_memory=False, **server_kwargs):
+    """
+    Run the fetcher for one month against a stand-in server.
+
+    Returns:
+        dict: Articles, wall time, throughput, memory, stage metrics and server statistics
+    """
+    pipeline = make_pipeline(full_normalization)
+    query_planner = SourceQueryPlanner() if grouped else None
+    dedup_cache = create_global_dedup_cache(month_start)
+    previous_base_url = os.environ.get('OPOINT_BASE_URL')
+
+    with OpointStandinServer(documents, **server_kwargs) as server:
+        os.environ['OPOINT_BASE_URL'] = server.url
+        PIPELINE_METRICS.reset('standin-benchmark')
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        processed = 0
+        try:
+            for topic_id in topic_ids:
+                articles = fetch_sugar_articles_for_period(
+                    'standin', month_start, month_end, [topic_id], max_articles=max_articles,
+                    normalization_pipeline=pipeline, global_dedup_cache=dedup_cache,
+                    query_planner=query_planner
+                )
+                processed += len(articles)
+        finally:
+            if previous_base_url is None:
+                os.environ.pop('OPOINT_BASE_URL', None)
+            else:
+                os.environ['OPOINT_BASE_URL'] = previous_base_url
+        elapsed = time.perf_counter() - started
+        traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+        server_stats = dict(server.stats)
+
+    snapshot = PIPELINE_METRICS.snapshot()
+    fetched = snapshot['counters'].get('api_results', 0)
+    return {
+        'documents_in_corpus': len(documents),
+        'topics': len(topic_ids),
+        'fetched': fetched,
+        'processed': processed,
+        'wall_seconds': round(elapsed, 3),
+        'fetched_per_second': round(fetched / elapsed, 1) if elapsed else 0.0,
+        'processed_per_second': round(processed / elapsed, 1) if elapsed else 0.0,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'traced_peak_mb': round(traced_peak / 2**20, 1) if traced_peak is not None else None,
+        'stages': {
+            stage: {key: summary[key] for key in ('count', 'items', 'sum_seconds', 'p50_seconds', 'p95_seconds')}
+            for stage, summary in snapshot['stages'].items()
+        },
+        'counters': snapshot['counters'],
+        'server': server_stats
+    }
+
+
+def print_report(result):
+    print(f"\n{result['fetched']} articles fetched, {result['processed']} processed from "
+          f"{result['documents_in_corpus']} documents over {result['topics']} topics in {result['wall_seconds']:.1f}s")
+    print(f"Throughput: {result['fetched_per_second']:.1f} fetched/s, {result['processed_per_second']:.1f} processed/s")
+    memory = f"Peak RSS: {result['peak_rss_mb']:.0f} MB"
+    if result['traced_peak_mb'] is not None:
+        memory += f", traced Python peak: {result['traced_peak_mb']:.1f} MB"
+    print(memory)
+
+    print(f"\n{'Stage':<14} {'Calls':>7} {'Items':>8} {'Seconds':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for stage, summary in result['stages'].items():
+        print(f"{stage:<14} {summary['count']:>7} {summary['items']:>8} {summary['sum_seconds']:>9.2f} "
+              f"{summary['p50_seconds'] * 1000:>8.1f} {summary['p95_seconds'] * 1000:>8.1f}")
+
+    server = result['server']
+    print(f"\nServer: {server['requests']} searches, {server['rate_limited']} rate limited, "
+          f"{server['errors']} errors, {server['documents']} documents, {server['bytes'] / 2**20:.1f} MB sent")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the sugar news fetcher against a local Opoint stand-in')
+    parser.add_argument('--month', default='2024-01', help='Month to fetch (YYYY-MM)')
+    parser.add_argument('--topics', type=int, default=len(MEDIA_TOPIC_IDS), help='Number of topics to fetch')
+    parser.add_argument('--articles-per-source', type=int, default=40, help='Synthetic documents per sugar source')
+    parser.add_argument('--response-cache-dir', help='Serve the documents recorded in this response cache instead')
+    parser.add_argument('--max-articles', type=int, default=5000, help='Maximum articles per request')
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds added to every search response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of searches answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of searches answered with 429')
+    parser.add_argument('--retry-after', type=float, default=0.0, help='Retry-After seconds of 429 responses')
+    parser.add_argument('--no-source-groups', action='store_true', help='Search every source separately')
+    parser.add_argument('--full-normalization', action='store_true', help='Load the translation and spaCy models')
+    parser.add_argument('--trace-memory', action='store_true', help='Also report the tracemalloc peak (slower)')
+    parser.add_argument('--json', help='Write the results to this JSON file')
+    args = parser.parse_args()
+
+    month_start, month_end = month_window(args.month)
+    if args.response_cache_dir:
+        cache = OpointResponseCache(args.response_cache_dir, ttl_seconds=None)
+        documents = load_recorded_documents(cache)
+        cache.close()
+        source = f"response cache {args.response_cache_dir}"
+    else:
+        sites = [(source['id'], source['name']) for source in ALL_SUGAR_SOURCES_27 if source['id']]
+        documents = make_synthetic_documents(sites, month_start, month_end, per_site=args.articles_per_source)
+        source = f"{len(documents)} synthetic documents"
+    print(f"Benchmarking {args.month} against a stand-in serving {source}")
+
+    result = run_benchmark(
+        documents, month_start, month_end, MEDIA_TOPIC_IDS[:args.topics],
+        max_articles=args.max_articles,
+        grouped=not args.no_source_groups,
+        full_normalization=args.full_normalization,
+        trace_memory=args.trace_memory,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after
+    )
+    print_report(result)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Benchmark the slang/synonym mapping stage of LanguageNormalizationPipeline.
+
+Compares the previous implementation (full en_core_web_sm pipeline per text, tokens re-joined
+with spaces) with the current one (tokenizer-only pipeline, batched through nlp.pipe).
+
+Usage:
+    python benchmark_slang_mapping.py [--articles 500] [--batch-size 64] [--n-process 1]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import spacy
+except ImportError:
+    spacy = None
+
+from sugar.backend.text_filtering.language_normalization import (
+    SLANG_DICT,
+    SLANG_EXCLUDED_COMPONENTS,
+    map_slang_tokens
+)
+
+SAMPLE_ARTICLE = (
+    "Raw sugar futures (NY11) rose 2.1% on Tuesday, as UNICA reported that the Centro-Sul harvest "
+    "was slower than expected. Traders said: \"u r not going to see 20 cents again, lol.\" "
+    "Mills in Brazil crushed 45.2 million tonnes of cane in the second half of May, "
+    "down from 48.1 million tonnes a year earlier, while India's export quota remains unclear. "
+)
+
+
+def legacy_map_slang(nlp, text):
+    """The previous per-text implementation"""
+    doc = nlp(text)
+    tokens = [SLANG_DICT.get(token.text.lower(), token.text) for token in doc]
+    return " ".join(tokens)
+
+
+def batched_map_slang(nlp, texts, batch_size, n_process):
+    """The current implementation"""
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [map_slang_tokens(text, doc) for text, doc in zip(texts, docs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark slang/synonym mapping')
+    parser.add_argument('--model', default='en_core_web_sm', help='spaCy model name')
+    parser.add_argument('--articles', type=int, default=500, help='Number of synthetic articles')
+    parser.add_argument('--batch-size', type=int, default=64, help='nlp.pipe batch size')
+    parser.add_argument('--n-process', type=int, default=1, help='nlp.pipe worker processes')
+    args = parser.parse_args()
+
+    if spacy is None:
+        print("spaCy is not installed; nothing to benchmark.")
+        return 1
+
+    texts = [f"Report {i}. " + SAMPLE_ARTICLE * 8 for i in range(args.articles)]
+
+    full_nlp = spacy.load(args.model)
+    started = time.perf_counter()
+    legacy = [legacy_map_slang(full_nlp, text) for text in texts]
+    legacy_seconds = time.perf_counter() - started
+
+    tokenizer_nlp = spacy.load(args.model, exclude=SLANG_EXCLUDED_COMPONENTS)
+    started = time.perf_counter()
+    batched = batched_map_slang(tokenizer_nlp, texts, args.batch_size, args.n_process)
+    batched_seconds = time.perf_counter() - started
+
+    print(f"Articles:          {len(texts)}")
+    print(f"Full pipeline:     {legacy_seconds:.2f}s ({len(texts) / legacy_seconds:.1f} articles/sec)")
+    print(f"Tokenizer + pipe:  {batched_seconds:.2f}s ({len(texts) / batched_seconds:.1f} articles/sec)")
+    print(f"Speedup:           {legacy_seconds / batched_seconds:.1f}x")
+    print(f"Legacy output:     {legacy[0][:120]}")
+    print(f"Current output:    {batched[0][:120]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,452 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for the CPU hot paths of article ingestion.
+
+Times clean_html, generate_content_hash, is_similar_content, triage_filter,
+split_article_intelligently and LanguageNormalizationPipeline.normalize on a seeded synthetic
+corpus of sugar and non-sugar articles in English, German (with compounds), Thai, Hindi and
+Portuguese, 50 to 10,000 tokens long, and compares the throughput with a stored baseline.
+
+Throughput is reported relative to a fixed pure-Python calibration workload timed in the same
+run, so a baseline recorded on one machine remains meaningful on another; it is only compared
+when the corpus (seed and size) is the same.
+
+    python benchmark_text_processing.py                     # run and compare with the baseline
+    python benchmark_text_processing.py --save-baseline     # record a new baseline
+    python benchmark_text_processing.py --only clean_html triage_filter --tolerance 0.15
+
+Exit status: 0 when every benchmark is within tolerance of the baseline (or no baseline exists),
+1 when at least one regressed, 2 when the baseline was recorded for a different corpus.
+
+Normalization uses whichever models are installed (translation, spaCy, SymSpell) and
+split_article_intelligently counts tokens with tiktoken when its encoding can be loaded; the
+baseline records both, and a baseline from an environment with other components is reported.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import platform
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers.news_parser import clean_html
+from sugar.backend.parsers.sugar_news_fetcher import (
+    generate_content_hash,
+    is_similar_content,
+    split_article_intelligently
+)
+from sugar.backend.text_filtering.sugar_triage_filter import triage_filter
+
+DEFAULT_BASELINE = current_dir / 'benchmark_text_processing_baseline.json'
+DEFAULT_SEED = 20240101
+DEFAULT_ARTICLES_PER_LANGUAGE = 12
+DEFAULT_TOLERANCE = 0.25
+MIN_TOKENS = 50
+MAX_TOKENS = 10000
+
+LANGUAGES = ('en', 'de', 'th', 'hi', 'pt')
+SOURCES = ('Nasdaq', 'Reuters', 'Handelsblatt', 'Bangkok Post', 'Business Standard', 'Notícias Agrícolas')
+
+# Sentences per language; {n} is replaced by a random figure so articles differ
+SENTENCES = {
+    'en': {
+        'sugar': [
+            "Raw sugar futures on ICE rose to {n} cents per pound as UNICA reported a slower cane crush.",
+            "White sugar in London gained {n} dollars a tonne on strong refinery demand from the Middle East.",
+            "India may cap sugar exports again after monsoon rains fell {n} percent short in Maharashtra.",
+            "Brazilian mills allocated {n} percent of the cane to sugar rather than ethanol this fortnight.",
+            "Thai sugarcane growers expect a harvest of {n} million tonnes despite dry weather.",
+        ],
+        'other': [
+            "Arabica coffee futures slipped {n} percent as Brazil's harvest advanced faster than expected.",
+            "Crude oil traded near {n} dollars a barrel after OPEC+ kept its output targets unchanged.",
+            "The central bank left its policy rate at {n} percent and signalled patience on inflation.",
+            "Wheat prices in Chicago fell as export inspections came in {n} thousand tonnes lower.",
+            "Shares of the carmaker rose {n} percent after quarterly deliveries beat estimates.",
+        ],
+    },
+    'de': {
+        'sugar': [
+            "Die Rohzuckerterminkontrakte stiegen auf {n} US-Cent je Pfund, der Zucker bleibt knapp.",
+            "Der Zuckerrübenanbau in Niedersachsen wächst um {n} Prozent, meldet die Zuckerindustrie.",
+            "Die Weißzuckerpreisentwicklung hängt an der Zuckerrohrernte in Brasilien und Zucker aus Indien.",
+            "Südzucker erwartet eine Zuckerrübenkampagne von {n} Tagen bei hohen Zuckergehalten.",
+        ],
+        'other': [
+            "Die Kaffeepreisentwicklung bleibt volatil, Arabica kostete zuletzt {n} US-Cent je Pfund.",
+            "Die Rohölterminkontrakte fielen um {n} Prozent nach den Lagerbestandsdaten.",
+            "Die Weizenexportprognose der Landwirtschaftskammer wurde um {n} Tonnen gesenkt.",
+            "Der Automobilzulieferer meldete einen Quartalsumsatz von {n} Millionen Euro.",
+        ],
+    },
+    'th': {
+        'sugar': [
+            "ราคาน้ำตาลทรายดิบในตลาดโลกปรับตัวขึ้นเป็น {n} เซนต์ต่อปอนด์ หลังผลผลิตอ้อยของบราซิลลดลง",
+            "โรงงานน้ำตาลในภาคอีสานคาดว่าจะหีบอ้อยได้ {n} ล้านตันในฤดูกาลนี้",
+            "สมาคมชาวไร่อ้อยเรียกร้องให้รัฐบาลช่วยเหลือเรื่องราคาน้ำตาลและต้นทุนปุ๋ย {n} บาท",
+        ],
+        'other': [
+            "ราคายางพาราในตลาดกลางปรับตัวลดลง {n} บาทต่อกิโลกรัม ตามทิศทางราคาน้ำมัน",
+            "ธนาคารแห่งประเทศไทยคงอัตราดอกเบี้ยนโยบายไว้ที่ร้อยละ {n}",
+            "การส่งออกข้าวหอมมะลิเพิ่มขึ้น {n} เปอร์เซ็นต์ในไตรมาสที่ผ่านมา",
+        ],
+    },
+    'hi': {
+        'sugar': [
+            "महाराष्ट्र में चीनी मिलों ने इस सत्र में {n} लाख टन गन्ने की पेराई की है।",
+            "सरकार चीनी निर्यात पर सीमा लगा सकती है क्योंकि मानसून {n} प्रतिशत कमजोर रहा।",
+            "उत्तर प्रदेश में गन्ना किसानों को {n} रुपये प्रति क्विंटल का भाव मिला, चीनी के दाम स्थिर रहे।",
+        ],
+        'other': [
+            "कच्चे तेल की कीमतें {n} डॉलर प्रति बैरल के आसपास बनी रहीं।",
+            "रिज़र्व बैंक ने रेपो दर को {n} प्रतिशत पर अपरिवर्तित रखा।",
+            "गेहूं की सरकारी खरीद इस साल {n} लाख टन तक पहुंच गई।",
+        ],
+    },
+    'pt': {
+        'sugar': [
+            "Os contratos futuros de açúcar bruto subiram para {n} centavos de dólar por libra-peso.",
+            "As usinas do Centro-Sul destinaram {n} por cento da cana à produção de açúcar.",
+            "A UNICA informou que a moagem de cana caiu {n} por cento na segunda quinzena.",
+            "O açúcar cristal foi negociado a {n} reais por saca no mercado paulista.",
+        ],
+        'other': [
+            "O café arábica recuou {n} por cento com o avanço da colheita em Minas Gerais.",
+            "O petróleo Brent foi negociado perto de {n} dólares por barril.",
+            "O Banco Central manteve a taxa Selic em {n} por cento ao ano.",
+            "As exportações de soja somaram {n} milhões de toneladas no mês.",
+        ],
+    },
+}
+
+HTML_NOISE = (
+    '<script type="text/javascript">var ad = {{slot: "{n}"}};</script>',
+    '<!-- advertisement {n} -->',
+    '<a href="https://example.com/markets/{n}">Markets &amp; commodities</a>',
+    '<style>.quote {{ color: #{n}; }}</style>',
+)
+
+
+def estimate_tokens(sentence, language):
+    """Approximate token count: words, or three characters per token for unspaced Thai"""
+    if language == 'th':
+        return max(1, len(sentence) // 3)
+    return len(sentence.split())
+
+
+def make_article(rng, index, language, sugar, target_tokens):
+    """One synthetic HTML article of about target_tokens tokens"""
+    pools = SENTENCES[language]
+    paragraphs = []
+    sentences = []
+    tokens = 0
+    while tokens < target_tokens:
+        pool = pools['sugar'] if sugar and rng.random() < 0.4 else pools['other']
+        sentence = rng.choice(pool).replace('{n}', f"{rng.uniform(1, 99):.2f}")
+        sentences.append(sentence)
+        tokens += estimate_tokens(sentence, language)
+        if len(sentences) >= rng.randint(3, 6):
+            paragraphs.append(f"<p>{' '.join(sentences)}</p>")
+            sentences = []
+            if rng.random() < 0.15:
+                paragraphs.append(rng.choice(HTML_NOISE).replace('{n}', str(rng.randint(100, 999))).format())
+    if sentences:
+        paragraphs.append(f"<p>{' '.join(sentences)}</p>")
+
+    title_pool = pools['sugar'] if sugar else pools['other']
+    title = rng.choice(title_pool).replace('{n}', f"{rng.uniform(1, 99):.1f}")
+    return {
+        'id': f"{language}-{index}",
+        'language': language,
+        'sugar': sugar,
+        'tokens': tokens,
+        'title': title,
+        'html': "\n".join(paragraphs),
+        'source': rng.choice(SOURCES),
+    }
+
+
+def make_corpus(seed=DEFAULT_SEED, articles_per_language=DEFAULT_ARTICLES_PER_LANGUAGE,
+                languages=LANGUAGES, min_tokens=MIN_TOKENS, max_tokens=MAX_TOKENS):
+    """
+    Generate the benchmark corpus.
+
+    Lengths are drawn log-uniformly between min_tokens and max_tokens; the first two articles
+    of every language are the shortest and the longest. Every other article is about sugar.
+
+    Args:
+        seed (int): Random seed; the same seed always gives the same corpus
+        articles_per_language (int): Articles generated per language
+        languages (tuple): Language codes from SENTENCES
+        min_tokens (int): Shortest article in tokens
+        max_tokens (int): Longest article in tokens
+
+    Returns:
+        list: Article dicts with id, language, sugar, tokens, title, html and source
+    """
+    rng = random.Random(seed)
+    articles = []
+    for language in languages:
+        for index in range(articles_per_language):
+            if index == 0:
+                target = min_tokens
+            elif index == 1:
+                target = max_tokens
+            else:
+                target = int(math.exp(rng.uniform(math.log(min_tokens), math.log(max_tokens))))
+            articles.append(make_article(rng, index, language, index % 2 == 0, target))
+    return articles
+
+
+def corpus_fingerprint(articles):
+    """Short hash identifying a corpus, stored with the baseline"""
+    digest = hashlib.sha256()
+    for article in articles:
+        digest.update(article['id'].encode('utf-8'))
+        digest.update(article['html'].encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def near_duplicate(text, rng):
+    """A lightly edited copy of a text, as syndicated copies of an article are"""
+    words = text.split()
+    for _ in range(max(1, len(words) // 50)):
+        position = rng.randrange(len(words))
+        words[position] = words[position].upper()
+    return " ".join(words) + " (Reporting by staff)"
+
+
+def prepare(articles, seed=DEFAULT_SEED):
+    """Untimed inputs derived from the corpus: clean texts and similarity pairs"""
+    rng = random.Random(seed + 1)
+    cleaned = [clean_html(article['html']) for article in articles]
+    pairs = []
+    for index, (article, text) in enumerate(zip(articles, cleaned)):
+        pairs.append((article['title'], text, article['source'],
+                      article['title'], near_duplicate(text, rng), article['source']))
+        other = articles[(index + 1) % len(articles)]
+        pairs.append((article['title'], text, article['source'],
+                      other['title'], cleaned[(index + 1) % len(articles)], article['source']))
+    return {'articles': articles, 'cleaned': cleaned, 'pairs': pairs}
+
+
+def make_pipeline():
+    from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+    return LanguageNormalizationPipeline()
+
+
+def tiktoken_available():
+    """Whether tiktoken can load its encoding; without it count_tokens falls back to an estimate"""
+    try:
+        import tiktoken
+        tiktoken.get_encoding("cl100k_base")
+        return True
+    except Exception:
+        return False
+
+
+def normalization_components(pipeline):
+    """Which optional normalization components are available, recorded with the baseline"""
+    return {name: getattr(pipeline, name, None) is not None for name in ('tokenizer', 'model', 'nlp', 'sym_spell')}
+
+
+# name -> (function over the prepared inputs, returning the items processed, what an item is)
+BENCHMARKS = {
+    'clean_html': (lambda data: len([clean_html(a['html']) for a in data['articles']]), 'articles'),
+    'generate_content_hash': (lambda data: len([
+        generate_content_hash(a['title'], text, a['source']) for a, text in zip(data['articles'], data['cleaned'])
+    ]), 'articles'),
+    'is_similar_content': (lambda data: len([is_similar_content(*pair) for pair in data['pairs']]), 'pairs'),
+    'triage_filter': (lambda data: len([
+        triage_filter(text, title=a['title']) for a, text in zip(data['articles'], data['cleaned'])
+    ]), 'articles'),
+    'split_article_intelligently': (lambda data: len([
+        split_article_intelligently(text) for text in data['cleaned']
+    ]), 'articles'),
+    'normalize': (lambda data: len([
+        data['pipeline'].normalize(text, source=a['source']) for a, text in zip(data['articles'], data['cleaned'])
+    ]), 'articles'),
+}
+
+
+def best_time(func, repeat):
+    """Best wall time of repeat runs of func, and its return value"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def calibrate(repeat=5):
+    """
+    Rate of a fixed pure-Python workload (string building, hashing, regex, sorting).
+
+    Throughputs are divided by this rate so baselines can be compared across machines.
+    """
+    words = [f"sugar{i % 97}cane{i}" for i in range(20000)]
+    pattern = re.compile(r'cane(\d+)')
+
+    def workload():
+        text = " ".join(words)
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        numbers = sorted(int(match) for match in pattern.findall(text))
+        return len(digest) + len(numbers)
+
+    seconds, _ = best_time(workload, repeat)
+    return 1.0 / seconds
+
+
+def run_suite(data, names, repeat=3):
+    """
+    Time the selected benchmarks.
+
+    Returns:
+        dict: name -> items, seconds, items_per_second and MB_per_second of input text
+    """
+    text_bytes = sum(len(text.encode('utf-8')) for text in data['cleaned'])
+    results = {}
+    for name in names:
+        func, unit = BENCHMARKS[name]
+        seconds, items = best_time(lambda: func(data), repeat)
+        size = text_bytes * (2 if unit == 'pairs' else 1)
+        results[name] = {
+            'items': items,
+            'unit': unit,
+            'seconds': round(seconds, 6),
+            'items_per_second': round(items / seconds, 3) if seconds else 0.0,
+            'mb_per_second': round(size / 2**20 / seconds, 3) if seconds else 0.0,
+        }
+    return results
+
+
+def compare(results, calibration, baseline, tolerance):
+    """
+    Compare calibrated throughputs with a baseline.
+
+    Args:
+        results (dict): run_suite results
+        calibration (float): Calibration rate of this run
+        baseline (dict): Stored baseline with 'calibration' and 'benchmarks'
+        tolerance (float): Allowed relative throughput loss (0.25 = 25% slower)
+
+    Returns:
+        dict: name -> {'ratio': current / baseline calibrated throughput, 'regressed': bool};
+            benchmarks missing from the baseline are skipped
+    """
+    comparison = {}
+    for name, result in results.items():
+        stored = baseline['benchmarks'].get(name)
+        if not stored or not stored.get('items_per_second'):
+            continue
+        current = result['items_per_second'] / calibration
+        reference = stored['items_per_second'] / baseline['calibration']
+        ratio = current / reference
+        comparison[name] = {'ratio': round(ratio, 3), 'regressed': ratio < 1.0 - tolerance}
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the text-processing hot paths of ingestion')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Corpus seed')
+    parser.add_argument('--articles-per-language', type=int, default=DEFAULT_ARTICLES_PER_LANGUAGE,
+                        help='Synthetic articles per language')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark; the best is kept')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Benchmarks to run (default: all)')
+    parser.add_argument('--skip', nargs='+', choices=list(BENCHMARKS), default=[], help='Benchmarks to leave out')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed throughput loss before failing (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    names = [name for name in (args.only or BENCHMARKS) if name not in args.skip]
+    articles = make_corpus(args.seed, args.articles_per_language)
+    data = prepare(articles, args.seed)
+    environment = {'python': platform.python_version(), 'machine': platform.machine()}
+    if 'split_article_intelligently' in names:
+        environment['tiktoken'] = tiktoken_available()
+    if 'normalize' in names:
+        data['pipeline'] = make_pipeline()
+        environment['normalization'] = normalization_components(data['pipeline'])
+    corpus = {
+        'seed': args.seed,
+        'articles_per_language': args.articles_per_language,
+        'articles': len(articles),
+        'tokens': sum(article['tokens'] for article in articles),
+        'fingerprint': corpus_fingerprint(articles),
+    }
+    print(f"Corpus: {corpus['articles']} articles, {corpus['tokens']} tokens, "
+          f"languages {', '.join(LANGUAGES)} (fingerprint {corpus['fingerprint']})")
+
+    calibration = calibrate()
+    results = run_suite(data, names, args.repeat)
+    run = {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'corpus': corpus,
+        'environment': environment,
+        'calibration': round(calibration, 3),
+        'tolerance': args.tolerance,
+        'benchmarks': results,
+    }
+
+    baseline = None
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    comparison = {}
+    status = 0
+    if baseline is not None:
+        if baseline['corpus']['fingerprint'] != corpus['fingerprint']:
+            print(f"Baseline {baseline_path} was recorded for another corpus "
+                  f"(fingerprint {baseline['corpus']['fingerprint']}); not comparing")
+            status = 2
+        else:
+            for component in ('normalization', 'tiktoken'):
+                if component in environment and baseline.get('environment', {}).get(component) != environment[component]:
+                    print(f"Note: the baseline was recorded with a different {component} setup "
+                          f"({baseline.get('environment', {}).get(component)} vs {environment[component]})")
+            comparison = compare(results, calibration, baseline, args.tolerance)
+            run['comparison'] = comparison
+
+    print(f"\n{'Benchmark':<28} {'Items':>6} {'Seconds':>9} {'Items/s':>10} {'MB/s':>8} {'vs baseline':>12}")
+    for name, result in results.items():
+        versus = ''
+        if name in comparison:
+            versus = f"{comparison[name]['ratio']:.2f}x" + (' REGRESSED' if comparison[name]['regressed'] else '')
+        print(f"{name:<28} {result['items']:>6} {result['seconds']:>9.3f} {result['items_per_second']:>10.1f} "
+              f"{result['mb_per_second']:>8.2f} {versus:>12}")
+
+    regressed = [name for name, entry in comparison.items() if entry['regressed']]
+    if regressed:
+        print(f"\nThroughput regressed by more than {args.tolerance:.0%}: {', '.join(regressed)}")
+        status = 1
+
+    if args.save_baseline:
+        with open(baseline_path, 'w') as f:
+            json.dump(run, f, indent=2, ensure_ascii=False)
+        print(f"\nBaseline written to {baseline_path}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(run, f, indent=2, ensure_ascii=False)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
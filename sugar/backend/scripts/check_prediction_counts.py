@@ -16,11 +16,10 @@ def main():
     print("=== DETAILED PREDICTION COUNT ANALYSIS ===")
     
     try:
-        from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
-        from clickhouse_driver import Client
+        from sugar.backend.storage import get_store
         
         # Connect to database
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_store()
         print("✓ ClickHouse connection successful")
         
         # Check 1: Count all predictions for sugar articles
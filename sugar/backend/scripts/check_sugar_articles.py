@@ -19,13 +19,16 @@ def main():
     print(f"Started at: {datetime.now()}")
     
     try:
-        from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
-        from clickhouse_driver import Client
+        from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG, STORAGE_BACKEND, EMBEDDED_STORE_PATH
+        from sugar.backend.storage import get_store
         
-        print(f"Connecting to ClickHouse at {CLICKHOUSE_NATIVE_CONFIG['host']}:{CLICKHOUSE_NATIVE_CONFIG['port']}")
+        if STORAGE_BACKEND == 'embedded':
+            print(f"Opening the embedded store at {EMBEDDED_STORE_PATH}")
+        else:
+            print(f"Connecting to ClickHouse at {CLICKHOUSE_NATIVE_CONFIG['host']}:{CLICKHOUSE_NATIVE_CONFIG['port']}")
         
         # Test connection
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_store()
         
         # Execute a simple query to test connectivity
         result = client.execute('SELECT 1 as test')
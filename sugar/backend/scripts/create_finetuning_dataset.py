@@ -4,13 +4,20 @@ Script to create a fine-tuning dataset from news.source_of_truth table.
 Extracts data for all commodities and creates JSONL files for training and evaluation.
 """
 
-import os
+import sys
 import json
 import random
+from pathlib import Path
 from dotenv import load_dotenv
-from clickhouse_driver import Client
 from datetime import datetime
 
+# Add the project root to Python path
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.storage import get_store
+
 def extract_source_of_truth_data():
     """
     Extract data from news.source_of_truth table with non-empty text fields for all commodities.
@@ -21,24 +28,11 @@ def extract_source_of_truth_data():
     # Load environment variables
     load_dotenv()
 
-    # Get ClickHouse credentials
-    clickhouse_host = os.getenv('CLICKHOUSE_HOST')
-    clickhouse_user = os.getenv('CLICKHOUSE_USERNAME')
-    clickhouse_password = os.getenv('CLICKHOUSE_PASSWORD')
-
-    if not all([clickhouse_host, clickhouse_user, clickhouse_password]):
-        raise ValueError("Missing required ClickHouse credentials in .env file")
-
     try:
-        # Connect to ClickHouse
-        client = Client(
-            host=clickhouse_host,
-            port=9000,
-            user=clickhouse_user,
-            password=clickhouse_password
-        )
-
-        print("Connected to ClickHouse. Extracting data for all commodities...")
+        # Connect to the configured news store (ClickHouse or the embedded store)
+        client = get_store()
+
+        print(f"Connected to the {client.name} store. Extracting data for all commodities...")
 
         # Build query to extract data with non-empty text fields
         query = """
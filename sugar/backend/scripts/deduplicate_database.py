@@ -2,6 +2,13 @@
 """
 Script to deduplicate Sugar news articles in the news.news database table by removing duplicates
 that have the same title, text, source, and date. Only processes records where asset = 'Sugar'.
+
+Duplicates are grouped by cityHash64(title, text, source, datetime) in a single aggregation
+whose groups are streamed, using the materialized content_hash column when the table has one
+(--add-hash-column creates it). Removals are applied as one lightweight DELETE per partition
+(or one ALTER TABLE ... DELETE mutation per partition with --mutation). The default is a dry
+run that only reports what would be removed. With SUGAR_STORAGE_BACKEND=embedded the same
+steps run on the local Parquet store.
 """
 
 import sys
@@ -9,6 +16,8 @@ import os
 from pathlib import Path
 import json
 import argparse
+import time
+from collections import defaultdict
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -22,149 +31,137 @@ load_dotenv()
 
 # Import configuration
 try:
-    from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
+    from sugar.backend.parsers.metrics import PIPELINE_METRICS
+    from sugar.backend.storage import get_store
 except ImportError:
     print("Error: Could not import ClickHouse configuration")
     print("Make sure you're running this script from the correct directory")
     sys.exit(1)
 
-from clickhouse_driver import Client
+# Duplicate groups kept in full for the report
+SAMPLE_GROUPS = 20
+
 
 def connect_to_clickhouse():
-    """Connect to ClickHouse database"""
+    """Connect to the configured news store (ClickHouse unless SUGAR_STORAGE_BACKEND is set)"""
     try:
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
-        # Test connection
-        client.execute("SELECT 1")
-        print("✓ Successfully connected to ClickHouse database")
+        client = get_store()
+        # Test connection (the embedded store has no server to reach)
+        if client.name == 'clickhouse':
+            client.execute("SELECT 1")
+        print(f"✓ Successfully connected to {client.name} news store")
         return client
     except Exception as e:
-        print(f"✗ Error connecting to ClickHouse: {e}")
+        print(f"✗ Error connecting to the news store: {e}")
         return None
 
-def find_duplicates(client, keep_newest=True, batch_size=1000):
+def find_duplicates(store, keep_newest=True, batch_size=10000, progress_every=10000):
     """
     Find duplicate articles in the news.news table based on:
     - Same title
     - Same text
     - Same source
     - Same date (datetime field)
-    
+
+    The table is aggregated once by the content hash and the duplicate groups are streamed, so
+    memory holds only the (id, created_at) keys to remove and a sample of groups.
+
     Args:
-        client: ClickHouse client
+        store: News store (see sugar.backend.storage)
         keep_newest: If True, keep the newest record when duplicates are found
                     If False, keep the oldest record
-        batch_size: Number of records to process at once
-    
+        batch_size: Rows per streamed block
+        progress_every: Print progress after this many groups
+
     Returns:
-        List of duplicate groups and total count of duplicates
+        dict: Groups, duplicates, the keys to remove per partition ID, sample groups and
+            the number of exact copies that a delete cannot separate from the kept record
     """
+    scan = {
+        'groups': 0,
+        'duplicates': 0,
+        'exact_copies': 0,
+        'partitions': defaultdict(list),
+        'samples': [],
+        'seconds': 0.0
+    }
     try:
         print("\nFinding duplicate articles...")
-        print("This may take a while for large datasets...")
-        
-        # First, let's get a count of total records to process
-        count_query = "SELECT COUNT(*) FROM news.news WHERE asset = 'Sugar'"
-        total_records = client.execute(count_query)[0][0]
-        print(f"Total Sugar records in database: {total_records:,}")
-        
-        # Query to find duplicates based on title, text, source, and datetime
-        # Only for records where asset = 'Sugar'
-        # Using a more efficient approach with LIMIT and OFFSET for pagination
-        duplicate_groups = []
-        total_duplicates = 0
-        offset = 0
-        
-        while True:
-            print(f"Processing records {offset:,} to {offset + batch_size:,}...")
-            
-            # Get a batch of potential duplicates
-            batch_query = f"""
-            SELECT
-                title,
-                text,
-                source,
-                datetime,
-                COUNT(*) as duplicate_count,
-                groupArray(id) as duplicate_ids,
-                groupArray(created_at) as created_at_times
-            FROM news.news
-            WHERE asset = 'Sugar'
-            GROUP BY
-                title,
-                text,
-                source,
-                datetime
-            HAVING COUNT(*) > 1
-            ORDER BY duplicate_count DESC
-            LIMIT {batch_size} OFFSET {offset}
-            """
-            
-            batch_duplicates = client.execute(batch_query)
-            
-            if not batch_duplicates:
-                break
-            
-            # Process this batch
-            for title, text, source, datetime_val, count, ids, created_times in batch_duplicates:
+
+        started = time.perf_counter()
+        with PIPELINE_METRICS.time('dedup_scan') as timer:
+            rows = store.duplicate_groups(asset='Sugar', batch_size=batch_size)
+            for group_hash, count, records, title, source, datetime_val in rows:
                 # Determine which record to keep based on created_at timestamp
-                if keep_newest:
-                    # Keep the record with the newest created_at timestamp
-                    keep_index = created_times.index(max(created_times))
-                else:
-                    # Keep the record with the oldest created_at timestamp
-                    keep_index = created_times.index(min(created_times))
-                
-                # The ID to keep
-                keep_id = ids[keep_index]
-                
-                # IDs to remove (all except the one we're keeping)
-                remove_ids = [id for i, id in enumerate(ids) if i != keep_index]
-                
-                duplicate_group = {
-                    'title': title,
-                    'text': text[:100] + '...' if len(text) > 100 else text,
-                    'source': source,
-                    'datetime': datetime_val,
-                    'duplicate_count': count,
-                    'keep_id': keep_id,
-                    'remove_ids': remove_ids,
-                    'keep_created_at': created_times[keep_index]
-                }
-                
-                duplicate_groups.append(duplicate_group)
-                total_duplicates += len(remove_ids)
-            
-            offset += batch_size
-            
-            # If we got fewer records than the batch size, we're done
-            if len(batch_duplicates) < batch_size:
-                break
-        
-        if not duplicate_groups:
+                created_times = [created_at for _, created_at, _ in records]
+                keep_index = created_times.index(max(created_times) if keep_newest else min(created_times))
+                keep_key = records[keep_index][:2]
+
+                remove_keys = []
+                for i, (record_id, created_at, partition_id) in enumerate(records):
+                    if i == keep_index:
+                        continue
+                    if (record_id, created_at) == keep_key:
+                        # Same ID and insert time as the kept record: a delete would remove both
+                        scan['exact_copies'] += 1
+                        continue
+                    scan['partitions'][partition_id].append((record_id, created_at))
+                    remove_keys.append(record_id)
+
+                scan['groups'] += 1
+                scan['duplicates'] += len(remove_keys)
+                if len(scan['samples']) < SAMPLE_GROUPS:
+                    scan['samples'].append({
+                        'content_hash': group_hash,
+                        'title': title,
+                        'source': source,
+                        'datetime': datetime_val,
+                        'duplicate_count': count,
+                        'keep_id': keep_key[0],
+                        'keep_created_at': keep_key[1],
+                        'remove_ids': remove_keys
+                    })
+
+                if scan['groups'] % progress_every == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"  {scan['groups']:,} groups, {scan['duplicates']:,} duplicates "
+                          f"({scan['groups'] / elapsed:,.0f} groups/s)")
+            timer.items = scan['groups']
+        scan['seconds'] = round(time.perf_counter() - started, 3)
+        PIPELINE_METRICS.increment('dedup_groups', scan['groups'])
+        PIPELINE_METRICS.increment('dedup_duplicates', scan['duplicates'])
+
+        if not scan['groups']:
             print("No duplicates found in the database.")
-            return [], 0
-        
-        print(f"Found {len(duplicate_groups)} groups of duplicates")
-        print(f"Total duplicate articles to be removed: {total_duplicates:,}")
-        
-        return duplicate_groups, total_duplicates
-        
+            return scan
+
+        print(f"Found {scan['groups']:,} groups of duplicates in {scan['seconds']:.1f}s")
+        print(f"Total duplicate articles to be removed: {scan['duplicates']:,} "
+              f"in {len(scan['partitions'])} partition(s)")
+        return scan
+
     except Exception as e:
         print(f"Error finding duplicates: {e}")
-        return [], 0
+        return scan
 
-def display_duplicates(duplicate_groups, total_duplicates):
+def display_duplicates(scan):
     """Display the duplicates that will be removed"""
     print("\n" + "="*80)
     print("DUPLICATE ARTICLES FOUND")
     print("="*80)
-    
-    print(f"Total duplicate groups: {len(duplicate_groups)}")
-    print(f"Total duplicate articles to be removed: {total_duplicates}")
-    
+
+    print(f"Total duplicate groups: {scan['groups']}")
+    print(f"Total duplicate articles to be removed: {scan['duplicates']}")
+    if scan['exact_copies']:
+        print(f"Exact copies (same id and created_at as the kept record) left in place: {scan['exact_copies']}")
+        print("  Remove them with OPTIMIZE TABLE news.news FINAL DEDUPLICATE")
+
+    print("\nDuplicates per partition:")
+    for partition_id, keys in sorted(scan['partitions'].items()):
+        print(f"  {partition_id}: {len(keys):,}")
+
     print("\nSample of duplicates (first 5 groups):")
-    for i, group in enumerate(duplicate_groups[:5], 1):
+    for i, group in enumerate(scan['samples'][:5], 1):
         print(f"\nGroup {i}:")
         print(f"  Title: {group['title']}")
         print(f"  Source: {group['source']}")
@@ -176,132 +173,95 @@ def display_duplicates(duplicate_groups, total_duplicates):
             print(f"    {j}. {remove_id}")
         if len(group['remove_ids']) > 3:
             print(f"    ... and {len(group['remove_ids']) - 3} more")
-    
-    if len(duplicate_groups) > 5:
-        print(f"\n... and {len(duplicate_groups) - 5} more duplicate groups")
 
-def remove_duplicates(client, duplicate_groups, dry_run=True):
+    if scan['groups'] > 5:
+        print(f"\n... and {scan['groups'] - 5} more duplicate groups")
+
+def remove_duplicates(store, partitions, dry_run=True, use_mutation=False):
     """
-    Remove duplicate articles from the database
-    
+    Remove duplicate articles from the database with one statement per partition
+
     Args:
-        client: ClickHouse client
-        duplicate_groups: List of duplicate groups
+        store: News store (see sugar.backend.storage)
+        partitions: (id, created_at) keys to remove per partition ID
         dry_run: If True, only show what would be removed
-    
+        use_mutation: Use ALTER TABLE ... DELETE (for servers without lightweight deletes)
+
     Returns:
         Number of articles removed
     """
-    try:
-        if dry_run:
-            print("\n=== DRY RUN MODE ===")
-            print("No articles will be removed. This is a preview only.")
-            return 0
-        
-        print("\nRemoving duplicate articles...")
-        
-        total_removed = 0
-        
-        for group in duplicate_groups:
-            remove_ids = group['remove_ids']
-            
-            if not remove_ids:
-                continue
-            
-            # Build the DELETE query for this group
-            ids_str = "', '".join(remove_ids)
-            delete_query = f"""
-            ALTER TABLE news.news
-            DELETE WHERE id IN ('{ids_str}')
-            """
-            
-            try:
-                result = client.execute(delete_query)
-                removed_count = len(remove_ids)
-                total_removed += removed_count
-                print(f"Removed {removed_count} duplicates for article: {group['title'][:50]}...")
-            except Exception as e:
-                print(f"Error removing duplicates for article {group['title'][:50]}...: {e}")
-                continue
-        
-        return total_removed
-        
-    except Exception as e:
-        print(f"Error removing duplicates: {e}")
+    if dry_run:
+        print("\n=== DRY RUN MODE ===")
+        print("No articles will be removed. This is a preview only.")
         return 0
 
-def verify_deduplication(client, duplicate_groups):
+    print(f"\nRemoving duplicate articles from {len(partitions)} partition(s)...")
+
+    total_removed = 0
+    for partition_id, keys in sorted(partitions.items()):
+        if not keys:
+            continue
+        started = time.perf_counter()
+        try:
+            with PIPELINE_METRICS.time('dedup_delete', items=len(keys)):
+                store.delete_records(partition_id, list(keys), use_mutation=use_mutation)
+        except Exception as e:
+            print(f"Error removing {len(keys)} duplicates from partition {partition_id}: {e}")
+            continue
+        total_removed += len(keys)
+        print(f"Removed {len(keys):,} duplicates from partition {partition_id} "
+              f"in {time.perf_counter() - started:.2f}s")
+
+    PIPELINE_METRICS.increment('dedup_removed', total_removed)
+    return total_removed
+
+def verify_deduplication(store, partitions):
     """Verify that duplicates have been removed"""
     try:
         print("\nVerifying deduplication...")
-        
-        # Check if any of the duplicate IDs still exist
-        all_remove_ids = []
-        for group in duplicate_groups:
-            all_remove_ids.extend(group['remove_ids'])
-        
-        if not all_remove_ids:
+
+        if not any(partitions.values()):
             print("No duplicates to verify")
             return True
-        
-        # Check in batches to avoid query size limits
-        batch_size = 100
-        remaining_ids = []
-        
-        for i in range(0, len(all_remove_ids), batch_size):
-            batch_ids = all_remove_ids[i:i + batch_size]
-            ids_str = "', '".join(batch_ids)
-            
-            query = f"""
-            SELECT COUNT(*) 
-            FROM news.news 
-            WHERE id IN ('{ids_str}')
-            """
-            
-            result = client.execute(query)
-            count = result[0][0] if result else 0
-            
-            if count > 0:
-                # Find which IDs still exist
-                existing_query = f"""
-                SELECT id 
-                FROM news.news 
-                WHERE id IN ('{ids_str}')
-                """
-                existing_ids = client.execute(existing_query)
-                remaining_ids.extend([id[0] for id in existing_ids])
-        
-        if remaining_ids:
-            print(f"⚠ Warning: {len(remaining_ids)} duplicate articles still exist in the database")
+
+        remaining = sum(store.count_records(partition_id, list(keys)) for partition_id, keys in partitions.items())
+
+        if remaining:
+            print(f"⚠ Warning: {remaining} duplicate articles still exist in the database")
             return False
         else:
             print("✓ All duplicates successfully removed")
             return True
-            
+
     except Exception as e:
         print(f"Error verifying deduplication: {e}")
         return False
 
-def save_report(duplicate_groups, total_duplicates, removed_count, verification_passed):
+def save_report(scan, removed_count, verification_passed, dry_run):
     """Save a report of the deduplication process"""
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_file = f"deduplication_report_{timestamp}.json"
-        
+
         report = {
             "timestamp": datetime.now().isoformat(),
-            "total_duplicate_groups": len(duplicate_groups),
-            "total_duplicates_found": total_duplicates,
+            "dry_run": dry_run,
+            "total_duplicate_groups": scan['groups'],
+            "total_duplicates_found": scan['duplicates'],
+            "exact_copies_left": scan['exact_copies'],
+            "duplicates_per_partition": {partition_id: len(keys) for partition_id, keys in scan['partitions'].items()},
             "duplicates_removed": removed_count,
             "verification_passed": verification_passed,
-            "duplicate_groups": duplicate_groups
+            "scan_seconds": scan['seconds'],
+            "metrics": PIPELINE_METRICS.snapshot(),
+            "sample_duplicate_groups": scan['samples']
         }
-        
+
         with open(report_file, 'w') as f:
             json.dump(report, f, indent=2, default=str)
-        
+
         print(f"\nDetailed report saved to: {report_file}")
-        
+
     except Exception as e:
         print(f"Error saving report: {e}")
 
@@ -309,7 +269,7 @@ def main():
     """Main function"""
     print("=== NEWS DATABASE DEDUPLICATION TOOL ===")
     print(f"Started at: {datetime.now()}")
-    
+
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Deduplicate Sugar news articles in ClickHouse database')
     parser.add_argument('--dry-run', action='store_true', default=True,
@@ -318,69 +278,84 @@ def main():
                        help='Actually remove duplicates (disables dry-run mode)')
     parser.add_argument('--keep-oldest', action='store_true',
                        help='Keep the oldest record instead of the newest when duplicates are found')
-    parser.add_argument('--batch-size', type=int, default=1000,
-                       help='Number of records to process at once (default: 1000)')
-    
+    parser.add_argument('--batch-size', type=int, default=10000,
+                       help='Rows per streamed block of duplicate groups (default: 10000)')
+    parser.add_argument('--add-hash-column', action='store_true',
+                       help='Add the materialized content_hash column to news.news before scanning (ClickHouse)')
+    parser.add_argument('--mutation', action='store_true',
+                       help='Remove with ALTER TABLE ... DELETE mutations instead of lightweight deletes')
+    parser.add_argument('--report', action='store_true',
+                       help='Save a JSON report (always saved after an execution)')
+
     args = parser.parse_args()
-    
+
     # Set dry_run mode
     dry_run = not args.execute
-    
+
     # Set which record to keep
     keep_newest = not args.keep_oldest
-    
+
     print(f"Mode: {'DRY RUN' if dry_run else 'EXECUTION'}")
     print(f"Strategy: Keep {'newest' if keep_newest else 'oldest'} record when duplicates found")
     print(f"Batch size: {args.batch_size}")
-    
+
     # Connect to database
     client = connect_to_clickhouse()
     if not client:
         sys.exit(1)
-    
+
+    PIPELINE_METRICS.reset('deduplicate-database')
     try:
+        if args.add_hash_column and hasattr(client, 'add_content_hash_column'):
+            client.add_content_hash_column()
+            print("✓ Added materialized column content_hash = cityHash64(title, text, source, datetime)")
+
         # Find duplicates
-        duplicate_groups, total_duplicates = find_duplicates(client, keep_newest=keep_newest, batch_size=args.batch_size)
-        
-        if not duplicate_groups:
+        scan = find_duplicates(client, keep_newest=keep_newest, batch_size=args.batch_size)
+
+        if not scan['groups']:
             print("No duplicates found. Nothing to do.")
             return
-        
+
         # Display duplicates
-        display_duplicates(duplicate_groups, total_duplicates)
-        
+        display_duplicates(scan)
+
         # Remove duplicates
-        removed_count = remove_duplicates(client, duplicate_groups, dry_run=dry_run)
-        
+        removed_count = remove_duplicates(client, scan['partitions'], dry_run=dry_run, use_mutation=args.mutation)
+
         if not dry_run and removed_count > 0:
             # Verify removal
-            verification_passed = verify_deduplication(client, duplicate_groups)
-            
+            verification_passed = verify_deduplication(client, scan['partitions'])
+
             # Print summary
             print("\n" + "="*80)
             print("DEDUPLICATION SUMMARY")
             print("="*80)
-            print(f"Total duplicates found: {total_duplicates}")
+            print(f"Total duplicates found: {scan['duplicates']}")
             print(f"Total duplicates removed: {removed_count}")
             print(f"Verification: {'PASSED' if verification_passed else 'FAILED'}")
-            
+
             # Save report
-            save_report(duplicate_groups, total_duplicates, removed_count, verification_passed)
+            save_report(scan, removed_count, verification_passed, dry_run)
         elif dry_run:
             print("\n" + "="*80)
             print("DRY RUN SUMMARY")
             print("="*80)
-            print(f"Total duplicates found: {total_duplicates}")
-            print(f"Total duplicates that would be removed: {total_duplicates}")
+            print(f"Total duplicates found: {scan['duplicates']}")
+            print(f"Total duplicates that would be removed: {scan['duplicates']}")
+            print(f"Statements that would be run: {len(scan['partitions'])} (one per partition)")
+            print(f"Scan time: {scan['seconds']:.1f}s")
             print("Run with --execute to actually remove the duplicates")
-        
+            if args.report:
+                save_report(scan, 0, None, dry_run)
+
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
     finally:
         client.disconnect()
-        print("\nDisconnected from ClickHouse database")
+        print("\nDisconnected from news store")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -8,7 +8,6 @@ import sys
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
-from clickhouse_driver import Client
 
 # Add the project root to Python path
 current_dir = Path(__file__).resolve().parent
@@ -20,7 +19,7 @@ load_dotenv()
 
 # Import configuration
 try:
-    from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
+    from sugar.backend.db import get_pool
 except ImportError:
     print("Error: Could not import ClickHouse configuration")
     print("Make sure you're running this script from the correct directory")
@@ -29,7 +28,7 @@ except ImportError:
 def connect_to_clickhouse():
     """Connect to ClickHouse database"""
     try:
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_pool()
         # Test connection
         client.execute("SELECT 1")
         print("✓ Successfully connected to ClickHouse database")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+"""
+Measure the memory held by processed articles of one month.
+
+Compares the previous representation (the result dict with the full pandas row as
+'raw_article' and the per-part triage results) with ArticleRecord (downstream fields only,
+interned source names, raw document held as a reference into the response cache).
+
+A real month is replayed from a populated Opoint response cache (no network access):
+
+    python measure_article_memory.py --response-cache-dir /path/to/cache --month 2024-01
+
+Without --response-cache-dir, a synthetic month of Opoint-shaped documents is written to a
+temporary cache and measured instead:
+
+    python measure_article_memory.py [--articles 2000]
+
+Normalization runs without the translation and spaCy models, which only changes the text
+of non-English articles, not what each representation keeps.
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.api.opoint.opoint_api import OpointAPI
+from sugar.backend.api.opoint.response_cache import OpointResponseCache
+from sugar.backend.parsers.article_record import ArticleRecord
+from sugar.backend.parsers.sugar_news_fetcher import build_dedup_entry
+from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+
+SITES = [('Nasdaq', 913), ('Barchart', 3478), ('Investing.com', 15086), ('Reuters', 1)]
+PARAGRAPH = (
+    "<p>Raw sugar futures on ICE rose 1.4% to 21.35 cents per pound as UNICA reported that mills in "
+    "Centre-South Brazil crushed less cane than expected in the second half of the month. "
+    "Traders also watched India's monsoon and the export quota for the coming season, while "
+    "white sugar in London gained $6.20 to $612.40 a tonne.</p>"
+)
+
+
+def make_month_documents(count, month_start):
+    """Opoint-shaped documents with the text sizes of a typical month"""
+    documents = []
+    for i in range(count):
+        site_name, site_id = SITES[i % len(SITES)]
+        body = PARAGRAPH * (2 + i % 12) + f"<p>Report {i}.</p>"
+        documents.append({
+            "header": {"text": f"Sugar prices move on Brazil harvest update {i}"},
+            "summary": {"text": PARAGRAPH[3:200]},
+            "body": {"text": body},
+            "local_time": {"text": month_start.replace(day=1 + i % 28).isoformat()},
+            "unix_timestamp": int(month_start.timestamp()) + i * 60,
+            "orig_url": f"https://www.example.com/markets/sugar/{i}",
+            "url": f"https://m360.opoint.com/story/{i}",
+            "first_source": {"sitename": site_name, "name": site_name, "url": "https://www.example.com"},
+            "id_site": site_id,
+            "id_article": i,
+            "position": i % 100,
+            "language": {"text": "en"},
+            "word_count": len(body.split())
+        })
+    return documents
+
+
+def write_synthetic_month(cache, documents, month_start, month_end, page_size=100):
+    """Store documents in the cache as one search response per page"""
+    for page, offset in enumerate(range(0, len(documents), page_size)):
+        payload = {
+            "expressions": [{"linemode": "R", "searchline": {"searchterm": f"sugar page:{page}", "filters": []}}],
+            "params": {"requestedarticles": page_size,
+                       "oldest": int(month_start.timestamp()), "newest": int(month_end.timestamp())}
+        }
+        cache.put(payload, {"searchresult": {"document": documents[offset:offset + page_size]}})
+
+
+def load_month_rows(cache, month_start, month_end, limit=None):
+    """Replay the cached searches of a month as OpointAPI would return them"""
+    api = OpointAPI(api_key="replay", cache=cache, cache_mode='replay')
+    frames = []
+    for key in cache.keys_between(int(month_start.timestamp()), int(month_end.timestamp())):
+        documents = cache.get_documents(key)
+        if documents:
+            frames.append(api._documents_to_dataframe(documents, cache_key=key))
+    if not frames:
+        return pd.DataFrame()
+    rows = pd.concat(frames, ignore_index=True)
+    return rows.head(limit) if limit else rows
+
+
+def legacy_result(entry):
+    """The article as kept before ArticleRecord: the result dict with its content hash"""
+    result = entry['result']
+    result['content_hash'] = entry['content_hash']
+    return result
+
+
+def record_result(entry):
+    return ArticleRecord.from_result(entry['result'], entry['content_hash'])
+
+
+def measure(cache, month_start, month_end, pipeline, keep, limit=None):
+    """
+    Process a month and measure what stays allocated once only the kept articles are referenced.
+
+    Returns:
+        tuple: (number of articles, retained bytes, peak bytes, DataFrame bytes, seconds)
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = load_month_rows(cache, month_start, month_end, limit)
+    entries = [build_dedup_entry(article, pipeline) for _, article in rows.iterrows()]
+    kept = [keep(entry) for entry in entries if entry]
+    del rows, entries
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+
+    frame_bytes = int(pd.DataFrame(kept).memory_usage(deep=True).sum()) if kept else 0
+    return len(kept), retained, peak, frame_bytes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure memory held by processed articles')
+    parser.add_argument('--response-cache-dir', help='Populated Opoint response cache to replay a month from')
+    parser.add_argument('--month', default='2024-01', help='Month to replay (YYYY-MM)')
+    parser.add_argument('--articles', type=int, default=2000, help='Synthetic articles when no cache is given')
+    parser.add_argument('--limit', type=int, help='Maximum number of cached articles to process')
+    args = parser.parse_args()
+
+    month_start = datetime.strptime(args.month, '%Y-%m')
+    next_month = (month_start.replace(day=28) + pd.Timedelta(days=4)).replace(day=1)
+    month_end = next_month - pd.Timedelta(seconds=1)
+
+    pipeline = LanguageNormalizationPipeline()
+    pipeline.tokenizer = None
+    pipeline.model = None
+    pipeline.nlp = None
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.response_cache_dir:
+            cache = OpointResponseCache(args.response_cache_dir, ttl_seconds=None)
+            source = f"response cache {args.response_cache_dir}"
+        else:
+            cache = OpointResponseCache(temp_dir, ttl_seconds=None)
+            write_synthetic_month(cache, make_month_documents(args.articles, month_start), month_start, month_end)
+            source = f"{args.articles} synthetic articles"
+
+        print(f"Measuring {args.month} from {source}")
+        # Warm up lazy imports and compiled patterns so neither run is charged for them
+        measure(cache, month_start, month_end, pipeline, record_result, limit=10)
+        results = {
+            'dict + raw_article': measure(cache, month_start, month_end, pipeline, legacy_result, args.limit),
+            'ArticleRecord': measure(cache, month_start, month_end, pipeline, record_result, args.limit)
+        }
+        cache.close()
+
+    count = results['ArticleRecord'][0]
+    if not count:
+        print("No articles found for this month")
+        return
+
+    print(f"\n{'Representation':<20} {'Articles':>8} {'Retained MB':>12} {'Per article':>12} "
+          f"{'Peak MB':>9} {'DataFrame MB':>13} {'Seconds':>8}")
+    for name, (articles, retained, peak, frame_bytes, elapsed) in results.items():
+        print(f"{name:<20} {articles:>8} {retained / 2**20:>12.1f} {retained / max(articles, 1):>10.0f} B "
+              f"{peak / 2**20:>9.1f} {frame_bytes / 2**20:>13.1f} {elapsed:>8.1f}")
+
+    legacy_retained = results['dict + raw_article'][1]
+    record_retained = results['ArticleRecord'][1]
+    print(f"\nRetained memory reduced by {(1 - record_retained / legacy_retained) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,13 +20,16 @@ def retrieve_sugar_articles():
     print("Retrieving sugar articles from ClickHouse database...")
     
     try:
-        from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
-        from clickhouse_driver import Client
+        from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG, STORAGE_BACKEND, EMBEDDED_STORE_PATH
+        from sugar.backend.storage import get_store
         
-        print(f"Connecting to ClickHouse at {CLICKHOUSE_NATIVE_CONFIG['host']}:{CLICKHOUSE_NATIVE_CONFIG['port']}")
+        if STORAGE_BACKEND == 'embedded':
+            print(f"Opening the embedded store at {EMBEDDED_STORE_PATH}")
+        else:
+            print(f"Connecting to ClickHouse at {CLICKHOUSE_NATIVE_CONFIG['host']}:{CLICKHOUSE_NATIVE_CONFIG['port']}")
         
         # Connect to the database
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_store()
         
         # Define sugar-related keywords
         sugar_keywords = [
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Test script for the multi-core article processing stage (ArticleProcessPool).
+
+This script tests:
+1. That pool results are identical to in-process build_dedup_entry, in input order
+2. That titles and texts are normalized in one batched call in the parent process
+3. That run_month_pipeline gives the same counters and saved articles with and without the pool
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers.article_processing import ArticleProcessPool
+from sugar.backend.parsers.sugar_news_fetcher import (
+    build_dedup_entry,
+    create_global_dedup_cache,
+    run_month_pipeline
+)
+from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+
+PUBLISHED = datetime(2024, 1, 15, 10, 0)
+WORDS = ['Brazil', 'India', 'Thailand', 'ethanol', 'cane', 'harvest', 'exports', 'refinery', 'monsoon', 'frost']
+
+
+def make_articles(count):
+    articles = [{
+        'title': f"Sugar market update {i}" if i % 3 else f"Coffee market update {i}",
+        'text': f"<p>Futures reacted to {WORDS[i % 10]} {i} and {WORDS[(i // 10 + i + 1) % 10]} news.</p>"
+                + (" Raw sugar NY11 Price: 21.5" if i % 4 == 0 else ""),
+        'site_name': 'Nasdaq',
+        'id_site': 913,
+        'url': f"https://www.nasdaq.com/sugar/{i}",
+        'published_date': PUBLISHED,
+        'unix_timestamp': int(PUBLISHED.timestamp()),
+        'summary': "not needed for processing"
+    } for i in range(count)]
+    # Long enough to go through the split-article path
+    articles[-1]['text'] = "<p>" + "Brazil frost hit the cane harvest and raw sugar futures rallied. " * 150 + "</p>"
+    return articles
+
+
+def make_pipeline():
+    pipeline = LanguageNormalizationPipeline()
+    pipeline.tokenizer = None
+    pipeline.model = None
+    pipeline.nlp = None
+    return pipeline
+
+
+def without_raw_article(entry):
+    if entry is None:
+        return None
+    result = {key: value for key, value in entry['result'].items() if key != 'raw_article'}
+    return dict(entry, result=result)
+
+
+def test_identical_entries():
+    """Test that the pool builds the same entries as in-process processing"""
+    print("\n=== TEST 1: Identical entries ===")
+
+    articles = [pd.Series(article) for article in make_articles(30)]
+    expected = [build_dedup_entry(article, make_pipeline()) for article in articles]
+
+    pipeline = make_pipeline()
+    pipeline.normalize_batch = Mock(side_effect=pipeline.normalize_batch)
+    with ArticleProcessPool(max_workers=2, chunk_size=4) as pool:
+        entries = pool.process(articles, pipeline)
+        assert pool.stats['chunks'] == 8
+
+    assert [without_raw_article(entry) for entry in entries] == [without_raw_article(entry) for entry in expected]
+    assert all(entry['result']['raw_article'] is article for entry, article in zip(entries, articles))
+    assert pipeline.normalize_batch.call_count == 1, "Titles and texts are normalized in one batched call"
+    print(f"✓ {len(entries)} entries identical to in-process processing")
+
+
+def run_month(article_processor=None):
+    articles = pd.DataFrame(make_articles(25))
+    saved = []
+
+    def mock_search_articles(*args, **kwargs):
+        # Both topics return the same articles; the second topic must be deduplicated
+        return articles if kwargs['site_id'] == '913' else pd.DataFrame()
+
+    def mock_save(df, metadata, asset, dedup_index=None, filter_sources=True):
+        saved.extend(df['id'])
+        return len(df)
+
+    with patch('sugar.backend.parsers.sugar_news_fetcher.OpointAPI') as mock_api_class, \
+            patch('sugar.backend.parsers.sugar_news_fetcher.save_to_database', side_effect=mock_save), \
+            patch('sugar.backend.parsers.sugar_news_fetcher.filter_trusted_sources', side_effect=lambda df, verbose=True: df):
+        mock_api = Mock()
+        mock_api.search_articles.side_effect = mock_search_articles
+        mock_api_class.return_value = mock_api
+        stats = run_month_pipeline(
+            "test-key", datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59),
+            ['20000386', '20000324'], 100, make_pipeline(), {'processing_mode': 'monthly'},
+            global_dedup_cache=create_global_dedup_cache(datetime(2024, 1, 1)),
+            queue_size=4, save_batch_size=10, topic_delay=0, article_processor=article_processor
+        )
+    stats.pop('pipeline')
+    # Whether a repeat from the second topic is caught by its URL or its content depends on
+    # how far the dedup stage has got, so only the total number of duplicates is stable
+    stats['duplicates'] = stats.pop('url_duplicates') + stats.pop('content_duplicates')
+    return stats, saved
+
+
+def test_month_pipeline_with_pool():
+    """Test that the pool does not change the month pipeline's results"""
+    print("\n=== TEST 2: Month pipeline with process pool ===")
+
+    expected_stats, expected_saved = run_month()
+    with ArticleProcessPool(max_workers=2, chunk_size=3) as pool:
+        stats, saved = run_month(pool)
+
+    assert stats == expected_stats, f"{stats} != {expected_stats}"
+    assert saved == expected_saved, "Saved articles and their order must not change"
+    assert stats['processed'] == 25 and stats['sugar'] > 0
+    print(f"✓ {stats['processed']} articles processed, {stats['saved']} saved, identical with and without the pool")
+
+
+if __name__ == "__main__":
+    test_identical_entries()
+    test_month_pipeline_with_pool()
+    print("\n✅ All article process pool tests passed!")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""
+Test script for the compact processed-article record (ArticleRecord).
+
+This script tests:
+1. That records keep the downstream fields, drop raw_article and part_results, intern source
+   names and behave like the result dicts for .get(), DataFrames, pickling and checkpoints
+2. That OpointAPI rows reference their raw document in the response cache and that the
+   reference reloads the original document
+3. That register_unique_article returns records and that they hold less memory than the
+   result dicts with the raw row
+"""
+
+import gc
+import pickle
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.api.opoint.opoint_api import OpointAPI
+from sugar.backend.api.opoint.response_cache import OpointResponseCache
+from sugar.backend.parsers.article_record import ARTICLE_FIELDS, ArticleRecord, RawArticleRef
+from sugar.backend.parsers.checkpoints import SegmentCheckpointStore
+from sugar.backend.parsers.sugar_news_fetcher import (
+    build_dedup_entry,
+    create_global_dedup_cache,
+    register_unique_article
+)
+
+PUBLISHED = datetime(2024, 1, 15, 10, 0)
+
+
+def make_result(i, site_name='Nasdaq'):
+    """A result dict as returned by normalize_and_filter_article"""
+    return {
+        'id': f"id-{i}",
+        'site_name': ''.join(site_name),  # A fresh string, not the literal
+        'clean_title': f"Sugar prices rise {i}",
+        'clean_text': f"Raw sugar futures climbed in session {i}.",
+        'published_date': PUBLISHED,
+        'url': f"https://www.nasdaq.com/sugar/{i}",
+        'score': None,
+        'context_zones_metadata': [],
+        'structured_pricing_metadata': [],
+        'entity_metadata': {'matched_keywords': ['sugar']},
+        'raw_article': pd.Series({'title': 'raw', 'response_cache_key': 'ab' * 32, 'response_index': i}),
+        'asset': 'Sugar',
+        'triage_passed': True,
+        'triage_reason': 'Passed sugar keyword filter',
+        'article_split': True,
+        'split_parts': 2,
+        'parts_passed': 1,
+        'part_results': [{'passed': True}, {'passed': False}]
+    }
+
+
+def make_response(n=3):
+    """Create a raw search response with n documents"""
+    return {
+        "searchresult": {
+            "document": [
+                {
+                    "header": {"text": f"Sugar prices rise {i}"},
+                    "body": {"text": f"<p>Raw sugar futures climbed in session {i}. " + "Brazil cane harvest. " * 40 + "</p>"},
+                    "local_time": {"text": "2024-01-15T10:00:00"},
+                    "orig_url": f"https://example.com/sugar/{i}",
+                    "first_source": {"sitename": "Nasdaq"},
+                    "id_site": 913,
+                    "id_article": i
+                }
+                for i in range(n)
+            ]
+        }
+    }
+
+
+def test_record_fields():
+    """Test the record fields and its mapping behaviour"""
+    print("\n=== TEST 1: Record fields ===")
+
+    result = make_result(1)
+    record = ArticleRecord.from_result(result, content_hash='hash-1')
+    other = ArticleRecord.from_result(make_result(2), content_hash='hash-2')
+
+    assert list(record) == list(ARTICLE_FIELDS)
+    assert 'raw_article' not in record and 'part_results' not in record
+    assert record['content_hash'] == 'hash-1' and record.get('asset') == 'Sugar'
+    assert record.get('source_name', '') == '' and record.get('triage_passed', False) is True
+    assert record.raw_ref == RawArticleRef('ab' * 32, 1)
+    assert record.site_name is other.site_name, "Source names should be interned"
+    assert not hasattr(record, '__dict__')
+    try:
+        record.asset = 'General'
+        raise AssertionError("Records should be read-only")
+    except AttributeError:
+        pass
+
+    restored = pickle.loads(pickle.dumps(record))
+    assert restored == record and restored.raw_ref == record.raw_ref
+
+    df = pd.DataFrame([record, other])
+    assert list(df.columns) == list(ARTICLE_FIELDS)
+    assert df['content_hash'].tolist() == ['hash-1', 'hash-2']
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        store = SegmentCheckpointStore(checkpoint_dir)
+        store.write_segment('2024-01', '20000386', [record, other])
+        loaded = pd.concat(list(store.iter_frames('2024-01')), ignore_index=True)
+    assert loaded['id'].tolist() == ['id-1', 'id-2']
+    assert loaded['entity_metadata'][0] == {'matched_keywords': ['sugar']}
+
+    plain = dict(make_result(3))
+    plain.pop('raw_article')
+    assert ArticleRecord.from_result(plain).raw_ref is None
+    print(f"✓ {len(ARTICLE_FIELDS)} fields kept; DataFrame, pickle and checkpoint round trips work")
+
+
+def test_raw_reference():
+    """Test that rows reference their raw document in the response cache"""
+    print("\n=== TEST 2: Raw document reference ===")
+
+    response = make_response(3)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = OpointResponseCache(cache_dir)
+        api = OpointAPI(api_key="test-key", cache=cache)
+        mock_response = Mock()
+        mock_response.json.return_value = response
+        mock_response.raise_for_status.return_value = None
+        with patch('sugar.backend.api.opoint.opoint_api.requests.post', return_value=mock_response):
+            df = api.search_articles(site_id="913", search_text="sugar", num_articles=3)
+
+        assert df['response_index'].tolist() == [0, 1, 2]
+        assert df['response_cache_key'].nunique() == 1
+        refs = [RawArticleRef.from_article(row) for _, row in df.iterrows()]
+        assert [ref.load(cache) for ref in refs] == response['searchresult']['document']
+        assert cache.get_document(refs[0].cache_key, 3) is None
+        cache.close()
+
+    uncached = OpointAPI(api_key="test-key")._documents_to_dataframe(response['searchresult']['document'])
+    assert 'response_cache_key' not in uncached.columns
+    assert RawArticleRef.from_article(uncached.iloc[0]) is None
+    print("✓ Raw documents are reloaded from the cache by (key, index)")
+
+
+def test_register_returns_records():
+    """Test register_unique_article and the retained memory"""
+    print("\n=== TEST 3: Dedup results and memory ===")
+
+    class Pipeline:
+        def normalize(self, text=None, sugar_pricing_lines=None):
+            return sugar_pricing_lines if sugar_pricing_lines is not None else text
+
+    response = make_response(60)
+    api = OpointAPI(api_key="test-key")
+    rows = api._documents_to_dataframe(response['searchresult']['document'], cache_key='cd' * 32)
+
+    def retained(keep):
+        # Both representations go through the same dedup cache registration
+        cache = create_global_dedup_cache(PUBLISHED)
+        gc.collect()
+        tracemalloc.start()
+        entries = [build_dedup_entry(article, Pipeline()) for _, article in rows.copy(deep=True).iterrows()]
+        kept = [keep(entry, register_unique_article(entry, cache)) for entry in entries]
+        del entries
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return kept, size
+
+    retained(lambda entry, record: record)  # Warm up lazy imports and compiled patterns
+    records, record_bytes = retained(lambda entry, record: record)
+    dicts, dict_bytes = retained(lambda entry, record: dict(entry['result'], content_hash=record['content_hash']))
+
+    assert all(isinstance(record, ArticleRecord) for record in records)
+    assert [record.raw_ref.index for record in records] == list(range(60))
+    assert [record['clean_text'] for record in records] == [result['clean_text'] for result in dicts]
+    assert record_bytes < dict_bytes * 0.75, f"{record_bytes} bytes retained, {dict_bytes} before"
+    print(f"✓ {len(records)} records retain {record_bytes} bytes instead of {dict_bytes}")
+
+
+if __name__ == "__main__":
+    test_record_fields()
+    test_raw_reference()
+    test_register_returns_records()
+    print("\n✅ All article record tests passed!")
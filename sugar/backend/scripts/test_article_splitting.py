@@ -7,6 +7,7 @@ This script tests:
 2. Article splitting for long articles
 3. Filtering logic for split articles
 4. Logging of split article processing
+5. That split articles are normalized once and keep the full-article metadata
 """
 
 import sys
@@ -184,6 +185,53 @@ def test_split_article_filtering():
     
     return result.get('article_split', False) and result.get('triage_passed', False)
 
+def test_split_article_normalized_once():
+    """Test that a split article is normalized once and its metadata matches the full text"""
+    print("\n=== Testing Normalize-Once Split Processing ===")
+    
+    paragraphs = [
+        "Raw sugar futures rallied after frost in the Centro-Sul cut the cane harvest outlook. " * 20,
+        "Coffee and cocoa futures moved sideways as traders watched the port of Santos in Brazil. " * 120,
+        "Analysts in Thailand expect a recovery in the crop next season. " * 20,
+    ]
+    test_article = {
+        'title': 'Softs weekly review',
+        'text': "\n\n".join(paragraphs) + "\n- Raw sugar NY11 contract closed at 21.5 cents",
+        'url': 'https://example.com/softs-weekly',
+        'published_date': '2025-01-15',
+        'site_name': 'Sugar Market News'
+    }
+    
+    class CountingNormalizationPipeline:
+        def __init__(self):
+            self.text_calls = 0
+        
+        def normalize(self, text=None, sugar_pricing_lines=None):
+            if sugar_pricing_lines:
+                return sugar_pricing_lines
+            self.text_calls += 1
+            return text
+    
+    normalization_pipeline = CountingNormalizationPipeline()
+    result = normalize_and_filter_article(test_article, normalization_pipeline)
+    
+    print(f"  Split parts: {result['split_parts']}, parts passed: {result['parts_passed']}")
+    print(f"  Text normalization calls: {normalization_pipeline.text_calls}")
+    
+    # Parts are slices of the normalized text
+    full_result = triage_filter(result['clean_text'], result['clean_title'])
+    checks = [
+        result['article_split'] and result['split_parts'] > 1,
+        normalization_pipeline.text_calls == 1,
+        0 < result['parts_passed'] < result['split_parts'],
+        result['context_zones_metadata'] == full_result['matched_zones'],
+        result['entity_metadata']['matched_keywords'] == full_result['matched_keywords'],
+        result['structured_pricing_metadata'] == full_result['extracted_sugar_pricing'],
+    ]
+    print(f"  Context zones: {result['context_zones_metadata']}")
+    print(f"  Matched keywords: {result['entity_metadata']['matched_keywords']}")
+    return all(checks)
+
 def main():
     """Run all tests"""
     print("Testing Article Splitting Implementation")
@@ -202,8 +250,13 @@ def main():
         filtering_test_passed = test_split_article_filtering()
         print(f"Split article filtering test: {'PASSED' if filtering_test_passed else 'FAILED'}")
         
+        # Test normalize-once split processing
+        normalize_once_test_passed = test_split_article_normalized_once()
+        print(f"Normalize-once split test: {'PASSED' if normalize_once_test_passed else 'FAILED'}")
+        
         # Overall result
-        all_tests_passed = token_test_passed and splitting_test_passed and filtering_test_passed
+        all_tests_passed = (token_test_passed and splitting_test_passed and filtering_test_passed
+                            and normalize_once_test_passed)
         
         print("\n" + "=" * 50)
         print(f"Overall test result: {'ALL TESTS PASSED' if all_tests_passed else 'SOME TESTS FAILED'}")
@@ -214,6 +267,7 @@ def main():
             print("✓ Each part is processed through the triage filter")
             print("✓ If ANY part passes, the ENTIRE article is retained")
             print("✓ Metadata extraction is performed on the complete article")
+            print("✓ Split articles are normalized once")
         else:
             print("\n✗ Some tests failed. Please check the implementation.")
         
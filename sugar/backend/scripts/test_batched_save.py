@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Test script for the batched ClickHouse save path (save_to_database).
+
+This script tests:
+1. That article IDs computed for a whole DataFrame equal those of generate_article_id
+2. That a 5,000 article batch takes a handful of round trips: chunked parameterized
+   IN queries and columnar INSERT blocks
+3. That articles known to the dedup index or the database, repeated IDs and non-Sugar
+   articles are not inserted
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.db import ClickHousePool
+from sugar.backend.parsers.dedup_index import PersistentDedupIndex
+from sugar.backend.parsers.news_parser import (
+    generate_article_id,
+    generate_article_ids,
+    save_to_database
+)
+from sugar.backend.storage.clickhouse import ID_CHECK_CHUNK_SIZE, ClickHouseStore
+
+METADATA = {'topic_ids': ['20000386'], 'person_entities': [], 'company_entities': [], 'keywords': []}
+
+
+def make_articles(count, asset='Sugar'):
+    return pd.DataFrame([{
+        'url': f"https://www.nasdaq.com/articles/{i}",
+        'title': f"Raw sugar futures move {i}",
+        'clean_title': f"Raw sugar futures move {i}",
+        'clean_text': "Raw sugar futures rose on lower Brazilian output.",
+        'published_date': pd.Timestamp('2024-01-15 08:30:00') + pd.Timedelta(minutes=i),
+        'site_name': 'Nasdaq',
+        'score': 0.5,
+        'triage_passed': True,
+        'triage_reason': 'sugar keywords',
+        'asset': asset
+    } for i in range(count)])
+
+
+def mock_store(client):
+    return ClickHouseStore(ClickHousePool(config={}, compression=False, client_factory=lambda **kwargs: client))
+
+
+def mock_client(existing_ids=()):
+    client = Mock()
+
+    def execute(query, params=None, columnar=False):
+        if query.startswith('SELECT'):
+            return [(article_id,) for article_id in params['ids'] if article_id in existing_ids]
+        return len(params[0])
+
+    client.execute.side_effect = execute
+    return client
+
+
+def test_vectorized_ids():
+    """Test that batch IDs match per-row IDs"""
+    print("\n=== TEST 1: Vectorized article IDs ===")
+
+    articles = make_articles(50)
+    articles.loc[3, 'url'] = None
+    articles['published_date'] = articles['published_date'].astype(object)
+    articles.loc[4, 'published_date'] = '2024-01-15T10:00:00Z'
+    ids = generate_article_ids(articles, articles['asset'].tolist())
+    expected = [
+        generate_article_id(row.get('url', ''), row.get('title', ''), row.get('published_date', ''), row['asset'])
+        for _, row in articles.iterrows()
+    ]
+    assert ids == expected
+    assert generate_article_ids(articles.drop(columns=['url']), ['Sugar'] * 50)[0] == generate_article_id(
+        '', articles.loc[0, 'title'], articles.loc[0, 'published_date'], 'Sugar'
+    )
+    print(f"✓ {len(ids)} IDs equal the per-row IDs, including missing URLs and columns")
+
+
+def test_round_trips():
+    """Test the number of database round trips of a large batch"""
+    print("\n=== TEST 2: Round trips ===")
+
+    articles = make_articles(5000)
+    ids = generate_article_ids(articles, ['Sugar'] * len(articles))
+    client = mock_client(existing_ids=set(ids[:100]))
+    store = mock_store(client)
+    with patch('sugar.backend.parsers.news_parser.get_store', return_value=store), \
+            patch('sugar.backend.parsers.news_parser.filter_trusted_sources') as source_filter:
+        saved = save_to_database(articles, METADATA, 'Sugar', filter_sources=False)
+
+    source_filter.assert_not_called()
+    assert saved == 4900
+    queries = [call.args for call in client.execute.call_args_list]
+    selects = [args for args in queries if args[0].startswith('SELECT')]
+    inserts = [args for args in queries if args[0].startswith('INSERT')]
+    assert len(selects) == -(-5000 // ID_CHECK_CHUNK_SIZE) and len(inserts) == 1
+    assert all("%(ids)s" in args[0] and ids[0] not in args[0] for args in selects), "IDs are passed as parameters"
+    columns = inserts[0][1]
+    assert len(columns) == 8 and all(len(column) == 4900 for column in columns)
+    assert columns[0][0] == ids[100] and columns[2][0] == 'Nasdaq' and columns[7][0] == 'Sugar'
+    assert client.execute.call_args_list[-1].kwargs == {'columnar': True}
+    assert store.client.snapshot()['connections_opened'] == 1 and store.client.stats['rows_written'] == 4900
+    print(f"✓ 5000 articles saved with {len(selects)} existence queries and {len(inserts)} columnar insert")
+
+
+def test_skipped_articles():
+    """Test that known, repeated and non-Sugar articles are skipped"""
+    print("\n=== TEST 3: Skipped articles ===")
+
+    articles = pd.concat([make_articles(10), make_articles(2).iloc[:1], make_articles(3, asset='General')],
+                         ignore_index=True)
+    ids = generate_article_ids(articles, articles['asset'].tolist())
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = PersistentDedupIndex(os.path.join(temp_dir, "dedup_index.db"), bloom_capacity=100)
+        index.add_many([{'db_id': ids[0]}, {'db_id': ids[1]}])
+        client = mock_client(existing_ids={ids[2]})
+        with patch('sugar.backend.parsers.news_parser.get_store', return_value=mock_store(client)):
+            saved = save_to_database(articles, METADATA, 'Sugar', dedup_index=index, filter_sources=False)
+
+        assert saved == 7, "2 indexed, 1 in the database, 1 repeated and 3 non-Sugar articles are skipped"
+        checked = client.execute.call_args_list[0].args[1]['ids']
+        assert ids[0] not in checked and ids[2] in checked, "Indexed IDs are not looked up"
+        assert index.known('db_id', ids[:10]) == set(ids[:10]), "Existing and inserted IDs are recorded"
+        index.close()
+
+    # A failing existence check does not prevent the insert
+    client = Mock()
+    client.execute.side_effect = [Exception("timeout"), None]
+    with patch('sugar.backend.parsers.news_parser.get_store', return_value=mock_store(client)):
+        assert save_to_database(make_articles(3), METADATA, 'Sugar', filter_sources=False) == 3
+    print("✓ Indexed, stored, repeated and non-Sugar articles skipped; insert survives a failed check")
+
+
+if __name__ == "__main__":
+    test_vectorized_ids()
+    test_round_trips()
+    test_skipped_articles()
+    print("\n✅ All batched save tests passed!")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+Test script for batched translation in LanguageNormalizationPipeline.
+
+The M2M100 tokenizer and model are replaced by small fakes that record how they are called,
+so the batching logic can be checked without downloading the model.
+
+This script tests:
+1. That English input never reaches the translation model
+2. That non-English texts are translated in one padded batch per language, in input order
+3. That long texts are chunked by sentence under max_chunk_tokens and reassembled
+4. That unpunctuated texts are split into token windows, so no input token is truncated
+5. That normalize() goes through the batched path and throughput is reported
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from langdetect import DetectorFactory
+
+from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+
+# Make langdetect deterministic
+DetectorFactory.seed = 0
+
+FRENCH_1 = "Les prix du sucre brut ont fortement augmenté cette semaine en raison de la sécheresse au Brésil."
+FRENCH_2 = "Les exportations de sucre de l'Inde devraient diminuer pendant la prochaine saison de récolte."
+HINDI = "ब्राजील में सूखे के कारण इस सप्ताह कच्ची चीनी की कीमतों में तेज वृद्धि हुई"
+GERMAN = "Die Zuckerpreise sind in dieser Woche wegen der schlechten Ernte in Thailand deutlich gestiegen."
+ENGLISH = "Raw sugar futures climbed this week on concerns about dry weather in Brazil."
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer that records every batch it encodes"""
+
+    def __init__(self):
+        self.src_lang = None
+        self.calls = []
+
+    def tokenize(self, text):
+        return text.split()
+
+    def convert_tokens_to_string(self, tokens):
+        return " ".join(tokens)
+
+    def get_lang_id(self, lang):
+        return 0
+
+    def __call__(self, batch, return_tensors=None, padding=False, truncation=False, max_length=None):
+        assert padding and truncation, "Batches must be padded and truncated"
+        self.calls.append({'src_lang': self.src_lang, 'batch': list(batch), 'max_length': max_length})
+        return {'input_ids': list(batch)}
+
+    def batch_decode(self, generated, skip_special_tokens=True):
+        return list(generated)
+
+
+class FakeModel:
+    """Translation model that tags its input"""
+
+    def generate(self, input_ids=None, forced_bos_token_id=None, max_new_tokens=None):
+        return [f"<en>{text}</en>" for text in input_ids]
+
+
+def make_pipeline(max_chunk_tokens=256):
+    pipeline = LanguageNormalizationPipeline(max_chunk_tokens=max_chunk_tokens)
+    pipeline.tokenizer = FakeTokenizer()
+    pipeline.model = FakeModel()
+    pipeline.sym_spell = None
+    pipeline.nlp = None
+    return pipeline
+
+
+def test_english_skips_translation():
+    """Test that English texts are not sent to the model"""
+    print("\n=== TEST 1: English input skips translation ===")
+
+    pipeline = make_pipeline()
+    result = pipeline.normalize_batch([ENGLISH, ENGLISH])
+    assert result == [ENGLISH, ENGLISH]
+    assert pipeline.tokenizer.calls == [], "English input should not be encoded"
+    print("✓ English input is returned without translation")
+
+
+def test_grouped_by_language():
+    """Test that texts are grouped into one batch per language"""
+    print("\n=== TEST 2: One batch per language ===")
+
+    pipeline = make_pipeline()
+    texts = [FRENCH_1, ENGLISH, GERMAN, FRENCH_2, ""]
+    result = pipeline.normalize_batch(texts)
+
+    assert result[0] == f"<en>{FRENCH_1}</en>"
+    assert result[1] == ENGLISH
+    assert result[2] == f"<en>{GERMAN}</en>"
+    assert result[3] == f"<en>{FRENCH_2}</en>"
+    assert result[4] == ""
+
+    calls_by_lang = {call['src_lang']: call for call in pipeline.tokenizer.calls}
+    assert len(pipeline.tokenizer.calls) == 2, "Expected one model batch per language"
+    assert sorted(calls_by_lang['fr']['batch']) == sorted([FRENCH_1, FRENCH_2])
+    assert calls_by_lang['de']['batch'] == [GERMAN]
+    print("✓ Texts are translated in one batch per language and returned in order")
+
+
+def test_long_text_chunking():
+    """Test sentence-level chunking of long texts"""
+    print("\n=== TEST 3: Sentence chunking ===")
+
+    pipeline = make_pipeline(max_chunk_tokens=40)
+    long_text = " ".join([FRENCH_1, FRENCH_2] * 4)
+    result = pipeline.normalize_batch([long_text])[0]
+
+    chunks = pipeline.tokenizer.calls[0]['batch']
+    assert len(chunks) > 1, "Long text should be split into several chunks"
+    assert all(len(chunk.split()) <= 40 for chunk in chunks), "Chunks must stay under max_chunk_tokens"
+    assert result.count("<en>") == len(chunks)
+    # Chunks are reassembled in their original order
+    restored = result.replace("<en>", "").replace("</en>", "")
+    assert restored == long_text
+    print(f"✓ Long text translated as {len(chunks)} chunks and reassembled in order")
+
+
+def test_unpunctuated_text_windows():
+    """Test that sentences longer than max_chunk_tokens are split instead of truncated"""
+    print("\n=== TEST 4: Token windows for long sentences ===")
+
+    pipeline = make_pipeline()
+    words = HINDI.split()
+    long_text = " ".join(words[i % len(words)] for i in range(1000))
+    result = pipeline.normalize_batch([long_text])[0]
+
+    call = pipeline.tokenizer.calls[0]
+    chunks = call['batch']
+    assert call['src_lang'] == 'hi'
+    assert len(chunks) == 4 and all(len(chunk.split()) <= 256 for chunk in chunks)
+    assert call['max_length'] >= max(len(chunk.split()) for chunk in chunks), "Chunks must not be truncated"
+    restored = result.replace("<en>", "").replace("</en>", "")
+    assert restored.split() == long_text.split(), "Every input token reaches the model once, in order"
+
+    # The danda ends a sentence, so punctuated Hindi is chunked by sentence
+    pipeline = make_pipeline(max_chunk_tokens=40)
+    pipeline.normalize_batch([" ".join([HINDI + " ।"] * 6)])
+    assert all(chunk.endswith("।") for chunk in pipeline.tokenizer.calls[0]['batch'])
+    print(f"✓ 1,000 unpunctuated tokens translated as {len(chunks)} windows without truncation")
+
+
+def test_normalize_uses_batch_path():
+    """Test that single-text normalize() shares the batched path and stats"""
+    print("\n=== TEST 5: normalize() and throughput ===")
+
+    pipeline = make_pipeline()
+    assert pipeline.normalize(FRENCH_1) == f"<en>{FRENCH_1}</en>"
+    assert pipeline.normalize(ENGLISH) == ENGLISH
+    assert pipeline.normalize(sugar_pricing_lines=["NY11 Price: 21.5"])[0]['price'] == "21.5"
+    assert pipeline.throughput_stats['texts'] == 2
+    assert pipeline.throughput_stats['translated'] == 1
+    assert pipeline.get_throughput() > 0
+    print(f"✓ normalize() uses the batched path ({pipeline.get_throughput():.0f} articles/sec)")
+
+
+if __name__ == "__main__":
+    test_english_skips_translation()
+    test_grouped_by_language()
+    test_long_text_chunking()
+    test_unpunctuated_text_windows()
+    test_normalize_uses_batch_path()
+    print("\n✅ All batched translation tests passed!")
@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 """
 Test script for checkpoint functionality in sugar_news_fetcher.py
+
+Intermediate results are stored as append-only Parquet segments, one per
+completed (month, topic) pair, indexed by a JSON manifest.
 """
 
 import os
@@ -14,6 +17,7 @@ current_dir = Path(__file__).resolve().parent
 project_root = current_dir.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from sugar.backend.parsers.checkpoints import SegmentCheckpointStore
 from sugar.backend.parsers.sugar_news_fetcher import (
     save_intermediate_results,
     load_intermediate_results,
@@ -30,24 +34,33 @@ def test_checkpoint_functions():
     with tempfile.TemporaryDirectory() as temp_dir:
         print(f"Using temporary directory: {temp_dir}")
         
-        # Test data
+        # Test data, including nested metadata and the raw API article
         test_data = [
-            {"id": 1, "title": "Test Article 1", "content": "Test content 1"},
-            {"id": 2, "title": "Test Article 2", "content": "Test content 2"},
-            {"id": 3, "title": "Test Article 3", "content": "Test content 3"}
+            {"id": "1", "title": "Test Article 1", "content": "Test content 1",
+             "entity_metadata": {"matched_keywords": ["sugar"]}, "raw_article": {"title": "raw"}},
+            {"id": "2", "title": "Test Article 2", "content": "Test content 2",
+             "entity_metadata": {"matched_keywords": []}, "raw_article": {"title": "raw"}},
+            {"id": "3", "title": "Test Article 3", "content": "Test content 3",
+             "entity_metadata": {"matched_keywords": ["cane", "ethanol"]}, "raw_article": {"title": "raw"}}
         ]
         
         # Test save_intermediate_results
         print("\n1. Testing save_intermediate_results...")
-        save_success = save_intermediate_results(test_data, 1, temp_dir)
+        save_success = save_intermediate_results(test_data, "2024-01", "20000386", temp_dir)
         assert save_success, "Failed to save intermediate results"
+        assert os.path.exists(os.path.join(temp_dir, "manifest.json")), "Manifest should be written"
         print("✓ save_intermediate_results works correctly")
         
         # Test load_intermediate_results
         print("\n2. Testing load_intermediate_results...")
         loaded_data = load_intermediate_results(temp_dir)
-        assert len(loaded_data) == len(test_data), "Loaded data length doesn't match original"
-        assert loaded_data == test_data, "Loaded data doesn't match original"
+        assert len(loaded_data) == 1, "Should load one segment"
+        loaded_records = loaded_data[0].to_dict('records')
+        assert len(loaded_records) == len(test_data), "Loaded data length doesn't match original"
+        for loaded, original in zip(loaded_records, test_data):
+            assert "raw_article" not in loaded, "Raw API article should not be checkpointed"
+            assert loaded["entity_metadata"] == original["entity_metadata"], "Nested metadata should round-trip"
+            assert loaded["title"] == original["title"], "Loaded data doesn't match original"
         print("✓ load_intermediate_results works correctly")
         
         # Test save_checkpoint and load_checkpoint
@@ -69,8 +82,8 @@ def test_checkpoint_functions():
         assert cleanup_success, "Failed to cleanup checkpoint files"
         
         # Verify files are cleaned up
-        remaining_files = [f for f in os.listdir(temp_dir) if f.startswith("intermediate_results_batch_")]
-        assert len(remaining_files) == 0, "Checkpoint files were not cleaned up"
+        assert not os.path.exists(os.path.join(temp_dir, "manifest.json")), "Manifest was not cleaned up"
+        assert not os.path.exists(os.path.join(temp_dir, "segments")), "Segments were not cleaned up"
         print("✓ cleanup_checkpoint_files works correctly")
         
         print("\n✅ All checkpoint functionality tests passed!")
@@ -96,22 +109,35 @@ def test_resume_functionality():
             {"id": "4", "title": "Article 4", "asset": "General"}
         ])
         
-        # Save intermediate results in batches
+        # Save one segment per completed (month, topic) pair
         print("\n1. Saving mock intermediate results...")
-        save_success1 = save_intermediate_results([mock_df1], 1, temp_dir)
-        save_success2 = save_intermediate_results([mock_df1, mock_df2], 2, temp_dir)
+        save_success1 = save_intermediate_results(mock_df1, "2024-01", "20000386", temp_dir)
+        save_success2 = save_intermediate_results(mock_df2, "2024-01", "20000324", temp_dir)
+        empty_success = save_intermediate_results(pd.DataFrame(), "2024-02", "20000386", temp_dir)
         
-        assert save_success1 and save_success2, "Failed to save mock intermediate results"
+        assert save_success1 and save_success2 and empty_success, "Failed to save mock intermediate results"
         print("✓ Mock intermediate results saved successfully")
         
-        # Test loading intermediate results (simulating resume)
-        print("\n2. Testing resume by loading intermediate results...")
+        # Segments are append-only: saving a completed pair again must not rewrite it
+        assert save_intermediate_results(mock_df2, "2024-01", "20000386", temp_dir)
+        
+        # Test resume from the manifest alone
+        print("\n2. Testing resume from the manifest...")
+        store = SegmentCheckpointStore(temp_dir)
+        assert store.completed_pairs() == {
+            ("2024-01", "20000386"), ("2024-01", "20000324"), ("2024-02", "20000386")
+        }, "Completed pairs should be read from the manifest"
+        assert store.completed_topics("2024-02") == {"20000386"}
+        assert store.total_rows() == 4, "Should have 4 total articles"
+        
         loaded_results = load_intermediate_results(temp_dir)
+        assert len(loaded_results) == 2, "Pairs without articles have no segment to load"
+        assert list(loaded_results[0]["id"]) == ["1", "2"], "First segment should not be rewritten"
+        assert list(loaded_results[1]["id"]) == ["3", "4"], "Second segment should have 2 articles"
         
-        # Verify loaded results
-        assert len(loaded_results) == 3, "Should have 3 total articles (2 from first batch, 1 new from second)"
-        assert len(loaded_results[0]) == 2, "First dataframe should have 2 articles"
-        assert len(loaded_results[1]) == 2, "Second dataframe should have 2 articles"
+        # Segments can be memory-mapped without decoding every column
+        table = store.read_segment(store.segments("2024-01")[0], columns=["id"])
+        assert table.num_rows == 2 and table.column_names == ["id"]
         print("✓ Resume functionality works correctly")
         
         # Test cleanup
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Test script for the pooled ClickHouse access module (sugar.backend.db).
+
+This script tests:
+1. That connections are reused across calls and threads, never more than the pool size
+   are opened, and connections that hit a network error are closed
+2. That execute_iter streams rows and closes the connection of an abandoned iterator
+3. That insert() sends row and columnar data in blocks, and that every call is timed
+   with its row count in PIPELINE_METRICS
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+from clickhouse_driver.errors import NetworkError
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.db import ClickHousePool, compression_available
+from sugar.backend.parsers.metrics import PIPELINE_METRICS
+
+
+class FakeClient:
+    """Stands in for clickhouse_driver.Client"""
+
+    created = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.queries = []
+        self.disconnected = False
+        self.in_use = False
+        FakeClient.created.append(self)
+
+    def execute(self, query, params=None, columnar=False):
+        assert not self.in_use, "A connection is used by one caller at a time"
+        self.in_use = True
+        try:
+            time.sleep(0.002)
+            self.queries.append((query, params, columnar))
+            if query == 'FAIL':
+                raise NetworkError("connection reset")
+            if query.startswith('INSERT'):
+                return len(params[0]) if columnar else len(params)
+            return [(1,), (2,), (3,)]
+        finally:
+            self.in_use = False
+
+    def execute_iter(self, query, params=None):
+        for i in range(10):
+            yield (i,)
+
+    def disconnect(self):
+        self.disconnected = True
+
+
+def make_pool(size=2, **kwargs):
+    FakeClient.created = []
+    return ClickHousePool(config={'host': 'clickhouse', 'port': 9000}, size=size,
+                          client_factory=FakeClient, **kwargs)
+
+
+def test_connection_reuse():
+    """Test connection reuse, the size limit and discarding broken connections"""
+    print("\n=== TEST 1: Connection reuse ===")
+
+    pool = make_pool(size=2, compression=True, settings={'max_threads': 2})
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(20):
+                assert pool.execute('SELECT 1') == [(1,), (2,), (3,)]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+    assert len(FakeClient.created) == 2, "6 threads share 2 connections"
+    assert FakeClient.created[0].kwargs == {'host': 'clickhouse', 'port': 9000, 'settings': {'max_threads': 2},
+                                            **({'compression': 'lz4'} if compression_available() else {})}
+    assert pool.stats['queries'] == 120 and pool.stats['rows_read'] == 360
+
+    broken = pool.acquire()
+    pool.release(broken)
+    try:
+        pool.execute('FAIL')
+        assert False, "Network errors are raised"
+    except NetworkError:
+        pass
+    assert broken.disconnected and pool.snapshot()['open_connections'] == 1
+    assert pool.stats['errors'] == 1
+
+    pool.disconnect()
+    assert all(client.disconnected for client in FakeClient.created)
+    assert pool.execute('SELECT 1') and len(FakeClient.created) == 3, "A disconnected pool reconnects"
+    print("✓ 120 queries from 6 threads on 2 connections; broken connection closed")
+
+
+def test_execute_iter():
+    """Test streaming rows"""
+    print("\n=== TEST 2: Streaming ===")
+
+    pool = make_pool(size=1)
+    assert [row[0] for row in pool.execute_iter('SELECT n')] == list(range(10))
+    first = FakeClient.created[0]
+    assert pool.snapshot()['idle_connections'] == 1 and not first.disconnected
+
+    rows = pool.execute_iter('SELECT n')
+    assert next(rows) == (0,)
+    rows.close()
+    assert first.disconnected, "Unread blocks make an abandoned connection unusable"
+    assert pool.snapshot()['open_connections'] == 0
+    assert pool.stats['rows_read'] == 11
+    print("✓ Rows streamed; the connection of an abandoned iterator is closed")
+
+
+def test_insert_and_metrics():
+    """Test block inserts and query instrumentation"""
+    print("\n=== TEST 3: Inserts and metrics ===")
+
+    PIPELINE_METRICS.reset('db-test')
+    pool = make_pool(size=1)
+    rows = ((i, f"title {i}") for i in range(25))
+    assert pool.insert('news.news', ['id', 'title'], rows, block_size=10) == 25
+    assert pool.insert('news.news', ['id', 'title'], [list(range(7)), ['t'] * 7], columnar=True, block_size=5) == 7
+
+    queries = FakeClient.created[0].queries
+    assert [len(params) if not columnar else len(params[0]) for _, params, columnar in queries] == [10, 10, 5, 5, 2]
+    assert queries[0][0] == 'INSERT INTO news.news (id, title) VALUES'
+    assert len(FakeClient.created) == 1
+
+    pool.execute('SELECT id FROM news.news')
+    stages = PIPELINE_METRICS.snapshot()['stages']
+    assert stages['db_insert']['count'] == 5 and stages['db_insert']['items'] == 32
+    assert stages['db_query']['count'] == 1 and stages['db_query']['items'] == 3
+    assert pool.stats['inserts'] == 5 and pool.stats['rows_written'] == 32
+    print("✓ 32 rows inserted in 5 blocks; latency and rows recorded per call")
+
+
+if __name__ == "__main__":
+    test_connection_reuse()
+    test_execute_iter()
+    test_insert_and_metrics()
+    print("\n✅ All ClickHouse pool tests passed!")
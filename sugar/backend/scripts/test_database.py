@@ -23,12 +23,12 @@ def test_database_connection():
     
     try:
         from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
-        from clickhouse_driver import Client
+        from sugar.backend.db import get_pool
         
         print(f"Attempting to connect to ClickHouse at {CLICKHOUSE_NATIVE_CONFIG['host']}:{CLICKHOUSE_NATIVE_CONFIG['port']}")
         
         # Test connection
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_pool()
         
         # Execute a simple query to test connectivity
         result = client.execute('SELECT 1 as test')
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Test script for the ClickHouse deduplication tool (deduplicate_database.py).
+
+This script tests:
+1. That duplicate groups are read in one streamed aggregation by content hash, keeping
+   the newest (or oldest) record and leaving exact copies to OPTIMIZE ... DEDUPLICATE
+2. That removals run as one lightweight delete (or mutation) per partition, and that a
+   dry run sends no delete
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.scripts.deduplicate_database import (
+    find_duplicates,
+    remove_duplicates,
+    verify_deduplication
+)
+from sugar.backend.storage.clickhouse import CONTENT_HASH_COLUMN, ClickHouseStore
+
+JAN_1 = datetime(2024, 1, 1, 8)
+JAN_2 = datetime(2024, 1, 2, 8)
+
+
+class FakeClickHouse:
+    """Returns canned duplicate groups and records the statements it receives"""
+
+    def __init__(self, groups, has_hash_column=False):
+        self.groups = groups
+        self.has_hash_column = has_hash_column
+        self.iter_queries = []
+        self.queries = []
+
+    def execute_iter(self, query, params=None, settings=None):
+        self.iter_queries.append((query, settings))
+        return iter(self.groups)
+
+    def execute(self, query, params=None, settings=None):
+        self.queries.append((query, params, settings))
+        return [(int(self.has_hash_column),)]
+
+
+def make_groups():
+    return [
+        (101, 3, [('a1', JAN_1, '202401'), ('a2', JAN_2, '202401'), ('a3', datetime(2024, 1, 3), '202402')],
+         "Raw sugar rallies", "Nasdaq", JAN_1),
+        (102, 2, [('b1', JAN_1, '202401'), ('b1', JAN_1, '202401')], "Sugar output falls", "Reuters", JAN_1),
+        (103, 2, [('c1', JAN_2, '202312'), ('c2', JAN_1, '202312')], "Ethanol parity", "UNICA", JAN_1),
+    ]
+
+
+def test_find_duplicates():
+    """Test the streamed duplicate scan"""
+    print("\n=== TEST 1: Streamed duplicate scan ===")
+
+    client = FakeClickHouse(make_groups(), has_hash_column=True)
+    scan = find_duplicates(ClickHouseStore(client), batch_size=500)
+    query, settings = client.iter_queries[0]
+    assert f'{CONTENT_HASH_COLUMN} AS group_hash' in query and 'GROUP BY group_hash' in query and 'OFFSET' not in query
+    assert settings == {'max_block_size': 500}
+    assert [query for query, _, _ in client.queries] == [client.queries[0][0]] and 'system.columns' in client.queries[0][0], \
+        "One column check and one streamed aggregation, nothing else"
+
+    assert scan['groups'] == 3 and scan['duplicates'] == 3 and scan['exact_copies'] == 1
+    assert dict(scan['partitions']) == {
+        '202401': [('a1', JAN_1), ('a2', JAN_2)],
+        '202312': [('c2', JAN_1)]
+    }, "The newest record of every group is kept"
+    assert scan['samples'][0]['keep_id'] == 'a3'
+
+    client = FakeClickHouse(make_groups())
+    oldest = find_duplicates(ClickHouseStore(client), keep_newest=False)
+    assert dict(oldest['partitions'])['202402'] == [('a3', datetime(2024, 1, 3))]
+    assert 'cityHash64(title, text, source, datetime) AS group_hash' in client.iter_queries[0][0], \
+        "Without the column the hash is computed in the query"
+    print(f"✓ {scan['groups']} groups streamed; {scan['duplicates']} removals in "
+          f"{len(scan['partitions'])} partitions, 1 exact copy left")
+
+
+def test_remove_duplicates():
+    """Test per-partition deletes and dry runs"""
+    print("\n=== TEST 2: Per-partition deletes ===")
+
+    scan = find_duplicates(ClickHouseStore(FakeClickHouse(make_groups())))
+
+    client = FakeClickHouse([])
+    store = ClickHouseStore(client)
+    assert remove_duplicates(store, scan['partitions'], dry_run=True) == 0
+    assert not client.queries, "A dry run sends no delete"
+
+    assert remove_duplicates(store, scan['partitions'], dry_run=False) == 3
+    assert len(client.queries) == 2, "One delete per partition"
+    query, params, settings = client.queries[1]
+    assert query.startswith('DELETE FROM news.news WHERE _partition_id = %(partition_id)s')
+    assert params == {'partition_id': '202401', 'keys': [('a1', JAN_1), ('a2', JAN_2)]}
+    assert 'mutations_sync' not in settings
+
+    client = FakeClickHouse([])
+    store = ClickHouseStore(client)
+    remove_duplicates(store, scan['partitions'], dry_run=False, use_mutation=True)
+    assert all(query.startswith('ALTER TABLE news.news DELETE IN PARTITION ID') for query, _, _ in client.queries)
+    assert client.queries[0][2]['mutations_sync'] == 1
+
+    assert verify_deduplication(store, scan['partitions'])
+    print("✓ Dry run sends nothing; 3 duplicates removed with 2 statements")
+
+
+if __name__ == "__main__":
+    test_find_duplicates()
+    test_remove_duplicates()
+    print("\n✅ All database deduplication tests passed!")
@@ -17,11 +17,10 @@ def main():
     print("=== TESTING DATABASE INSERTION ===")
     
     try:
-        from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
-        from clickhouse_driver import Client
+        from sugar.backend.db import get_pool
         
         # Connect to database
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_pool()
         print("✓ ClickHouse connection successful")
         
         # Test 1: Check if we can read from sentiment_predictions
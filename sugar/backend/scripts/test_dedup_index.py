@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+"""
+Test script for the persistent cross-run deduplication index.
+
+This script tests:
+1. That the Bloom filter never reports false negatives
+2. That recorded keys survive reopening the index (warm load)
+3. That near-duplicate articles from the same source are found by SimHash
+4. That a second run drops already saved articles before normalization
+5. That articles the triage filter did not save are not recorded in the index
+6. That a shared index sees the keys other processes commit while it is open
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers.dedup_index import (
+    BloomFilter,
+    PersistentDedupIndex,
+    compute_simhash,
+    KIND_URL,
+    KIND_DB_ID
+)
+from sugar.backend.parsers.sugar_news_fetcher import run_month_pipeline
+
+
+def add_urls(db_path, worker, batches, output):
+    """Record batches of URLs from another process, as a job queue worker does"""
+    index = PersistentDedupIndex(db_path, shared=True)
+    added = 0
+    for batch in range(batches):
+        added += index.add_many([{'url': f"https://example.com/{worker}/{batch}/{i}"} for i in range(20)])
+    index.close()
+    output.put(added)
+
+
+def test_bloom_filter():
+    """Test Bloom filter membership"""
+    print("\n=== TEST 1: Bloom filter ===")
+
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"url:https://example.com/{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items), "Bloom filter must not have false negatives"
+    false_positives = sum(f"url:https://other.com/{i}" in bloom for i in range(10000))
+    assert false_positives < 300, f"Too many false positives: {false_positives}"
+    print(f"✓ No false negatives, {false_positives} false positives in 10000 lookups")
+
+
+def test_index_persistence():
+    """Test that keys are persisted and warm-loaded"""
+    print("\n=== TEST 2: Persistence and warm load ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "dedup_index.db")
+        index = PersistentDedupIndex(db_path, bloom_capacity=10)
+        added = index.add_many([
+            {'url': 'https://www.nasdaq.com/a ', 'article_id': 'a1', 'content_hash': 'h1', 'db_id': 'd1'},
+            {'url': 'https://www.nasdaq.com/b', 'article_id': 'b1', 'content_hash': 'h2'}
+        ])
+        assert added == 7
+        assert index.add_many([{'url': 'https://www.nasdaq.com/b'}]) == 0, "Keys are only recorded once"
+        index.close()
+
+        reopened = PersistentDedupIndex(db_path, bloom_capacity=10)
+        assert reopened.contains_url('https://www.nasdaq.com/a'), "URLs are stripped before lookup"
+        assert reopened.contains(KIND_DB_ID, 'd1')
+        assert not reopened.contains(KIND_URL, 'https://www.nasdaq.com/c')
+        assert reopened.stats['bloom_negatives'] == 1, "Unknown keys should be answered by the Bloom filter"
+        assert reopened.known(KIND_DB_ID, ['d1', 'd2']) == {'d1'}
+        assert len(reopened) == 7
+        reopened.close()
+    print("✓ Keys survive reopening the index")
+
+
+def test_near_duplicates():
+    """Test SimHash near-duplicate detection"""
+    print("\n=== TEST 3: Near duplicates ===")
+
+    # A full-length article: SimHash signatures are only computed for texts of 50+ distinct words
+    rng = random.Random(7)
+    vocabulary = [f"term{i}" for i in range(2000)]
+    text = " ".join(rng.sample(vocabulary, 300))
+    assert compute_simhash("Raw sugar futures rose on dry weather in Brazil") == 0, "Short texts have no signature"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = PersistentDedupIndex(os.path.join(temp_dir, "dedup_index.db"))
+        index.add_many([{'content_hash': 'h1', 'title': 'Sugar rallies', 'text': text, 'source': 'Nasdaq'}])
+
+        assert index.find_near_duplicate('Sugar rallies', text + ' again', 'Nasdaq') == 'h1'
+        assert index.find_near_duplicate('Sugar rallies', text, 'Barchart') is None, "Sources are compared separately"
+        assert index.find_near_duplicate('Coffee slides', " ".join(rng.sample(vocabulary, 300)), 'Nasdaq') is None
+        index.close()
+    print("✓ Near duplicates are detected")
+
+
+def run_month(index, start_date, articles):
+    """Run run_month_pipeline for one topic against a mocked API and database"""
+    def mock_search_articles(*args, **kwargs):
+        return articles if kwargs['site_id'] == '913' else pd.DataFrame()
+
+    normalization_pipeline = Mock()
+    normalization_pipeline.normalize.side_effect = lambda text=None, sugar_pricing_lines=None: (
+        [] if sugar_pricing_lines is not None else text
+    )
+    with patch('sugar.backend.parsers.sugar_news_fetcher.OpointAPI') as mock_api_class, \
+            patch('sugar.backend.parsers.sugar_news_fetcher.save_to_database',
+                  side_effect=lambda df, metadata, asset, dedup_index=None, filter_sources=True: len(df)), \
+            patch('sugar.backend.parsers.sugar_news_fetcher.filter_trusted_sources',
+                  side_effect=lambda df, verbose=True: df):
+        mock_api = Mock()
+        mock_api.search_articles.side_effect = mock_search_articles
+        mock_api_class.return_value = mock_api
+        stats = run_month_pipeline(
+            "test-key", start_date, datetime(2024, 1, 31, 23, 59, 59), ['20000386'], 100,
+            normalization_pipeline, {'processing_mode': 'monthly'}, topic_delay=0, dedup_index=index
+        )
+    return stats, normalization_pipeline.normalize.call_count
+
+
+def make_articles(texts):
+    published = datetime(2024, 1, 15, 10, 0)
+    return pd.DataFrame([{
+        'title': title,
+        'text': text,
+        'site_name': 'Nasdaq',
+        'id_site': 913,
+        'url': f"https://www.nasdaq.com/news/{i}",
+        'published_date': published
+    } for i, (title, text) in enumerate(texts)])
+
+
+def test_second_run_skips_saved_articles():
+    """Test that articles saved by one run are dropped before normalization in the next"""
+    print("\n=== TEST 4: Cross-run deduplication ===")
+
+    articles = make_articles([
+        (f"Sugar market update {i}", f"Raw sugar futures reacted to harvest report number {i} from mill group {i * 7}.")
+        for i in range(5)
+    ])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "dedup_index.db")
+        first_stats, first_calls = run_month(PersistentDedupIndex(db_path), datetime(2024, 1, 1), articles)
+        assert first_stats['processed'] == 5 and first_calls > 0
+
+        # A new run with a fresh in-memory cache and a different month window
+        second_stats, second_calls = run_month(PersistentDedupIndex(db_path), datetime(2024, 1, 10), articles)
+        assert second_stats['processed'] == 0
+        assert second_stats['url_duplicates'] == 5
+        assert second_calls == 0, "Known articles should be dropped before normalization"
+    print("✓ Saved articles are not normalized again in later runs")
+
+
+def test_unsaved_articles_not_recorded():
+    """Test that articles the triage filter dropped are judged again by the next run"""
+    print("\n=== TEST 5: Only saved articles are recorded ===")
+
+    articles = make_articles([
+        (f"Sugar market update {i}", f"Raw sugar futures reacted to harvest report number {i} from mill group {i * 7}.")
+        for i in range(3)
+    ] + [
+        (f"Copper outlook {i}", f"Copper mining output at Chilean pit number {i} rose by {i * 3} percent.")
+        for i in range(2)
+    ])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "dedup_index.db")
+        index = PersistentDedupIndex(db_path)
+        first_stats = run_month(index, datetime(2024, 1, 1), articles)[0]
+        assert first_stats['sugar'] == 3 and first_stats['general'] == 2, first_stats
+        assert index.known(KIND_URL, articles['url']) == set(articles['url'][:3]), \
+            "Only the saved Sugar articles are in the index"
+        index.close()
+
+        # With a changed triage rule the General articles would now be saved, so they must come back
+        second_stats, second_calls = run_month(PersistentDedupIndex(db_path), datetime(2024, 1, 10), articles)
+        assert second_stats['url_duplicates'] == 3 and second_stats['processed'] == 2
+        assert second_calls > 0, "Articles that were not saved are normalized again"
+    print("✓ Articles dropped by the triage filter stay out of the index")
+
+
+def test_shared_index_across_processes():
+    """Test that keys written by other processes are found by a shared index"""
+    print("\n=== TEST 6: Shared index across processes ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "dedup_index.db")
+        shared = PersistentDedupIndex(db_path, shared=True)
+        private = PersistentDedupIndex(db_path)
+
+        # Two writers commit at the same time; the busy timeout makes them wait for each other
+        output = multiprocessing.Queue()
+        writers = [multiprocessing.Process(target=add_urls, args=(db_path, worker, 50, output)) for worker in range(2)]
+        for writer in writers:
+            writer.start()
+        added = [output.get(timeout=120) for _ in writers]
+        for writer in writers:
+            writer.join(timeout=60)
+            assert writer.exitcode == 0
+
+        urls = [f"https://example.com/{worker}/{batch}/{i}" for worker in range(2) for batch in range(50) for i in range(20)]
+        assert added == [1000, 1000] and len(shared) == 2000
+        assert all(shared.contains_url(url) for url in urls), "Keys committed by other processes must be found"
+        assert not private.contains_url(urls[0]), "A private index only knows the keys loaded at startup"
+        shared.close()
+        private.close()
+    print("✓ 2,000 keys written by 2 concurrent processes are all found by the shared index")
+
+
+if __name__ == "__main__":
+    test_bloom_filter()
+    test_index_persistence()
+    test_near_duplicates()
+    test_second_run_skips_saved_articles()
+    test_unsaved_articles_not_recorded()
+    test_shared_index_across_processes()
+    print("\n✅ All dedup index tests passed!")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Test script for streamed search responses (iter_documents, OpointAPI.iter_articles).
+
+This script tests:
+1. That the incremental parser yields the same documents as json.loads for any chunk size,
+   rejects truncated bodies and holds far less memory than decoding the whole body
+2. That OpointAPI.iter_articles streams records from the network, stores the response in the
+   cache only once it has been read completely, and streams cache hits without the network
+3. That the fetcher yields the same articles and watermarks as single dicts when streaming
+"""
+
+import io
+import json
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.api.opoint.document_stream import _iter_documents_stdlib, iter_documents
+from sugar.backend.api.opoint.opoint_api import OpointAPI
+from sugar.backend.api.opoint.response_cache import OpointResponseCache
+from sugar.backend.parsers.sugar_news_fetcher import (
+    ALL_SUGAR_SOURCES_27,
+    SUGAR_SOURCES,
+    calculate_source_quotas,
+    iter_sugar_source_articles
+)
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 31, 23, 59, 59)
+
+
+def make_document(i, site_id=913, text_size=1):
+    return {
+        "header": {"text": f"Sugar prices rise {i} \"quoted\" [document] {{braces}}"},
+        "summary": {"text": "Açúcar e etanol: usinas do Centro-Sul — 砂糖"},
+        "body": {"text": "<p>Raw sugar futures climbed. \\ backslash</p>" * text_size},
+        "local_time": {"text": "2024-01-15T10:00:00"},
+        "unix_timestamp": int(START.timestamp()) + i * 3600,
+        "orig_url": f"https://example.com/{site_id}/{i}",
+        "first_source": {"sitename": "Nasdaq"},
+        "id_site": site_id,
+        "id_article": i,
+        "matches": [{"text": "sugar", "document": []}],
+        "score": 0.91
+    }
+
+
+def make_body(documents):
+    """A search response with fields before and after the document array"""
+    response = {
+        "searchresult": {
+            "search_start": 0,
+            "context": {"document": ["not", "this", "one"], "note": "a \"searchresult\" string"},
+            "documents": len(documents),
+            "document": documents,
+            "range_count": 1
+        },
+        "debug": {"searchresult": {"document": [{"wrong": True}]}}
+    }
+    return json.dumps(response, ensure_ascii=False).encode("utf-8")
+
+
+def test_parser():
+    """Test the incremental parser"""
+    print("\n=== TEST 1: Incremental parser ===")
+
+    documents = [make_document(i) for i in range(25)]
+    body = make_body(documents)
+    for chunk_size in (1, 7, 100, 64 * 1024):
+        parsed = list(_iter_documents_stdlib(io.BytesIO(body), chunk_size))
+        assert parsed == documents, f"Chunk size {chunk_size}"
+    assert list(iter_documents(io.BytesIO(body))) == documents
+
+    assert list(_iter_documents_stdlib(io.BytesIO(make_body([])), 16)) == []
+    assert list(_iter_documents_stdlib(io.BytesIO(b'{"searchresult": {"documents": 0}}'), 16)) == []
+    for truncated in (body[:len(body) // 2], body[:40]):
+        try:
+            list(_iter_documents_stdlib(io.BytesIO(truncated), 64))
+            raise AssertionError("Truncated bodies must raise")
+        except ValueError:
+            pass
+
+    # Documents are yielded while the body is being read
+    stream = io.BytesIO(body)
+    first = next(_iter_documents_stdlib(stream, 256))
+    assert first == documents[0] and stream.tell() < len(body) // 4
+
+    large = make_body([make_document(i, text_size=60) for i in range(1500)])
+
+    def peak(consume):
+        tracemalloc.start()
+        consume()
+        result = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+
+    decoded_peak = peak(lambda: len(json.loads(large)['searchresult']['document']))
+    streamed_peak = peak(lambda: sum(1 for _ in _iter_documents_stdlib(io.BytesIO(large), 64 * 1024)))
+    assert streamed_peak * 10 < decoded_peak, f"{streamed_peak} vs {decoded_peak} bytes"
+    print(f"✓ Same documents for every chunk size; peak {streamed_peak / 2**20:.1f} MB streamed vs "
+          f"{decoded_peak / 2**20:.1f} MB decoded for a {len(large) / 2**20:.1f} MB body")
+
+
+def streaming_response(body):
+    """A requests response whose body can be read as a stream or decoded at once"""
+    response = Mock()
+    response.raise_for_status.return_value = None
+    response.raw = io.BytesIO(body)
+    response.json.side_effect = lambda: json.loads(body)
+    return response
+
+
+def test_iter_articles_and_cache():
+    """Test OpointAPI.iter_articles with the response cache"""
+    print("\n=== TEST 2: Streaming search and cache ===")
+
+    documents = [make_document(i) for i in range(5)]
+    body = make_body(documents)
+    search_kwargs = dict(site_id="913", search_text="sugar", num_articles=5, start_date=START, end_date=END)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = OpointResponseCache(cache_dir)
+        api = OpointAPI(api_key="test-key", cache=cache)
+
+        # Stopping early must not leave a partial entry
+        with patch('sugar.backend.api.opoint.opoint_api.requests.post',
+                   side_effect=lambda *args, **kwargs: streaming_response(body)) as post:
+            records = api.iter_articles(**search_kwargs)
+            next(records)
+            records.close()
+            assert len(cache) == 0
+            assert post.call_args.kwargs['stream'] is True
+
+            streamed = list(api.iter_articles(**search_kwargs))
+            assert post.call_count == 2 and len(cache) == 1
+
+        expected = api._documents_to_dataframe(documents, cache_key=streamed[0]['response_cache_key'])
+        assert [record['title'] for record in streamed] == expected['title'].tolist()
+        assert [record['response_index'] for record in streamed] == list(range(5))
+        assert list(streamed[0]) == list(expected.columns)
+        assert cache.get_document(streamed[0]['response_cache_key'], 3) == documents[3]
+
+        # Hits are streamed from the cache without the network
+        with patch('sugar.backend.api.opoint.opoint_api.requests.post') as post:
+            replayed = list(api.iter_articles(**search_kwargs))
+            post.assert_not_called()
+        assert [record['url'] for record in replayed] == [record['url'] for record in streamed]
+
+        replay_api = OpointAPI(api_key="test-key", cache=cache, cache_mode='replay')
+        assert list(replay_api.iter_articles(**dict(search_kwargs, site_id="3478"))) == []
+
+        # A body cut off mid-stream yields what was complete and is not cached
+        with patch('sugar.backend.api.opoint.opoint_api.requests.post',
+                   return_value=streaming_response(body[:len(body) // 2])):
+            partial = list(api.iter_articles(**dict(search_kwargs, site_id="1")))
+        assert 0 < len(partial) < 5 and len(cache) == 1
+        cache.close()
+    print(f"✓ {len(streamed)} records streamed, cached once complete and replayed from the cache")
+
+
+def make_site_responses():
+    """Response body per site ID, with one article from a foreign site"""
+    bodies = {}
+    for position, source in enumerate(ALL_SUGAR_SOURCES_27[:6]):
+        documents = [make_document(position * 100 + i, site_id=source['id']) for i in range(position + 1)]
+        documents.append(make_document(position * 100 + 99, site_id=999999))
+        bodies[str(source['id'])] = make_body(documents)
+    return bodies
+
+
+def test_fetcher_streams_records():
+    """Test the streamed fetch against the DataFrame fetch"""
+    print("\n=== TEST 3: Streamed fetch ===")
+
+    bodies = make_site_responses()
+
+    def post(url, headers=None, json=None, timeout=None, stream=False):
+        searchterm = json['expressions'][0]['searchline']['searchterm']
+        site_id = searchterm.rsplit('site:', 1)[1]
+        return streaming_response(bodies.get(site_id, make_body([])))
+
+    def collect(stream_records):
+        api = OpointAPI(api_key="test-key")
+        quotas = calculate_source_quotas(5000, SUGAR_SOURCES)
+        watermarks = {}
+        with patch('sugar.backend.api.opoint.opoint_api.requests.post', side_effect=post) as mock_post:
+            items = list(iter_sugar_source_articles(api, "sugar", quotas, START, END, ['20000386'],
+                                                    watermark_updates=watermarks, stream_records=stream_records))
+            assert all(call.kwargs.get('stream', False) is stream_records for call in mock_post.call_args_list)
+        return items, watermarks
+
+    frames, frame_watermarks = collect(False)
+    records, record_watermarks = collect(True)
+
+    assert all(isinstance(record, dict) for record in records)
+    expected_ids = [article_id for frame in frames for article_id in frame['id_article']]
+    assert [record['id_article'] for record in records] == expected_ids
+    assert len(records) == sum(range(1, 7)), "Articles of foreign sites are filtered out"
+    assert record_watermarks == frame_watermarks and len(record_watermarks) == 6
+    print(f"✓ {len(records)} articles streamed as dicts, same articles and watermarks as the DataFrame path")
+
+
+if __name__ == "__main__":
+    test_parser()
+    test_iter_articles_and_cache()
+    test_fetcher_streams_records()
+    print("\n✅ All document stream tests passed!")
@@ -20,12 +20,12 @@ def test_fixed_query():
     
     try:
         from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
-        from clickhouse_driver import Client
+        from sugar.backend.db import get_pool
         
         print(f"Connecting to ClickHouse at {CLICKHOUSE_NATIVE_CONFIG['host']}:{CLICKHOUSE_NATIVE_CONFIG['port']}")
         
         # Test connection
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_pool()
         
         # Execute a simple query to test connectivity
         result = client.execute('SELECT 1 as test')
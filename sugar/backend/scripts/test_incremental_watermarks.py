@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""
+Test script for watermark-based incremental fetching in sugar_news_fetcher.py
+
+This script tests:
+1. That ProcessedDatesTracker uses a persistent WAL-mode connection
+2. That overlap checks find every overlapping range
+3. That per-(source, topic) watermarks only move forward
+4. That fetch_sugar_articles_for_period only requests the delta after each watermark
+5. That a streamed source that fails mid-response does not advance its watermark
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers.sugar_news_fetcher import (
+    ProcessedDatesTracker,
+    fetch_sugar_articles_for_period,
+    iter_sugar_source_articles,
+    ALL_SUGAR_SOURCES_27
+)
+
+
+def test_tracker_wal_and_overlap():
+    """Test WAL mode and overlap detection"""
+    print("\n=== TEST 1: WAL mode and overlap checks ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tracker = ProcessedDatesTracker(os.path.join(temp_dir, "processed_dates.db"))
+        journal_mode = tracker.conn.execute('PRAGMA journal_mode').fetchone()[0]
+        assert journal_mode.lower() == 'wal', f"Expected WAL journal mode, got {journal_mode}"
+
+        january = (datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59))
+        assert tracker.mark_date_range_processed(*january, 'monthly')
+        assert tracker.is_date_range_processed(*january, 'monthly')
+        assert tracker.is_date_processed(datetime(2024, 1, 15), 'monthly')
+
+        cases = [
+            ((datetime(2023, 12, 15), datetime(2024, 1, 5)), True),   # overlaps start
+            ((datetime(2024, 1, 20), datetime(2024, 2, 5)), True),    # overlaps end
+            ((datetime(2024, 1, 10), datetime(2024, 1, 12)), True),   # contained
+            ((datetime(2023, 12, 1), datetime(2024, 2, 29)), True),   # contains
+            ((datetime(2024, 2, 1), datetime(2024, 2, 29)), False),   # disjoint
+        ]
+        for (start, end), expected in cases:
+            has_overlap, _ = tracker.check_overlap_with_processed_ranges(start, end, 'monthly')
+            assert has_overlap == expected, f"Overlap for {start} - {end} should be {expected}"
+        tracker.close()
+    print("✓ WAL mode and overlap checks work correctly")
+
+
+def test_watermarks_only_move_forward():
+    """Test that watermarks never move backwards"""
+    print("\n=== TEST 2: Watermarks ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tracker = ProcessedDatesTracker(os.path.join(temp_dir, "processed_dates.db"))
+        newer = int(datetime(2024, 1, 30, 12, 0).timestamp())
+        older = int(datetime(2024, 1, 10, 12, 0).timestamp())
+
+        assert tracker.get_watermark('Nasdaq', '20000386') is None
+        assert tracker.update_watermarks('20000386', {'Nasdaq': newer, 'Barchart': older})
+        assert tracker.update_watermarks('20000386', {'Nasdaq': older})
+
+        assert tracker.get_watermark('Nasdaq', '20000386') == datetime.fromtimestamp(newer)
+        assert tracker.get_watermarks('20000386') == {
+            'Nasdaq': datetime.fromtimestamp(newer),
+            'Barchart': datetime.fromtimestamp(older)
+        }
+        assert tracker.get_watermarks('20000324') == {}
+        tracker.close()
+    print("✓ Watermarks only move forward")
+
+
+def test_fetch_requests_only_delta():
+    """Test that the fetcher starts each source after its watermark"""
+    print("\n=== TEST 3: Incremental fetch window ===")
+
+    start_date = datetime(2024, 1, 1)
+    end_date = datetime(2024, 1, 31, 23, 59, 59)
+    nasdaq_watermark = datetime(2024, 1, 29, 8, 0)
+    # A watermark at the end of the window means there is nothing left to fetch for that source
+    barchart_watermark = end_date
+
+    calls = []
+
+    def mock_search_articles(*args, **kwargs):
+        calls.append(kwargs)
+        if kwargs['site_id'] != '913':
+            return pd.DataFrame()
+        published = datetime(2024, 1, 30, 9, 30)
+        return pd.DataFrame([{
+            'title': 'Sugar futures climb',
+            'text': 'Raw sugar futures rose on Brazilian supply concerns.',
+            'site_name': 'Nasdaq',
+            'id_site': 913,
+            'url': 'https://www.nasdaq.com/sugar-futures-climb',
+            'published_date': published,
+            'unix_timestamp': int(published.timestamp())
+        }])
+
+    normalization_pipeline = Mock()
+    normalization_pipeline.normalize.side_effect = lambda text=None, sugar_pricing_lines=None: (
+        [] if sugar_pricing_lines is not None else text
+    )
+
+    watermark_updates = {}
+    with patch('sugar.backend.parsers.sugar_news_fetcher.OpointAPI') as mock_api_class:
+        mock_api = Mock()
+        mock_api.search_articles.side_effect = mock_search_articles
+        mock_api_class.return_value = mock_api
+
+        fetch_sugar_articles_for_period(
+            "test-key", start_date, end_date, ['20000386'], max_articles=100,
+            normalization_pipeline=normalization_pipeline,
+            source_watermarks={'Nasdaq': nasdaq_watermark, 'Barchart': barchart_watermark},
+            watermark_updates=watermark_updates
+        )
+
+    requested_sites = {call['site_id'] for call in calls}
+    assert '124923' not in requested_sites, "Barchart is fully fetched and should not be requested"
+    assert len(calls) == len(ALL_SUGAR_SOURCES_27) - 1
+
+    nasdaq_call = next(call for call in calls if call['site_id'] == '913')
+    assert nasdaq_call['start_date'] == nasdaq_watermark + timedelta(seconds=1)
+    other_call = next(call for call in calls if call['site_id'] == '3478')
+    assert other_call['start_date'] == start_date
+
+    assert watermark_updates == {'Nasdaq': int(datetime(2024, 1, 30, 9, 30).timestamp())}
+    print("✓ Only the delta after each watermark is requested")
+
+
+def test_failed_stream_keeps_watermark():
+    """Test that only completely read sources advance their watermark"""
+    print("\n=== TEST 4: Failed streams keep their watermark ===")
+
+    published = datetime(2024, 1, 30, 9, 30)
+
+    class StreamingAPI:
+        SUPPORTS_STREAMING = True
+
+        def iter_articles(self, site_id=None, raise_errors=False, **kwargs):
+            assert raise_errors, "The fetcher must see errors instead of a silently truncated stream"
+            yield {'id_site': site_id, 'title': 'Sugar futures climb', 'unix_timestamp': int(published.timestamp())}
+            if site_id == '913':
+                raise ConnectionError("connection reset after 1 result")
+
+    watermark_updates = {}
+    records = list(iter_sugar_source_articles(
+        StreamingAPI(), 'sugar', {}, datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59), ['20000386'],
+        watermark_updates=watermark_updates, stream_records=True
+    ))
+
+    streamed_sources = [source for source in ALL_SUGAR_SOURCES_27 if source['id']]
+    assert len(records) == len(streamed_sources), "Articles read before the error are still yielded"
+    assert 'Nasdaq' not in watermark_updates, "The truncated source must be fetched again next run"
+    assert len(watermark_updates) == len(streamed_sources) - 1
+    print("✓ A source that failed mid-stream keeps its old watermark")
+
+
+if __name__ == "__main__":
+    test_tracker_wal_and_overlap()
+    test_watermarks_only_move_forward()
+    test_fetch_requests_only_delta()
+    test_failed_stream_keeps_watermark()
+    print("\n✅ All incremental fetching tests passed!")
@@ -447,15 +447,14 @@ def test_end_to_end_pipeline():
     try:
         from sugar.backend.text_filtering.sugar_triage_filter import triage_filter
         from sugar.backend.parsers.news_parser import clean_html, generate_article_id
-        from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
-        from clickhouse_driver import Client
+        from sugar.backend.db import get_pool
         import json
         
         # Create test articles
         test_articles = create_test_article_data()
         
         # Initialize components
-        db_client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        db_client = get_pool()
         
         passed = 0
         failed = 0
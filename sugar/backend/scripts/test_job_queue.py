@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+"""
+Test script for the durable backfill job queue (job_queue.py).
+
+This script tests:
+1. That enqueueing is idempotent, jobs are claimed oldest window first with exclusive
+   leases, and completion is idempotent
+2. That failed attempts are retried until max_attempts, expired leases are taken over, and
+   a worker that lost its lease can neither renew it nor fail the job
+3. That several processes draining one queue claim every job exactly once
+4. That SharedRateLimiter keeps several limiter instances under one request rate
+5. That run_queue_worker drains a queue through run_month_pipeline, retries a failed job
+   and marks a window processed once all its topics are done
+6. That a job in which a single source fails to fetch is retried instead of completed
+"""
+
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import requests
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers import sugar_news_fetcher
+from sugar.backend.parsers.job_queue import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_LEASED,
+    JOB_PENDING,
+    JobQueue,
+    SharedRateLimiter
+)
+from sugar.backend.parsers.sugar_news_fetcher import ProcessedDatesTracker, run_queue_worker
+
+WINDOWS = [
+    (datetime(2024, 2, 1), datetime(2024, 2, 29, 23, 59, 59)),
+    (datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59)),
+]
+TOPICS = ['20000386', '20000324']
+
+
+def drain(queue_path, worker_id, output):
+    """Claim and complete jobs until none is left, recording the claimed IDs"""
+    queue = JobQueue(queue_path)
+    claimed = []
+    while True:
+        jobs = queue.claim(worker_id, limit=2)
+        if not jobs:
+            break
+        for job in jobs:
+            claimed.append(job.job_id)
+            queue.complete(job.job_id, worker_id)
+    queue.close()
+    output.put(claimed)
+
+
+def test_claim_and_complete():
+    """Test enqueueing, exclusive leases and idempotent completion"""
+    print("\n=== TEST 1: Enqueue, claim and complete ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "jobs.db")
+        queue = JobQueue(path)
+        assert queue.enqueue(WINDOWS, TOPICS) == 4
+        assert queue.enqueue(WINDOWS, TOPICS) == 0, "Enqueueing again keeps the existing jobs"
+
+        other = JobQueue(path)
+        first = queue.claim('worker-a')[0]
+        second = other.claim('worker-b')[0]
+        assert first.window_start == datetime(2024, 1, 1) and first.topic_id == '20000324', "Oldest window first"
+        assert first.job_id != second.job_id and first.status == JOB_LEASED and first.attempts == 1
+
+        assert queue.complete(first.job_id, 'worker-a', {'saved': 12})
+        assert not other.complete(first.job_id, 'worker-b'), "Completing a done job is a no-op"
+        assert queue.jobs(JOB_DONE)[0].result == {'saved': 12}
+        assert queue.counts() == {JOB_PENDING: 2, JOB_LEASED: 1, JOB_DONE: 1, JOB_FAILED: 0}
+        assert not queue.window_done(*WINDOWS[1])
+        queue.complete(second.job_id, 'worker-b')
+        assert queue.window_done(*WINDOWS[1])
+        other.close()
+        queue.close()
+    print("✓ 4 jobs enqueued once, leased exclusively and completed idempotently")
+
+
+def test_retries_and_leases():
+    """Test retries, lease expiry and lost leases"""
+    print("\n=== TEST 2: Retries and lease expiry ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        queue = JobQueue(os.path.join(temp_dir, "jobs.db"), lease_seconds=0.2, max_attempts=2, retry_delay=0)
+        queue.enqueue(WINDOWS[:1], TOPICS[:1])
+
+        job = queue.claim('worker-a')[0]
+        assert queue.fail(job.job_id, 'worker-a', "HTTP 500") == JOB_PENDING
+        job = queue.claim('worker-a')[0]
+        assert job.attempts == 2 and job.last_error == "HTTP 500"
+        assert queue.fail(job.job_id, 'worker-a', "HTTP 500") == JOB_FAILED
+        assert not queue.claim('worker-a'), "A job without attempts left is not claimed"
+        assert queue.retry() == 1 and queue.claim('worker-a')[0].attempts == 1
+
+        # worker-a stops renewing (crash); after the lease expires worker-b takes the job over
+        time.sleep(0.3)
+        job = queue.claim('worker-b')[0]
+        assert job.lease_owner == 'worker-b' and job.attempts == 2
+        assert not queue.heartbeat(job.job_id, 'worker-a'), "The old worker's lease is gone"
+        assert queue.fail(job.job_id, 'worker-a', "late failure") is None
+        assert queue.heartbeat(job.job_id, 'worker-b')
+
+        with queue.keep_alive(job.job_id, 'worker-b', interval=0.05) as lost:
+            time.sleep(0.4)
+        assert not lost.is_set() and not queue.claim('worker-c'), "The keep-alive renews the lease"
+
+        time.sleep(0.3)
+        assert not queue.claim('worker-c'), "An expired lease without attempts left is not handed out"
+        assert queue.counts()[JOB_FAILED] == 1
+
+        queue.retry()
+        job = queue.claim('worker-c')[0]
+        assert queue.release(job.job_id, 'worker-c') and queue.jobs()[0].attempts == 0
+        queue.close()
+    print("✓ Retries stop at max_attempts, expired leases are taken over, lost leases are rejected")
+
+
+def test_concurrent_workers():
+    """Test several processes draining one queue"""
+    print("\n=== TEST 3: Concurrent worker processes ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "jobs.db")
+        queue = JobQueue(path)
+        windows = [(datetime(2023, month, 1), datetime(2023, month, 28)) for month in range(1, 13)]
+        queue.enqueue(windows, TOPICS + ['20000210'])
+
+        context = multiprocessing.get_context('spawn')
+        output = context.Queue()
+        workers = [context.Process(target=drain, args=(path, f"worker-{i}", output)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        claimed = [job_id for _ in workers for job_id in output.get(timeout=120)]
+        for worker in workers:
+            worker.join(timeout=120)
+
+        assert len(claimed) == 36 and len(set(claimed)) == 36, "Every job is claimed exactly once"
+        assert queue.counts()[JOB_DONE] == 36
+        queue.close()
+    print(f"✓ 4 processes drained {len(claimed)} jobs without claiming any twice")
+
+
+def test_shared_rate_limiter():
+    """Test the shared token bucket"""
+    print("\n=== TEST 4: Shared rate limiter ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "jobs.db")
+        limiters = [SharedRateLimiter(path, rate=20, burst=2) for _ in range(2)]
+        started = time.monotonic()
+        for i in range(12):
+            assert limiters[i % 2].acquire()
+        elapsed = time.monotonic() - started
+        # 2 tokens of burst, then 10 more at 20 per second
+        assert elapsed >= 0.45, f"Two limiters on one bucket share the rate ({elapsed:.2f}s)"
+        assert not limiters[0].acquire(timeout=0.001)
+        for limiter in limiters:
+            limiter.close()
+    print(f"✓ 12 requests through 2 limiters at 20/s took {elapsed:.2f}s")
+
+
+def make_args(temp_dir):
+    return argparse.Namespace(
+        lease_seconds=60, max_attempts=3, retry_delay=0, queue_journal_mode='WAL', requests_per_second=50,
+        response_cache_dir=None, response_cache_ttl_days=30, response_cache_max_mb=2048,
+        response_cache_mode='readwrite', normalization_service=None, process_workers=0, process_chunk_size=32,
+        no_source_groups=True, source_group_page_size=100, no_dedup_index=True,
+        dedup_index_db=os.path.join(temp_dir, "dedup_index.db"),
+        processed_dates_db=os.path.join(temp_dir, "processed_dates.db"),
+        max_articles=100, queue_size=16, save_batch_size=10, max_memory_mb=4000, metrics_dir=None
+    )
+
+
+def test_queue_worker():
+    """Test draining a queue with run_queue_worker"""
+    print("\n=== TEST 5: run_queue_worker ===")
+
+    calls = []
+
+    def fake_pipeline(api_key, start_date, end_date, topic_ids, *args, **kwargs):
+        calls.append((start_date, topic_ids[0]))
+        assert kwargs['rate_limiter'] is not None and kwargs['global_dedup_cache'] is not None
+        failed = 1 if len(calls) == 1 else 0  # The first fetch fails and is retried
+        return {'processed': 5, 'saved': 0 if failed else 3, 'failed_topics': failed, 'source_errors': 0,
+                'save_errors': 0, 'pipeline': {}}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "jobs.db")
+        queue = JobQueue(path)
+        queue.enqueue(WINDOWS, TOPICS)
+        with patch.object(sugar_news_fetcher, 'run_month_pipeline', side_effect=fake_pipeline):
+            summary = run_queue_worker(path, 'test-key', make_args(temp_dir), worker_id='worker-a', poll_interval=0.01)
+
+        assert summary == {'completed': 4, 'retried': 1, 'failed': 0, 'saved': 12}, summary
+        assert len(calls) == 5 and calls[0][0] == datetime(2024, 1, 1), "Oldest window first, one retry"
+        assert queue.counts()[JOB_DONE] == 4
+        tracker = ProcessedDatesTracker(os.path.join(temp_dir, "processed_dates.db"))
+        assert all(tracker.is_date_range_processed(start, end, 'monthly') for start, end in WINDOWS)
+        tracker.close()
+
+        output = subprocess.run([sys.executable, '-m', 'sugar.backend.parsers.job_queue', path, 'status'],
+                                cwd=str(project_root), capture_output=True, text=True, timeout=60).stdout
+        assert 'done: 4' in output and 'total: 4' in output, output
+        queue.close()
+    print(f"✓ 4 jobs drained in {len(calls)} pipeline runs; both months marked processed")
+
+
+def test_failed_source_retries_job():
+    """Test that a source error fails the job instead of completing its topic"""
+    print("\n=== TEST 6: Failed source fetch ===")
+
+    published = datetime(2024, 1, 15, 10, 0)
+    searches = []
+
+    def mock_search_articles(*args, **kwargs):
+        assert kwargs.get('raise_errors'), "Source searches must raise instead of returning no results"
+        searches.append(kwargs['site_id'])
+        if kwargs['site_id'] == '913' and searches.count('913') == 1:
+            raise requests.exceptions.ConnectionError("connection reset")
+        if kwargs['site_id'] != '913':
+            return pd.DataFrame()
+        return pd.DataFrame([{
+            'title': 'Sugar futures climb',
+            'text': 'Raw sugar futures rose on Brazilian supply concerns.',
+            'site_name': 'Nasdaq',
+            'id_site': 913,
+            'url': 'https://www.nasdaq.com/sugar-futures-climb',
+            'published_date': published,
+            'unix_timestamp': int(published.timestamp())
+        }])
+
+    normalization_pipeline = Mock()
+    normalization_pipeline.normalize.side_effect = lambda text=None, sugar_pricing_lines=None: (
+        [] if sugar_pricing_lines is not None else text
+    )
+    mock_api = Mock()
+    mock_api.search_articles.side_effect = mock_search_articles
+    saved = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "jobs.db")
+        queue = JobQueue(path)
+        queue.enqueue(WINDOWS[1:], TOPICS[:1])
+        with patch.object(sugar_news_fetcher, 'OpointAPI', return_value=mock_api), \
+                patch.object(sugar_news_fetcher, 'LanguageNormalizationPipeline', return_value=normalization_pipeline), \
+                patch.object(sugar_news_fetcher, 'save_to_database',
+                             side_effect=lambda df, *args, **kwargs: saved.append(len(df)) or len(df)), \
+                patch.object(sugar_news_fetcher, 'filter_trusted_sources', side_effect=lambda df, verbose=True: df):
+            summary = run_queue_worker(path, 'test-key', make_args(temp_dir), worker_id='worker-a', poll_interval=0.01)
+
+        assert summary == {'completed': 1, 'retried': 1, 'failed': 0, 'saved': 1}, summary
+        assert searches.count('913') == 2, "The failed source is fetched again by the retry"
+        assert queue.counts()[JOB_DONE] == 1
+        tracker = ProcessedDatesTracker(os.path.join(temp_dir, "processed_dates.db"))
+        assert tracker.is_date_range_processed(*WINDOWS[1], 'monthly')
+        tracker.close()
+        queue.close()
+    print("✓ The job with a failed source was retried and completed on its second attempt")
+
+
+if __name__ == "__main__":
+    test_claim_and_complete()
+    test_retries_and_leases()
+    test_concurrent_workers()
+    test_shared_rate_limiter()
+    test_queue_worker()
+    test_failed_source_retries_job()
+    print("\n✅ All job queue tests passed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Test script for fast language identification with per-source priors.
+
+This script tests:
+1. That LanguageIdentifier returns the same codes as seeded langdetect on the validation set
+2. That repeated texts are answered from the LRU cache
+3. That a source with a full single-language window skips detection, except for other scripts
+4. That the normalization pipeline and fetcher pass the article source through
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "sugar" / "backend" / "text_filtering"))
+
+from sugar.backend.text_filtering.language_id import LanguageIdentifier
+from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+from sugar.backend.parsers.sugar_news_fetcher import normalize_article_text
+from language_id_validation_test import VALIDATION_SET, reference_detect, identifier_detect
+
+ENGLISH = ("Raw sugar futures rose on Tuesday as the dry weather in Brazil threatened the cane crop "
+           "and traders said that the mills were not able to crush as much as they had planned.")
+
+
+def test_matches_langdetect():
+    """Test parity with seeded langdetect on the labelled validation set"""
+    print("\n=== TEST 1: Parity with langdetect ===")
+
+    identifier = LanguageIdentifier()
+    for text, label in VALIDATION_SET:
+        expected = reference_detect(text)
+        assert identifier_detect(identifier, text) == expected, f"Mismatch for {text!r}"
+        if label:
+            assert expected == label, f"langdetect label changed for {text!r}"
+    assert identifier.stats['script'] > 0 and identifier.stats['langdetect'] > 0
+    print(f"✓ {len(VALIDATION_SET)} texts match langdetect ({dict(identifier.stats)})")
+
+
+def test_cache():
+    """Test the LRU cache"""
+    print("\n=== TEST 2: LRU cache ===")
+
+    identifier = LanguageIdentifier(cache_size=2)
+    texts = ["Цены на сахар выросли.", "Les prix du sucre ont augmenté cette semaine.", "Die Zuckerpreise sind gestiegen."]
+    for text in texts:
+        identifier.detect(text)
+    assert identifier.detect(texts[2]) == "de"
+    assert identifier.stats['cache'] == 1
+    identifier.detect(texts[0])
+    assert identifier.stats['cache'] == 1, "Oldest entry should have been evicted"
+    print("✓ Repeated texts are cached and the cache stays bounded")
+
+
+def test_source_prior():
+    """Test learned per-source priors"""
+    print("\n=== TEST 3: Per-source priors ===")
+
+    identifier = LanguageIdentifier(prior_window=10, prior_recheck_interval=5)
+    for i in range(10):
+        assert identifier.get_prior("Nasdaq") is None
+        identifier.detect(f"{ENGLISH} Update {i}.", source="Nasdaq")
+    assert identifier.get_prior("Nasdaq") == "en"
+    assert identifier.get_prior("Other") is None
+
+    detected_before = identifier.stats['english'] + identifier.stats['langdetect']
+    for i in range(10):
+        assert identifier.detect(f"Short note {i}", source="Nasdaq") == "en"
+    detected_after = identifier.stats['english'] + identifier.stats['langdetect']
+    assert identifier.stats['prior'] == 8
+    assert detected_after - detected_before == 2, "Every 5th article should still be detected"
+
+    assert identifier.detect("Цены на сахар выросли из-за засухи.", source="Nasdaq") == "ru"
+    print("✓ Single-language sources skip detection; other scripts are still detected")
+
+
+def test_source_passed_through():
+    """Test that the article source reaches the identifier"""
+    print("\n=== TEST 4: Source plumbing ===")
+
+    pipeline = LanguageNormalizationPipeline(language_identifier=LanguageIdentifier(prior_window=1))
+    pipeline.tokenizer = Mock()
+    pipeline.model = Mock()
+    pipeline.sym_spell = None
+    pipeline.nlp = None
+    assert normalize_article_text(pipeline, ENGLISH, "Nasdaq") == ENGLISH
+    assert pipeline.language_identifier.get_prior("Nasdaq") == "en"
+
+    # Pipelines without source priors are called as before
+    plain = Mock(spec=['normalize'])
+    plain.normalize.return_value = "text"
+    assert normalize_article_text(plain, "text", "Nasdaq") == "text"
+    plain.normalize.assert_called_once_with("text")
+    print("✓ normalize() passes the article source to the identifier")
+
+
+if __name__ == "__main__":
+    test_matches_langdetect()
+    test_cache()
+    test_source_prior()
+    test_source_passed_through()
+    print("\n✅ All language identification tests passed!")
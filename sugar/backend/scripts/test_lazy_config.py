@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+Test script for lazy configuration loading and deferred optional imports.
+
+This script tests:
+1. That importing sugar.backend.config reads nothing and prints nothing, and that settings
+   are resolved from the environment on first access and cached
+2. That SUGAR_CONFIG_DEBUG prints the resolved settings with secrets masked
+3. That importing sugar_news_fetcher neither resolves the configuration nor imports
+   tiktoken, psutil, torch, transformers or spaCy, and how long the cold import takes
+4. That load_env() makes variables outside the settings (NEBIUS_API_KEY) available from
+   the .env file without resolving the settings
+
+Every check runs in a fresh interpreter so that nothing is imported beforehand.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+DEFERRED_MODULES = ('tiktoken', 'psutil', 'torch', 'transformers', 'spacy')
+
+
+def run_python(code, **environment):
+    """Run code in a fresh interpreter from the project root and return its stdout"""
+    env = dict(os.environ)
+    for name in ('SUGAR_CONFIG_DEBUG', 'NEBIUS_API_KEY', 'OPOINT_API_KEY'):
+        env.pop(name, None)
+    env.update(PYTHONPATH=str(project_root), **environment)
+    result = subprocess.run([sys.executable, '-c', code], cwd=str(project_root), env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_lazy_config():
+    """Test that settings are resolved on first access"""
+    print("\n=== TEST 1: Lazy configuration ===")
+
+    output = run_python(
+        "import json, sys\n"
+        "from sugar.backend import config\n"
+        "loaded_on_import = config._CONFIG is not None or 'dotenv' in sys.modules\n"
+        "native = config.CLICKHOUSE_NATIVE_CONFIG\n"
+        "print(json.dumps({'loaded_on_import': loaded_on_import, 'native': native,\n"
+        "                  'cached': config.get_config()['CLICKHOUSE_NATIVE_CONFIG'] is native,\n"
+        "                  'backend': config.STORAGE_BACKEND}))\n",
+        CLICKHOUSE_HOST='ch.example', CLICKHOUSE_NATIVE_PORT='9440', CLICKHOUSE_PASSWORD='secret',
+        SUGAR_STORAGE_BACKEND='Embedded'
+    )
+    lines = output.strip().splitlines()
+    assert len(lines) == 1, f"Nothing but the result is printed, got: {lines[:-1]}"
+    result = json.loads(lines[0])
+    assert not result['loaded_on_import'], "Importing the module must not load the configuration"
+    assert result['native']['host'] == 'ch.example' and result['native']['port'] == 9440
+    assert result['cached'] and result['backend'] == 'embedded'
+
+    try:
+        from sugar.backend import config
+        config.NO_SUCH_SETTING
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Unknown settings must raise AttributeError")
+    print("✓ Settings resolve on first access, silently, and are cached")
+
+
+def test_debug_output():
+    """Test the SUGAR_CONFIG_DEBUG output"""
+    print("\n=== TEST 2: Debug output ===")
+
+    output = run_python(
+        "from sugar.backend.config import get_config\nget_config()\n",
+        CLICKHOUSE_HOST='ch.example', CLICKHOUSE_PASSWORD='secret', SUGAR_CONFIG_DEBUG='1'
+    )
+    assert 'Looking for .env file at' in output
+    assert 'ClickHouse Native configuration:' in output and 'ch.example' in output
+    assert 'secret' not in output, "Secrets are masked"
+    print("✓ SUGAR_CONFIG_DEBUG=1 prints the .env search and masked settings")
+
+
+def test_fetcher_cold_import():
+    """Test that the fetcher defers configuration and heavy optional imports"""
+    print("\n=== TEST 3: Fetcher cold import ===")
+
+    output = run_python(
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import sugar.backend.parsers.sugar_news_fetcher as fetcher\n"
+        "seconds = time.perf_counter() - started\n"
+        "from sugar.backend import config\n"
+        f"deferred = [name for name in {DEFERRED_MODULES!r} if name in sys.modules]\n"
+        "fetcher.get_memory_usage()\n"
+        "print(json.dumps({'seconds': seconds, 'imported': deferred, 'config_loaded': config._CONFIG is not None,\n"
+        "                  'tokens': fetcher.count_tokens('Raw sugar futures rose sharply')}))\n"
+    )
+    result = json.loads(output.strip().splitlines()[-1])
+    assert not result['imported'], f"Imported at module load: {result['imported']}"
+    assert not result['config_loaded'], "The configuration is resolved when a store is first used"
+    assert result['tokens'] > 0
+    print(f"✓ Cold import in {result['seconds'] * 1000:.0f} ms without {', '.join(DEFERRED_MODULES)}")
+
+
+def test_load_env():
+    """Test loading the .env file for variables outside the settings"""
+    print("\n=== TEST 4: load_env() ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / '.env'
+        env_file.write_text("NEBIUS_API_KEY=from-dotenv\nOPOINT_API_KEY=from-dotenv\n")
+        output = run_python(
+            "import json, os\n"
+            "from pathlib import Path\n"
+            "from sugar.backend import config\n"
+            f"config.ENV_PATHS = (Path({str(env_file)!r}),)\n"
+            "before = os.getenv('NEBIUS_API_KEY')\n"
+            "config.load_env()\n"
+            "print(json.dumps({'before': before, 'nebius': os.getenv('NEBIUS_API_KEY'),\n"
+            "                  'opoint': os.getenv('OPOINT_API_KEY'), 'config_loaded': config._CONFIG is not None}))\n",
+            OPOINT_API_KEY='from-environment'
+        )
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result['before'] is None and result['nebius'] == 'from-dotenv'
+    assert result['opoint'] == 'from-environment', "Variables already set are not overridden"
+    assert not result['config_loaded'], "load_env() does not resolve the settings"
+    print("✓ load_env() reads NEBIUS_API_KEY from .env without overriding the environment")
+
+
+if __name__ == "__main__":
+    test_lazy_config()
+    test_debug_output()
+    test_fetcher_cold_import()
+    test_load_env()
+    print("\n✅ All lazy configuration tests passed!")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+"""
+Test script for lazy model loading and the shared normalization service.
+
+This script tests:
+1. That constructing LanguageNormalizationPipeline loads no model until a component is used
+2. That English-only input never loads the translation model
+3. That several clients share one service and get the same results as a local pipeline
+4. That service errors are reported to the client
+5. That without NORMALIZATION_SERVICE_AUTHKEY the service writes a random key only its owner can
+   read, clients use it, and non-loopback addresses are refused
+6. That the service builds its pipeline with the fetcher's arguments, so protected terms are
+   normalized exactly like in-process
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.text_filtering import language_normalization
+from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+from sugar.backend.parsers.sugar_news_fetcher import normalization_pipeline_kwargs
+from sugar.backend.text_filtering.normalization_service import (
+    NormalizationClient,
+    NormalizationService,
+    load_authkey,
+    service_pipeline_kwargs
+)
+
+ENGLISH = ("Raw sugar futures rose on Tuesday as the dry weather in Brazil threatened the cane crop "
+           "and traders said that the mills were not able to crush as much as they had planned.")
+
+
+class CountingLoader:
+    """Stand-in for from_pretrained() that counts model loads"""
+
+    def __init__(self):
+        self.loads = 0
+
+    def from_pretrained(self, name):
+        self.loads += 1
+        return self
+
+    def eval(self):
+        return self
+
+
+def test_lazy_loading():
+    """Test that components load on first use only"""
+    print("\n=== TEST 1: Lazy component loading ===")
+
+    loader = CountingLoader()
+    with patch.object(language_normalization, 'M2M100Tokenizer', loader), \
+            patch.object(language_normalization, 'M2M100ForConditionalGeneration', loader):
+        pipeline = LanguageNormalizationPipeline()
+        assert loader.loads == 0, "Construction must not load models"
+        assert 'sym_spell' not in pipeline.__dict__ and 'nlp' not in pipeline.__dict__
+
+        pipeline.nlp = None
+        assert pipeline.normalize(ENGLISH) == ENGLISH
+        assert loader.loads == 0, "English input must not load the translation model"
+        assert 'sym_spell' in pipeline.__dict__, "Typo correction loads SymSpell on first use"
+
+        pipeline.model
+        assert loader.loads == 1
+        pipeline.model
+        assert loader.loads == 1, "Components are loaded once"
+    print("✓ Models are loaded on first use only")
+
+
+def start_service(pipeline=None, authkey=b"test", **kwargs):
+    service = NormalizationService(("localhost", 0), authkey=authkey, pipeline=pipeline, **kwargs)
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    while service.listener is None:
+        time.sleep(0.01)
+    return service
+
+
+def make_pipeline():
+    pipeline = LanguageNormalizationPipeline()
+    pipeline.tokenizer = None
+    pipeline.model = None
+    pipeline.nlp = None
+    pipeline.sym_spell = None
+    return pipeline
+
+
+def test_shared_service():
+    """Test that several clients are served by one pipeline"""
+    print("\n=== TEST 2: Shared service ===")
+
+    local = make_pipeline()
+    service = start_service(make_pipeline())
+    try:
+        texts = ["Sugar  prices rose!!", "u r gr8", ENGLISH]
+        results = {}
+
+        def worker(name):
+            client = NormalizationClient(service.listener.address, authkey=b"test")
+            results[name] = (client.normalize_batch(texts, sources=["Nasdaq"] * 3),
+                             client.normalize(texts[0], source="Nasdaq"),
+                             client.normalize(sugar_pricing_lines=["NY11 Price: 21.5"]))
+            client.close()
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        expected = (local.normalize_batch(texts), local.normalize(texts[0]),
+                    local.normalize(sugar_pricing_lines=["NY11 Price: 21.5"]))
+        assert all(result == expected for result in results.values())
+        assert service.stats['clients'] == 4 and service.stats['texts'] == 16
+    finally:
+        service.stop()
+    print(f"✓ 4 clients shared one pipeline ({service.stats['requests']} requests)")
+
+
+def test_service_errors():
+    """Test that failures are raised in the client"""
+    print("\n=== TEST 3: Error reporting ===")
+
+    pipeline = make_pipeline()
+    pipeline.normalize_batch = lambda texts, sources=None: 1 / 0
+    service = start_service(pipeline)
+    try:
+        client = NormalizationClient(service.listener.address, authkey=b"test")
+        try:
+            client.normalize("text")
+            raise AssertionError("Expected RuntimeError")
+        except RuntimeError as e:
+            assert "division by zero" in str(e)
+        client.close()
+    finally:
+        service.stop()
+    print("✓ Service errors are raised as RuntimeError in the client")
+
+
+def test_generated_authkey():
+    """Test the generated key file and the loopback check"""
+    print("\n=== TEST 4: Authentication key ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        key_path = os.path.join(temp_dir, "keys", "normalization_service.key")
+        environment = {k: v for k, v in os.environ.items() if k != 'NORMALIZATION_SERVICE_AUTHKEY'}
+        environment['NORMALIZATION_SERVICE_AUTHKEY_FILE'] = key_path
+        with patch.dict(os.environ, environment, clear=True):
+            try:
+                NormalizationClient(("localhost", 1), connect_timeout=0)
+                raise AssertionError("Clients need a key")
+            except RuntimeError as e:
+                assert "NORMALIZATION_SERVICE_AUTHKEY" in str(e)
+
+            service = start_service(make_pipeline(), authkey=None)
+            try:
+                assert stat.S_IMODE(os.stat(key_path).st_mode) == 0o600, "Only the owner may read the key"
+                assert len(service.authkey) == 64 and service.authkey == load_authkey()
+                try:
+                    NormalizationClient(service.listener.address, authkey=b"sugar-normalization")
+                    raise AssertionError("A wrong key must be rejected")
+                except AuthenticationError:
+                    pass
+                # The rejected client does not stop the service
+                client = NormalizationClient(service.listener.address)
+                assert client.normalize(ENGLISH) == ENGLISH
+                client.close()
+            finally:
+                service.stop()
+
+            with patch.dict(os.environ, {'NORMALIZATION_SERVICE_AUTHKEY': 'from-env'}):
+                assert load_authkey() == b"from-env"
+
+        for address in [("0.0.0.0", 0), "10.1.2.3:6010"]:
+            try:
+                NormalizationService(address, authkey=b"test", pipeline=make_pipeline())
+                raise AssertionError(f"{address} must be refused")
+            except ValueError as e:
+                assert "allow_remote" in str(e)
+        NormalizationService(("0.0.0.0", 0), authkey=b"test", pipeline=make_pipeline(), allow_remote=True)
+    print("✓ A random 0600 key file is shared with clients, wrong keys are rejected and public addresses need allow_remote")
+
+
+def test_service_matches_in_process():
+    """Test that the service normalizes with the fetcher's pipeline arguments"""
+    print("\n=== TEST 5: Service and in-process output ===")
+
+    text = "Tereos said sugar exports rose"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # A dictionary in which the entity name Tereos is a typo of "terms"
+        dictionary = os.path.join(temp_dir, "frequency_dictionary.txt")
+        with open(dictionary, "w") as f:
+            f.write("terms 5000\nsaid 5000\nsugar 5000\nexports 5000\nrose 5000\n")
+
+        def local_pipeline(**kwargs):
+            pipeline = LanguageNormalizationPipeline(symspell_dict_path=dictionary, **kwargs)
+            pipeline.tokenizer = None
+            pipeline.model = None
+            pipeline.nlp = None
+            return pipeline
+
+        assert local_pipeline().normalize(text) != text, "Unprotected entity names are corrected"
+        in_process = local_pipeline(**normalization_pipeline_kwargs())
+
+        kwargs = service_pipeline_kwargs(dictionary)
+        assert kwargs == dict(normalization_pipeline_kwargs(), symspell_dict_path=dictionary)
+        service = start_service(pipeline_kwargs=kwargs, preload=False)
+        try:
+            service.pipeline.tokenizer = None
+            service.pipeline.model = None
+            service.pipeline.nlp = None
+            client = NormalizationClient(service.listener.address, authkey=b"test")
+            served = client.normalize_batch([text, ENGLISH])
+            client.close()
+        finally:
+            service.stop()
+        assert served == in_process.normalize_batch([text, ENGLISH]) and served[0] == text
+    print("✓ The service keeps protected terms like the in-process pipeline")
+
+
+if __name__ == "__main__":
+    test_lazy_loading()
+    test_shared_service()
+    test_service_errors()
+    test_generated_authkey()
+    test_service_matches_in_process()
+    print("\n✅ All normalization service tests passed!")
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+"""
+Test script for the content-addressed Opoint response cache.
+
+This script tests:
+1. That cache keys are stable under cosmetic payload differences
+2. That responses round-trip through the compressed on-disk store
+3. That TTL expiry and size-bounded LRU eviction work
+4. That OpointAPI serves repeated searches from the cache and supports offline replay
+5. That searches of a window that has not ended yet are fetched again instead of replayed
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.api.opoint.opoint_api import OpointAPI
+from sugar.backend.api.opoint.response_cache import OpointResponseCache, is_open_window, make_cache_key
+
+
+def make_payload(searchterm="sugar AND site:913", filters=None, requested=50):
+    """Create a search payload in the shape built by OpointAPI"""
+    return {
+        "expressions": [{
+            "linemode": "R",
+            "searchline": {
+                "searchterm": searchterm,
+                "filters": filters if filters is not None else [{"type": "score", "min": 0.77}, {"type": "lang", "id": "en"}]
+            }
+        }],
+        "params": {
+            "requestedarticles": requested,
+            "oldest": 1704067200,
+            "newest": 1706745599,
+            "main": {"header": 1, "summary": 1, "text": 1}
+        }
+    }
+
+
+def make_response(n=3):
+    """Create a raw search response with n documents"""
+    return {
+        "searchresult": {
+            "document": [
+                {
+                    "header": {"text": f"Sugar prices rise {i}"},
+                    "body": {"text": f"Raw sugar futures climbed in session {i}."},
+                    "local_time": {"text": "2024-01-15T10:00:00"},
+                    "orig_url": f"https://example.com/sugar/{i}",
+                    "first_source": {"sitename": "Nasdaq"},
+                    "id_site": 913,
+                    "id_article": i
+                }
+                for i in range(n)
+            ]
+        }
+    }
+
+
+def test_cache_key_canonicalization():
+    """Test that cache keys ignore filter order and whitespace but not content"""
+    print("\n=== TEST 1: Cache key canonicalization ===")
+
+    base = make_payload()
+    reordered = make_payload(filters=[{"type": "lang", "id": "en"}, {"type": "score", "min": 0.77}])
+    spaced = make_payload(searchterm="sugar   AND  site:913")
+    different = make_payload(requested=100)
+
+    assert make_cache_key(base) == make_cache_key(reordered), "Filter order should not change the key"
+    assert make_cache_key(base) == make_cache_key(spaced), "Whitespace should not change the key"
+    assert make_cache_key(base) != make_cache_key(different), "Requested article count must change the key"
+    print("✓ Cache keys are canonical")
+
+
+def test_cache_roundtrip_and_ttl():
+    """Test storing, reading and expiring entries"""
+    print("\n=== TEST 2: Round-trip and TTL ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = OpointResponseCache(temp_dir, ttl_seconds=1)
+        payload = make_payload()
+        response = make_response()
+
+        assert cache.get(payload) is None, "Empty cache should miss"
+        key = cache.put(payload, response)
+        assert os.path.exists(cache.path_for(key)), "Compressed entry should exist on disk"
+        assert cache.get(payload) == response, "Cached response should round-trip"
+        assert cache.stats['hits'] == 1
+
+        time.sleep(1.1)
+        assert cache.get(payload) is None, "Expired entry should miss"
+        assert not os.path.exists(cache.path_for(key)), "Expired entry should be removed from disk"
+        cache.close()
+    print("✓ Round-trip and TTL work correctly")
+
+
+def test_cache_lru_eviction():
+    """Test that the least recently used entries are evicted above max_bytes"""
+    print("\n=== TEST 3: LRU eviction ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = OpointResponseCache(temp_dir, ttl_seconds=None, max_bytes=10 ** 9)
+        payloads = [make_payload(searchterm=f"sugar AND site:{i}") for i in range(3)]
+        for payload in payloads:
+            cache.put(payload, make_response(20))
+            time.sleep(0.01)
+
+        entry_size = cache.total_bytes() // 3
+        # Touch the oldest entry so the second one becomes least recently used
+        assert cache.get(payloads[0]) is not None
+
+        cache.max_bytes = entry_size * 2 + entry_size // 2
+        cache.put(make_payload(searchterm="sugar AND site:99"), make_response(20))
+
+        assert cache.get(payloads[1]) is None, "Least recently used entry should be evicted"
+        assert cache.get(payloads[0]) is not None, "Recently used entry should be kept"
+        assert cache.total_bytes() <= cache.max_bytes
+        cache.close()
+    print("✓ LRU eviction works correctly")
+
+
+def test_opoint_api_uses_cache():
+    """Test that OpointAPI only hits the network once per identical search"""
+    print("\n=== TEST 4: OpointAPI cache integration ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = OpointResponseCache(temp_dir)
+        api = OpointAPI(api_key="test-key", cache=cache)
+
+        mock_response = Mock()
+        mock_response.json.return_value = make_response(2)
+        mock_response.raise_for_status.return_value = None
+
+        search_kwargs = dict(
+            site_id="913",
+            search_text="sugar",
+            num_articles=10,
+            min_score=0.77,
+            start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 1, 31, 23, 59, 59)
+        )
+
+        with patch('sugar.backend.api.opoint.opoint_api.requests.post', return_value=mock_response) as mock_post:
+            first = api.search_articles(**search_kwargs)
+            second = api.search_articles(**search_kwargs)
+            assert mock_post.call_count == 1, "Second identical search should be served from cache"
+        assert len(first) == len(second) == 2
+        assert list(first['title']) == list(second['title'])
+
+        # Replay mode must never touch the network
+        replay_api = OpointAPI(api_key="test-key", cache=cache, cache_mode='replay')
+        with patch('sugar.backend.api.opoint.opoint_api.requests.post') as mock_post:
+            replayed = replay_api.search_articles(**search_kwargs)
+            missing = replay_api.search_articles(**dict(search_kwargs, site_id="3478"))
+            assert mock_post.call_count == 0, "Replay mode should not make network requests"
+        assert len(replayed) == 2
+        assert missing.empty, "Replay mode should return an empty result on a cache miss"
+        cache.close()
+    print("✓ OpointAPI serves repeated searches from the cache")
+
+
+def test_open_window_not_replayed():
+    """Test that a window ending in the future always goes to the network"""
+    print("\n=== TEST 5: Open windows ===")
+
+    assert not is_open_window(make_payload())
+    assert is_open_window({"params": {"newest": int(time.time()) + 3600}})
+    assert is_open_window({"params": {}}), "A search without an end date runs up to now"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = OpointResponseCache(temp_dir)
+        api = OpointAPI(api_key="test-key", cache=cache)
+
+        first_response = Mock()
+        first_response.json.return_value = make_response(1)
+        later_response = Mock()
+        later_response.json.return_value = make_response(3)
+
+        # Like the current month of generate_monthly_date_ranges: it ends after now
+        today = datetime.now()
+        search_kwargs = dict(site_id="913", search_text="sugar", num_articles=10,
+                             start_date=today.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+                             end_date=today + timedelta(days=1))
+
+        with patch('sugar.backend.api.opoint.opoint_api.requests.post',
+                   side_effect=[first_response, later_response]) as mock_post:
+            first = api.search_articles(**search_kwargs)
+            second = api.search_articles(**search_kwargs)
+            assert mock_post.call_count == 2, "The second search of an open window must go to the network"
+        assert len(first) == 1 and len(second) == 3, "Articles published since the first search are seen"
+        assert len(cache) == 1, "The open window is stored, replacing the earlier response"
+
+        # The newest response is still available offline
+        replay_api = OpointAPI(api_key="test-key", cache=cache, cache_mode='replay')
+        with patch('sugar.backend.api.opoint.opoint_api.requests.post') as mock_post:
+            assert len(replay_api.search_articles(**search_kwargs)) == 3
+            assert mock_post.call_count == 0
+        cache.close()
+    print("✓ Open windows are fetched again in readwrite mode and replayed offline")
+
+
+if __name__ == "__main__":
+    test_cache_key_canonicalization()
+    test_cache_roundtrip_and_ttl()
+    test_cache_lru_eviction()
+    test_opoint_api_uses_cache()
+    test_open_window_not_replayed()
+    print("\n✅ All response cache tests passed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Test script for the local Opoint stand-in server and the replay benchmark.
+
+This script tests:
+1. That the stand-in applies the site:, date window and article count of OpointAPI payloads,
+   answers newest first, checks the token and serves gzip and streamed clients
+2. That OpointAPI waits and retries searches answered with 429 Too Many Requests
+3. That the benchmark runs fetch_sugar_articles_for_period end-to-end against the stand-in
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.api.opoint.opoint_api import OpointAPI
+from sugar.backend.api.opoint.standin_server import OpointStandinServer, make_synthetic_documents
+from sugar.backend.scripts.benchmark_fetcher_standin import run_benchmark
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 31, 23, 59, 59)
+SITES = [(913, 'Nasdaq'), (3478, 'Barchart'), (15086, 'Investing.com')]
+
+
+def test_search_contract():
+    """Test the /search/ contract of the stand-in"""
+    print("\n=== TEST 1: Search contract ===")
+
+    documents = make_synthetic_documents(SITES, START, END, per_site=30)
+    with OpointStandinServer(documents, api_key="standin-key") as server:
+        api = OpointAPI(api_key="standin-key", base_url=server.url)
+
+        single = api.search_articles(site_id="913", search_text="sugar", num_articles=10,
+                                     start_date=START, end_date=END)
+        assert len(single) == 10 and set(single['id_site']) == {913}
+        assert single['unix_timestamp'].is_monotonic_decreasing, "Newest articles come first"
+
+        window_end = datetime(2024, 1, 10)
+        grouped = api.search_articles(site_ids=["913", "3478"], num_articles=500, start_date=START, end_date=window_end)
+        expected = [d for d in documents if d['id_site'] in (913, 3478) and d['unix_timestamp'] <= window_end.timestamp()]
+        assert len(grouped) == len(expected) and set(grouped['id_site']) <= {913, 3478}
+
+        streamed = list(api.iter_articles(site_id="15086", num_articles=5, start_date=START, end_date=END))
+        assert [record['id_article'] for record in streamed] == single_ids(server, "15086", 5)
+
+        unauthorized = requests.post(f"{server.url}/search/", json={}, headers={"Authorization": "Token wrong"})
+        assert unauthorized.status_code == 401
+        assert server.stats['requests'] == 3
+    print(f"✓ Site, OR-ed site and date filters applied; {server.stats['bytes']} gzip bytes served")
+
+
+def single_ids(server, site_id, count):
+    return [document['id_article'] for document in server.by_site[site_id][:count]]
+
+
+def test_rate_limit_retry():
+    """Test the 429 retry of OpointAPI"""
+    print("\n=== TEST 2: Rate limit retry ===")
+
+    documents = make_synthetic_documents(SITES, START, END, per_site=5)
+    with OpointStandinServer(documents) as server:
+        api = OpointAPI(api_key="standin", base_url=server.url, rate_limit_retries=2)
+        with patch.object(server, '_inject_failure', side_effect=[429, 429, None, 429, None]), \
+                patch('sugar.backend.api.opoint.opoint_api.time.sleep') as sleep:
+            results = api.search_articles(site_id="913", num_articles=5, start_date=START, end_date=END)
+            streamed = list(api.iter_articles(site_id="913", num_articles=5, start_date=START, end_date=END))
+        assert len(results) == 5 and len(streamed) == 5
+        assert server.stats['rate_limited'] == 3 and sleep.call_count == 3
+
+        # Still rate limited after every retry: the search fails like any other HTTP error
+        with patch.object(server, '_inject_failure', return_value=429), \
+                patch('sugar.backend.api.opoint.opoint_api.time.sleep'):
+            assert api.search_articles(site_id="913", num_articles=5).empty
+        assert server.stats['rate_limited'] == 6
+    print("✓ Rate limited searches are retried after Retry-After and give up after rate_limit_retries")
+
+
+def test_benchmark_end_to_end():
+    """Test the replay benchmark"""
+    print("\n=== TEST 3: End-to-end benchmark ===")
+
+    from sugar.backend.parsers.sugar_news_fetcher import ALL_SUGAR_SOURCES_27, MEDIA_TOPIC_IDS
+    sites = [(source['id'], source['name']) for source in ALL_SUGAR_SOURCES_27 if source['id']]
+    documents = make_synthetic_documents(sites, START, END, per_site=4, languages=['en', 'pt'])
+    result = run_benchmark(documents, START, END, MEDIA_TOPIC_IDS[:1], rate_limit_rate=0.2, seed=3)
+
+    assert result['fetched'] == len(documents), "Every synthetic document is fetched once per topic"
+    assert 0 < result['processed'] <= result['fetched']
+    assert {'fetch', 'normalize', 'triage', 'dedup'} <= set(result['stages'])
+    assert result['server']['requests'] >= 1 and result['fetched_per_second'] > 0
+    print(f"✓ {result['fetched']} fetched, {result['processed']} processed in {result['wall_seconds']}s "
+          f"({result['server']['rate_limited']} rate limited searches retried)")
+
+
+if __name__ == "__main__":
+    test_search_contract()
+    test_rate_limit_retry()
+    test_benchmark_end_to_end()
+    print("\n✅ All Opoint stand-in tests passed!")
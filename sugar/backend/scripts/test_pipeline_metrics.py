@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+"""
+Test script for the fetcher run metrics (PipelineMetrics).
+
+This script tests:
+1. Latency histograms, throughput, derived ratios, per-source ratios, cache hit rates and the pipeline bottleneck
+2. The JSON and Prometheus textfile export
+3. That run_month_pipeline records every stage, its counters, the per-source counters and the dedup cache statistics
+4. That DateProcessingLogger.get_processing_statistics parses its log file
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers.metrics import PipelineMetrics, PIPELINE_METRICS, STAGES
+from sugar.backend.parsers.sugar_news_fetcher import (
+    DateProcessingLogger,
+    create_global_dedup_cache,
+    run_month_pipeline
+)
+from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+
+PUBLISHED = datetime(2024, 1, 15, 10, 0)
+
+
+def test_snapshot():
+    """Test histograms, ratios, caches and the bottleneck"""
+    print("\n=== TEST 1: Snapshot ===")
+
+    metrics = PipelineMetrics(run_id="test")
+    for seconds in [0.002] * 90 + [0.2] * 10:
+        metrics.observe('normalize', seconds)
+    metrics.observe('fetch', 1.5, items=40)
+    metrics.add_counters({'processed': 40, 'sugar': 10, 'pipeline': {'ignored': 1}, 'flag': True})
+    metrics.increment('quota_allocated', 100)
+    metrics.increment('quota_fetched', 40)
+    metrics.record_cache('dedup', hits=3, misses=1)
+    metrics.record_source('Nasdaq', quota_allocated=20, quota_fetched=5)
+    metrics.record_source('Nasdaq', processed=4, sugar=1)
+    metrics.record_source('Nasdaq', processed=1, sugar=1)
+    metrics.record_pipeline({'wall_seconds': 10.0, 'source': {'items_out': 40, 'busy_seconds': 2.0},
+                             'stages': {'normalize': {'items_out': 40, 'busy_seconds': 8.0},
+                                        'save': {'items_out': 1, 'busy_seconds': 0.5}}})
+
+    snapshot = metrics.snapshot()
+    normalize = snapshot['stages']['normalize']
+    assert list(snapshot['stages']) == ['fetch', 'normalize'], "Stages are reported in pipeline order"
+    assert normalize['count'] == 100 and normalize['items'] == 100
+    assert 0.001 <= normalize['p50_seconds'] <= 0.005
+    assert 0.1 <= normalize['p99_seconds'] <= 0.2
+    assert normalize['buckets']['+Inf'] == 100
+    assert snapshot['stages']['fetch']['items_per_busy_second'] == round(40 / 1.5, 3)
+    assert snapshot['counters'] == {'processed': 40, 'sugar': 10, 'quota_allocated': 100, 'quota_fetched': 40}
+    assert snapshot['ratios'] == {'triage_pass_rate': 0.25, 'quota_utilization': 0.4, 'source_filtered_rate': 0.0}
+    assert snapshot['sources']['Nasdaq']['counters'] == {'quota_allocated': 20, 'quota_fetched': 5,
+                                                          'processed': 5, 'sugar': 2}
+    assert snapshot['sources']['Nasdaq']['ratios'] == {'triage_pass_rate': 0.4, 'quota_utilization': 0.25,
+                                                        'source_filtered_rate': 0.0}
+    assert snapshot['caches']['dedup']['hit_rate'] == 0.75
+    assert snapshot['pipeline']['stages']['normalize']['utilization'] == 0.8
+    assert snapshot['pipeline']['bottleneck'] == 'normalize'
+    print(f"✓ p50={normalize['p50_seconds']}s p99={normalize['p99_seconds']}s, bottleneck: normalize")
+
+
+def test_export():
+    """Test the JSON and Prometheus files"""
+    print("\n=== TEST 2: Export ===")
+
+    metrics = PipelineMetrics(run_id="20240115_100000")
+    with metrics.time('save') as timer:
+        timer.items = 25
+    metrics.increment('saved', 25)
+    metrics.record_cache('opoint_response', hits=1, misses=2)
+    metrics.record_source('Reuters "Commodities"', quota_allocated=10, quota_fetched=4)
+
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        paths = metrics.export(metrics_dir)
+        assert sorted(os.listdir(metrics_dir)) == ['sugar_fetcher.prom', 'sugar_fetcher_20240115_100000.json']
+        with open(paths['json']) as f:
+            exported = json.load(f)
+        with open(paths['prometheus']) as f:
+            prometheus = f.read()
+
+    assert exported['stages']['save']['items'] == 25
+    assert exported['counters']['saved'] == 25
+    assert 'sugar_fetcher_stage_latency_seconds_bucket{stage="save",le="+Inf"} 1' in prometheus
+    assert 'sugar_fetcher_stage_latency_seconds_count{stage="save"} 1' in prometheus
+    assert 'sugar_fetcher_stage_items_total{stage="save"} 25' in prometheus
+    assert 'sugar_fetcher_events_total{name="saved"} 25' in prometheus
+    assert 'sugar_fetcher_cache_requests_total{cache="opoint_response",result="miss"} 2' in prometheus
+    assert 'sugar_fetcher_source_events_total{source="Reuters \\"Commodities\\"",name="quota_fetched"} 4' in prometheus
+    assert 'sugar_fetcher_source_ratio{source="Reuters \\"Commodities\\"",name="quota_utilization"} 0.4' in prometheus
+    assert exported['sources']['Reuters "Commodities"']['ratios'] == {'quota_utilization': 0.4}
+    for line in prometheus.splitlines():
+        assert line.startswith('#') or len(line.rsplit(' ', 1)) == 2, f"Malformed line: {line}"
+    print("✓ JSON and Prometheus textfile written")
+
+
+def make_articles(count):
+    return pd.DataFrame([{
+        'title': f"Sugar market update {i}" if i % 2 else f"Coffee market update {i}",
+        'text': f"<p>{'Raw sugar' if i % 2 else 'Arabica'} futures moved on Brazil harvest news {i}.</p>",
+        'site_name': 'Nasdaq',
+        'id_site': 913,
+        'url': f"https://www.nasdaq.com/sugar/{i}",
+        'published_date': PUBLISHED,
+        'unix_timestamp': int(PUBLISHED.timestamp())
+    } for i in range(count)])
+
+
+def test_month_pipeline_metrics():
+    """Test that a month run records every stage"""
+    print("\n=== TEST 3: Month pipeline metrics ===")
+
+    pipeline = LanguageNormalizationPipeline()
+    pipeline.tokenizer = None
+    pipeline.model = None
+    pipeline.nlp = None
+
+    def mock_search_articles(*args, **kwargs):
+        return make_articles(10) if kwargs['site_id'] == '913' else pd.DataFrame()
+
+    PIPELINE_METRICS.reset("month-test")
+    with patch('sugar.backend.parsers.sugar_news_fetcher.OpointAPI') as mock_api_class, \
+            patch('sugar.backend.parsers.sugar_news_fetcher.save_to_database', side_effect=lambda df, *a, **k: len(df)):
+        mock_api = Mock()
+        mock_api.search_articles.side_effect = mock_search_articles
+        mock_api_class.return_value = mock_api
+        counters = run_month_pipeline(
+            "test-key", datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59),
+            ['20000386'], 100, pipeline, {'processing_mode': 'monthly'},
+            global_dedup_cache=create_global_dedup_cache(datetime(2024, 1, 1)),
+            queue_size=4, save_batch_size=5, topic_delay=0
+        )
+
+    snapshot = PIPELINE_METRICS.snapshot()
+    assert set(snapshot['stages']) == set(STAGES), f"Missing stages: {set(STAGES) - set(snapshot['stages'])}"
+    assert snapshot['stages']['fetch']['items'] == 10
+    assert snapshot['stages']['normalize']['items'] == counters['processed'] + counters['content_duplicates']
+    assert snapshot['counters']['fetched'] == 10
+    assert snapshot['counters']['saved'] == counters['saved'] > 0
+    assert 0 < snapshot['ratios']['triage_pass_rate'] < 1
+    assert snapshot['ratios']['quota_utilization'] > 0
+    assert snapshot['caches']['dedup']['misses'] == counters['processed']
+    nasdaq = snapshot['sources']['Nasdaq']
+    assert nasdaq['counters']['quota_fetched'] == 10 and nasdaq['counters']['processed'] == counters['processed']
+    assert nasdaq['ratios']['triage_pass_rate'] == snapshot['ratios']['triage_pass_rate']
+    assert nasdaq['ratios']['quota_utilization'] > 0
+    assert set(snapshot['pipeline']['stages']) == {'source', 'normalize', 'dedup', 'save'}
+    print(f"✓ {len(snapshot['stages'])} stages recorded; bottleneck: {snapshot['pipeline']['bottleneck']}")
+
+
+def test_processing_statistics():
+    """Test DateProcessingLogger.get_processing_statistics"""
+    print("\n=== TEST 4: Date processing statistics ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, "date_processing.log")
+        old = (datetime.now() - timedelta(days=3)).strftime('%Y-%m-%d %H:%M:%S')
+        with open(log_file, 'w') as f:
+            f.write(f"{old},000 - x.date_processing - INFO - COMPLETE processing date range: "
+                    f"2023-12-01 to 2023-12-31 (monthly mode) - Articles: 99, Duration: 0:01:00\n")
+
+        # The dedicated logger keeps its first file handler; start from a clean logger
+        logging.getLogger('sugar.backend.parsers.sugar_news_fetcher.date_processing').handlers.clear()
+        date_logger = DateProcessingLogger(log_file)
+        january = (datetime(2024, 1, 1), datetime(2024, 1, 31))
+        date_logger.log_processing_start(*january, 'monthly')
+        date_logger.log_processing_complete(*january, 'monthly', 42, timedelta(minutes=3), "Month: January 2024")
+        date_logger.log_processing_skip(datetime(2024, 2, 1), datetime(2024, 2, 29), 'monthly', "Already processed")
+        date_logger.log_overlap_detected(*january, 'daily', [("2024-01-01", "2024-01-15", "2024-01-16")])
+        for handler in date_logger.logger.handlers:
+            handler.flush()
+
+        stats = date_logger.get_processing_statistics(processing_mode='monthly')
+        all_stats = date_logger.get_processing_statistics(hours_back=None)
+        for handler in list(date_logger.logger.handlers):
+            handler.close()
+            date_logger.logger.removeHandler(handler)
+
+    assert stats['total_started'] == 1 and stats['total_processed'] == 1 and stats['total_skipped'] == 1
+    assert stats['total_overlaps'] == 0, "Overlap was logged for another processing mode"
+    assert stats['total_articles'] == 42
+    assert [entry['event'] for entry in stats['recent_activity']] == ['START', 'COMPLETE', 'SKIP']
+    assert all_stats['total_processed'] == 2 and all_stats['total_articles'] == 141
+    assert all_stats['total_overlaps'] == 1
+    print(f"✓ Parsed {len(all_stats['recent_activity'])} log entries")
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.WARNING)
+    test_snapshot()
+    test_export()
+    test_month_pipeline_metrics()
+    test_processing_statistics()
+    print("\n✅ All pipeline metrics tests passed!")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Test script for grouped source searches (SourceQueryPlanner).
+
+This script tests:
+1. That sources are packed into groups that fit a page, respect the group size limit and
+   only share a group with sources of the same start date
+2. That the OR-ed site: filter is built for several site IDs
+3. That grouped fetching returns the same articles per source as one search per source,
+   with several times fewer requests, and falls back to per-source searches on overflow
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.api.opoint.opoint_api import OpointAPI
+from sugar.backend.parsers.query_planner import SourceQueryPlanner
+from sugar.backend.parsers.sugar_news_fetcher import (
+    ALL_SUGAR_SOURCES_27,
+    SUGAR_SOURCES,
+    calculate_source_quotas,
+    iter_sugar_source_articles
+)
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 31, 23, 59, 59)
+
+
+class FakeOpoint:
+    """Answers searches from an in-memory corpus, newest articles first, like Opoint"""
+
+    def __init__(self, articles_per_site):
+        rows = []
+        base = int(START.timestamp())
+        for site_index, (site_id, count) in enumerate(articles_per_site.items()):
+            for i in range(count):
+                rows.append({
+                    'id_site': str(site_id),
+                    'id_article': i,
+                    'title': f"Sugar article {i} from {site_id}",
+                    'text': "Raw sugar futures moved.",
+                    'url': f"https://example.com/{site_id}/{i}",
+                    'site_name': str(site_id),
+                    'unix_timestamp': base + (i * 997 + site_index * 131) % (30 * 86400)
+                })
+        self.corpus = pd.DataFrame(rows)
+        self.calls = []
+
+    def search_articles(self, site_id=None, site_ids=None, num_articles=20, start_date=None, end_date=None, **kwargs):
+        self.calls.append(site_ids or [site_id])
+        sites = {str(sid) for sid in (site_ids or [site_id])}
+        matches = self.corpus[
+            self.corpus['id_site'].isin(sites)
+            & (self.corpus['unix_timestamp'] >= int(start_date.timestamp()))
+            & (self.corpus['unix_timestamp'] <= int(end_date.timestamp()))
+        ]
+        matches = matches.sort_values(['unix_timestamp', 'id_site', 'id_article'], ascending=False)
+        return matches.head(num_articles).reset_index(drop=True)
+
+
+def make_sources(n):
+    return [{'name': f"Source {i}", 'id': 1000 + i} for i in range(n)]
+
+
+def test_plan():
+    """Test group packing"""
+    print("\n=== TEST 1: Group plan ===")
+
+    sources = make_sources(12)
+    quotas = {source['name']: 200 for source in sources}
+    start_dates = {source['name']: START for source in sources}
+    start_dates['Source 11'] = START + timedelta(days=10)
+
+    planner = SourceQueryPlanner(page_size=100, max_sites_per_group=4, default_expected_yield=20)
+    planner.record_yield('Source 0', 90)
+    planner.record_yield('Source 1', 500)
+    groups = planner.plan(sources, quotas, start_dates)
+
+    names = [[source['name'] for source in group.sources] for group in groups]
+    assert sorted(name for group in names for name in group) == sorted(quotas)
+    assert ['Source 1'] in names, "A source expected to fill a page is searched alone"
+    assert ['Source 11'] in names, "Sources with another start date are not grouped"
+    for group in groups:
+        assert len(group.sources) <= 4
+        expected = sum(planner.expected_yield(source['name'], 200) for source in group.sources)
+        assert len(group.sources) == 1 or expected <= 100
+    assert names[0][0] == 'Source 0', "Groups are fetched in configuration order"
+    print(f"✓ 12 sources packed into {len(groups)} groups: {names}")
+
+
+def test_site_filter():
+    """Test the OR-ed site: filter"""
+    print("\n=== TEST 2: Site filter ===")
+
+    api = OpointAPI(api_key="test-key")
+    payload = api._build_search_payload(search_text="sugar", site_ids=['913', '3478'])
+    searchterm = payload['expressions'][0]['searchline']['searchterm']
+    assert searchterm.endswith("(site:913 OR site:3478)"), searchterm
+    single = api._build_search_payload(site_ids=['913'])
+    assert single['expressions'][0]['searchline']['searchterm'] == "site:913"
+    print(f"✓ {searchterm}")
+
+
+def collect(planner, counts):
+    api = FakeOpoint(counts)
+    quotas = calculate_source_quotas(5000, SUGAR_SOURCES)
+    frames = list(iter_sugar_source_articles(api, "sugar", quotas, START, END, ['20000386'], query_planner=planner))
+    articles = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    by_site = {site: sorted(group['id_article']) for site, group in articles.groupby('id_site')} if len(articles) else {}
+    return by_site, api.calls
+
+
+def test_grouped_fetch_matches_per_source():
+    """Test that grouped searches return the same articles with fewer requests"""
+    print("\n=== TEST 3: Grouped fetch ===")
+
+    # Most sources return far fewer articles than their quota, a few return more
+    counts = {source['id']: [0, 3, 8, 15, 40][i % 5] for i, source in enumerate(ALL_SUGAR_SOURCES_27)}
+    counts[ALL_SUGAR_SOURCES_27[0]['id']] = 900
+    counts[ALL_SUGAR_SOURCES_27[1]['id']] = 260
+
+    expected, individual_calls = collect(None, counts)
+    planner = SourceQueryPlanner()
+    grouped, grouped_calls = collect(planner, counts)
+
+    assert grouped == expected, "Grouped searches must return the same articles per source"
+    assert len(individual_calls) == len(ALL_SUGAR_SOURCES_27)
+    assert len(grouped_calls) * 3 <= len(individual_calls), f"{len(grouped_calls)} grouped requests"
+
+    # The second run plans with the learned yields
+    regrouped, second_calls = collect(planner, counts)
+    assert regrouped == expected
+    assert len(second_calls) * 3 <= len(individual_calls)
+
+    # Small pages and a single page per group: truncated groups fall back to per-source searches
+    small_pages = SourceQueryPlanner(page_size=100, max_pages=1)
+    overflowed, overflow_calls = collect(small_pages, counts)
+    assert overflowed == expected
+    assert small_pages.stats['overflow_sources'] >= 1
+    assert [str(ALL_SUGAR_SOURCES_27[0]['id'])] in overflow_calls, "Overflowing source is searched alone"
+    print(f"✓ {len(individual_calls)} per-source requests -> {len(grouped_calls)} grouped "
+          f"({len(second_calls)} once yields are known), identical results, "
+          f"{small_pages.stats['overflow_sources']} sources fetched alone after overflow")
+
+
+if __name__ == "__main__":
+    test_plan()
+    test_site_filter()
+    test_grouped_fetch_matches_per_source()
+    print("\n✅ All query planner tests passed!")
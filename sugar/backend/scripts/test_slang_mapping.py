@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Test script for batched slang/synonym mapping in LanguageNormalizationPipeline.
+
+spaCy is replaced by a small regex tokenizer exposing the token attributes the stage reads
+(text, lower_, whitespace_), so the mapping can be checked without a spaCy model.
+
+This script tests:
+1. That slang tokens are replaced while punctuation spacing is preserved
+2. That texts are tokenized in batches through nlp.pipe with the configured workers
+3. That normalize_batch() and normalize() go through the batched stage
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+
+
+class FakeToken:
+    def __init__(self, text, whitespace):
+        self.text = text
+        self.lower_ = text.lower()
+        self.whitespace_ = whitespace
+
+
+class FakeNlp:
+    """Tokenizer-only stand-in for a spaCy Language object that records pipe() calls"""
+
+    def __init__(self):
+        self.pipe_calls = []
+
+    def _tokenize(self, text):
+        return [FakeToken(match.group(1), match.group(2)) for match in re.finditer(r"(\w+|[^\w\s])(\s*)", text)]
+
+    def pipe(self, texts, batch_size=1000, n_process=1):
+        texts = list(texts)
+        self.pipe_calls.append({'texts': texts, 'batch_size': batch_size, 'n_process': n_process})
+        for text in texts:
+            yield self._tokenize(text)
+
+
+def make_pipeline(**kwargs):
+    pipeline = LanguageNormalizationPipeline(**kwargs)
+    pipeline.tokenizer = None
+    pipeline.model = None
+    pipeline.sym_spell = None
+    pipeline.nlp = FakeNlp()
+    return pipeline
+
+
+def test_whitespace_preserved():
+    """Test that mapping keeps the original spacing"""
+    print("\n=== TEST 1: Whitespace preservation ===")
+
+    pipeline = make_pipeline()
+    assert pipeline._map_slang_synonyms("U r right, lol!") == "you are right, laughing out loud!"
+    text = "Sugar rose 2.1% (NY11), traders said."
+    assert pipeline._map_slang_synonyms(text) == text, "Text without slang must be unchanged"
+    print("✓ Slang is mapped without re-spacing punctuation")
+
+
+def test_batched_pipe():
+    """Test that the stage uses one nlp.pipe call per batch of texts"""
+    print("\n=== TEST 2: nlp.pipe batching ===")
+
+    pipeline = make_pipeline(slang_batch_size=32, slang_n_process=2)
+    texts = ["u r gr8", "Raw sugar futures rose.", "lol... that's sooo funny!!!"]
+    result = pipeline._map_slang_synonyms_batch(texts)
+    assert result == ["you are gr8", "Raw sugar futures rose.", "laughing out loud... that's sooo funny!!!"]
+    assert len(pipeline.nlp.pipe_calls) == 1
+    assert pipeline.nlp.pipe_calls[0]['batch_size'] == 32 and pipeline.nlp.pipe_calls[0]['n_process'] == 2
+    print("✓ All texts are tokenized in a single nlp.pipe call")
+
+
+def test_normalize_uses_batched_stage():
+    """Test integration with normalize_batch() and normalize()"""
+    print("\n=== TEST 3: normalize_batch() integration ===")
+
+    pipeline = make_pipeline()
+    assert pipeline.normalize_batch(["u r gr8!", "OK."]) == ["you are great!", "OK."]
+    assert len(pipeline.nlp.pipe_calls) == 1
+    assert pipeline.normalize("brb, u r the best") == "brb, you are the best"
+    print("✓ normalize() and normalize_batch() share the batched slang stage")
+
+
+if __name__ == "__main__":
+    test_whitespace_preserved()
+    test_batched_pipe()
+    test_normalize_uses_batched_stage()
+    print("\n✅ All slang mapping tests passed!")
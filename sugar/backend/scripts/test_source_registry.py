@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Test script for the precomputed source registry (SourceRegistry).
+
+This script tests:
+1. That category, reliability and site ID lookups match the SUGAR_SOURCES configuration
+2. That the vectorized mask matches per-row is_trusted checks, including site IDs and missing names
+3. That filter_trusted_sources keeps the same rows and filters a 30k-row frame quickly
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers.source_registry import SourceRegistry
+from sugar.backend.parsers.source_filter import SOURCE_REGISTRY as TRUST_REGISTRY, filter_trusted_sources
+from sugar.backend.parsers.sugar_news_fetcher import (
+    SOURCE_REGISTRY,
+    SUGAR_SOURCES,
+    SUGAR_SOURCES_27,
+    SOURCE_RELIABILITY_SCORES,
+    calculate_source_quotas
+)
+
+SITE_NAMES = ['Nasdaq', 'Toti', 'Head Topics', 'Reuters', ' Nasdaq ', '', None, 'USDA', 'Bit News Bot']
+
+
+def walk_category(source_name):
+    """Category lookup by walking the configuration, as before the registry"""
+    for category, sources in SUGAR_SOURCES.items():
+        for source in sources:
+            if source['name'] == source_name:
+                return category
+    return 'unknown'
+
+
+def test_lookups():
+    """Test category, reliability and site ID lookups"""
+    print("\n=== TEST 1: Registry lookups ===")
+
+    for source in SUGAR_SOURCES_27:
+        name = source['name']
+        assert SOURCE_REGISTRY.get_category(name) == walk_category(name)
+        assert SOURCE_REGISTRY.get_reliability(name) == SOURCE_RELIABILITY_SCORES.get(name, 0.5)
+        assert SOURCE_REGISTRY.get_site_id(name) == source['id']
+        assert SOURCE_REGISTRY.get_name(source['id']) == name
+    assert SOURCE_REGISTRY.get_category('Reuters') == 'unknown'
+    assert SOURCE_REGISTRY.get_reliability('Reuters') == 0.5
+    assert SOURCE_REGISTRY.get_site_id('Reuters') is None
+
+    quotas = calculate_source_quotas(100, SUGAR_SOURCES)
+    assert len(quotas) == len(SUGAR_SOURCES_27) and sum(quotas.values()) >= 100
+    print(f"✓ {len(SUGAR_SOURCES_27)} sources resolve to the configured category, reliability and site ID")
+
+
+def test_mask_matches_rows():
+    """Test that the vectorized mask matches per-row checks"""
+    print("\n=== TEST 2: Vectorized mask ===")
+
+    registry = SourceRegistry(trusted_names={'Nasdaq', 'Toti'}, trusted_ids={913},
+                              non_trusted_names={'Toti', 'Head Topics', 'Bit News Bot'})
+    df = pd.DataFrame({
+        'site_name': SITE_NAMES,
+        'site_id': [913, 1, 2, 3, 4, 913, 5, 6, 913]
+    })
+    expected = [registry.is_trusted(name, site_id) for name, site_id in zip(df['site_name'], df['site_id'])]
+    assert registry.mask(df).tolist() == expected
+    assert expected == [True, True, False, True, True, True, False, True, True]
+
+    names_only = df[['site_name']].set_index(pd.Index(range(10, 19)))
+    mask = registry.mask(names_only)
+    assert mask.index.equals(names_only.index)
+    assert mask.tolist() == [registry.is_trusted(name) for name in names_only['site_name']]
+    assert mask.tolist() == [True, True, False, True, True, False, False, True, False]
+    print("✓ Mask matches is_trusted for trusted IDs, stripped names, empty and missing names")
+
+
+def test_filter_trusted_sources():
+    """Test filter_trusted_sources on a large frame"""
+    print("\n=== TEST 3: filter_trusted_sources ===")
+
+    rng = np.random.default_rng(0)
+    names = np.array([name for name in SITE_NAMES if name is not None], dtype=object)
+    df = pd.DataFrame({
+        'site_name': rng.choice(names, 30000),
+        'site_id': rng.choice([913, 15086, 7, 8], 30000),
+        'title': 'Sugar'
+    })
+    expected = df[[TRUST_REGISTRY.is_trusted(name, site_id)
+                   for name, site_id in zip(df['site_name'], df['site_id'])]]
+
+    started = time.perf_counter()
+    filtered = filter_trusted_sources(df, verbose=False)
+    elapsed = time.perf_counter() - started
+
+    assert filtered.index.equals(expected.index)
+    assert elapsed < 1.0, f"Filtering 30k rows took {elapsed:.3f}s"
+    print(f"✓ {len(filtered)}/{len(df)} rows kept in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_lookups()
+    test_mask_matches_rows()
+    test_filter_trusted_sources()
+    print("\n✅ All source registry tests passed!")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Test script for token-level spelling correction in LanguageNormalizationPipeline.
+
+Uses the English frequency dictionary bundled with symspellpy.
+
+This script tests:
+1. That misspelled tokens are corrected while whitespace, punctuation and case are preserved
+2. That domain terms (NY11, UNICA, Centro-Sul, entity names) are never rewritten
+3. That corrections are memoized in a bounded LRU shared across articles
+4. That token-level correction is much faster than whole-text lookup_compound
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import symspellpy
+from symspellpy import SymSpell
+
+from sugar.backend.text_filtering.language_normalization import LanguageNormalizationPipeline
+from sugar.backend.text_filtering.spelling_correction import TokenSpellCorrector
+
+DICTIONARY_PATH = os.path.join(os.path.dirname(symspellpy.__file__), "frequency_dictionary_en_82_765.txt")
+
+ARTICLE = ("Raw sugar futures (NY11) rose 2.1% on Tuesday, as UNICA reported that the Centro-Sul "
+           "harvest was slowr than expected. Copersucar and Raízen said mills were crushng less cane, "
+           "while traders in London watched the whites premium.")
+
+
+def make_pipeline(**kwargs):
+    pipeline = LanguageNormalizationPipeline(symspell_dict_path=DICTIONARY_PATH, **kwargs)
+    pipeline.tokenizer = None
+    pipeline.model = None
+    pipeline.nlp = None
+    return pipeline
+
+
+def test_corrects_tokens_in_place():
+    """Test that typos are corrected without touching the surrounding text"""
+    print("\n=== TEST 1: Token-level correction ===")
+
+    pipeline = make_pipeline()
+    corrected = pipeline._correct_typos("The harvst was slowr than expctd.\n\nMills are crushng  less Cane!")
+    assert corrected == "The harvest was slow than expected.\n\nMills are crushing  less Cane!", corrected
+    print(f"✓ {corrected!r}")
+
+
+def test_protected_terms():
+    """Test that domain terms are left alone"""
+    print("\n=== TEST 2: Protected domain vocabulary ===")
+
+    pipeline = make_pipeline(protected_terms=["Copersucar", "Raízen"])
+    corrected = pipeline._correct_typos(ARTICLE)
+    for term in ["NY11", "UNICA", "Centro-Sul", "Copersucar", "Raízen", "2.1%", "(NY11)"]:
+        assert term in corrected, f"{term} was rewritten: {corrected}"
+    assert "slowr" not in corrected and "crushing" in corrected
+    print("✓ NY11, UNICA, Centro-Sul and entity names are preserved; typos are fixed")
+
+
+def test_shared_cache():
+    """Test memoization across articles"""
+    print("\n=== TEST 3: Shared LRU ===")
+
+    pipeline = make_pipeline(spelling_cache_size=2)
+    pipeline._correct_typos("crushng crushng")
+    pipeline._correct_typos("The mills are crushng.")
+    info = pipeline._spell_corrector.cache_info()
+    assert info.misses == 1 and info.hits == 2
+    pipeline._correct_typos("slowr harvst")
+    assert pipeline._spell_corrector.cache_info().currsize == 2, "Cache must stay bounded"
+    print(f"✓ {info}")
+
+
+def test_faster_than_lookup_compound():
+    """Compare against the previous whole-text lookup_compound"""
+    print("\n=== TEST 4: Speed ===")
+
+    sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+    sym_spell.load_dictionary(DICTIONARY_PATH, term_index=0, count_index=1)
+    articles = [f"{ARTICLE} Report number {i} on the sesason." * 3 for i in range(5)]
+
+    started = time.perf_counter()
+    for article in articles:
+        sym_spell.lookup_compound(article, 2)
+    compound_seconds = time.perf_counter() - started
+
+    corrector = TokenSpellCorrector(sym_spell)
+    started = time.perf_counter()
+    for article in articles:
+        corrector.correct(article)
+    token_seconds = time.perf_counter() - started
+
+    speedup = compound_seconds / token_seconds
+    assert speedup > 10, f"Token-level correction only {speedup:.1f}x faster"
+    print(f"✓ lookup_compound {compound_seconds:.3f}s, token-level {token_seconds:.3f}s ({speedup:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    test_corrects_tokens_in_place()
+    test_protected_terms()
+    test_shared_cache()
+    test_faster_than_lookup_compound()
+    print("\n✅ All spelling correction tests passed!")
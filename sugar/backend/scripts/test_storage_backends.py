@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+Test script for the pluggable storage backends (sugar.backend.storage).
+
+This script tests:
+1. That save_to_database writes to the embedded Parquet store and that a second save of
+   the same articles inserts nothing
+2. That the embedded store finds duplicates and removes them one partition at a time,
+   with the same deduplicate_database functions used for ClickHouse
+3. That the backend is selected by name and unknown backends are rejected
+4. That analytics SQL runs on the embedded store when duckdb is installed
+5. That predictor prompts are saved to the embedded store and NewsStore is abstract
+"""
+
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers.news_parser import generate_article_ids, save_to_database
+from sugar.backend.scripts.deduplicate_database import (
+    find_duplicates,
+    remove_duplicates,
+    verify_deduplication
+)
+from sugar.backend.storage import NEWS_COLUMNS, PROMPT_COLUMNS, NewsStore, create_store
+from sugar.backend.storage.embedded import EmbeddedStore, duckdb
+
+METADATA = {'topic_ids': ['20000386'], 'person_entities': [], 'company_entities': [], 'keywords': []}
+
+
+def make_articles(count):
+    return pd.DataFrame([{
+        'url': f"https://www.nasdaq.com/articles/{i}",
+        'title': f"Raw sugar futures move {i}",
+        'clean_title': f"Raw sugar futures move {i}",
+        'clean_text': "Raw sugar futures rose on lower Brazilian output.",
+        'published_date': pd.Timestamp('2024-01-31 20:00:00') + pd.Timedelta(hours=i),
+        'site_name': 'Nasdaq',
+        'score': 0.5,
+        'triage_passed': True,
+        'triage_reason': 'sugar keywords',
+        'asset': 'Sugar'
+    } for i in range(count)])
+
+
+def make_row(record_id, title, published, created_at):
+    return (record_id, published, 'Reuters', title, 'Sugar output falls in Brazil.', '{}', created_at, 'Sugar')
+
+
+def test_save_round_trip():
+    """Test saving articles to the embedded store"""
+    print("\n=== TEST 1: save_to_database on the embedded store ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = EmbeddedStore(tmpdir)
+        articles = make_articles(6)
+        with patch('sugar.backend.parsers.news_parser.get_store', return_value=store):
+            saved = save_to_database(articles, METADATA, filter_sources=False)
+            saved_again = save_to_database(articles, METADATA, filter_sources=False)
+
+        assert saved == 6 and saved_again == 0, "The existence check sees the first save"
+        partitions = sorted(path.name for path in (Path(tmpdir) / 'news').iterdir())
+        assert partitions == ['202401', '202402'], "Files are partitioned by month like news.news"
+
+        article_ids = generate_article_ids(articles, articles['asset'])
+        assert store.existing_ids(article_ids + ['missing']) == set(article_ids)
+        print(f"✓ Saved {saved} articles to {len(partitions)} partitions; the second save inserted nothing")
+
+
+def test_embedded_deduplication():
+    """Test the duplicate scan and per-partition deletes of the embedded store"""
+    print("\n=== TEST 2: Embedded deduplication ===")
+
+    jan, feb = datetime(2024, 1, 10, 8), datetime(2024, 2, 10, 8)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = EmbeddedStore(tmpdir)
+        rows = [
+            make_row('a1', "Raw sugar rallies", jan, datetime(2024, 1, 10, 9)),
+            make_row('a2', "Raw sugar rallies", jan, datetime(2024, 1, 10, 10)),
+            make_row('a3', "Raw sugar rallies", jan, datetime(2024, 1, 10, 11)),
+            make_row('b1', "Ethanol parity", feb, datetime(2024, 2, 10, 9)),
+            make_row('b2', "Ethanol parity", feb, datetime(2024, 2, 10, 10)),
+            make_row('c1', "White sugar premium", feb, datetime(2024, 2, 10, 9)),
+        ]
+        assert store.insert('news.news', NEWS_COLUMNS, rows) == 6
+        assert store.existing_ids(['a1', 'c1', 'zz']) == {'a1', 'c1'}
+
+        scan = find_duplicates(store)
+        assert scan['groups'] == 2 and scan['duplicates'] == 3
+        assert sorted(scan['partitions']) == ['202401', '202402']
+        assert {key[0] for key in scan['partitions']['202401']} == {'a1', 'a2'}, "The newest record is kept"
+
+        assert remove_duplicates(store, scan['partitions'], dry_run=True) == 0
+        assert store.count_records('202401', scan['partitions']['202401']) == 2
+        assert remove_duplicates(store, scan['partitions'], dry_run=False) == 3
+        assert verify_deduplication(store, scan['partitions'])
+        assert store.existing_ids(['a1', 'a2', 'a3', 'b1', 'b2', 'c1']) == {'a3', 'b2', 'c1'}
+        assert not list(store.duplicate_groups()), "No duplicates are left"
+        print(f"✓ {scan['duplicates']} duplicates in {scan['groups']} groups removed from 2 partitions")
+
+
+def test_backend_selection():
+    """Test selecting the backend by name"""
+    print("\n=== TEST 3: Backend selection ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = create_store('embedded', path=tmpdir)
+        assert isinstance(store, EmbeddedStore) and store.root == Path(tmpdir)
+
+    try:
+        create_store('bogus')
+    except ValueError as e:
+        assert 'bogus' in str(e)
+    else:
+        raise AssertionError("An unknown backend must be rejected")
+    print("✓ 'embedded' creates an EmbeddedStore; unknown backends raise ValueError")
+
+
+def test_embedded_sql():
+    """Test analytics SQL on the embedded store"""
+    print("\n=== TEST 4: Analytics SQL on the embedded store ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = EmbeddedStore(tmpdir)
+        store.insert('news.news', NEWS_COLUMNS, [
+            make_row('a1', "Raw sugar rallies", datetime(2024, 1, 10, 8), datetime(2024, 1, 10, 9)),
+            make_row('b1', "Ethanol parity", datetime(2024, 2, 10, 8), datetime(2024, 2, 10, 9)),
+        ])
+
+        if duckdb is None:
+            try:
+                store.execute("SELECT count() FROM news.news")
+            except ImportError:
+                print("✓ duckdb is not installed; SQL raises ImportError (skipped)")
+                return
+            raise AssertionError("SQL without duckdb must raise ImportError")
+
+        rows = store.execute(
+            "SELECT toYYYYMM(datetime) AS month, count(*) FROM news.news "
+            "WHERE asset = 'Sugar' AND id IN %(ids)s GROUP BY month ORDER BY month",
+            {'ids': ('a1', 'b1')}
+        )
+        assert rows == [(202401, 1), (202402, 1)]
+        assert list(store.execute_iter("SELECT id FROM news ORDER BY id")) == [('a1',), ('b1',)]
+        store.disconnect()
+        print("✓ ClickHouse functions and parameters run on DuckDB")
+
+
+def test_embedded_prompts():
+    """Test the news.prompts table of the embedded store"""
+    print("\n=== TEST 5: Prompts on the embedded store ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = EmbeddedStore(tmpdir)
+        created_at = datetime(2024, 1, 10, 9)
+        rows = [
+            ('a1', "system", "user", '{"sentiment": "positive"}', 'positive', 0.75, "Dry weather",
+             "Raw sugar rallies", 'Sugar', '["weather"]', created_at),
+            ('b1', "system", "user", '{"sentiment": "neutral"}', 'neutral', 0.5, "No news",
+             None, None, None, created_at),
+        ]
+        assert store.insert_prompts(rows[:1]) == 1
+        assert store.insert_prompts(rows[1:]) == 1
+
+        files = store._files('news.prompts')
+        assert len(files) == 2 and all(path.parent.name == 'all' for path in files)
+        saved = pa.concat_tables([pq.read_table(path) for path in files])
+        assert saved.column_names == PROMPT_COLUMNS
+        assert saved.schema.field('confidence').type == pa.float32()
+        assert sorted(saved.to_pylist(), key=lambda row: row['article_id']) == [
+            dict(zip(PROMPT_COLUMNS, row)) for row in rows
+        ]
+
+    try:
+        NewsStore()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("NewsStore must not be instantiable")
+    print("✓ Prompts are stored without ClickHouse; NewsStore is an abstract base class")
+
+
+if __name__ == "__main__":
+    test_save_round_trip()
+    test_embedded_deduplication()
+    test_backend_selection()
+    test_embedded_sql()
+    test_embedded_prompts()
+    print("\n✅ All storage backend tests passed!")
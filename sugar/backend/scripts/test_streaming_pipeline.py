@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+"""
+Test script for the streaming stage pipeline used by sugar_news_fetcher.py
+
+This script tests:
+1. That items flow through item and batch stages in order, with dropped items removed
+2. That bounded queues apply backpressure to the source
+3. That a failing stage stops the pipeline and raises the error
+4. That run_month_pipeline deduplicates across topics and saves in batches while still fetching
+5. That run_month_pipeline checkpoints each completed topic and skips checkpointed topics on resume
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers.checkpoints import SegmentCheckpointStore
+from sugar.backend.parsers.streaming_pipeline import StreamingPipeline, PipelineStage
+from sugar.backend.parsers.sugar_news_fetcher import run_month_pipeline, create_global_dedup_cache
+
+
+def test_stage_order_and_batching():
+    """Test ordering, dropping and batching"""
+    print("\n=== TEST 1: Stage order and batching ===")
+
+    batches = []
+
+    def collect(batch):
+        batches.append(list(batch))
+        return []
+
+    pipeline = StreamingPipeline([
+        PipelineStage('square', lambda x: x * x),
+        PipelineStage('drop_odd', lambda x: x if x % 2 == 0 else None),
+        PipelineStage('sink', collect, batch_size=4)
+    ], queue_size=2)
+    stats = pipeline.run(range(20))
+
+    flattened = [item for batch in batches for item in batch]
+    assert flattened == [x * x for x in range(20) if x % 2 == 0], "Order should be preserved"
+    assert [len(batch) for batch in batches] == [4, 4, 2], "Last partial batch should be flushed"
+    assert stats['source']['items_out'] == 20
+    assert stats['stages']['drop_odd']['items_out'] == 10
+    print("✓ Items flow through stages in order")
+
+
+def test_backpressure():
+    """Test that the source cannot run far ahead of a slow sink"""
+    print("\n=== TEST 2: Backpressure ===")
+
+    produced = []
+    max_in_flight = []
+    consumed = [0]
+    lock = threading.Lock()
+
+    def source():
+        for i in range(40):
+            with lock:
+                produced.append(i)
+                max_in_flight.append(len(produced) - consumed[0])
+            yield i
+
+    def slow_sink(item):
+        time.sleep(0.005)
+        with lock:
+            consumed[0] += 1
+        return None
+
+    queue_size = 3
+    pipeline = StreamingPipeline([
+        PipelineStage('pass', lambda x: x),
+        PipelineStage('sink', slow_sink)
+    ], queue_size=queue_size)
+    pipeline.run(source())
+
+    # Two queues plus one item held by each of the two stages plus the one being produced
+    bound = 2 * queue_size + 2 + 1
+    assert consumed[0] == 40
+    assert max(max_in_flight) <= bound, f"At most {bound} items should be in flight, saw {max(max_in_flight)}"
+    print(f"✓ At most {max(max_in_flight)} items were in flight")
+
+
+def test_stage_failure():
+    """Test that a stage error stops the pipeline"""
+    print("\n=== TEST 3: Stage failure ===")
+
+    def fail_on_five(item):
+        if item == 5:
+            raise ValueError("bad item")
+        return item
+
+    def endless():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    pipeline = StreamingPipeline([PipelineStage('fail', fail_on_five)], queue_size=2)
+    try:
+        pipeline.run(endless())
+        assert False, "Pipeline should have raised"
+    except RuntimeError as e:
+        assert "fail" in str(e)
+        assert isinstance(e.__cause__, ValueError)
+    print("✓ Stage errors stop the pipeline")
+
+
+def run_mocked_month(**kwargs):
+    """Run run_month_pipeline for two topics against a mocked API and database"""
+    published = datetime(2024, 1, 15, 10, 0)
+
+    words = ['Brazil', 'India', 'Thailand', 'ethanol', 'cane', 'harvest', 'exports', 'refinery', 'monsoon', 'frost']
+
+    def make_articles(site_id, count):
+        # Every article uses a distinct pair of words so none of them look similar to each other
+        return pd.DataFrame([{
+            'title': f"Sugar market update {i}",
+            'text': f"Raw sugar futures reacted to {words[i % 10]} {i} and {words[(i // 10 + i + 1) % 10]} news.",
+            'site_name': 'Nasdaq',
+            'id_site': int(site_id),
+            'url': f"https://www.nasdaq.com/sugar/{i}",
+            'published_date': published,
+            'unix_timestamp': int(published.timestamp())
+        } for i in range(count)])
+
+    def mock_search_articles(*args, **kwargs):
+        # Both topics return the same Nasdaq articles; the second topic must be deduplicated
+        if kwargs['site_id'] == '913':
+            return make_articles('913', 25)
+        return pd.DataFrame()
+
+    normalization_pipeline = Mock()
+    normalization_pipeline.normalize.side_effect = lambda text=None, sugar_pricing_lines=None: (
+        [] if sugar_pricing_lines is not None else text
+    )
+
+    saved_batches = []
+    searches_at_first_save = []
+    mock_api = Mock()
+    mock_api.search_articles.side_effect = mock_search_articles
+
+    def mock_save(df, metadata, asset, dedup_index=None, filter_sources=True):
+        if not saved_batches:
+            searches_at_first_save.append(mock_api.search_articles.call_count)
+        saved_batches.append(len(df))
+        return len(df)
+
+    with patch('sugar.backend.parsers.sugar_news_fetcher.OpointAPI') as mock_api_class, \
+            patch('sugar.backend.parsers.sugar_news_fetcher.save_to_database', side_effect=mock_save), \
+            patch('sugar.backend.parsers.sugar_news_fetcher.filter_trusted_sources', side_effect=lambda df, verbose=True: df):
+        mock_api_class.return_value = mock_api
+
+        stats = run_month_pipeline(
+            "test-key", datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59),
+            ['20000386', '20000324'], 100, normalization_pipeline, {'processing_mode': 'monthly'},
+            global_dedup_cache=create_global_dedup_cache(datetime(2024, 1, 1)),
+            queue_size=4, save_batch_size=10, topic_delay=0, **kwargs
+        )
+    return stats, saved_batches, searches_at_first_save, mock_api.search_articles.call_count
+
+
+def test_run_month_pipeline():
+    """Test the month pipeline with a mocked API and database"""
+    print("\n=== TEST 4: Month pipeline ===")
+
+    stats, saved_batches, searches_at_first_save, total_searches = run_mocked_month()
+
+    assert stats['fetched'] == 50, f"Expected 50 fetched articles, got {stats['fetched']}"
+    assert stats['processed'] == 25, f"Expected 25 unique articles, got {stats['processed']}"
+    assert stats['url_duplicates'] + stats['content_duplicates'] == 25
+    assert stats['completed_topics'] == 2 and stats['failed_topics'] == 0
+    assert stats['saved'] == stats['sugar'] == sum(saved_batches)
+    assert all(size <= 10 for size in saved_batches), "Saves should be batched"
+    assert searches_at_first_save[0] < total_searches, \
+        "Saving should start before every source has been fetched"
+    print(f"✓ {stats['processed']} unique articles saved in {len(saved_batches)} batches")
+
+
+def test_run_month_pipeline_checkpoints():
+    """Test per-topic checkpoint segments and resume"""
+    print("\n=== TEST 5: Month pipeline checkpoints ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = SegmentCheckpointStore(temp_dir)
+        stats = run_mocked_month(checkpoint_store=store)[0]
+        assert stats['checkpointed_topics'] == 2
+        assert store.completed_topics('2024-01') == {'20000386', '20000324'}
+        assert store.total_rows() == stats['processed'], "Every processed article should be checkpointed once"
+
+        resumed_stats, saved_batches, _, total_searches = run_mocked_month(
+            checkpoint_store=store, skip_topic_ids=store.completed_topics('2024-01')
+        )
+        assert resumed_stats['skipped_topics'] == 2 and total_searches == 0, "Checkpointed topics should not be refetched"
+        assert not saved_batches
+    print("✓ Completed topics are checkpointed and skipped on resume")
+
+
+if __name__ == "__main__":
+    test_stage_order_and_batching()
+    test_backpressure()
+    test_stage_failure()
+    test_run_month_pipeline()
+    test_run_month_pipeline_checkpoints()
+    print("\n✅ All streaming pipeline tests passed!")
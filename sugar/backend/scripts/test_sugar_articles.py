@@ -21,12 +21,12 @@ def retrieve_sugar_articles():
     
     try:
         from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
-        from clickhouse_driver import Client
+        from sugar.backend.db import get_pool
         
         print(f"Connecting to ClickHouse at {CLICKHOUSE_NATIVE_CONFIG['host']}:{CLICKHOUSE_NATIVE_CONFIG['port']}")
         
         # Connect to the database
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_pool()
         
         # Define sugar-related keywords
         sugar_keywords = [
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Test script for the text-processing benchmark suite (benchmark_text_processing.py).
+
+This script tests:
+1. That the seeded corpus is reproducible, covers every language and the 50 to 10,000 token
+   range, and that its English sugar articles pass triage while the others do not
+2. That calibrated throughputs are compared with the baseline and regressions are flagged
+3. That the suite times the hot paths, and that hashing a long German article with
+   compounds stays fast (placeholders used to multiply exponentially)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.parsers.sugar_news_fetcher import generate_content_hash
+from sugar.backend.scripts.benchmark_text_processing import (
+    LANGUAGES,
+    MAX_TOKENS,
+    MIN_TOKENS,
+    compare,
+    corpus_fingerprint,
+    make_corpus,
+    prepare,
+    run_suite
+)
+from sugar.backend.text_filtering.sugar_triage_filter import triage_filter
+
+
+def test_corpus():
+    """Test the synthetic corpus"""
+    print("\n=== TEST 1: Seeded corpus ===")
+
+    corpus = make_corpus(seed=7, articles_per_language=6)
+    assert corpus_fingerprint(corpus) == corpus_fingerprint(make_corpus(seed=7, articles_per_language=6))
+    assert corpus_fingerprint(corpus) != corpus_fingerprint(make_corpus(seed=8, articles_per_language=6))
+    assert {article['language'] for article in corpus} == set(LANGUAGES)
+
+    tokens = [article['tokens'] for article in corpus]
+    assert min(tokens) >= MIN_TOKENS and min(tokens) < MIN_TOKENS * 1.5
+    assert max(tokens) >= MAX_TOKENS and max(tokens) < MAX_TOKENS * 1.05
+    assert any('Zuckerrüben' in article['html'] for article in corpus if article['language'] == 'de')
+
+    # Triage sees translated text in the pipeline, so only the English labels are checked
+    data = prepare(corpus, seed=7)
+    for article, text in zip(corpus, data['cleaned']):
+        if article['language'] != 'en':
+            continue
+        passed = triage_filter(text, title=article['title'])['passed']
+        assert passed == article['sugar'], f"{article['id']} sugar={article['sugar']} passed={passed}"
+    print(f"✓ {len(corpus)} reproducible articles, {min(tokens)} to {max(tokens)} tokens, "
+          f"triage agrees with the English sugar labels")
+
+
+def test_compare():
+    """Test the baseline comparison"""
+    print("\n=== TEST 2: Baseline comparison ===")
+
+    baseline = {'calibration': 100.0, 'benchmarks': {
+        'clean_html': {'items_per_second': 1000.0},
+        'triage_filter': {'items_per_second': 50.0},
+    }}
+    # The machine is twice as fast (calibration 200): only clean_html kept up
+    results = {
+        'clean_html': {'items_per_second': 2100.0},
+        'triage_filter': {'items_per_second': 60.0},
+        'normalize': {'items_per_second': 10.0},
+    }
+    comparison = compare(results, 200.0, baseline, tolerance=0.25)
+    assert comparison['clean_html'] == {'ratio': 1.05, 'regressed': False}
+    assert comparison['triage_filter'] == {'ratio': 0.6, 'regressed': True}
+    assert 'normalize' not in comparison, "Benchmarks without a baseline are not compared"
+    print("✓ Throughputs are calibrated before comparing; a 40% loss fails a 25% tolerance")
+
+
+def test_suite_and_long_german_hash():
+    """Test a small suite run and the hashing of long German articles"""
+    print("\n=== TEST 3: Suite run ===")
+
+    data = prepare(make_corpus(seed=3, articles_per_language=3), seed=3)
+    results = run_suite(data, ['clean_html', 'generate_content_hash', 'is_similar_content', 'triage_filter'], repeat=1)
+    assert results['clean_html']['items'] == 15 and results['is_similar_content']['items'] == 30
+    assert all(result['items_per_second'] > 0 for result in results.values())
+
+    sentence = ("Der Zuckerrübenanbau wächst. Südzucker erwartet eine Zuckerrübenkampagne "
+                "bei hohen Zuckergehalten. Zucker bleibt knapp. ")
+    started = time.perf_counter()
+    long_hash = generate_content_hash("Zuckerpreis", sentence * 400, "Handelsblatt")
+    elapsed = time.perf_counter() - started
+    assert elapsed < 5, f"Hashing a long German article took {elapsed:.1f}s"
+    assert long_hash == generate_content_hash("Zuckerpreis", sentence * 400, "Handelsblatt")
+    print(f"✓ {len(results)} benchmarks timed; a {len(sentence * 400)} character German article hashes in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    test_corpus()
+    test_compare()
+    test_suite_and_long_german_hash()
+    print("\n✅ All text processing benchmark tests passed!")
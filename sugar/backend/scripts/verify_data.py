@@ -2,32 +2,26 @@
 """
 Script to verify the data in the news.source_of_truth table.
 """
-import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
-from clickhouse_driver import Client
+
+# Add the project root to Python path
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sugar.backend.storage import get_store
 
 def main():
     # Load environment variables
     load_dotenv()
 
-    # Get ClickHouse credentials
-    clickhouse_host = os.getenv('CLICKHOUSE_HOST')
-    clickhouse_user = os.getenv('CLICKHOUSE_USERNAME')
-    clickhouse_password = os.getenv('CLICKHOUSE_PASSWORD')
-
-    if not all([clickhouse_host, clickhouse_user, clickhouse_password]):
-        raise ValueError("Missing required ClickHouse credentials in .env file")
-
     try:
-        # Connect to ClickHouse
-        client = Client(
-            host=clickhouse_host,
-            port=9000,
-            user=clickhouse_user,
-            password=clickhouse_password
-        )
-
-        print("Connected to ClickHouse. Running verification queries...\n")
+        # Connect to the configured news store (ClickHouse or the embedded store)
+        client = get_store()
+
+        print(f"Connected to the {client.name} store. Running verification queries...\n")
 
         # 1. Get total count
         count = client.execute("SELECT count() FROM news.source_of_truth")[0][0]
@@ -0,0 +1,56 @@
+"""
+Pluggable storage of the news tables.
+
+get_store() returns the backend selected by STORAGE_BACKEND (SUGAR_STORAGE_BACKEND):
+
+- 'clickhouse' (default): ClickHouseStore on the shared connection pool
+- 'embedded': EmbeddedStore, Parquet files under EMBEDDED_STORE_PATH queried with DuckDB,
+  for development, tests and analysis machines without a ClickHouse server
+
+Both implement NewsStore: inserts, article ID existence checks, the duplicate scan and
+per-partition deletes, the predictor's news.prompts table, and execute()/execute_iter() for
+analytics SQL.
+"""
+
+import threading
+from typing import Optional
+
+from sugar.backend import config
+from sugar.backend.storage.base import NEWS_COLUMNS, PROMPT_COLUMNS, NewsStore
+
+BACKENDS = ('clickhouse', 'embedded')
+
+_STORE: Optional[NewsStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def create_store(backend: Optional[str] = None, **kwargs) -> NewsStore:
+    """
+    Create a storage backend.
+
+    Args:
+        backend: 'clickhouse' or 'embedded' (default: STORAGE_BACKEND)
+        **kwargs: Backend arguments (client for ClickHouse, path for the embedded store)
+    """
+    backend = (backend or config.STORAGE_BACKEND).lower()
+    # Backends are imported on demand so that each works without the other's packages
+    if backend == 'clickhouse':
+        from sugar.backend.storage.clickhouse import ClickHouseStore
+        return ClickHouseStore(**kwargs)
+    if backend == 'embedded':
+        from sugar.backend.storage.embedded import EmbeddedStore
+        return EmbeddedStore(**kwargs)
+    raise ValueError(f"Unknown storage backend '{backend}', expected one of {', '.join(BACKENDS)}")
+
+
+def get_store() -> NewsStore:
+    """Shared store of the configured backend, created on first use"""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = create_store()
+    return _STORE
+
+
+__all__ = ['BACKENDS', 'NEWS_COLUMNS', 'PROMPT_COLUMNS', 'NewsStore', 'create_store', 'get_store']
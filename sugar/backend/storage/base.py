@@ -0,0 +1,95 @@
+"""
+Interface shared by the storage backends.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Iterator, List, Sequence, Set, Tuple
+
+# Columns of news.news in insert order
+NEWS_COLUMNS = ['id', 'datetime', 'source', 'title', 'text', 'metadata', 'created_at', 'asset']
+# Columns of news.prompts (prompts and responses saved by the sentiment predictor) in insert order
+PROMPT_COLUMNS = ['article_id', 'system_prompt', 'user_prompt', 'response', 'sentiment', 'confidence',
+                  'reasoning', 'title', 'commodity', 'topics', 'created_at']
+
+
+class NewsStore(ABC):
+    """
+    Storage of the news tables.
+
+    Subclasses implement the operations the pipeline and the scripts need: block inserts,
+    article ID existence checks, the duplicate scan and per-partition removal of
+    deduplicate_database, the news.prompts table of the predictor, and SQL for analytics.
+    Records are identified by their (id, created_at) key and partitions by an opaque
+    partition ID.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def execute(self, query: str, params=None, **kwargs) -> List[tuple]:
+        """Run an analytics query and return its rows"""
+
+    @abstractmethod
+    def execute_iter(self, query: str, params=None, **kwargs) -> Iterator[tuple]:
+        """Stream the rows of an analytics query"""
+
+    @abstractmethod
+    def insert(self, table: str, columns: Sequence[str], data: Iterable, columnar: bool = False,
+               block_size: int = None) -> int:
+        """
+        Insert rows into a table.
+
+        Args:
+            table: Table name, e.g. 'news.news'
+            columns: Column names
+            data: Row tuples, or with columnar=True one sequence of values per column
+            columnar: Whether data holds columns instead of rows
+            block_size: Rows per insert block (backend default if None)
+
+        Returns:
+            int: Number of rows inserted
+        """
+
+    @abstractmethod
+    def existing_ids(self, article_ids: Iterable[str]) -> Set[str]:
+        """Return the article IDs that are already stored in news.news"""
+
+    @abstractmethod
+    def duplicate_groups(self, asset: str = 'Sugar', batch_size: int = 10000) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream the groups of news.news records with the same title, text, source and datetime.
+
+        Yields:
+            tuple: (group_hash, duplicate_count, [(id, created_at, partition_id), ...],
+                title, source, datetime) for every group of two or more records
+        """
+
+    @abstractmethod
+    def delete_records(self, partition_id: str, keys: List[Tuple[str, Any]], use_mutation: bool = False) -> int:
+        """Remove the news.news records with the given (id, created_at) keys from one partition"""
+
+    @abstractmethod
+    def count_records(self, partition_id: str, keys: List[Tuple[str, Any]]) -> int:
+        """Count the news.news records of one partition that have the given (id, created_at) keys"""
+
+    @abstractmethod
+    def ensure_prompts_table(self):
+        """Create the news.prompts table (PROMPT_COLUMNS) if it does not exist"""
+
+    def insert_prompts(self, rows: Iterable[tuple]) -> int:
+        """
+        Insert rows of PROMPT_COLUMNS into news.prompts, creating the table on first use.
+
+        Returns:
+            int: Number of rows inserted
+        """
+        if not getattr(self, '_prompts_table_ready', False):
+            self.ensure_prompts_table()
+            self._prompts_table_ready = True
+        return self.insert('news.prompts', PROMPT_COLUMNS, rows)
+
+    def disconnect(self):
+        """Release connections; the store reconnects when it is used again"""
+
+    def close(self):
+        self.disconnect()
@@ -0,0 +1,147 @@
+"""
+ClickHouse storage backend on the shared connection pool of sugar.backend.db.
+"""
+
+from typing import Any, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from sugar.backend.db import DEFAULT_INSERT_BLOCK_SIZE, get_pool
+from sugar.backend.storage.base import NewsStore
+
+# Article IDs per existence query (32 character IDs keep the query well below max_query_size)
+ID_CHECK_CHUNK_SIZE = 2000
+
+CONTENT_HASH_COLUMN = 'content_hash'
+CONTENT_HASH_EXPRESSION = 'cityHash64(title, text, source, datetime)'
+# Deletes carry every (id, created_at) key of a partition in one statement
+DELETE_MAX_QUERY_SIZE = 256 * 1024 * 1024
+
+PROMPTS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS news.prompts (
+    article_id String,
+    system_prompt String,
+    user_prompt String,
+    response String,
+    sentiment String,
+    confidence Float32,
+    reasoning String,
+    title Nullable(String),
+    commodity Nullable(String),
+    topics Nullable(String),
+    created_at DateTime
+) ENGINE = MergeTree()
+ORDER BY (article_id, created_at)
+"""
+
+
+class ClickHouseStore(NewsStore):
+    """
+    News storage in ClickHouse.
+
+    Removals are lightweight deletes restricted to one partition through _partition_id, or
+    ALTER TABLE ... DELETE IN PARTITION mutations on servers without lightweight deletes.
+    """
+
+    name = 'clickhouse'
+
+    def __init__(self, client=None):
+        """
+        Args:
+            client: ClickHousePool (default: the shared pool)
+        """
+        self.client = client if client is not None else get_pool()
+
+    def execute(self, query: str, params=None, **kwargs) -> List[tuple]:
+        return self.client.execute(query, params, **kwargs)
+
+    def execute_iter(self, query: str, params=None, **kwargs) -> Iterator[tuple]:
+        return self.client.execute_iter(query, params, **kwargs)
+
+    def insert(self, table: str, columns: Sequence[str], data: Iterable, columnar: bool = False,
+               block_size: int = None) -> int:
+        return self.client.insert(table, columns, data, columnar=columnar,
+                                  block_size=block_size or DEFAULT_INSERT_BLOCK_SIZE)
+
+    def existing_ids(self, article_ids: Iterable[str], chunk_size: int = ID_CHECK_CHUNK_SIZE) -> Set[str]:
+        """Look up article IDs with one parameterized `WHERE id IN (...)` query per chunk"""
+        article_ids = list(dict.fromkeys(article_ids))
+        existing = set()
+        for offset in range(0, len(article_ids), chunk_size):
+            rows = self.client.execute(
+                'SELECT id FROM news.news WHERE id IN %(ids)s',
+                {'ids': tuple(article_ids[offset:offset + chunk_size])}
+            )
+            existing.update(row[0] for row in rows)
+        return existing
+
+    def has_content_hash_column(self) -> bool:
+        """Check whether news.news has the materialized content_hash column"""
+        result = self.client.execute(
+            "SELECT count() FROM system.columns WHERE database = 'news' AND table = 'news' AND name = %(name)s",
+            {'name': CONTENT_HASH_COLUMN}
+        )
+        return bool(result and result[0][0])
+
+    def add_content_hash_column(self):
+        """
+        Add the materialized content_hash column to news.news and compute it for existing parts.
+
+        New rows get the hash on insert. Parts written before the column existed compute it when
+        read until the MATERIALIZE COLUMN mutation has rewritten them.
+        """
+        self.client.execute(
+            f"ALTER TABLE news.news ADD COLUMN IF NOT EXISTS {CONTENT_HASH_COLUMN} UInt64 "
+            f"MATERIALIZED {CONTENT_HASH_EXPRESSION}"
+        )
+        self.client.execute(f"ALTER TABLE news.news MATERIALIZE COLUMN {CONTENT_HASH_COLUMN}")
+
+    def duplicate_groups(self, asset: str = 'Sugar', batch_size: int = 10000) -> Iterator[Tuple[Any, ...]]:
+        """
+        One aggregation by content hash whose groups are streamed; it reads the content_hash
+        column when the table has one and computes the hash otherwise.
+        """
+        hash_expression = CONTENT_HASH_COLUMN if self.has_content_hash_column() else CONTENT_HASH_EXPRESSION
+        query = f"""
+        SELECT
+            {hash_expression} AS group_hash,
+            count() AS duplicate_count,
+            groupArray((id, created_at, _partition_id)) AS records,
+            any(title) AS title,
+            any(source) AS source,
+            any(datetime) AS datetime
+        FROM news.news
+        WHERE asset = %(asset)s
+        GROUP BY group_hash
+        HAVING duplicate_count > 1
+        """
+        return self.client.execute_iter(query, {'asset': asset}, settings={'max_block_size': batch_size})
+
+    def delete_records(self, partition_id: str, keys: List[Tuple[str, Any]], use_mutation: bool = False) -> int:
+        if not keys:
+            return 0
+        if use_mutation:
+            query = ("ALTER TABLE news.news DELETE IN PARTITION ID %(partition_id)s "
+                     "WHERE (id, created_at) IN %(keys)s")
+            settings = {'max_query_size': DELETE_MAX_QUERY_SIZE, 'mutations_sync': 1}
+        else:
+            query = ("DELETE FROM news.news WHERE _partition_id = %(partition_id)s "
+                     "AND (id, created_at) IN %(keys)s")
+            settings = {'max_query_size': DELETE_MAX_QUERY_SIZE}
+        self.client.execute(query, {'partition_id': partition_id, 'keys': list(keys)}, settings=settings)
+        return len(keys)
+
+    def count_records(self, partition_id: str, keys: List[Tuple[str, Any]]) -> int:
+        if not keys:
+            return 0
+        result = self.client.execute(
+            "SELECT count() FROM news.news WHERE _partition_id = %(partition_id)s "
+            "AND (id, created_at) IN %(keys)s",
+            {'partition_id': partition_id, 'keys': list(keys)},
+            settings={'max_query_size': DELETE_MAX_QUERY_SIZE}
+        )
+        return result[0][0] if result else 0
+
+    def ensure_prompts_table(self):
+        self.client.execute(PROMPTS_TABLE_DDL)
+
+    def disconnect(self):
+        self.client.disconnect()
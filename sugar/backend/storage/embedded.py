@@ -0,0 +1,313 @@
+"""
+Embedded storage backend: Parquet files queried with DuckDB, for machines without ClickHouse.
+
+Every table is a directory under the store root with one sub-directory per partition, the
+YYYYMM month of its datetime column like the ClickHouse partitions ('all' for tables
+without one):
+
+    <root>/news/202401/part-<time>-<n>.parquet
+
+Inserts, ID lookups, the duplicate scan and deletes only need pyarrow. SQL queries need the
+optional duckdb package: every table is visible as a news.<table> and a <table> view, and
+the ClickHouse functions the scripts use most (toYear, toYYYYMM, groupArray, uniqExact, ...)
+are defined as macros, so most queries run unchanged.
+"""
+
+import hashlib
+import itertools
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Sequence, Set, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+from sugar.backend import config
+from sugar.backend.storage.base import NewsStore
+
+logger = logging.getLogger(__name__)
+
+NEWS_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('datetime', pa.timestamp('us')),
+    ('source', pa.string()),
+    ('title', pa.string()),
+    ('text', pa.string()),
+    ('metadata', pa.string()),
+    ('created_at', pa.timestamp('us')),
+    ('asset', pa.string()),
+])
+PROMPTS_SCHEMA = pa.schema([
+    ('article_id', pa.string()),
+    ('system_prompt', pa.string()),
+    ('user_prompt', pa.string()),
+    ('response', pa.string()),
+    ('sentiment', pa.string()),
+    ('confidence', pa.float32()),
+    ('reasoning', pa.string()),
+    ('title', pa.string()),
+    ('commodity', pa.string()),
+    ('topics', pa.string()),
+    ('created_at', pa.timestamp('us')),
+])
+TABLE_SCHEMAS = {'news': NEWS_SCHEMA, 'prompts': PROMPTS_SCHEMA}
+UNPARTITIONED = 'all'
+# Rows per fetch of execute_iter
+FETCH_SIZE = 10000
+
+# ClickHouse functions used by the scripts, defined as DuckDB macros
+CLICKHOUSE_MACROS = {
+    'toYear(d)': 'year(d)',
+    'toMonth(d)': 'month(d)',
+    'toDate(d)': 'CAST(d AS DATE)',
+    'toYYYYMM(d)': 'year(d) * 100 + month(d)',
+    'toStartOfMonth(d)': "date_trunc('month', d)",
+    'toStartOfDay(d)': "date_trunc('day', d)",
+    'groupArray(x)': 'list(x)',
+    'uniqExact(x)': 'count(DISTINCT x)',
+    'uniq(x)': 'approx_count_distinct(x)',
+    'positionCaseInsensitive(haystack, needle)': 'instr(lower(haystack), lower(needle))',
+}
+
+_IN_PARAMETER = re.compile(r'\bIN\s+%\((\w+)\)s', re.IGNORECASE)
+_PARAMETER = re.compile(r'%\((\w+)\)s')
+
+
+def _plain_value(value):
+    """Python value storable by pyarrow; aware datetimes become naive UTC like ClickHouse DateTime"""
+    if hasattr(value, 'to_pydatetime'):
+        value = value.to_pydatetime()
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _partition_id(value) -> str:
+    value = _plain_value(value)
+    if isinstance(value, datetime):
+        return f"{value.year}{value.month:02d}"
+    return UNPARTITIONED
+
+
+def to_duckdb_query(query: str, params=None):
+    """
+    Translate a clickhouse_driver query with %(name)s parameters to DuckDB $name parameters.
+
+    `IN %(name)s` becomes `IN (SELECT unnest($name))` and tuple or set values become lists.
+    """
+    query = _IN_PARAMETER.sub(r'IN (SELECT unnest($\1))', query)
+    query = _PARAMETER.sub(r'$\1', query)
+    if params:
+        params = {key: list(value) if isinstance(value, (tuple, set, frozenset)) else value
+                  for key, value in params.items()}
+    return query, params
+
+
+class EmbeddedStore(NewsStore):
+    """
+    News storage in local Parquet files.
+
+    Parquet files are immutable, so a delete rewrites the files of its partition without
+    the removed records, which matches the one-statement-per-partition removal of ClickHouse.
+    """
+
+    name = 'embedded'
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Store root directory (default: EMBEDDED_STORE_PATH)
+        """
+        self.root = Path(path or config.EMBEDDED_STORE_PATH)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._sequence = itertools.count()
+        self._duckdb = None
+
+    def _table_dir(self, table: str) -> Path:
+        return self.root / table.split('.')[-1]
+
+    def _files(self, table: str, partition_id: str = None) -> List[Path]:
+        return sorted(self._table_dir(table).glob(f"{partition_id or '*'}/*.parquet"))
+
+    def _write(self, table: str, partition_id: str, arrow_table: pa.Table):
+        directory = self._table_dir(table) / partition_id
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{time.time_ns()}-{next(self._sequence)}.parquet"
+        pq.write_table(arrow_table, path)
+        return path
+
+    def insert(self, table: str, columns: Sequence[str], data: Iterable, columnar: bool = False,
+               block_size: int = None) -> int:
+        columns = list(columns)
+        if columnar:
+            values = [[_plain_value(value) for value in column] for column in data]
+        else:
+            rows = list(data)
+            values = [[_plain_value(value) for value in column] for column in zip(*rows)] if rows else []
+        count = len(values[0]) if values else 0
+        if not count:
+            return 0
+
+        schema = TABLE_SCHEMAS.get(table.split('.')[-1])
+        arrays = [
+            pa.array(column, type=schema.field(name).type if schema is not None and name in schema.names else None)
+            for name, column in zip(columns, values)
+        ]
+        arrow_table = pa.Table.from_arrays(arrays, names=columns)
+
+        if 'datetime' in columns:
+            partition_ids = [_partition_id(value) for value in values[columns.index('datetime')]]
+        else:
+            partition_ids = [UNPARTITIONED] * count
+        positions = {}
+        for position, partition_id in enumerate(partition_ids):
+            positions.setdefault(partition_id, []).append(position)
+
+        with self._lock:
+            for partition_id, partition_positions in positions.items():
+                self._write(table, partition_id, arrow_table.take(partition_positions))
+        return count
+
+    def existing_ids(self, article_ids: Iterable[str]) -> Set[str]:
+        """Scan only the id column of news.news for the given IDs"""
+        article_ids = list(set(article_ids))
+        files = self._files('news.news')
+        if not article_ids or not files:
+            return set()
+        found = ds.dataset([str(path) for path in files], format='parquet').to_table(
+            columns=['id'], filter=pc.field('id').isin(article_ids)
+        )
+        return set(found.column('id').to_pylist())
+
+    def duplicate_groups(self, asset: str = 'Sugar', batch_size: int = 10000) -> Iterator[Tuple[Any, ...]]:
+        """
+        Group records by a 64-bit BLAKE2 hash of title, text, source and datetime, reading one
+        file at a time; only the keys of every group are kept in memory.
+        """
+        columns = ['id', 'created_at', 'title', 'text', 'source', 'datetime']
+        groups = {}
+        for path in self._files('news.news'):
+            partition_id = path.parent.name
+            arrow_table = pq.read_table(path, columns=columns + ['asset'], filters=pc.field('asset') == asset)
+            for batch in arrow_table.to_batches(max_chunksize=batch_size):
+                for record_id, created_at, title, text, source, datetime_val in zip(
+                        *(batch.column(name).to_pylist() for name in columns)):
+                    key = '\x1f'.join(str(value) for value in (title, text, source, datetime_val))
+                    group_hash = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+                    group = groups.get(group_hash)
+                    if group is None:
+                        groups[group_hash] = group = ([], title, source, datetime_val)
+                    group[0].append((record_id, created_at, partition_id))
+
+        for group_hash, (records, title, source, datetime_val) in groups.items():
+            if len(records) > 1:
+                yield group_hash, len(records), records, title, source, datetime_val
+
+    def _partition_table(self, partition_id: str):
+        files = self._files('news.news', partition_id)
+        if not files:
+            return files, None
+        return files, pa.concat_tables([pq.read_table(path) for path in files], promote_options='default')
+
+    def _key_mask(self, arrow_table: pa.Table, keys) -> List[bool]:
+        key_set = {(record_id, _plain_value(created_at)) for record_id, created_at in keys}
+        return [key in key_set for key in zip(arrow_table.column('id').to_pylist(),
+                                               arrow_table.column('created_at').to_pylist())]
+
+    def delete_records(self, partition_id: str, keys: List[Tuple[str, Any]], use_mutation: bool = False) -> int:
+        if not keys:
+            return 0
+        with self._lock:
+            files, arrow_table = self._partition_table(partition_id)
+            if arrow_table is None:
+                return 0
+            matches = self._key_mask(arrow_table, keys)
+            removed = sum(matches)
+            if not removed:
+                return 0
+            remaining = arrow_table.filter(pa.array([not match for match in matches]))
+            if remaining.num_rows:
+                self._write('news.news', partition_id, remaining)
+            for path in files:
+                path.unlink()
+        return removed
+
+    def count_records(self, partition_id: str, keys: List[Tuple[str, Any]]) -> int:
+        if not keys:
+            return 0
+        with self._lock:
+            _, arrow_table = self._partition_table(partition_id)
+        return sum(self._key_mask(arrow_table, keys)) if arrow_table is not None else 0
+
+    def ensure_prompts_table(self):
+        """Create the prompts directory; inserts apply PROMPTS_SCHEMA"""
+        self._table_dir('news.prompts').mkdir(parents=True, exist_ok=True)
+
+    def _connection(self):
+        if duckdb is None:
+            raise ImportError("SQL queries on the embedded store need duckdb (pip install duckdb)")
+        if self._duckdb is None:
+            connection = duckdb.connect()
+            connection.execute("CREATE SCHEMA IF NOT EXISTS news")
+            for signature, body in CLICKHOUSE_MACROS.items():
+                connection.execute(f"CREATE OR REPLACE MACRO {signature} AS {body}")
+            self._duckdb = connection
+        # Views are recreated so that files written since the last query are included
+        for directory in sorted(path for path in self.root.iterdir() if path.is_dir()):
+            if any(directory.glob('*/*.parquet')):
+                pattern = str(directory / '*' / '*.parquet').replace("'", "''")
+                source = f"SELECT * FROM read_parquet('{pattern}', union_by_name = true)"
+                # Queries name tables with (news.news) or without (sentiment_predictions) a database
+                self._duckdb.execute(f"CREATE OR REPLACE VIEW news.{directory.name} AS {source}")
+                self._duckdb.execute(f"CREATE OR REPLACE VIEW main.{directory.name} AS {source}")
+        return self._duckdb
+
+    def execute(self, query: str, params=None, **kwargs) -> List[tuple]:
+        """
+        Run a query with DuckDB.
+
+        ClickHouse-only keyword arguments such as settings are ignored; columnar=True
+        returns one tuple per column like clickhouse_driver.
+        """
+        query, params = to_duckdb_query(query, params)
+        with self._lock:
+            connection = self._connection()
+            rows = connection.execute(query, params).fetchall() if params else connection.execute(query).fetchall()
+        if kwargs.get('columnar'):
+            return list(zip(*rows))
+        return rows
+
+    def execute_iter(self, query: str, params=None, **kwargs) -> Iterator[tuple]:
+        query, params = to_duckdb_query(query, params)
+        with self._lock:
+            cursor = self._connection().cursor()
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+        try:
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
+
+    def disconnect(self):
+        with self._lock:
+            if self._duckdb is not None:
+                self._duckdb.close()
+                self._duckdb = None
@@ -0,0 +1,225 @@
+"""
+Fast language identification for the language normalization pipeline.
+
+langdetect is slow (it builds n-gram probabilities for every call) and non-deterministic
+unless seeded. Most of our 27 sources publish in a single language, so most calls can be
+answered without it. Detection runs in this order:
+
+1. Per-source prior: a source whose last prior_window detected articles were at least
+   prior_threshold one language skips detection (every prior_recheck_interval-th article of
+   the source is still detected so the prior keeps learning).
+2. LRU cache keyed by a hash of the text (split parts and re-fetched articles repeat).
+3. Script fast path: text written almost entirely in a script used by one supported
+   language (Hangul, kana, Thai, Hebrew, Greek).
+4. English fast path: plain ASCII text with a high share of English function words.
+5. Seeded langdetect, which returns the same codes as the unseeded call used before.
+
+The fast paths are deliberately conservative so their results match langdetect;
+language_id_validation_test.py checks this on a labelled set.
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict, deque
+from typing import Dict, Optional
+
+try:
+    from langdetect import DetectorFactory, detect, LangDetectException
+except ImportError:
+    DetectorFactory = None
+    detect = None
+    LangDetectException = Exception  # fallback
+
+# (langdetect code, letters of a script used only by that language among our supported ones)
+SCRIPT_LANGUAGES = [
+    ("ko", re.compile(r"[가-힯ᄀ-ᇿ㄰-㆏]")),
+    ("ja", re.compile(r"[぀-ヿ一-鿿]")),  # kana, plus kanji when kana is present
+    ("th", re.compile(r"[฀-๿]")),
+    ("he", re.compile(r"[֐-׿]")),
+    ("el", re.compile(r"[Ͱ-Ͽἀ-῿]")),
+]
+_KANA = re.compile(r"[぀-ヿ]")
+_LATIN = re.compile(r"[A-Za-zÀ-ɏ]")
+_LETTER = re.compile(r"[^\W\d_]", re.UNICODE)
+_NON_ASCII_LETTER = re.compile(r"[^\x00-\x7F]")
+_WORD = re.compile(r"[a-z']+")
+
+# Share of letters that must belong to the script for the script fast path
+SCRIPT_SHARE_THRESHOLD = 0.9
+
+# langdetect codes of languages not written in Latin script
+NON_LATIN_LANGUAGES = frozenset([
+    "ar", "bg", "bn", "el", "fa", "gu", "he", "hi", "ja", "kn", "ko", "mk", "ml", "mr", "ne", "pa",
+    "ru", "ta", "te", "th", "uk", "ur", "zh-cn", "zh-tw"
+])
+
+# English fast path: minimum number of words and share of English function words
+ENGLISH_MIN_WORDS = 15
+ENGLISH_STOPWORD_SHARE = 0.3
+ENGLISH_STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers him his how i if in into is it its itself just me more most my no nor not
+now of off on once only or other our ours out over own same she should so some such than that the
+their theirs them then there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your yours said says amid
+""".split())
+
+
+def text_key(text: str) -> str:
+    """Return the cache key of a text"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def detect_by_script(text: str) -> Optional[str]:
+    """
+    Detect the language of text written almost entirely in a single-language script.
+
+    Returns:
+        Optional[str]: langdetect code, or None if the script does not decide the language
+    """
+    letters = _LETTER.findall(text)
+    if not letters:
+        return None
+    total = len(letters)
+    joined = "".join(letters)
+    for lang, pattern in SCRIPT_LANGUAGES:
+        if lang == "ja" and not _KANA.search(joined):
+            # Kanji without kana may be Chinese
+            continue
+        if len(pattern.findall(joined)) / total >= SCRIPT_SHARE_THRESHOLD:
+            return lang
+    return None
+
+
+def is_latin_text(text: str) -> bool:
+    """Check whether most letters of a text are Latin"""
+    letters = _LETTER.findall(text)
+    if not letters:
+        return True
+    return len(_LATIN.findall("".join(letters))) * 2 >= len(letters)
+
+
+def detect_english(text: str) -> bool:
+    """
+    Check whether text is confidently English: ASCII only, long enough and rich in function words.
+    """
+    if _NON_ASCII_LETTER.search(text):
+        return False
+    words = _WORD.findall(text.lower())
+    if len(words) < ENGLISH_MIN_WORDS:
+        return False
+    stopwords = sum(1 for word in words if word in ENGLISH_STOPWORDS)
+    return stopwords / len(words) >= ENGLISH_STOPWORD_SHARE
+
+
+class LanguageIdentifier:
+    """
+    Language identification with per-source priors, an LRU cache and fast paths before langdetect.
+    """
+
+    def __init__(self,
+                 cache_size: int = 10000,
+                 prior_window: int = 1000,
+                 prior_threshold: float = 0.99,
+                 prior_recheck_interval: int = 50,
+                 seed: int = 0):
+        """
+        Initialize the identifier.
+
+        Args:
+            cache_size (int): Maximum number of cached detection results
+            prior_window (int): Number of recent detections kept per source
+            prior_threshold (float): Share of one language needed over a full window to skip detection
+            prior_recheck_interval (int): Every n-th article of a source with a prior is still detected
+            seed (int): langdetect seed, making the fallback deterministic
+        """
+        self.cache_size = cache_size
+        self.prior_window = prior_window
+        self.prior_threshold = prior_threshold
+        self.prior_recheck_interval = prior_recheck_interval
+        self._cache = OrderedDict()
+        self._history: Dict[str, deque] = {}
+        self._counts: Dict[str, Counter] = {}
+        self._seen: Counter = Counter()
+        self._lock = threading.Lock()
+        self.stats = Counter()
+        if DetectorFactory is not None:
+            DetectorFactory.seed = seed
+
+    def get_prior(self, source: Optional[str]) -> Optional[str]:
+        """Return the language a source is known to publish in, or None if it has no prior yet"""
+        if not source:
+            return None
+        with self._lock:
+            history = self._history.get(source)
+            if not history or len(history) < self.prior_window:
+                return None
+            language, count = self._counts[source].most_common(1)[0]
+            if language is not None and count / len(history) >= self.prior_threshold:
+                return language
+            return None
+
+    def _record(self, source: Optional[str], language: Optional[str]):
+        if not source:
+            return
+        with self._lock:
+            history = self._history.setdefault(source, deque())
+            counts = self._counts.setdefault(source, Counter())
+            history.append(language)
+            counts[language] += 1
+            if len(history) > self.prior_window:
+                counts[history.popleft()] -= 1
+
+    def detect(self, text: str, source: Optional[str] = None) -> Optional[str]:
+        """
+        Detect the language of a text.
+
+        Args:
+            text (str): Text to identify
+            source (Optional[str]): Source (site) name used for the per-source prior
+
+        Returns:
+            Optional[str]: langdetect language code
+
+        Raises:
+            LangDetectException: If langdetect is needed and cannot detect a language
+        """
+        prior = self.get_prior(source)
+        if prior is not None:
+            with self._lock:
+                self._seen[source] += 1
+                recheck = self._seen[source] % self.prior_recheck_interval == 0
+            # Text in a script the source does not use always goes through detection
+            script_matches = is_latin_text(text) == (prior not in NON_LATIN_LANGUAGES)
+            if not recheck and script_matches:
+                self.stats["prior"] += 1
+                return prior
+
+        key = text_key(text)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["cache"] += 1
+                language = self._cache[key]
+                cached = True
+            else:
+                cached = False
+        if not cached:
+            language = detect_by_script(text)
+            if language is not None:
+                self.stats["script"] += 1
+            elif detect_english(text):
+                language = "en"
+                self.stats["english"] += 1
+            else:
+                self.stats["langdetect"] += 1
+                language = detect(text)
+            with self._lock:
+                self._cache[key] = language
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        self._record(source, language)
+        return language
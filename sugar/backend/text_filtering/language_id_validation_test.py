@@ -0,0 +1,94 @@
+from langdetect import DetectorFactory, detect
+
+from language_id import LanguageIdentifier
+
+# Labelled validation set: (text, language code). Short slang, transliterations and
+# code-switching have no reliable label (None); they only have to match what langdetect
+# returns today, misfires included, because LanguageIdentifier must not change any result.
+VALIDATION_SET = [
+    # Sugar market English
+    ("Raw sugar futures rose 2% on Tuesday as dry weather in Brazil's centre-south threatened the cane crop.", "en"),
+    ("ICE white sugar for March delivery settled lower after India said it would allow more exports this season.", "en"),
+    ("The mills in Uttar Pradesh have started crushing earlier than usual, and output is expected to be higher than last year.", "en"),
+    ("Sugar prices fell to a three-month low on speculation that the Thai harvest will be larger than forecast.", "en"),
+    ("Analysts said that the deficit for the 2024/25 season was smaller than they had expected in the spring.", "en"),
+    # Other Latin-script languages
+    ("Hola amigo! ¿Cómo estás?", "es"),
+    ("Les prix du sucre brut ont fortement augmenté cette semaine en raison de la sécheresse au Brésil.", "fr"),
+    ("Die Zuckerpreise sind in dieser Woche wegen der schlechten Ernte in Thailand deutlich gestiegen.", "de"),
+    ("Os preços do açúcar subiram com a menor moagem de cana no centro-sul do Brasil.", "pt"),
+    ("I prezzi dello zucchero sono scesi dopo le piogge in India.", "it"),
+    # Non-Latin scripts
+    ("你好，世界！", "zh-cn"),
+    ("مرحبا كيف الحال؟", "ar"),
+    ("Цены на сахар выросли из-за засухи в Бразилии.", "ru"),
+    ("砂糖の価格はブラジルの干ばつで上昇しました。", "ja"),
+    ("설탕 가격이 브라질 가뭄으로 상승했습니다.", "ko"),
+    ("ราคาน้ำตาลสูงขึ้นเนื่องจากภัยแล้งในบราซิล", "th"),
+    ("מחירי הסוכר עלו בגלל הבצורת בברזיל.", "he"),
+    ("Οι τιμές της ζάχαρης αυξήθηκαν λόγω της ξηρασίας στη Βραζιλία.", "el"),
+    ("चीनी की कीमतें ब्राज़ील में सूखे के कारण बढ़ गईं।", "hi"),
+    # Slang, transliterations and code-switching
+    ("u r gr8! lol, wassup?", None),
+    ("brb, gotta go 2 the store rn", None),
+    ("namaste! ap kaise ho?", None),
+    ("gr8 job, bhai!", None),
+    ("Let's go to the mercado for some comida.", None),
+    ("今日はgood dayですね。", None),
+    ("lol... that's sooo funny!!!", None),
+    ("I can't believe u did that, smh.", None),
+    ("gr8, namaste, lol, u r awesome!", None),
+]
+
+
+def reference_detect(text):
+    """Language detection as the pipeline did it before LanguageIdentifier"""
+    DetectorFactory.seed = 0
+    try:
+        return detect(text)
+    except Exception:
+        return None
+
+
+def identifier_detect(identifier, text, source=None):
+    try:
+        return identifier.detect(text, source=source)
+    except Exception:
+        return None
+
+
+def run_tests():
+    identifier = LanguageIdentifier()
+    mismatches = 0
+
+    for i, (text, label) in enumerate(VALIDATION_SET, 1):
+        expected = reference_detect(text)
+        # Unlabelled cases only have to agree with langdetect
+        label = label or expected
+        result = identifier_detect(identifier, text)
+        cached = identifier_detect(identifier, text)
+        ok = result == expected == label and cached == result
+        mismatches += not ok
+        print(f"Test {i}: {'OK' if ok else 'MISMATCH'}")
+        print(f"  Text:       {text}")
+        print(f"  Label:      {label}  langdetect: {expected}  LanguageIdentifier: {result}")
+        print("-" * 60)
+
+    # Per-source prior: an English-only source stops running detection once the window is full
+    prior_identifier = LanguageIdentifier(prior_window=20)
+    english = [text for text, label in VALIDATION_SET if label == "en"]
+    for i in range(100):
+        identifier_detect(prior_identifier, f"{english[i % len(english)]} Report {i}.", source="Nasdaq")
+    print(f"Prior: {prior_identifier.get_prior('Nasdaq')}  stats: {dict(prior_identifier.stats)}")
+    foreign = identifier_detect(prior_identifier, "Цены на сахар выросли из-за засухи в Бразилии.", source="Nasdaq")
+    print(f"Foreign-script text from an English source: {foreign}")
+    if foreign != "ru":
+        mismatches += 1
+
+    print(f"Stats: {dict(identifier.stats)}")
+    print(f"Mismatches: {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    run_tests()
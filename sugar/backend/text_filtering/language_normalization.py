@@ -12,16 +12,21 @@ Requirements:
 - Ready for integration with triage/filtering and subsequent workflow stages.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import contextlib
+import logging
 import re
-
-# Placeholder imports for required libraries
-# Actual implementations should ensure these are installed and configured
-try:
-    from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
-except ImportError:
-    M2M100ForConditionalGeneration = None
-    M2M100Tokenizer = None
+import threading
+import time
+
+# torch, transformers and spaCy take seconds to import, so they are imported on first use
+# (see _import_translation and _import_spacy); each name is None once found missing
+NOT_IMPORTED = object()
+torch = NOT_IMPORTED
+M2M100ForConditionalGeneration = NOT_IMPORTED
+M2M100Tokenizer = NOT_IMPORTED
+spacy = NOT_IMPORTED
+_import_lock = threading.Lock()
 
 try:
     from langdetect import detect, LangDetectException
@@ -29,70 +34,258 @@ except ImportError:
     detect = None
     LangDetectException = Exception  # fallback
 
-try:
-    import spacy
-except ImportError:
-    spacy = None
-
 try:
     from symspellpy import SymSpell, Verbosity
 except ImportError:
     SymSpell = None
     Verbosity = None
 
+try:
+    from .language_id import LanguageIdentifier
+    from .spelling_correction import TokenSpellCorrector
+except ImportError:
+    from language_id import LanguageIdentifier
+    from spelling_correction import TokenSpellCorrector
+
+logger = logging.getLogger(__name__)
+
+# Map langdetect codes to M2M100 supported codes
+M2M_LANG_MAP = {
+    "en": "en", "fr": "fr", "de": "de", "es": "es", "ru": "ru", "zh-cn": "zh", "zh": "zh",
+    "hi": "hi", "ar": "ar", "pt": "pt", "it": "it", "ja": "ja", "ko": "ko", "tr": "tr",
+    "pl": "pl", "nl": "nl", "sv": "sv", "fi": "fi", "no": "no", "da": "da", "cs": "cs",
+    "el": "el", "he": "he", "id": "id", "ms": "ms", "th": "th", "vi": "vi", "uk": "uk",
+    "ro": "ro", "hu": "hu", "fa": "fa", "bg": "bg", "sr": "sr", "hr": "hr", "sk": "sk",
+    "sl": "sl", "lt": "lt", "lv": "lv", "et": "et"
+}
+
+# Slang/abbreviation replacements applied to single tokens (keys are lowercase)
+SLANG_DICT = {"u": "you", "r": "are", "lol": "laughing out loud"}
+
+# spaCy components the slang stage never uses; only the tokenizer is needed
+SLANG_EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"]
+
+# Sentence boundaries used to chunk long texts before translation (including the Devanagari danda)
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?。！？।॥])\s+|\n+')
+
+# SentencePiece marks the first piece of every word with this character
+WORD_START = "\u2581"
+
+# Room on top of max_chunk_tokens for the language code and </s> that M2M100 adds to every chunk,
+# and for small differences when the pieces of a split sentence are joined back into text
+CHUNK_TOKEN_MARGIN = 8
+
+def _import_translation():
+    """Import torch and the M2M100 classes on first use; returns (tokenizer class, model class)"""
+    global torch, M2M100ForConditionalGeneration, M2M100Tokenizer
+    with _import_lock:
+        if torch is NOT_IMPORTED:
+            try:
+                import torch as torch_module
+            except ImportError:
+                torch_module = None
+            torch = torch_module
+        if M2M100Tokenizer is NOT_IMPORTED or M2M100ForConditionalGeneration is NOT_IMPORTED:
+            try:
+                import transformers
+                tokenizer_class, model_class = transformers.M2M100Tokenizer, transformers.M2M100ForConditionalGeneration
+            except ImportError:
+                tokenizer_class = model_class = None
+            if M2M100Tokenizer is NOT_IMPORTED:
+                M2M100Tokenizer = tokenizer_class
+            if M2M100ForConditionalGeneration is NOT_IMPORTED:
+                M2M100ForConditionalGeneration = model_class
+    return M2M100Tokenizer, M2M100ForConditionalGeneration
+
+
+def _import_spacy():
+    """Import spaCy on first use; None if it is not installed"""
+    global spacy
+    with _import_lock:
+        if spacy is NOT_IMPORTED:
+            try:
+                import spacy as spacy_module
+            except ImportError:
+                spacy_module = None
+            spacy = spacy_module
+    return spacy
+
+
+def map_slang_tokens(text: str, doc) -> str:
+    """Replace slang tokens of a tokenized text, keeping every token's trailing whitespace"""
+    if not any(token.lower_ in SLANG_DICT for token in doc):
+        return text
+    return "".join(SLANG_DICT.get(token.lower_, token.text) + token.whitespace_ for token in doc)
+
+class LazyComponent:
+    """
+    Pipeline attribute that is loaded by the named loader method on first access.
+
+    Assigning the attribute (e.g. to a test double or None) replaces the component without loading it.
+    """
+
+    def __init__(self, loader_name: str):
+        self.loader_name = loader_name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with instance._component_lock:
+            if self.name not in instance.__dict__:
+                started = time.perf_counter()
+                instance.__dict__[self.name] = getattr(instance, self.loader_name)()
+                logger.info(f"Loaded {self.name} in {time.perf_counter() - started:.2f}s")
+            return instance.__dict__[self.name]
+
+
 # Pipeline class
 class LanguageNormalizationPipeline:
+    # normalize() and normalize_batch() accept the article source for per-source language priors
+    SUPPORTS_SOURCE_PRIORS = True
+
+    # Models are loaded on first use, so pipelines that never translate never load M2M100
+    tokenizer = LazyComponent("_load_tokenizer")
+    model = LazyComponent("_load_model")
+    nlp = LazyComponent("_load_nlp")
+    sym_spell = LazyComponent("_load_sym_spell")
+
     def __init__(self,
                  translation_model_name: str = "facebook/m2m100_418M",
                  slang_model: str = "en_core_web_sm",
-                 symspell_dict_path: str = None):
+                 symspell_dict_path: str = None,
+                 translation_batch_size: int = 16,
+                 max_chunk_tokens: int = 256,
+                 language_identifier: Optional[LanguageIdentifier] = None,
+                 protected_terms: Optional[List[str]] = None,
+                 spelling_cache_size: int = 50000,
+                 slang_batch_size: int = 64,
+                 slang_n_process: int = 1):
+        self._component_lock = threading.RLock()
+
         # Translation setup
-        if M2M100Tokenizer and M2M100ForConditionalGeneration:
-            self.tokenizer = M2M100Tokenizer.from_pretrained(translation_model_name)
-            self.model = M2M100ForConditionalGeneration.from_pretrained(translation_model_name)
-        else:
-            self.tokenizer = None
-            self.model = None
-
-        # Slang/synonym setup
-        if spacy:
-            self.nlp = spacy.load(slang_model)
-        else:
-            self.nlp = None
+        self.translation_model_name = translation_model_name
+        self.translation_batch_size = translation_batch_size
+        # Chunks stay well under M2M100's 1024 position limit; longer texts are split by sentence,
+        # and sentences longer than the limit into windows of tokens
+        self.max_chunk_tokens = max_chunk_tokens
+        self.throughput_stats = {"texts": 0, "translated": 0, "chunks": 0, "seconds": 0.0}
+
+        # Language identification with per-source priors and a result cache in front of langdetect
+        self.language_identifier = language_identifier or LanguageIdentifier()
+
+        # Slang/synonym setup: tokenizer-only pipeline, batched through nlp.pipe
+        self.slang_model = slang_model
+        self.slang_batch_size = slang_batch_size
+        self.slang_n_process = slang_n_process
 
         # Typo correction setup
-        if SymSpell:
-            self.sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
-            if symspell_dict_path:
-                self.sym_spell.load_dictionary(symspell_dict_path, term_index=0, count_index=1)
-        else:
-            self.sym_spell = None
-
-    def normalize(self, text: str = None, sugar_pricing_lines: List[str] = None) -> Any:
+        self.symspell_dict_path = symspell_dict_path
+        # Domain terms (e.g. entity names) that typo correction must never rewrite,
+        # in addition to the triage filter keywords
+        self.protected_terms = protected_terms
+        self.spelling_cache_size = spelling_cache_size
+        self._spell_corrector = None
+
+    def _load_tokenizer(self):
+        tokenizer_class, model_class = _import_translation()
+        if tokenizer_class and model_class:
+            return tokenizer_class.from_pretrained(self.translation_model_name)
+        return None
+
+    def _load_model(self):
+        tokenizer_class, model_class = _import_translation()
+        if tokenizer_class and model_class:
+            model = model_class.from_pretrained(self.translation_model_name)
+            model.eval()
+            return model
+        return None
+
+    def _load_nlp(self):
+        spacy = _import_spacy()
+        if not spacy:
+            return None
+        try:
+            return spacy.load(self.slang_model, exclude=SLANG_EXCLUDED_COMPONENTS)
+        except OSError:
+            print(f"[WARN] spaCy model '{self.slang_model}' not available, using a blank English tokenizer.")
+            return spacy.blank("en")
+
+    def _load_sym_spell(self):
+        if not SymSpell:
+            return None
+        sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+        if self.symspell_dict_path:
+            sym_spell.load_dictionary(self.symspell_dict_path, term_index=0, count_index=1)
+        return sym_spell
+
+    def preload(self):
+        """Load every component now instead of on first use (e.g. in a long-running service)"""
+        for name in ("tokenizer", "model", "nlp", "sym_spell"):
+            getattr(self, name)
+
+    def _translation_available(self) -> bool:
+        """Check whether translation is possible without loading the model"""
+        if "tokenizer" in self.__dict__ or "model" in self.__dict__:
+            return bool(self.tokenizer and self.model)
+        tokenizer_class, model_class = _import_translation()
+        return tokenizer_class is not None and model_class is not None
+
+    def normalize(self, text: str = None, sugar_pricing_lines: List[str] = None, source: str = None) -> Any:
         """
         If sugar_pricing_lines is provided, normalize and extract structured pricing data.
         Otherwise, perform standard normalization on text.
+        source is the article's site name, used for its language prior.
         """
         if sugar_pricing_lines is not None:
             return self._normalize_sugar_pricing_data(sugar_pricing_lines)
         if text is None:
             return ""
+        return self.normalize_batch([text], sources=[source])[0]
+
+    def normalize_batch(self, texts: List[str], sources: Optional[List[str]] = None) -> List[str]:
+        """
+        Normalize several texts at once.
+
+        English texts skip translation; the others are translated in padded batches grouped by
+        language and length, then every text goes through the remaining normalization steps.
+        Results are returned in input order. sources optionally gives each text's site name.
+        """
+        started = time.perf_counter()
+        texts = ["" if text is None else text for text in texts]
+
         # 1. Translation to English
-        text = self._translate_to_english(text)
+        translated = self._translate_batch_to_english(texts, sources)
 
         # 2. Typo correction
-        text = self._correct_typos(text)
+        corrected = [self._correct_typos(text) for text in translated]
 
         # 3. Slang/synonym mapping
-        text = self._map_slang_synonyms(text)
+        mapped = self._map_slang_synonyms_batch(corrected)
 
-        # 4. Punctuation/formatting normalization
-        text = self._normalize_punctuation(text)
-
-        # 5. Edge case handling
-        text = self._handle_edge_cases(text)
+        normalized = []
+        for text in mapped:
+            # 4. Punctuation/formatting normalization
+            text = self._normalize_punctuation(text)
+
+            # 5. Edge case handling
+            text = self._handle_edge_cases(text)
+            normalized.append(text)
+
+        elapsed = time.perf_counter() - started
+        self.throughput_stats["texts"] += len(texts)
+        self.throughput_stats["seconds"] += elapsed
+        if len(texts) > 1:
+            rate = len(texts) / elapsed if elapsed > 0 else float("inf")
+            logger.info(f"normalize_batch: {len(texts)} texts in {elapsed:.2f}s ({rate:.1f} articles/sec)")
+        return normalized
 
-        return text
+    def get_throughput(self) -> float:
+        """Return the overall normalization throughput in articles per second"""
+        seconds = self.throughput_stats["seconds"]
+        return self.throughput_stats["texts"] / seconds if seconds > 0 else 0.0
 
     def _normalize_sugar_pricing_data(self, lines: List[str]) -> List[Dict[str, Any]]:
         """
@@ -139,67 +332,170 @@ class LanguageNormalizationPipeline:
             normalized.append(entry)
         return normalized
 
-    def _translate_to_english(self, text: str) -> str:
-        if self.tokenizer and self.model:
-            # Language detection using langdetect
-            src_lang = "en"
-            try:
-                if detect:
-                    detected = detect(text)
-                    # Map langdetect code to M2M100 supported codes
-                    m2m_lang_map = {
-                        "en": "en", "fr": "fr", "de": "de", "es": "es", "ru": "ru", "zh-cn": "zh", "zh": "zh",
-                        "hi": "hi", "ar": "ar", "pt": "pt", "it": "it", "ja": "ja", "ko": "ko", "tr": "tr",
-                        "pl": "pl", "nl": "nl", "sv": "sv", "fi": "fi", "no": "no", "da": "da", "cs": "cs",
-                        "el": "el", "he": "he", "id": "id", "ms": "ms", "th": "th", "vi": "vi", "uk": "uk",
-                        "ro": "ro", "hu": "hu", "fa": "fa", "bg": "bg", "sr": "sr", "hr": "hr", "sk": "sk",
-                        "sl": "sl", "lt": "lt", "lv": "lv", "et": "et"
-                    }
-                    src_lang = m2m_lang_map.get(detected, None)
-                    if not src_lang:
-                        print(f"[WARN] Detected language '{detected}' not supported for M2M100. Skipping translation.")
-                        return text
-                else:
-                    print("[WARN] langdetect not available, defaulting to English.")
-                    src_lang = "en"
-            except LangDetectException:
-                print("[ERROR] Language detection failed. Skipping translation.")
-                return text
-            except Exception as e:
-                print(f"[ERROR] Unexpected error in language detection: {e}. Skipping translation.")
-                return text
+    def _detect_language(self, text: str, source: str = None) -> Optional[str]:
+        """
+        Detect the M2M100 source language of a text.
+        Returns None when the language cannot be detected or is not supported.
+        """
+        if not detect:
+            print("[WARN] langdetect not available, defaulting to English.")
+            return "en"
+        try:
+            detected = self.language_identifier.detect(text, source=source)
+        except LangDetectException:
+            print("[ERROR] Language detection failed. Skipping translation.")
+            return None
+        except Exception as e:
+            print(f"[ERROR] Unexpected error in language detection: {e}. Skipping translation.")
+            return None
+        src_lang = M2M_LANG_MAP.get(detected, None)
+        if not src_lang:
+            print(f"[WARN] Detected language '{detected}' not supported for M2M100. Skipping translation.")
+        return src_lang
+
+    def _count_tokens(self, text: str) -> int:
+        return len(self.tokenizer.tokenize(text))
+
+    def _split_long_sentence(self, sentence: str) -> List[str]:
+        """
+        Split a sentence longer than max_chunk_tokens into windows of at most max_chunk_tokens tokens,
+        cut before a word where possible. Texts without sentence punctuation (e.g. Thai) end up here.
+        """
+        tokens = self.tokenizer.tokenize(sentence)
+        windows = []
+        start = 0
+        while start < len(tokens):
+            end = min(start + self.max_chunk_tokens, len(tokens))
+            if end < len(tokens):
+                # Move the cut back to the start of a word, but never below half a window
+                for cut in range(end, start + self.max_chunk_tokens // 2, -1):
+                    if tokens[cut].startswith(WORD_START):
+                        end = cut
+                        break
+            windows.append(self.tokenizer.convert_tokens_to_string(tokens[start:end]).strip())
+            start = end
+        return windows
+
+    def _split_into_chunks(self, text: str) -> List[str]:
+        """
+        Split a text into sentence-aligned chunks of at most max_chunk_tokens tokens.
+        A single sentence longer than the limit is split into token windows, so no input is truncated.
+        """
+        if self._count_tokens(text) <= self.max_chunk_tokens:
+            return [text]
+        chunks = []
+        current = []
+        current_tokens = 0
+        for sentence in SENTENCE_SPLIT_PATTERN.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            sentence_tokens = self._count_tokens(sentence)
+            if sentence_tokens > self.max_chunk_tokens:
+                if current:
+                    chunks.append(" ".join(current))
+                    current = []
+                    current_tokens = 0
+                chunks.extend(self._split_long_sentence(sentence))
+                continue
+            if current and current_tokens + sentence_tokens > self.max_chunk_tokens:
+                chunks.append(" ".join(current))
+                current = []
+                current_tokens = 0
+            current.append(sentence)
+            current_tokens += sentence_tokens
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def _translate_chunks(self, src_lang: str, chunks: List[str]) -> List[str]:
+        """Translate chunks of one language in padded batches of similar length"""
+        # Sorting by length keeps padding inside each batch small
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+        results = [None] * len(chunks)
+        self.tokenizer.src_lang = src_lang
+        forced_bos_token_id = self.tokenizer.get_lang_id("en")
+        _import_translation()
+        no_grad = torch.inference_mode() if torch is not None else contextlib.nullcontext()
+        with no_grad:
+            for start in range(0, len(order), self.translation_batch_size):
+                batch_indices = order[start:start + self.translation_batch_size]
+                batch = [chunks[i] for i in batch_indices]
+                try:
+                    encoded = self.tokenizer(
+                        batch, return_tensors="pt", padding=True, truncation=True,
+                        max_length=self.max_chunk_tokens + CHUNK_TOKEN_MARGIN
+                    )
+                    generated_tokens = self.model.generate(
+                        **encoded, forced_bos_token_id=forced_bos_token_id, max_new_tokens=self.max_chunk_tokens * 2
+                    )
+                    decoded = self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+                except Exception as e:
+                    print(f"[ERROR] Translation failed: {e}. Returning original text.")
+                    decoded = batch
+                for i, translation in zip(batch_indices, decoded):
+                    results[i] = translation
+        self.throughput_stats["chunks"] += len(chunks)
+        return results
+
+    def _translate_batch_to_english(self, texts: List[str], sources: Optional[List[str]] = None) -> List[str]:
+        """
+        Translate non-English texts to English, grouped by detected language.
+        English, empty and undetectable texts are returned unchanged.
+        """
+        if not self._translation_available():
+            return list(texts)
+
+        # Group chunks by source language, remembering which text each chunk belongs to
+        chunks_by_lang: Dict[str, List[str]] = {}
+        owners_by_lang: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            if not text.strip():
+                continue
+            src_lang = self._detect_language(text, sources[index] if sources else None)
+            if src_lang is None or src_lang == "en":
+                continue
+            for chunk in self._split_into_chunks(text):
+                chunks_by_lang.setdefault(src_lang, []).append(chunk)
+                owners_by_lang.setdefault(src_lang, []).append(index)
+
+        translated_parts: Dict[int, List[str]] = {}
+        for src_lang, chunks in chunks_by_lang.items():
+            for owner, translation in zip(owners_by_lang[src_lang], self._translate_chunks(src_lang, chunks)):
+                translated_parts.setdefault(owner, []).append(translation)
+
+        self.throughput_stats["translated"] += len(translated_parts)
+        return [" ".join(translated_parts[i]) if i in translated_parts else text for i, text in enumerate(texts)]
 
-            print(f"[DEBUG] _translate_to_english: src_lang={src_lang}, text={text}")
-            try:
-                self.tokenizer.src_lang = src_lang
-                encoded = self.tokenizer(text, return_tensors="pt")
-                generated_tokens = self.model.generate(**encoded, forced_bos_token_id=self.tokenizer.get_lang_id("en"))
-                return self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)[0]
-            except Exception as e:
-                print(f"[ERROR] Translation failed: {e}. Returning original text.")
-                return text
-        return text
+    def _translate_to_english(self, text: str) -> str:
+        return self._translate_batch_to_english([text])[0]
 
     def _correct_typos(self, text: str) -> str:
         if self.sym_spell:
             try:
-                # Use integer value for Verbosity.TOP to avoid comparison issues
-                suggestions = self.sym_spell.lookup_compound(text, 1)  # 1 corresponds to Verbosity.TOP
-                if suggestions:
-                    return suggestions[0].term
+                # Token-level correction with a shared LRU; protected domain terms and
+                # dictionary words are never looked up
+                if self._spell_corrector is None or self._spell_corrector.sym_spell is not self.sym_spell:
+                    self._spell_corrector = TokenSpellCorrector(
+                        self.sym_spell, self.protected_terms, cache_size=self.spelling_cache_size
+                    )
+                return self._spell_corrector.correct(text)
             except Exception as e:
                 print(f"[WARN] Typo correction failed: {e}. Continuing with original text.")
         return text
 
     def _map_slang_synonyms(self, text: str) -> str:
-        if self.nlp:
-            doc = self.nlp(text)
-            # Replace slang/abbreviations using custom rules or spaCy matcher
-            # Example: Replace "u" with "you", "r" with "are"
-            slang_dict = {"u": "you", "r": "are", "lol": "laughing out loud"}
-            tokens = [slang_dict.get(token.text.lower(), token.text) for token in doc]
-            return " ".join(tokens)
-        return text
+        return self._map_slang_synonyms_batch([text])[0]
+
+    def _map_slang_synonyms_batch(self, texts: List[str]) -> List[str]:
+        """
+        Replace slang/abbreviations token by token, keeping each token's trailing whitespace
+        so punctuation spacing is unchanged. Texts are tokenized in batches through nlp.pipe.
+        """
+        if not self.nlp:
+            return list(texts)
+        docs = self.nlp.pipe(texts, batch_size=self.slang_batch_size, n_process=self.slang_n_process)
+        return [map_slang_tokens(text, doc) for text, doc in zip(texts, docs)]
 
     def _normalize_punctuation(self, text: str) -> str:
         # Remove excessive whitespace, standardize punctuation
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+"""
+Normalization service: one process that loads the normalization models once and serves
+batched normalization requests to several fetcher or test workers over a local connection.
+
+Without it every worker process constructs its own LanguageNormalizationPipeline and loads
+M2M100, spaCy and SymSpell again. NormalizationClient has the same normalize() and
+normalize_batch() interface as the pipeline, so it can be passed wherever a pipeline is expected.
+
+Usage:
+    python normalization_service.py --address localhost:6010
+    python sugar_news_fetcher.py --normalization-service localhost:6010 ...
+
+Requests are pickled, so only clients holding the shared secret may connect. The secret is
+NORMALIZATION_SERVICE_AUTHKEY if set; otherwise the service generates a random key and writes
+it to a file only its owner can read (~/.sugar/normalization_service.key, or the path in
+NORMALIZATION_SERVICE_AUTHKEY_FILE), which clients of the same user read. The service only
+listens on loopback addresses and Unix sockets unless --allow-remote is given.
+"""
+
+import argparse
+import ipaddress
+import logging
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError, Process
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADDRESS = "localhost:6010"
+# Key file written by the service when NORMALIZATION_SERVICE_AUTHKEY is not set
+DEFAULT_AUTHKEY_FILE = os.path.join(os.path.expanduser("~"), ".sugar", "normalization_service.key")
+
+
+def load_authkey(create: bool = False) -> bytes:
+    """
+    Resolve the shared secret of the service.
+
+    NORMALIZATION_SERVICE_AUTHKEY is used if set. Otherwise the key file is read, and with create
+    a random key is generated and written to it with mode 0600 if it does not exist yet.
+
+    Args:
+        create (bool): Generate the key file if it is missing (the service side)
+
+    Returns:
+        bytes: The secret
+
+    Raises:
+        RuntimeError: If no key is configured and create is False
+    """
+    key = os.getenv("NORMALIZATION_SERVICE_AUTHKEY")
+    if key:
+        return key.encode("utf-8")
+    path = os.getenv("NORMALIZATION_SERVICE_AUTHKEY_FILE", DEFAULT_AUTHKEY_FILE)
+    try:
+        with open(path, "rb") as key_file:
+            if os.fstat(key_file.fileno()).st_mode & 0o077:
+                logger.warning(f"Normalization service key file {path} is readable by other users")
+            key = key_file.read().strip()
+        if key:
+            return key
+    except FileNotFoundError:
+        pass
+    if not create:
+        raise RuntimeError(f"No normalization service key: set NORMALIZATION_SERVICE_AUTHKEY or start the "
+                           f"service first, which writes {path}")
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    key = secrets.token_hex(32).encode("ascii")
+    try:
+        descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another service wrote the key first
+        return load_authkey()
+    with os.fdopen(descriptor, "wb") as key_file:
+        key_file.write(key)
+    logger.info(f"Wrote a new normalization service key to {path}")
+    return key
+
+
+def parse_address(address: Union[str, Tuple[str, int]]) -> Union[str, Tuple[str, int]]:
+    """
+    Parse a service address.
+
+    Args:
+        address: "host:port" for TCP on the loopback interface, or a path for a Unix socket
+
+    Returns:
+        Address accepted by multiprocessing.connection
+    """
+    if isinstance(address, tuple):
+        return address
+    host, separator, port = address.rpartition(":")
+    if separator and port.isdigit():
+        return (host or "localhost", int(port))
+    return address
+
+
+def is_loopback_address(address: Union[str, Tuple[str, int]]) -> bool:
+    """
+    Whether a parsed address only accepts connections from this host.
+
+    Args:
+        address: Address returned by parse_address
+
+    Returns:
+        bool: True for Unix sockets and hosts that resolve to loopback addresses only
+    """
+    if not isinstance(address, tuple):
+        return True
+    try:
+        resolved = socket.getaddrinfo(address[0], None)
+    except socket.gaierror:
+        return False
+    return bool(resolved) and all(ipaddress.ip_address(info[4][0].split("%")[0]).is_loopback for info in resolved)
+
+
+class NormalizationService:
+    """
+    Serves normalization requests from a single shared LanguageNormalizationPipeline.
+    """
+
+    def __init__(self, address: Union[str, Tuple[str, int]] = DEFAULT_ADDRESS,
+                 authkey: Optional[bytes] = None, pipeline=None, pipeline_kwargs: Optional[Dict[str, Any]] = None,
+                 preload: bool = True, allow_remote: bool = False):
+        """
+        Initialize the service.
+
+        Args:
+            address: Address to listen on (see parse_address)
+            authkey (Optional[bytes]): Shared secret clients must present (default: load_authkey(create=True))
+            pipeline: Pipeline to serve; a LanguageNormalizationPipeline is created if None
+            pipeline_kwargs (Optional[Dict[str, Any]]): Constructor arguments for the created pipeline
+            preload (bool): Load every model before accepting connections
+            allow_remote (bool): Listen on an address other hosts can reach
+
+        Raises:
+            ValueError: If the address is not a loopback address or Unix socket and allow_remote is False
+        """
+        address = parse_address(address)
+        if not allow_remote and not is_loopback_address(address):
+            raise ValueError(f"Refusing to serve pickled requests on non-loopback address {address[0]!r}; "
+                             f"pass allow_remote (--allow-remote) to do so anyway")
+        if pipeline is None:
+            try:
+                from .language_normalization import LanguageNormalizationPipeline
+            except ImportError:
+                from language_normalization import LanguageNormalizationPipeline
+            pipeline = LanguageNormalizationPipeline(**(pipeline_kwargs or {}))
+            if preload:
+                pipeline.preload()
+        self.pipeline = pipeline
+        self.address = address
+        self.authkey = authkey or load_authkey(create=True)
+        # The models are not thread-safe: requests are served one batch at a time
+        self.pipeline_lock = threading.Lock()
+        self.stats = {"requests": 0, "texts": 0, "clients": 0, "seconds": 0.0}
+        self._stopped = threading.Event()
+        self.listener = None
+
+    def handle_request(self, request: Tuple) -> Any:
+        """
+        Execute one request.
+
+        Args:
+            request (Tuple): ("normalize_batch", texts, sources), ("normalize_pricing", lines) or ("stats",)
+
+        Returns:
+            Any: Result of the request
+        """
+        command = request[0]
+        if command == "stats":
+            return dict(self.stats)
+        started = time.perf_counter()
+        with self.pipeline_lock:
+            if command == "normalize_batch":
+                texts, sources = request[1], request[2]
+                result = self.pipeline.normalize_batch(texts, sources=sources)
+                self.stats["texts"] += len(texts)
+            elif command == "normalize_pricing":
+                result = self.pipeline.normalize(sugar_pricing_lines=request[1])
+            else:
+                raise ValueError(f"Unknown normalization service command: {command}")
+            self.stats["requests"] += 1
+            self.stats["seconds"] += time.perf_counter() - started
+        return result
+
+    def _serve_client(self, conn):
+        self.stats["clients"] += 1
+        with conn:
+            while not self._stopped.is_set():
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if request[0] == "close":
+                    return
+                try:
+                    conn.send(("ok", self.handle_request(request)))
+                except Exception as e:
+                    logger.error(f"Normalization request failed: {e}")
+                    conn.send(("error", str(e)))
+
+    def serve_forever(self):
+        """Accept clients until stop() is called; each client is served by its own thread"""
+        self.listener = Listener(self.address, authkey=self.authkey)
+        logger.info(f"Normalization service listening on {self.listener.address}")
+        try:
+            while not self._stopped.is_set():
+                try:
+                    conn = self.listener.accept()
+                except AuthenticationError:
+                    logger.warning("Rejected a normalization client with a wrong key")
+                    continue
+                except OSError:
+                    if self._stopped.is_set():
+                        break
+                    raise
+                threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+        finally:
+            self.listener.close()
+
+    def stop(self):
+        """Stop accepting clients"""
+        self._stopped.set()
+        if self.listener is not None:
+            self.listener.close()
+
+
+class NormalizationClient:
+    """
+    Client with the normalize()/normalize_batch() interface of LanguageNormalizationPipeline.
+    """
+
+    SUPPORTS_SOURCE_PRIORS = True
+
+    def __init__(self, address: Union[str, Tuple[str, int]] = DEFAULT_ADDRESS,
+                 authkey: Optional[bytes] = None, connect_timeout: float = 60.0):
+        """
+        Connect to a running normalization service.
+
+        Args:
+            address: Service address (see parse_address)
+            authkey (Optional[bytes]): Shared secret of the service (default: load_authkey())
+            connect_timeout (float): Seconds to keep retrying while the service is starting
+        """
+        self.address = parse_address(address)
+        authkey = authkey or load_authkey()
+        deadline = time.monotonic() + connect_timeout
+        while True:
+            try:
+                self.conn = Client(self.address, authkey=authkey)
+                break
+            except (ConnectionRefusedError, FileNotFoundError):
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.2)
+        # One request in flight per connection; threads of one worker share it
+        self.lock = threading.Lock()
+
+    def _call(self, *request) -> Any:
+        with self.lock:
+            self.conn.send(request)
+            status, result = self.conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"Normalization service error: {result}")
+        return result
+
+    def normalize(self, text: str = None, sugar_pricing_lines: List[str] = None, source: str = None) -> Any:
+        """Same contract as LanguageNormalizationPipeline.normalize()"""
+        if sugar_pricing_lines is not None:
+            return self._call("normalize_pricing", sugar_pricing_lines)
+        if text is None:
+            return ""
+        return self.normalize_batch([text], sources=[source])[0]
+
+    def normalize_batch(self, texts: List[str], sources: Optional[List[str]] = None) -> List[str]:
+        """Same contract as LanguageNormalizationPipeline.normalize_batch()"""
+        return self._call("normalize_batch", list(texts), sources)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the service's request statistics"""
+        return self._call("stats")
+
+    def close(self):
+        """Close the connection"""
+        with self.lock:
+            try:
+                self.conn.send(("close",))
+            except OSError:
+                pass
+            self.conn.close()
+
+
+def _run_service(address, authkey, pipeline_kwargs, allow_remote):
+    NormalizationService(address, authkey, pipeline_kwargs=pipeline_kwargs, allow_remote=allow_remote).serve_forever()
+
+
+def start_normalization_service(address: Union[str, Tuple[str, int]] = DEFAULT_ADDRESS,
+                                authkey: Optional[bytes] = None,
+                                pipeline_kwargs: Optional[Dict[str, Any]] = None,
+                                allow_remote: bool = False) -> Process:
+    """
+    Start the service in a daemon process.
+
+    Args:
+        address: Address to listen on
+        authkey (Optional[bytes]): Shared secret (default: load_authkey(create=True))
+        pipeline_kwargs (Optional[Dict[str, Any]]): LanguageNormalizationPipeline constructor arguments
+        allow_remote (bool): Listen on an address other hosts can reach
+
+    Returns:
+        Process: The service process; connect with NormalizationClient, which waits while it starts
+    """
+    authkey = authkey or load_authkey(create=True)
+    process = Process(target=_run_service, args=(address, authkey, pipeline_kwargs, allow_remote), daemon=True,
+                      name="normalization-service")
+    process.start()
+    return process
+
+
+def service_pipeline_kwargs(symspell_dict_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Pipeline arguments of the fetcher's in-process pipelines (normalization_pipeline_kwargs), so
+    clients of the service get exactly the same normalization.
+
+    Args:
+        symspell_dict_path (Optional[str]): SymSpell frequency dictionary
+
+    Returns:
+        Dict[str, Any]: LanguageNormalizationPipeline constructor arguments
+    """
+    try:
+        from sugar.backend.parsers.sugar_news_fetcher import normalization_pipeline_kwargs
+    except ImportError:
+        # Run as a script: the project root is not on the path
+        sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+        from sugar.backend.parsers.sugar_news_fetcher import normalization_pipeline_kwargs
+    kwargs = normalization_pipeline_kwargs()
+    if symspell_dict_path:
+        kwargs['symspell_dict_path'] = symspell_dict_path
+    return kwargs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve LanguageNormalizationPipeline to local workers')
+    parser.add_argument('--address', default=DEFAULT_ADDRESS,
+                        help=f'host:port or Unix socket path to listen on (default: {DEFAULT_ADDRESS})')
+    parser.add_argument('--symspell-dict-path', default=None, help='SymSpell frequency dictionary')
+    parser.add_argument('--allow-remote', action='store_true',
+                        help='Listen on a non-loopback address; anyone with the key and network access can then '
+                             'send requests (default: False)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        service = NormalizationService(args.address, pipeline_kwargs=service_pipeline_kwargs(args.symspell_dict_path),
+                                       allow_remote=args.allow_remote)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
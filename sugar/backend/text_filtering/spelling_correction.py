@@ -0,0 +1,124 @@
+"""
+Token-level spelling correction for the language normalization pipeline.
+
+Running SymSpell lookup_compound over a whole article is slow on long texts, lowercases and
+strips punctuation, and rewrites domain terms such as NY11, UNICA or Centro-Sul. This corrector
+works on single word tokens instead and leaves everything around them untouched:
+
+- tokens containing digits, all-uppercase acronyms and very short tokens are skipped
+- tokens in the protected domain vocabulary (sugar keywords, context zone keywords and entity
+  names) are skipped
+- tokens already in the SymSpell dictionary are skipped
+- the remaining tokens are looked up once and memoized in a bounded LRU shared across articles
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, Optional, Set
+
+try:
+    from symspellpy import Verbosity
+except ImportError:
+    Verbosity = None
+
+try:
+    from .sugar_triage_filter import SUGAR_KEYWORDS, KEYWORDS
+except ImportError:
+    from sugar_triage_filter import SUGAR_KEYWORDS, KEYWORDS
+
+# Word tokens, including internal apostrophes (e.g. "don't"); hyphenated terms are split at the hyphen
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*|\w+", re.UNICODE)
+_DIGIT = re.compile(r"\d")
+_TERM_PART = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Tokens shorter than this are left alone; SymSpell suggestions for them are mostly noise
+MIN_TOKEN_LENGTH = 3
+
+
+def build_protected_vocabulary(extra_terms: Optional[Iterable[str]] = None) -> Set[str]:
+    """
+    Build the lowercased set of words that must never be spell-corrected.
+
+    Args:
+        extra_terms (Optional[Iterable[str]]): Additional terms, e.g. company, government and person entities
+
+    Returns:
+        Set[str]: Protected words; multi-word and hyphenated terms contribute each of their words
+    """
+    terms = list(SUGAR_KEYWORDS)
+    for zone_keywords in KEYWORDS.values():
+        terms.extend(zone_keywords)
+    if extra_terms:
+        terms.extend(extra_terms)
+    vocabulary = set()
+    for term in terms:
+        vocabulary.update(part.lower() for part in _TERM_PART.findall(term))
+    return vocabulary
+
+
+def _match_case(original: str, corrected: str) -> str:
+    """Apply the capitalization of the original token to its correction"""
+    if original.isupper():
+        return corrected.upper()
+    if original[:1].isupper():
+        return corrected[:1].upper() + corrected[1:]
+    return corrected
+
+
+class TokenSpellCorrector:
+    """
+    SymSpell-based corrector that only looks up unknown, unprotected word tokens.
+    """
+
+    def __init__(self,
+                 sym_spell,
+                 protected_terms: Optional[Iterable[str]] = None,
+                 cache_size: int = 50000,
+                 max_edit_distance: int = 2):
+        """
+        Initialize the corrector.
+
+        Args:
+            sym_spell: Loaded SymSpell instance
+            protected_terms (Optional[Iterable[str]]): Domain terms to protect in addition to the triage keywords
+            cache_size (int): Maximum number of memoized token corrections
+            max_edit_distance (int): Maximum edit distance of a correction
+        """
+        self.sym_spell = sym_spell
+        self.protected = build_protected_vocabulary(protected_terms)
+        dictionary_distance = getattr(sym_spell, '_max_dictionary_edit_distance', max_edit_distance)
+        self.max_edit_distance = min(max_edit_distance, dictionary_distance)
+        self._lookup = lru_cache(maxsize=cache_size)(self._lookup_uncached)
+
+    def _lookup_uncached(self, word: str) -> str:
+        suggestions = self.sym_spell.lookup(word, Verbosity.TOP, max_edit_distance=self.max_edit_distance)
+        return suggestions[0].term if suggestions else word
+
+    def needs_correction(self, token: str) -> bool:
+        """Check whether a token should be looked up"""
+        if len(token) < MIN_TOKEN_LENGTH or token.isupper() or _DIGIT.search(token):
+            return False
+        word = token.lower()
+        return word not in self.protected and word not in self.sym_spell.words
+
+    def correct_token(self, token: str) -> str:
+        """Return the correction of a single token, or the token itself"""
+        if not self.needs_correction(token):
+            return token
+        return _match_case(token, self._lookup(token.lower()))
+
+    def correct(self, text: str) -> str:
+        """
+        Correct the word tokens of a text, preserving whitespace, punctuation and case.
+
+        Args:
+            text (str): Text to correct
+
+        Returns:
+            str: Corrected text
+        """
+        return TOKEN_PATTERN.sub(lambda match: self.correct_token(match.group(0)), text)
+
+    def cache_info(self):
+        """Return the LRU statistics of the correction cache"""
+        return self._lookup.cache_info()
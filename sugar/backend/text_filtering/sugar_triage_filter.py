@@ -80,6 +80,40 @@ def text_matches_keywords(text: str, patterns: List[re.Pattern]) -> bool:
 # Monthly stats logging is preserved
 import logging
 
+logger = logging.getLogger(__name__)
+
+ZONE_ORDER = ["market", "supply_chain", "event", "region"]
+
+def extract_context_zones(combined_content: str):
+    """
+    Find the first matching keyword of each context zone.
+
+    Args:
+        combined_content: Title and text to search.
+    Returns:
+        Tuple of (matched_zones, matched_keywords) in zone order.
+    """
+    matched_zones = []
+    matched_keywords = []
+    for zone in ZONE_ORDER:
+        for pat, kw in zip(KEYWORD_PATTERNS[zone], KEYWORDS[zone]):
+            if pat.search(combined_content):
+                matched_zones.append(zone)
+                matched_keywords.append(kw)
+                break  # Only need one match per zone
+    return matched_zones, matched_keywords
+
+def extract_sugar_pricing(text: str) -> List[str]:
+    """Return the structured pricing lines of a text that mention sugar keywords."""
+    extracted_sugar_pricing = []
+    for struct_pat in STRUCTURED_PATTERNS:
+        for match in struct_pat.finditer(text):
+            line = match.group(0)
+            # Only keep lines with sugar-related keywords
+            if text_matches_keywords(line, SUGAR_KEYWORD_PATTERNS):
+                extracted_sugar_pricing.append(line.strip())
+    return extracted_sugar_pricing
+
 def triage_filter(
     text: str,
     title: str = None,
@@ -158,26 +192,10 @@ def triage_filter(
     # EXTRACT METADATA (only for enrichment, not for filtering):
     
     # 1. Extract context zones metadata
-    matched_zones = []
-    matched_keywords = []
-    for zone in ["market", "supply_chain", "event", "region"]:
-        zone_patterns = KEYWORD_PATTERNS[zone]
-        zone_matched = False
-        for pat, kw in zip(zone_patterns, KEYWORDS[zone]):
-            if pat.search(combined_content):
-                matched_zones.append(zone)
-                matched_keywords.append(kw)
-                zone_matched = True
-                break  # Only need one match per zone
+    matched_zones, matched_keywords = extract_context_zones(combined_content)
     
     # 2. Extract structured pricing metadata
-    extracted_sugar_pricing = []
-    for struct_pat in STRUCTURED_PATTERNS:
-        for match in struct_pat.finditer(text):
-            line = match.group(0)
-            # Only keep lines with sugar-related keywords
-            if text_matches_keywords(line, SUGAR_KEYWORD_PATTERNS):
-                extracted_sugar_pricing.append(line.strip())
+    extracted_sugar_pricing = extract_sugar_pricing(text)
     
     # If structured sugar pricing data found, add to result
     if extracted_sugar_pricing:
@@ -191,6 +209,54 @@ def triage_filter(
     result["reason"] = "Passed sugar keyword filter"
     return result
 
+def merge_part_results(part_results: List[Dict[str, Any]], part_texts: List[str], title: str = None) -> Dict[str, Any]:
+    """
+    Build the triage result of a whole article from the results of its parts.
+
+    The parts are consecutive slices of the article text, so the article passes if any part
+    passes, and its metadata is what triage_filter would extract from the full text: per zone
+    the keyword listed first among the parts' matches, and the pricing lines of all parts in order.
+    Only parts that failed are searched again for context zones; passed parts are reused as is.
+
+    Args:
+        part_results: triage_filter results of the parts, in order.
+        part_texts: Text of each part.
+        title: Article title passed to triage_filter for each part.
+    Returns:
+        Dict with the same keys as a triage_filter result for the full article.
+    """
+    result = {
+        "passed": False,
+        "reason": "No sugar-related keywords found",
+        "matched_zones": [],
+        "matched_keywords": [],
+        "extracted_sugar_pricing": [],
+        "is_part": False,
+        "part_number": None
+    }
+    if not any(part.get("passed") for part in part_results):
+        return result
+
+    zone_keywords = {}
+    for part, part_text in zip(part_results, part_texts):
+        if part.get("passed"):
+            zones, keywords = part["matched_zones"], part["matched_keywords"]
+            # Parts without sugar keywords have no sugar pricing lines
+            result["extracted_sugar_pricing"].extend(part["extracted_sugar_pricing"])
+        else:
+            zones, keywords = extract_context_zones(f"{title} {part_text}" if title else part_text)
+        for zone, kw in zip(zones, keywords):
+            if zone not in zone_keywords or KEYWORDS[zone].index(kw) < KEYWORDS[zone].index(zone_keywords[zone]):
+                zone_keywords[zone] = kw
+
+    for zone in ZONE_ORDER:
+        if zone in zone_keywords:
+            result["matched_zones"].append(zone)
+            result["matched_keywords"].append(zone_keywords[zone])
+    result["passed"] = True
+    result["reason"] = "Passed sugar keyword filter"
+    return result
+
 # Example usage:
 if __name__ == "__main__":
     sample_text = "Brazilian sugar exports are rising due to market price changes."
@@ -12,7 +12,6 @@ import logging
 from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from clickhouse_driver import Client
 import pandas as pd
 import numpy as np
 
@@ -23,10 +22,12 @@ load_dotenv()
 current_dir = Path(__file__).resolve().parent
 parent_dir = current_dir.parent  # Go up to sugar examples root
 sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(parent_dir.parent))  # Project root, for sugar.backend.db
 
 # Import the required modules
 try:
     from backend.config import CLICKHOUSE_NATIVE_CONFIG
+    from sugar.backend.db import get_pool
     print("Successfully imported database configuration")
 except ImportError as e:
     print(f"Import attempt failed: {e}")
@@ -71,7 +72,7 @@ class SugarDataCombiner:
             if not CLICKHOUSE_NATIVE_CONFIG:
                 raise ValueError("Database configuration not available")
             
-            self.client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+            self.client = get_pool()
             
             # Test connection
             result = self.client.execute('SELECT 1 as test')
@@ -8,7 +8,6 @@ import sys
 import pandas as pd
 from pathlib import Path
 from dotenv import load_dotenv
-from clickhouse_driver import Client
 
 # Load environment variables
 load_dotenv()
@@ -17,10 +16,12 @@ load_dotenv()
 current_dir = Path(__file__).resolve().parent
 parent_dir = current_dir.parent  # Go up to sugar examples root
 sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(parent_dir.parent))  # Project root, for sugar.backend.db
 
 # Import the required modules
 try:
     from backend.config import CLICKHOUSE_NATIVE_CONFIG
+    from sugar.backend.db import get_pool
     print("Successfully imported database configuration")
 except ImportError as e:
     print(f"Import attempt failed: {e}")
@@ -33,7 +34,7 @@ def main():
         print("Database configuration not available")
         return 1
     
-    client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+    client = get_pool()
     
     try:
         # Get sample data from source_of_truth
@@ -14,7 +14,6 @@ import csv
 from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from clickhouse_driver import Client
 import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed, ProcessPoolExecutor
 import threading
@@ -30,11 +29,13 @@ load_dotenv()
 current_dir = Path(__file__).resolve().parent
 parent_dir = current_dir.parent  # Go up to sugar examples root
 sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(parent_dir.parent))  # Project root, for sugar.backend.db
 
 # Import the required modules
 try:
     from backend.api.nebius.nebius_api import NebiusAPI
     from backend.config import CLICKHOUSE_NATIVE_CONFIG
+    from sugar.backend.db import get_pool
     print("Successfully imported using relative path")
 except ImportError as e:
     print(f"Import attempt failed: {e}")
@@ -407,7 +408,7 @@ def main():
     # Initialize APIs and database
     try:
         api_keys = load_api_keys()
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_pool()
         print("Successfully connected to Nebius APIs and ClickHouse database")
         logger.info("Successfully connected to Nebius APIs and ClickHouse database")
     except Exception as e:
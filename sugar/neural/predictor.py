@@ -6,17 +6,26 @@ Analyzes news text and returns sentiment classification and confidence scores.
 """
 
 import os
+import sys
 import json
 import argparse
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from openai import OpenAI
 from datetime import datetime
+
+# Project root, for sugar.backend when run as a script or imported as `predictor` from sugar/neural
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
 try:
-    from clickhouse_driver import Client
-    from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
-    CLICKHOUSE_AVAILABLE = True
+    from sugar.backend import config
+    from sugar.backend.storage import get_store
+    STORAGE_AVAILABLE = True
 except ImportError:
-    CLICKHOUSE_AVAILABLE = False
+    config = None
+    STORAGE_AVAILABLE = False
 
 
 class CommoditySentimentPredictor:
@@ -31,18 +40,20 @@ class CommoditySentimentPredictor:
         
         Args:
             api_key: Nebius API key. If None, will try to get from environment.
-            save_prompts: Whether to save prompts to ClickHouse news.prompts table.
+            save_prompts: Whether to save prompts to the news.prompts table of the storage backend.
         """
         # First try to use the provided api_key, then fall back to environment variable
         self.api_key = api_key
         
-        # If no api_key provided, try to get from environment
+        # If no api_key provided, try to get from environment (including the .env file)
         if self.api_key is None:
+            if config is not None:
+                config.load_env()
             self.api_key = os.environ.get("NEBIUS_API_KEY")
         
         self.model = "Qwen/Qwen3-32B-LoRa:my-custom-model-commodity-pedw"
         self._client = None
-        self._clickhouse_client = None
+        self._store = None
         self.save_prompts = save_prompts
         
         # Validate that we have a non-empty API key
@@ -62,8 +73,8 @@ class CommoditySentimentPredictor:
         # Trim whitespace from the API key
         self.api_key = self.api_key.strip()
         
-        if self.save_prompts and not CLICKHOUSE_AVAILABLE:
-            raise ImportError("ClickHouse dependencies not available. Install clickhouse-driver and ensure config is accessible.")
+        if self.save_prompts and not STORAGE_AVAILABLE:
+            raise ImportError("Storage dependencies not available. Install the storage backend requirements and ensure config is accessible.")
     
     @property
     def client(self):
@@ -76,11 +87,11 @@ class CommoditySentimentPredictor:
         return self._client
     
     @property
-    def clickhouse_client(self):
-        """Lazy initialization of the ClickHouse client."""
-        if self._clickhouse_client is None and self.save_prompts:
-            self._clickhouse_client = Client(**CLICKHOUSE_NATIVE_CONFIG)
-        return self._clickhouse_client
+    def store(self):
+        """Lazy access to the configured storage backend."""
+        if self._store is None and self.save_prompts:
+            self._store = get_store()
+        return self._store
     
     def _create_system_prompt(self) -> str:
         """
@@ -265,9 +276,9 @@ Respond in JSON format with the following structure:
                 if not (0.0 <= result['confidence'] <= 1.0):
                     raise ValueError(f"Confidence score out of range: {result['confidence']}")
                 
-                # Save prompts to ClickHouse if enabled
+                # Save prompts if enabled
                 if self.save_prompts and article_id:
-                    self._save_prompts_to_clickhouse(
+                    self._save_prompts(
                         article_id=article_id,
                         system_prompt=system_prompt,
                         user_prompt=user_prompt,
@@ -312,9 +323,9 @@ Respond in JSON format with the following structure:
                         if not (0.0 <= result['confidence'] <= 1.0):
                             raise ValueError(f"Confidence score out of range: {result['confidence']}")
                         
-                        # Save prompts to ClickHouse if enabled
+                        # Save prompts if enabled
                         if self.save_prompts and article_id:
-                            self._save_prompts_to_clickhouse(
+                            self._save_prompts(
                                 article_id=article_id,
                                 system_prompt=system_prompt,
                                 user_prompt=user_prompt,
@@ -338,9 +349,9 @@ Respond in JSON format with the following structure:
                 parsed_result = self._parse_text_response(response_content)
                 print(f"DEBUG: Using parsed text response: {parsed_result}")
                 
-                # Save prompts to ClickHouse if enabled
+                # Save prompts if enabled
                 if self.save_prompts and article_id:
-                    self._save_prompts_to_clickhouse(
+                    self._save_prompts(
                         article_id=article_id,
                         system_prompt=system_prompt,
                         user_prompt=user_prompt,
@@ -441,12 +452,12 @@ Respond in JSON format with the following structure:
         
         return results
     
-    def _save_prompts_to_clickhouse(self, article_id: str, system_prompt: str, user_prompt: str,
-                                   response: str, sentiment: str, confidence: float, reasoning: str,
-                                   title: Optional[str] = None, commodity: Optional[str] = None,
-                                   topics: Optional[List[str]] = None, datetime: Optional[datetime] = None) -> bool:
+    def _save_prompts(self, article_id: str, system_prompt: str, user_prompt: str,
+                      response: str, sentiment: str, confidence: float, reasoning: str,
+                      title: Optional[str] = None, commodity: Optional[str] = None,
+                      topics: Optional[List[str]] = None, datetime: Optional[datetime] = None) -> bool:
         """
-        Save prompts and analysis results to ClickHouse news.prompts table.
+        Save prompts and analysis results to the news.prompts table of the storage backend.
         
         Args:
             article_id: ID of the article
@@ -468,17 +479,12 @@ Respond in JSON format with the following structure:
             return False
         
         try:
-            # Check if prompts table exists, create if not
-            self._ensure_prompts_table_exists()
-            
             # Prepare data for insertion
             created_at = datetime.now()
             topics_json = json.dumps(topics) if topics else None
             
-            # Insert data
-            self.clickhouse_client.execute(
-                'INSERT INTO news.prompts (article_id, system_prompt, user_prompt, response, '
-                'sentiment, confidence, reasoning, title, commodity, topics, created_at) VALUES',
+            # Insert data; the store creates news.prompts on first use
+            self.store.insert_prompts(
                 [(article_id, system_prompt, user_prompt, response, sentiment, confidence,
                   reasoning, title, commodity, topics_json, created_at)]
             )
@@ -486,44 +492,8 @@ Respond in JSON format with the following structure:
             return True
             
         except Exception as e:
-            print(f"Error saving prompts to ClickHouse: {str(e)}")
+            print(f"Error saving prompts: {str(e)}")
             return False
-    
-    def _ensure_prompts_table_exists(self) -> None:
-        """
-        Ensure that the news.prompts table exists in ClickHouse.
-        Create it if it doesn't exist.
-        """
-        try:
-            # Check if table exists
-            tables = self.clickhouse_client.execute("SHOW TABLES FROM news")
-            table_names = [table[0] for table in tables]
-            
-            if 'prompts' not in table_names:
-                # Create the prompts table
-                create_table_query = """
-                CREATE TABLE news.prompts (
-                    article_id String,
-                    system_prompt String,
-                    user_prompt String,
-                    response String,
-                    sentiment String,
-                    confidence Float32,
-                    reasoning String,
-                    title Nullable(String),
-                    commodity Nullable(String),
-                    topics Nullable(String),
-                    created_at DateTime
-                ) ENGINE = MergeTree()
-                ORDER BY (article_id, created_at)
-                """
-                
-                self.clickhouse_client.execute(create_table_query)
-                print("Created news.prompts table in ClickHouse")
-            
-        except Exception as e:
-            print(f"Error ensuring prompts table exists: {str(e)}")
-            raise
 
 
 def main():
@@ -538,7 +508,7 @@ def main():
     parser.add_argument('--datetime', type=str, help='Article datetime in ISO format (YYYY-MM-DD HH:MM:SS)')
     parser.add_argument('--file', type=str, help='Input file containing text to analyze')
     parser.add_argument('--output', type=str, help='Output file for results (JSON format)')
-    parser.add_argument('--save-prompts', action='store_true', help='Save prompts to ClickHouse news.prompts table')
+    parser.add_argument('--save-prompts', action='store_true', help='Save prompts to the news.prompts table of the storage backend (SUGAR_STORAGE_BACKEND)')
     parser.add_argument('--article-id', type=str, help='Article ID for saving prompts')
     
     args = parser.parse_args()
@@ -31,7 +31,7 @@ def test_datetime_in_prompt():
             predictor.api_key = "dummy_key_for_testing"
             predictor.model = "test_model"
             predictor._client = None
-            predictor._clickhouse_client = None
+            predictor._store = None
             predictor.save_prompts = False
         else:
             raise e
@@ -17,9 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from predictor import CommoditySentimentPredictor
 
-# Add the backend config path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
-from config import CLICKHOUSE_NATIVE_CONFIG
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))  # Project root, for sugar.backend.db
 
 def connect_to_clickhouse():
     """
@@ -29,10 +27,10 @@ def connect_to_clickhouse():
         Tuple of (success: bool, client: object or None, error: str or None)
     """
     try:
-        from clickhouse_driver import Client
+        from sugar.backend.db import get_pool
         
         print("Connecting to ClickHouse...")
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_pool()
         
         # Test connection
         result = client.execute('SELECT 1 as test')
@@ -31,13 +31,13 @@ def connect_to_clickhouse():
         Tuple of (success: bool, client: object or None, error: str or None)
     """
     try:
-        from clickhouse_driver import Client
         from sugar.backend.config import CLICKHOUSE_NATIVE_CONFIG
+        from sugar.backend.db import get_pool
         
         print(f"Connecting to ClickHouse at {CLICKHOUSE_NATIVE_CONFIG['host']}:{CLICKHOUSE_NATIVE_CONFIG['port']}...")
         
         # Test connection
-        client = Client(**CLICKHOUSE_NATIVE_CONFIG)
+        client = get_pool()
         
         # Execute a simple query to test connectivity
         result = client.execute('SELECT 1 as test')